@@ -0,0 +1,130 @@
+"""
+Advanced OS Project - Backend Locator and Launcher
+Finds the main_system and file_server binaries and launches it the right way on Windows,
+Linux and macOS
+"""
+
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+
+
+BACKEND_ENV = 'OSNEXUS_BACKEND'
+BACKEND_NAME = 'main_system'
+FILE_SERVER_ENV = 'OSNEXUS_FILE_SERVER'
+FILE_SERVER_NAME = 'file_server'
+SERVICE_ENV = 'OSNEXUS_SERVICE'
+SERVICE_HOST = '127.0.0.1'
+SERVICE_PORT = 9092
+IS_WINDOWS = os.name == 'nt'
+
+
+def client_dir():
+    """Directory of the client (next to the executable when frozen)"""
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+SERVER_DIR = os.path.normpath(os.path.join(client_dir(), '..', 'server'))
+
+
+def backend_names(name=BACKEND_NAME):
+    """Binary names to try, native name first"""
+    if IS_WINDOWS:
+        return (name + '.exe', name)
+    # A .exe next to the sources is a Windows build; it cannot run here
+    return (name,)
+
+
+def _runnable(path):
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def backend_candidates(server_dir=SERVER_DIR, name=BACKEND_NAME, env=BACKEND_ENV):
+    """Every place locate_backend looks, in order"""
+    candidates = []
+    configured = os.environ.get(env)
+    if configured:
+        candidates.append(os.path.expanduser(configured))
+    candidates.extend(os.path.join(server_dir, exe) for exe in backend_names(name))
+    return candidates
+
+
+def locate_backend(server_dir=SERVER_DIR, name=BACKEND_NAME, env=BACKEND_ENV):
+    """Path of a runnable main_system (or another server binary), or None
+
+    Looks at $OSNEXUS_BACKEND, then server/, then PATH.
+    """
+    for path in backend_candidates(server_dir, name, env):
+        if _runnable(path):
+            return os.path.abspath(path)
+    return shutil.which(name)
+
+
+def locate_file_server(server_dir=SERVER_DIR):
+    """Path of a runnable file_server: $OSNEXUS_FILE_SERVER, server/, then PATH"""
+    return locate_backend(server_dir, FILE_SERVER_NAME, FILE_SERVER_ENV)
+
+
+def describe_search(server_dir=SERVER_DIR, name=BACKEND_NAME, env=BACKEND_ENV):
+    """Human-readable list of the searched locations, for error messages"""
+    return ', '.join(backend_candidates(server_dir, name, env) + ['PATH'])
+
+
+def parse_address(text):
+    """Scheduling service address: ('unix', path) or ('tcp', (host, port))
+
+    Accepts unix:PATH (or any path containing a slash), HOST:PORT, :PORT
+    and PORT; host defaults to 127.0.0.1.
+    """
+    text = text.strip()
+    if text.startswith('unix:'):
+        return ('unix', text[len('unix:'):])
+    if '/' in text or (IS_WINDOWS and '\\' in text):
+        return ('unix', text)
+    host, _, port = text.rpartition(':')
+    host = host.strip('[]') or SERVICE_HOST
+    if not port.isdigit() or not 0 <= int(port) < 65536:
+        raise ValueError(f"Bad service address {text!r}; use HOST:PORT or unix:PATH")
+    return ('tcp', (host, int(port)))
+
+
+def popen_kwargs():
+    """Platform flags for a headless backend driven over pipes"""
+    if IS_WINDOWS:
+        return {'creationflags': getattr(subprocess, 'CREATE_NO_WINDOW', 0)}
+    # Own session: a Ctrl+C in the launching terminal reaches the client,
+    # which then closes its backends in order. Orphans exit on stdin EOF.
+    return {'start_new_session': True}
+
+
+def terminal_command(exe_path):
+    """Command that opens exe_path interactively in a new terminal window"""
+    if IS_WINDOWS:
+        return ['cmd', '/k', exe_path]
+    if sys.platform == 'darwin':
+        return ['open', '-a', 'Terminal', exe_path]
+
+    configured = os.environ.get('TERMINAL')
+    if configured and shutil.which(shlex.split(configured)[0]):
+        return shlex.split(configured) + ['-e', exe_path]
+    # Each emulator spells "run this program" differently
+    for terminal, flag in (('x-terminal-emulator', '-e'), ('gnome-terminal', '--'),
+                           ('konsole', '-e'), ('xfce4-terminal', '-x'), ('xterm', '-e')):
+        if shutil.which(terminal):
+            return [terminal, flag, exe_path]
+    return None
+
+
+def open_in_terminal(exe_path):
+    """Start the backend's interactive menu in its own terminal window"""
+    command = terminal_command(exe_path)
+    if command is None:
+        raise RuntimeError("No terminal emulator found; set $TERMINAL or run "
+                           f"{exe_path} from a shell")
+    if IS_WINDOWS:
+        return subprocess.Popen(command, creationflags=getattr(subprocess, 'CREATE_NEW_CONSOLE', 0))
+    return subprocess.Popen(command, start_new_session=True)
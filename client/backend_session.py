@@ -0,0 +1,387 @@
+"""
+Advanced OS Project - Persistent Backend Session
+Keeps one main_system process open in API mode and pipelines menu commands
+"""
+
+import socket
+import subprocess
+import threading
+import queue
+import collections
+import time
+
+import metrics
+from backend_launcher import parse_address, popen_kwargs
+from shm_transfer import SharedTransfer
+
+
+RESPONSE_DELIMITER = 'END_OF_RESPONSE'
+EXIT_OPTION = 8
+POLL_INTERVAL = 0.1
+CONNECT_TIMEOUT = 5
+
+
+class BackendError(RuntimeError):
+    """Raised when the backend process cannot answer a request"""
+
+
+class JobCancelled(BackendError):
+    """Raised when a streaming request is cancelled by the caller"""
+
+
+def format_workload(processes):
+    """Serialize processes into an API-mode LOAD command"""
+    with metrics.timer('workload_format_seconds', "Serializing a workload to LOAD").time():
+        return _format_workload(processes)
+
+
+def _format_workload(processes):
+    if hasattr(processes, 'sorted_columns'):
+        arrival, burst, priority = processes.sorted_columns()
+    else:
+        ordered = sorted(processes, key=lambda x: x['arrival'])
+        arrival = [p['arrival'] for p in ordered]
+        burst = [p['burst'] for p in ordered]
+        priority = [p['priority'] for p in ordered]
+    lines = [f"LOAD {len(arrival)}"]
+    lines.extend(f"{a} {b} {p}" for a, b, p in zip(arrival, burst, priority))
+    return '\n'.join(lines) + '\n'
+
+
+class BackendSession:
+    """Long-lived main_system process driven over stdin/stdout
+
+    With shared_memory set, workloads and result columns travel through
+    memory-mapped files (see shm_transfer) and stdout carries only the
+    small RESULT_MAP frames; decode them with this session's segment.
+    """
+
+    def __init__(self, exe_path, timeout=10, init_payloads=(), shared_memory=False):
+        self.exe_path = exe_path
+        self.timeout = timeout
+        self.init_payloads = list(init_payloads)
+        self.transfer = SharedTransfer() if shared_memory else None
+        if self.transfer is not None:
+            self.init_payloads.append(self.transfer.format_command())
+        self.process = None
+        self.restarts = 0
+        self._lines = None
+        self._pending_init = []
+        self._stderr = collections.deque(maxlen=200)
+        # Reentrant so run_algorithm can hold it across writing the workload
+        # segment and the request that reads it
+        self._lock = threading.RLock()
+
+    @property
+    def segment(self):
+        """The SharedTransfer RESULT_MAP frames refer to, or None"""
+        return self.transfer
+
+    # ========== PROCESS LIFECYCLE ==========
+
+    def start(self):
+        """Spawn the backend and start the stdout/stderr reader threads"""
+        with metrics.timer('backend_spawn_seconds', "Starting a backend process").time():
+            self.process = subprocess.Popen(
+                [self.exe_path],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+                **popen_kwargs()
+            )
+        self._lines = queue.Queue()
+        # Session settings (e.g. result format) are replayed on every spawn
+        self._pending_init = list(self.init_payloads)
+        threading.Thread(target=self._read_stdout,
+                         args=(self.process.stdout, self._lines), daemon=True).start()
+        threading.Thread(target=self._read_stderr,
+                         args=(self.process.stderr,), daemon=True).start()
+
+    def is_alive(self):
+        """Check whether the backend process is still running"""
+        return self.process is not None and self.process.poll() is None
+
+    def ensure_started(self):
+        """Start the backend, restarting it if the previous process died"""
+        if self.is_alive():
+            return
+        if self.process is not None:
+            self._kill()
+            self.restarts += 1
+            metrics.counter('backend_restarts', "Backend processes respawned").inc()
+        self.start()
+
+    def close(self):
+        """Ask the backend to exit, killing it if it does not"""
+        with self._lock:
+            if self.transfer is not None:
+                self.transfer.close()
+            if not self.is_alive():
+                self.process = None
+                return
+            try:
+                self.process.stdin.write(f"RUN {EXIT_OPTION}\n")
+                self.process.stdin.flush()
+                self.process.wait(timeout=2)
+            except (OSError, ValueError, subprocess.TimeoutExpired):
+                pass
+            self._kill()
+            self.process = None
+
+    def _kill(self):
+        """Terminate the current process and release its pipes"""
+        process = self.process
+        if process is None:
+            return
+        if process.poll() is None:
+            process.kill()
+            try:
+                process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                pass
+        for stream in (process.stdin, process.stdout, process.stderr):
+            try:
+                stream.close()
+            except (OSError, ValueError):
+                pass
+
+    def _send(self, data):
+        try:
+            self.process.stdin.write(data)
+            self.process.stdin.flush()
+        except (OSError, ValueError):
+            raise BrokenPipeError("Backend stdin closed")
+
+    def _read_stdout(self, stream, lines):
+        """Reader thread: forward stdout lines, None marks end of stream"""
+        try:
+            for line in stream:
+                lines.put(line)
+        except (OSError, ValueError):
+            pass
+        lines.put(None)
+
+    def _read_stderr(self, stream):
+        """Reader thread: keep recent stderr lines so the pipe never fills"""
+        try:
+            for line in stream:
+                self._stderr.append(line)
+        except (OSError, ValueError):
+            pass
+
+    def drain_stderr(self):
+        """Return and clear the stderr captured since the last call"""
+        text = ''.join(self._stderr)
+        self._stderr.clear()
+        return text
+
+    # ========== REQUESTS ==========
+
+    def pipeline(self, payloads, timeout=None, on_line=None, cancel_event=None, skip=0,
+                 check_skipped=False):
+        """Send several commands in one write and return one response per command
+
+        The first skip responses are consumed silently (not streamed or
+        returned). With check_skipped, one of them not starting with OK
+        raises BackendError with its text once the rest have arrived.
+        """
+        args = (payloads, timeout, on_line, cancel_event, skip, check_skipped)
+        with self._lock:
+            try:
+                return self._exchange(*args)
+            except BrokenPipeError:
+                # Process died between requests; restart once and retry
+                self._kill()
+                return self._exchange(*args)
+
+    def request(self, payload, timeout=None, on_line=None, cancel_event=None):
+        """Send one command block and return its framed response"""
+        return self.pipeline([payload], timeout, on_line, cancel_event)[0]
+
+    def ping(self, timeout=None):
+        """Health check: start the backend if needed and wait for its PONG
+
+        Returns the round trip in seconds.
+        """
+        started = time.perf_counter()
+        reply = self.request("PING\n", timeout)
+        if not reply.startswith("OK: PONG"):
+            raise BackendError(f"Unexpected health check reply: {reply.strip()}")
+        return time.perf_counter() - started
+
+    def run_algorithm(self, option, processes, timeout=None, on_line=None, cancel_event=None,
+                      quantum=None, cpus=None):
+        """Load a workload and run one menu option against it
+
+        quantum, when given, sets the Round Robin time quantum first, and
+        cpus the number of simulated cores.
+        """
+        with self._lock:
+            if self.transfer is not None:
+                load = self.transfer.load_command(processes)
+            else:
+                load = format_workload(processes)
+            payloads = [load, f"RUN {option}\n"]
+            if quantum is not None:
+                payloads.insert(0, f"QUANTUM {quantum}\n")
+            if cpus is not None:
+                payloads.insert(0, f"CPUS {cpus}\n")
+            # A rejected setting or workload must not pass for a run under it
+            return self.pipeline(payloads, timeout, on_line, cancel_event,
+                                 skip=len(payloads) - 1, check_skipped=True)[0]
+
+    def replay_trace(self, trace_command, heap=None, timeout=None, cancel_event=None):
+        """Run a TRACE command block and return its response
+
+        heap, a (size, policy) pair, replaces the allocator heap first.
+        """
+        payloads = [trace_command]
+        if heap is not None:
+            payloads.insert(0, f"HEAP {heap[0]} {heap[1]}\n")
+        responses = self.pipeline(payloads, timeout, cancel_event=cancel_event)
+        if heap is not None and not responses[0].startswith('OK'):
+            raise BackendError(responses[0].strip())
+        return responses[-1]
+
+    def _exchange(self, payloads, timeout, on_line=None, cancel_event=None, skip=0,
+                  check_skipped=False):
+        """Write all payloads, then collect the delimited responses
+
+        on_line is called with each stdout line as soon as it arrives.
+        Setting cancel_event kills the backend mid-response, since it
+        cannot be interrupted any other way; the next request respawns it.
+        """
+        self.ensure_started()
+        timeout = self.timeout if timeout is None else timeout
+        started = time.perf_counter()
+
+        init, self._pending_init = self._pending_init, []
+        checked = len(init)
+        skip += len(init)
+        payloads = init + list(payloads)
+
+        data = ''.join(payloads)
+        self._send(data)
+        metrics.counter('backend_bytes_sent', "Characters written to backend stdin").inc(len(data))
+
+        responses = []
+        current = []
+        idle = 0.0
+        while len(responses) < len(payloads):
+            if cancel_event is not None and cancel_event.is_set():
+                self._kill()
+                raise JobCancelled("Backend request cancelled")
+            try:
+                line = self._lines.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                idle += POLL_INTERVAL
+                if idle >= timeout:
+                    self._kill()
+                    raise BackendError(f"Backend did not respond within {timeout} seconds")
+                continue
+            idle = 0.0
+            if line is None:
+                self._kill()
+                raise BackendError("Backend exited before finishing the response")
+            if line.rstrip('\r\n') == RESPONSE_DELIMITER:
+                responses.append(''.join(current))
+                current = []
+            else:
+                current.append(line)
+                if on_line is not None and len(responses) >= skip:
+                    on_line(line)
+        metrics.counter('backend_lines_received', "Lines read from backend stdout").inc(
+            sum(r.count('\n') for r in responses))
+        metrics.timer('backend_request_seconds', "Backend round trip, write to last delimiter").observe(
+            time.perf_counter() - started)
+        if check_skipped:
+            for reply in responses[checked:skip]:
+                if not reply.startswith('OK'):
+                    raise BackendError(reply.strip())
+        return responses[skip:]
+
+
+class ServiceSession(BackendSession):
+    """BackendSession that talks to a shared scheduling service
+    (scheduler_service.py) over a socket instead of spawning main_system
+
+    The service speaks the backend's API protocol, so requests, framing
+    and reconnecting after a dropped connection all work as for a local
+    backend. address is anything parse_address accepts.
+    """
+
+    def __init__(self, address, timeout=10, init_payloads=()):
+        super().__init__(None, timeout, init_payloads)
+        self.address = address
+        self.connection = None
+        self._eof = threading.Event()
+
+    def start(self):
+        """Connect and start the reader thread"""
+        family, target = parse_address(self.address)
+        timer = metrics.timer('service_connect_seconds', "Connecting to the scheduling service")
+        with timer.time():
+            try:
+                if family == 'unix':
+                    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    connection.settimeout(CONNECT_TIMEOUT)
+                    connection.connect(target)
+                else:
+                    connection = socket.create_connection(target, CONNECT_TIMEOUT)
+            except OSError as e:
+                raise BackendError(f"Cannot reach the scheduling service at {self.address}: "
+                                   f"{e}")
+        connection.settimeout(None)
+        self.connection = connection
+        self._lines = queue.Queue()
+        self._eof = threading.Event()
+        self._pending_init = list(self.init_payloads)
+        reader = connection.makefile('r', encoding='utf-8', newline='')
+        threading.Thread(target=self._read_connection, args=(reader, self._lines, self._eof),
+                         daemon=True).start()
+
+    def _read_connection(self, reader, lines, eof):
+        self._read_stdout(reader, lines)
+        eof.set()
+
+    def is_alive(self):
+        """Connected, and the service has not closed its end"""
+        return self.connection is not None and not self._eof.is_set()
+
+    def ensure_started(self):
+        """Connect, reconnecting if the service dropped the last connection"""
+        if self.is_alive():
+            return
+        if self.connection is not None:
+            self._kill()
+            self.restarts += 1
+        self.start()
+
+    def close(self):
+        """Say goodbye to the service and drop the connection"""
+        with self._lock:
+            if self.connection is not None:
+                try:
+                    self._send(f"RUN {EXIT_OPTION}\n")
+                except BrokenPipeError:
+                    pass
+            self._kill()
+
+    def _kill(self):
+        """Drop the connection; the reader thread sees end of stream"""
+        connection, self.connection = self.connection, None
+        if connection is None:
+            return
+        try:
+            connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        connection.close()
+
+    def _send(self, data):
+        try:
+            self.connection.sendall(data.encode('utf-8'))
+        except (OSError, AttributeError):
+            raise BrokenPipeError("Scheduling service connection closed")
@@ -0,0 +1,282 @@
+"""
+Advanced OS Project - Headless Batch Runner
+Sweeps algorithms x RR/MLFQ quantums x workload variants over a process
+pool and prints a summary table; no display needed
+
+Usage:
+    python client/batch_runner.py workload.csv --quantums 1,2,4,8 \\
+        --variants base,arrival*0.5,burst*2 --workers 16
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import util
+
+from backend_launcher import SERVICE_ENV, describe_search, locate_backend
+from backend_session import BackendError, BackendSession, ServiceSession
+from process_store import ProcessStore
+from result_protocol import FORMAT_COMMAND, decode_results
+from scheduling_engine import (DEFAULT_QUANTUM, OPTION_ALGORITHMS, QUANTUM_ALGORITHMS,
+                               columns_from_processes, schedule)
+from workload_io import load_workload
+
+
+ALGORITHM_OPTIONS = {name: option for option, name in OPTION_ALGORITHMS.items()}
+ALGORITHM_ALIASES = {'fcfs': 'FCFS', 'sjf': 'SJF', 'priority': 'Priority',
+                     'rr': 'Round Robin', 'round robin': 'Round Robin', 'srtf': 'SRTF',
+                     'ppriority': 'Preemptive Priority',
+                     'preemptive priority': 'Preemptive Priority', 'mlfq': 'MLFQ'}
+SUMMARY_FIELDS = ('variant', 'algorithm', 'quantum', 'processes', 'avg_wt', 'avg_tat',
+                  'makespan', 'throughput', 'slices', 'seconds')
+
+
+class SweepError(ValueError):
+    """Raised for an invalid sweep specification"""
+
+
+# ========== SWEEP SPECIFICATION ==========
+
+def parse_algorithm(name):
+    canonical = ALGORITHM_ALIASES.get(name.strip().lower())
+    if canonical is None:
+        raise SweepError(f"Unknown algorithm {name!r} (use FCFS, SJF, Priority, RR, "
+                         "SRTF, PPriority or MLFQ)")
+    return canonical
+
+
+def parse_variant(spec):
+    """Check a workload variant spec: base, arrival*F, burst*F or head:N"""
+    spec = spec.strip()
+    if spec == 'base':
+        return spec
+    try:
+        if spec.startswith(('arrival*', 'burst*')):
+            if float(spec.split('*', 1)[1]) <= 0:
+                raise SweepError(f"Variant {spec!r} needs a positive factor")
+            return spec
+        if spec.startswith('head:') and int(spec[5:]) > 0:
+            return spec
+    except ValueError:
+        pass
+    raise SweepError(f"Unknown variant {spec!r} (use base, arrival*F, burst*F or head:N)")
+
+
+def apply_variant(store, spec):
+    """New ProcessStore derived from store by a variant spec"""
+    if spec == 'base':
+        return store
+    variant = ProcessStore()
+    if spec.startswith('head:'):
+        n = int(spec[5:])
+        variant.extend_columns(store.ids[:n], store.arrival[:n], store.burst[:n], store.priority[:n])
+    elif spec.startswith('arrival*'):
+        factor = float(spec.split('*', 1)[1])
+        variant.extend_columns(store.ids, (int(a * factor) for a in store.arrival),
+                               store.burst, store.priority)
+    else:
+        factor = float(spec.split('*', 1)[1])
+        variant.extend_columns(store.ids, store.arrival,
+                               (max(1, round(b * factor)) for b in store.burst), store.priority)
+    return variant
+
+
+def build_tasks(algorithms, quantums, variants):
+    """Every (variant, algorithm, quantum) run; quantum only varies for RR and MLFQ"""
+    tasks = []
+    for variant in variants:
+        for algorithm in algorithms:
+            for quantum in (quantums if algorithm in QUANTUM_ALGORITHMS else [0]):
+                tasks.append((variant, algorithm, quantum))
+    return tasks
+
+
+def load_sweep(path):
+    """Read {"algorithms": [...], "quantums": [...], "variants": [...]} from JSON"""
+    with open(path, encoding='utf-8') as f:
+        spec = json.load(f)
+    if not isinstance(spec, dict):
+        raise SweepError(f"{path}: sweep spec must be a JSON object")
+    return spec
+
+
+# ========== WORKERS ==========
+
+# Per-worker state, filled once by _init_worker
+_worker = {}
+
+
+def _init_worker(workload_path, exe_path, timeout, shared_memory=False, service=None):
+    """Load the workload and open this worker's own backend session"""
+    _worker['base'] = load_workload(workload_path, ProcessStore())
+    _worker['variants'] = {}
+    _worker['session'] = None
+    if service:
+        session = ServiceSession(service, timeout=timeout, init_payloads=[FORMAT_COMMAND])
+        _worker['session'] = session
+        util.Finalize(session, session.close, exitpriority=10)
+    elif exe_path:
+        session = BackendSession(exe_path, timeout=timeout, init_payloads=[FORMAT_COMMAND],
+                                 shared_memory=shared_memory)
+        _worker['session'] = session
+        # Pool workers leave through os._exit, so atexit would never run
+        util.Finalize(session, session.close, exitpriority=10)
+
+
+def _variant(spec):
+    variants = _worker['variants']
+    if spec not in variants:
+        variants[spec] = apply_variant(_worker['base'], spec)
+    return variants[spec]
+
+
+def run_task(task):
+    """Run one sweep point in a worker and return its summary row"""
+    variant, algorithm, quantum = task
+    processes = _variant(variant)
+    session = _worker['session']
+    started = time.perf_counter()
+    if session is None:
+        result = schedule(algorithm, *columns_from_processes(processes),
+                          quantum=quantum or DEFAULT_QUANTUM)
+    else:
+        output = session.run_algorithm(ALGORITHM_OPTIONS[algorithm], processes,
+                                       quantum=quantum or None)
+        results, text = decode_results(output, session.segment)
+        if not results:
+            raise BackendError(f"No result from backend: {text.strip()}")
+        result = results[0]
+    seconds = time.perf_counter() - started
+
+    makespan = result.makespan
+    return {
+        'variant': variant,
+        'algorithm': algorithm,
+        'quantum': quantum,
+        'processes': len(processes),
+        'avg_wt': result.avg_wt,
+        'avg_tat': result.avg_tat,
+        'makespan': makespan,
+        'throughput': len(processes) / makespan if makespan else 0.0,
+        'slices': result.slice_count,
+        'seconds': seconds,
+    }
+
+
+# ========== SWEEP ==========
+
+def run_sweep(workload_path, tasks, exe_path=None, workers=None, timeout=60, progress=None,
+              shared_memory=False, service=None):
+    """Fan tasks out over a process pool; rows come back in task order"""
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks) or 1))
+    rows = [None] * len(tasks)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(workload_path, exe_path, timeout, shared_memory,
+                                       service)) as pool:
+        futures = {pool.submit(run_task, task): k for k, task in enumerate(tasks)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            rows[futures[future]] = future.result()
+            if progress is not None:
+                progress(done, len(tasks))
+    return rows
+
+
+def format_table(rows):
+    """Aligned text summary table"""
+    header = ('Variant', 'Algorithm', 'Q', 'N', 'Avg WT', 'Avg TAT', 'Makespan',
+              'Throughput', 'Slices', 'Time (s)')
+    body = [(r['variant'], r['algorithm'], str(r['quantum'] or '-'), str(r['processes']),
+             f"{r['avg_wt']:.2f}", f"{r['avg_tat']:.2f}", str(r['makespan']),
+             f"{r['throughput']:.4f}", str(r['slices']), f"{r['seconds']:.3f}")
+            for r in rows]
+    widths = [max(len(row[k]) for row in [header] + body) for k in range(len(header))]
+    line = lambda row: '  '.join(cell.ljust(w) if k < 2 else cell.rjust(w)
+                                 for k, (cell, w) in enumerate(zip(row, widths)))
+    rule = '-' * len(line(header))
+    return '\n'.join([line(header), rule] + [line(row) for row in body]) + '\n'
+
+
+def write_rows(path, rows):
+    """Save rows as .json or .csv by extension"""
+    if path.lower().endswith('.json'):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+    else:
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def parse_list(text):
+    return [item for item in (part.strip() for part in text.split(',')) if item]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless scheduling sweeps over a workload file")
+    parser.add_argument('workload', help="Workload file (.csv, .jsonl or .bin)")
+    parser.add_argument('--algorithms', default='FCFS,SJF,Priority,RR,SRTF,PPriority,MLFQ',
+                        help="Comma-separated algorithms (default: all)")
+    parser.add_argument('--quantums', default=str(DEFAULT_QUANTUM),
+                        help="Comma-separated Round Robin and MLFQ quantums")
+    parser.add_argument('--variants', default='base',
+                        help="Comma-separated variants: base, arrival*F, burst*F, head:N")
+    parser.add_argument('--sweep', help="JSON sweep spec; overrides the three options above")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="Worker processes (default: every core)")
+    parser.add_argument('--engine', action='store_true',
+                        help="Use the in-process engine instead of main_system")
+    parser.add_argument('--backend', help="Path to main_system "
+                        "(default: $OSNEXUS_BACKEND, server/, then PATH)")
+    parser.add_argument('--shm', action='store_true',
+                        help="Transfer workloads and results through shared memory")
+    parser.add_argument('--service', help="Run on a scheduling service at HOST:PORT or "
+                        "unix:PATH (default: $OSNEXUS_SERVICE) instead of local backends")
+    parser.add_argument('--timeout', type=float, default=60,
+                        help="Backend idle timeout per run, seconds")
+    parser.add_argument('--output', help="Also write the rows to a .csv or .json file")
+    args = parser.parse_args(argv)
+
+    try:
+        spec = load_sweep(args.sweep) if args.sweep else {}
+        algorithms = [parse_algorithm(a) for a in
+                      spec.get('algorithms', parse_list(args.algorithms))]
+        quantums = [int(q) for q in spec.get('quantums', parse_list(args.quantums))]
+        if any(q < 1 for q in quantums):
+            raise SweepError("Quantums must be at least 1")
+        variants = [parse_variant(v) for v in spec.get('variants', parse_list(args.variants))]
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    exe_path = service = None
+    if not args.engine:
+        service = args.service or os.environ.get(SERVICE_ENV) or None
+    if not args.engine and not service:
+        exe_path = args.backend or locate_backend()
+        if exe_path is None:
+            parser.error(f"main_system not found (searched {describe_search()}); "
+                         "build it, pass --backend or use --engine")
+
+    tasks = build_tasks(algorithms, quantums, variants)
+    progress = lambda done, total: print(f"\r{done}/{total} runs", end='', file=sys.stderr)
+    started = time.perf_counter()
+    rows = run_sweep(args.workload, tasks, exe_path, args.workers, args.timeout, progress,
+                     args.shm, service)
+    print(file=sys.stderr)
+
+    sys.stdout.write(format_table(rows))
+    source = (f"service {service}" if service else
+              'engine' if exe_path is None else os.path.basename(exe_path))
+    print(f"{len(rows)} runs in {time.perf_counter() - started:.2f}s "
+          f"({source}, {min(args.workers or 1, len(tasks))} workers)")
+    if args.output:
+        write_rows(args.output, rows)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,427 @@
+"""
+Advanced OS Project - Benchmark Suite
+Times each stage of a scheduling run (spawn, serialization, backend
+compute, result parsing, Gantt geometry) over synthetic workloads, plus the
+allocator policies, and writes the timings as JSON for regression tracking
+
+Usage:
+    python client/bench_suite.py --sizes 10,1k,100k --output bench.json
+    python client/bench_suite.py --output new.json --compare bench.json
+    python client/bench_suite.py --sizes 1M --shm    # Shared-memory transfer
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import math
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from backend_launcher import describe_search, locate_backend
+from backend_session import BackendError, BackendSession, format_workload
+from gantt_view import MARGIN, lod_blocks
+from process_store import ProcessStore
+from result_protocol import FORMAT_COMMAND, decode_results
+from scheduling_engine import (DEFAULT_QUANTUM, OPTION_ALGORITHMS, QUANTUM_ALGORITHMS,
+                               columns_from_processes, schedule)
+
+
+SCHEMA_VERSION = 1
+DEFAULT_SIZES = '10,100,1k,10k,100k,1M'
+DEFAULT_GENERATORS = 'uniform,bursty,heavy_tailed'
+ALGORITHM_OPTIONS = {name: option for option, name in OPTION_ALGORITHMS.items()}
+ALLOC_POLICIES = ('SEGREGATED', 'BESTFIT', 'BUDDY')
+RENDER_WIDTH = 1200 - 2 * MARGIN   # Gantt plot width of the default window
+SCHEDULER_STAGES = ('generate', 'serialize', 'spawn', 'load', 'compute', 'parse', 'render')
+REGRESSION_THRESHOLD = 1.25
+MIN_REGRESSION_SECONDS = 0.002     # Ignore slowdowns below timer noise
+
+_SIZE = re.compile(r'^(\d+)([kKmM]?)$')
+
+
+class BenchError(ValueError):
+    """Raised for an invalid benchmark specification"""
+
+
+# ========== WORKLOAD GENERATORS ==========
+
+def _store(arrival, burst, priority):
+    store = ProcessStore()
+    store.extend_columns([f"P{k}" for k in range(1, len(arrival) + 1)], arrival, burst, priority)
+    return store
+
+
+def uniform(n, rng):
+    """Arrivals spread evenly at about 80% load; bursts 1-10"""
+    burst = [rng.randint(1, 10) for _ in range(n)]
+    horizon = max(1, int(sum(burst) / 0.8))
+    return _store([rng.randrange(horizon) for _ in range(n)], burst,
+                  [rng.randint(1, 5) for _ in range(n)])
+
+
+def bursty(n, rng):
+    """Arrivals in clumps of ~50 processes separated by idle gaps"""
+    arrival = []
+    clock = 0
+    while len(arrival) < n:
+        size = min(n - len(arrival), max(1, int(rng.expovariate(1 / 50))))
+        arrival.extend(clock + rng.randrange(3) for _ in range(size))
+        # Enough idle time on average for the clump to drain
+        clock += int(rng.expovariate(1 / (size * 5.5))) + 1
+    return _store(arrival, [rng.randint(1, 10) for _ in range(n)],
+                  [rng.randint(1, 5) for _ in range(n)])
+
+
+def heavy_tailed(n, rng):
+    """Poisson arrivals; Pareto (alpha 1.5) bursts, so a few jobs dominate"""
+    arrival = []
+    clock = 0.0
+    for _ in range(n):
+        clock += rng.expovariate(1 / 4)
+        arrival.append(int(clock))
+    burst = [min(10000, int(rng.paretovariate(1.5))) for _ in range(n)]
+    return _store(arrival, burst, [rng.randint(1, 5) for _ in range(n)])
+
+
+GENERATORS = {
+    'uniform': uniform,
+    'bursty': bursty,
+    'heavy_tailed': heavy_tailed,
+}
+
+
+def generate(name, n, seed):
+    """Workload n processes long; the same (name, n, seed) always matches"""
+    return GENERATORS[name](n, random.Random(f"{name}:{n}:{seed}"))
+
+
+# ========== SPECIFICATION ==========
+
+def parse_count(text):
+    """'250k' -> 250000"""
+    match = _SIZE.match(text.strip())
+    if not match or int(match.group(1)) < 1:
+        raise BenchError(f"Bad size {text.strip()!r} (use e.g. 500, 10k or 1M)")
+    scale = {'': 1, 'k': 1000, 'm': 1000000}[match.group(2).lower()]
+    return int(match.group(1)) * scale
+
+
+def parse_sizes(text):
+    """'10,1k,1M' -> [10, 1000, 1000000]"""
+    return [parse_count(part) for part in text.split(',')]
+
+
+def parse_names(text, known, what):
+    names = [name.strip() for name in text.split(',') if name.strip()]
+    for name in names:
+        if name not in known:
+            raise BenchError(f"Unknown {what} {name!r} (use {', '.join(known)})")
+    return names
+
+
+# ========== STAGES ==========
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    value = fn(*args)
+    return value, time.perf_counter() - started
+
+
+def render_geometry(result, width=RENDER_WIDTH):
+    """The Gantt chart's fit-to-width level-of-detail pass; returns block count"""
+    if not result.makespan:
+        return 0
+    return len(lod_blocks(result.slice_pid, result.slice_start, result.slice_end,
+                          width / result.makespan, 0, width))
+
+
+def bench_workload(exe_path, name, n, algorithms, seed, quantum, timeout, engine=False,
+                   shared_memory=False):
+    """One generated workload through every stage; returns a row per algorithm
+
+    With shared_memory the serialize, load and parse stages time the
+    mapped-file transfer instead of LOAD text and JSON arrays.
+    """
+    store, generate_s = _timed(generate, name, n, seed)
+    session = BackendSession(exe_path, timeout=timeout, init_payloads=[FORMAT_COMMAND],
+                             shared_memory=shared_memory)
+    try:
+        if shared_memory:
+            payload, serialize_s = _timed(session.transfer.load_command, store)
+            payload_bytes = os.path.getsize(session.transfer.workload_path)
+        else:
+            payload, serialize_s = _timed(format_workload, store)
+            payload_bytes = len(payload)
+        # Spawn is the time to the first answer from a fresh backend
+        _, spawn_s = _timed(session.request, f"QUANTUM {quantum}\n")
+        _, load_s = _timed(session.request, payload)
+        rows = []
+        for algorithm in algorithms:
+            output, compute_s = _timed(session.request, f"RUN {ALGORITHM_OPTIONS[algorithm]}\n")
+            (results, text), parse_s = _timed(decode_results, output, session.segment)
+            if not results:
+                raise BackendError(f"No {algorithm} result from backend: {text.strip()[:200]}")
+            result = results[0]
+            blocks, render_s = _timed(render_geometry, result)
+            stages = {'generate': generate_s, 'serialize': serialize_s, 'spawn': spawn_s,
+                      'load': load_s, 'compute': compute_s, 'parse': parse_s, 'render': render_s}
+            if engine:
+                _, stages['engine'] = _timed(schedule, algorithm, *columns_from_processes(store),
+                                             quantum)
+            rows.append({
+                'generator': name,
+                'processes': n,
+                'algorithm': algorithm,
+                'quantum': quantum if algorithm in QUANTUM_ALGORITHMS else 0,
+                'slices': result.slice_count,
+                'render_blocks': blocks,
+                'payload_bytes': payload_bytes,
+                'output_bytes': len(output),
+                'avg_wt': result.avg_wt,
+                'stages': stages,
+            })
+        return rows
+    finally:
+        session.close()
+
+
+_ALLOC_FIELDS = {
+    'Ops/sec': ('ops_per_sec', float),
+    'Failed allocations': ('failed', int),
+    'Peak allocated': ('peak_bytes', int),
+    'Internal fragmentation (avg)': ('internal_frag', float),
+    'External fragmentation (avg)': ('external_frag', float),
+    'Heap check': ('heap_check', str),
+}
+
+
+def parse_alloc_bench(output):
+    """Fields of an ALLOCBENCH report"""
+    row = {}
+    for line in output.splitlines():
+        key, sep, value = line.partition(': ')
+        if sep and key in _ALLOC_FIELDS:
+            field, convert = _ALLOC_FIELDS[key]
+            row[field] = convert(value.split()[0].rstrip('%'))
+    if 'ops_per_sec' not in row:
+        raise BackendError(f"Bad ALLOCBENCH output: {output.strip()[:200]}")
+    return row
+
+
+def bench_allocator(exe_path, policy, ops, heap, seed, timeout):
+    session = BackendSession(exe_path, timeout=timeout)
+    try:
+        reply = session.request(f"HEAP {heap} {policy}\n")
+        if not reply.startswith('OK'):
+            raise BackendError(reply.strip())
+        output, seconds = _timed(session.request, f"ALLOCBENCH {ops} 1024 1024 {seed}\n")
+    finally:
+        session.close()
+    row = {'policy': policy, 'ops': ops, 'heap': heap, 'wall_seconds': seconds}
+    row.update(parse_alloc_bench(output))
+    return row
+
+
+def median_rows(runs):
+    """Merge repeated runs of the same rows, taking the median of each stage"""
+    merged = []
+    for rows in zip(*runs):
+        row = dict(rows[0])
+        row['stages'] = {stage: statistics.median(r['stages'][stage] for r in rows)
+                         for stage in rows[0]['stages']}
+        merged.append(row)
+    return merged
+
+
+# ========== REPORT ==========
+
+def environment(exe_path):
+    """Where the numbers came from, so runs on different versions compare fairly"""
+    env = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'backend': exe_path,
+    }
+    if exe_path:
+        with open(exe_path, 'rb') as f:
+            env['backend_sha256'] = hashlib.sha256(f.read()).hexdigest()
+    try:
+        env['git_commit'] = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        env['git_commit'] = None
+    return env
+
+
+def _scheduler_key(row):
+    return ('scheduler', row['generator'], row['processes'], row['algorithm'])
+
+
+def compare(current, baseline, threshold=REGRESSION_THRESHOLD,
+            min_seconds=MIN_REGRESSION_SECONDS):
+    """Stages that got slower than threshold x baseline, as readable strings
+
+    Only rows present in both reports are compared. Allocator rows regress
+    when ops/sec drops below baseline / threshold.
+    """
+    regressions = []
+    old = {_scheduler_key(row): row for row in baseline.get('scheduler', [])}
+    for row in current.get('scheduler', []):
+        before = old.get(_scheduler_key(row))
+        if before is None:
+            continue
+        for stage, seconds in row['stages'].items():
+            was = before['stages'].get(stage)
+            if was is not None and seconds > was * threshold and seconds - was > min_seconds:
+                regressions.append(f"{row['generator']} n={row['processes']} {row['algorithm']} "
+                                   f"{stage}: {was:.4f}s -> {seconds:.4f}s "
+                                   f"({seconds / was if was else math.inf:.2f}x)")
+    old = {(row['policy'], row['ops']): row for row in baseline.get('allocator', [])}
+    for row in current.get('allocator', []):
+        before = old.get((row['policy'], row['ops']))
+        if before and row['ops_per_sec'] * threshold < before['ops_per_sec']:
+            regressions.append(f"allocator {row['policy']}: {before['ops_per_sec']:,.0f} -> "
+                               f"{row['ops_per_sec']:,.0f} ops/sec")
+    return regressions
+
+
+def format_table(report):
+    stages = [s for s in SCHEDULER_STAGES + ('engine',)
+              if any(s in row['stages'] for row in report['scheduler'])]
+    header = ('Generator', 'N', 'Algorithm') + tuple(stages)
+    body = [(row['generator'], f"{row['processes']:,}", row['algorithm'])
+            + tuple(f"{row['stages'][s] * 1000:.1f}" for s in stages)
+            for row in report['scheduler']]
+    lines = []
+    if body:
+        widths = [max(len(r[k]) for r in [header] + body) for k in range(len(header))]
+        line = lambda r: '  '.join(c.ljust(w) if k in (0, 2) else c.rjust(w)
+                                   for k, (c, w) in enumerate(zip(r, widths)))
+        lines += [line(header) + '   (ms)', '-' * len(line(header))] + [line(r) for r in body]
+    for row in report['allocator']:
+        lines.append(f"Allocator {row['policy']:<10} {row['ops_per_sec']:>14,.0f} ops/sec  "
+                     f"internal {row['internal_frag']:.1f}%  external {row['external_frag']:.1f}%  "
+                     f"heap check {row['heap_check']}")
+    return '\n'.join(lines) + '\n'
+
+
+def run_suite(exe_path, sizes, generators, algorithms, policies=ALLOC_POLICIES, alloc_ops=1000000,
+              heap='4M', repeat=1, seed=1, quantum=DEFAULT_QUANTUM, timeout=120, engine=False,
+              progress=None, shared_memory=False):
+    """Run every case and return the report dict"""
+    cases = [(name, n) for n in sizes for name in generators]
+    scheduler = []
+    for k, (name, n) in enumerate(cases, start=1):
+        runs = [bench_workload(exe_path, name, n, algorithms, seed, quantum, timeout, engine,
+                               shared_memory)
+                for _ in range(repeat)]
+        scheduler.extend(median_rows(runs))
+        if progress is not None:
+            progress(f"{k}/{len(cases)} workloads ({name}, n={n:,})")
+    allocator = []
+    for policy in policies:
+        runs = [bench_allocator(exe_path, policy, alloc_ops, heap, seed, timeout)
+                for _ in range(repeat)]
+        row = max(runs, key=lambda r: r['ops_per_sec'])   # Best of: least scheduler noise
+        allocator.append(row)
+    return {
+        'schema': SCHEMA_VERSION,
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'environment': environment(exe_path),
+        'config': {'sizes': sizes, 'generators': generators, 'algorithms': algorithms,
+                   'policies': list(policies), 'alloc_ops': alloc_ops, 'heap': heap,
+                   'repeat': repeat, 'seed': seed, 'quantum': quantum,
+                   'shared_memory': shared_memory},
+        'scheduler': scheduler,
+        'allocator': allocator,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stage-by-stage benchmarks of the scheduler, "
+                                                 "allocator and client pipeline")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f"Comma-separated process counts, k/M suffixes allowed "
+                             f"(default: {DEFAULT_SIZES})")
+    parser.add_argument('--generators', default=DEFAULT_GENERATORS,
+                        help=f"Comma-separated workload generators (default: {DEFAULT_GENERATORS})")
+    parser.add_argument('--algorithms', default=','.join(OPTION_ALGORITHMS.values()),
+                        help="Comma-separated algorithms (default: all)")
+    parser.add_argument('--policies', default=','.join(ALLOC_POLICIES),
+                        help="Comma-separated allocator policies; empty to skip")
+    parser.add_argument('--alloc-ops', default='1M',
+                        help="Operations per ALLOCBENCH run, k/M suffixes allowed (default: 1M)")
+    parser.add_argument('--heap', default='4M', help="Allocator heap size (default: 4M)")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="Runs per case; stages report the median (default: 1)")
+    parser.add_argument('--seed', type=int, default=1, help="Workload seed (default: 1)")
+    parser.add_argument('--engine', action='store_true',
+                        help="Also time the in-process engine per algorithm")
+    parser.add_argument('--shm', action='store_true',
+                        help="Transfer workloads and results through shared memory")
+    parser.add_argument('--backend', help="Path to main_system "
+                        "(default: $OSNEXUS_BACKEND, server/, then PATH)")
+    parser.add_argument('--timeout', type=float, default=120,
+                        help="Backend idle timeout per request, seconds")
+    parser.add_argument('--output', help="Write the JSON report here (default: stdout)")
+    parser.add_argument('--compare', help="Baseline JSON report; exit 1 on regressions")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help=f"Slowdown factor counted as a regression "
+                             f"(default: {REGRESSION_THRESHOLD})")
+    args = parser.parse_args(argv)
+
+    try:
+        sizes = parse_sizes(args.sizes)
+        alloc_ops = parse_count(args.alloc_ops)
+        generators = parse_names(args.generators, tuple(GENERATORS), 'generator')
+        algorithms = parse_names(args.algorithms, tuple(ALGORITHM_OPTIONS), 'algorithm')
+        policies = parse_names(args.policies, ALLOC_POLICIES, 'policy')
+        if args.repeat < 1:
+            raise BenchError("--repeat must be at least 1")
+        baseline = None
+        if args.compare:
+            with open(args.compare, encoding='utf-8') as f:
+                baseline = json.load(f)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    exe_path = args.backend or locate_backend()
+    if exe_path is None:
+        parser.error(f"main_system not found (searched {describe_search()}); "
+                     "build it or pass --backend")
+
+    progress = lambda text: print(f"\r{text}\033[K", end='', file=sys.stderr)
+    report = run_suite(exe_path, sizes, generators, algorithms, policies, alloc_ops,
+                       args.heap, args.repeat, args.seed, timeout=args.timeout,
+                       engine=args.engine, progress=progress, shared_memory=args.shm)
+    print(file=sys.stderr)
+    sys.stderr.write(format_table(report))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION: {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
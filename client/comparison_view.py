@@ -0,0 +1,128 @@
+"""
+Advanced OS Project - Algorithm Comparison View
+Side-by-side table of every algorithm's summary figures over one workload,
+with a small Gantt chart per algorithm on a shared time scale
+"""
+
+from tkinter import ttk
+
+from gantt_view import GanttView
+
+
+# (key, heading, format, lower is better); keys are ScheduleResult
+# attributes or summary fields
+COLUMNS = (
+    ('avg_wt', "Avg WT", '{:.2f}', True),
+    ('avg_tat', "Avg TAT", '{:.2f}', True),
+    ('avg_response', "Avg Response", '{:.2f}', True),
+    ('max_waiting', "Max WT", '{:,}', True),
+    ('makespan', "Makespan", '{:,}', True),
+    ('throughput', "Throughput", '{:.4f}', False),
+    ('utilization', "CPU %", '{:.1f}', False),
+    ('preemptions', "Preemptions", '{:,}', True),
+)
+BEST_MARK = ' ★'
+GRID_COLUMNS = 3       # small multiples per row
+SMALL_GANTT_HEIGHT = 130
+
+
+def metric(result, key):
+    if key in ('avg_wt', 'avg_tat'):
+        return getattr(result, key)
+    return result.summary[key]
+
+
+def comparison_rows(results):
+    """(algorithm, formatted cells) per result, the best value in each
+    column marked; ties are all marked"""
+    values = [[metric(r, key) for key, _, _, _ in COLUMNS] for r in results]
+    best = []
+    for c, (_, _, _, lower) in enumerate(COLUMNS):
+        column = [row[c] for row in values]
+        best.append((min if lower else max)(column) if column else None)
+    rows = []
+    for r, row in zip(results, values):
+        cells = tuple(fmt.format(v) + (BEST_MARK if v == best[c] and len(results) > 1 else '')
+                      for c, ((_, _, fmt, _), v) in enumerate(zip(COLUMNS, row)))
+        rows.append((r.algorithm, cells))
+    return rows
+
+
+class ComparisonView:
+    """Comparison table above a grid of small-multiple Gantt charts
+
+    Results can arrive one at a time as a run streams in. All charts use
+    the longest makespan seen so far, so bar lengths compare directly.
+    Selecting a table row calls on_select with that row's result.
+    """
+
+    def __init__(self, parent, axis_color='#34495e', on_select=None):
+        self.axis_color = axis_color
+        self.on_select = on_select
+        self.results = []
+        self.charts = []
+        self.span = 0
+
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=[key for key, _, _, _ in COLUMNS],
+                                 show='tree headings', height=7)
+        self.tree.heading('#0', text='Algorithm')
+        self.tree.column('#0', width=160)
+        for key, heading, _, _ in COLUMNS:
+            self.tree.heading(key, text=heading)
+            self.tree.column(key, width=90, anchor='e')
+        self.tree.pack(fill='x', padx=5, pady=5)
+        self.tree.bind('<<TreeviewSelect>>', self._on_tree_select)
+
+        self.grid = ttk.Frame(self.frame)
+        self.grid.pack(fill='both', expand=True, padx=5)
+        for column in range(GRID_COLUMNS):
+            self.grid.columnconfigure(column, weight=1)
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    # ========== DATA ==========
+
+    def clear(self):
+        self.results = []
+        self.span = 0
+        self.tree.delete(*self.tree.get_children())
+        for box, _ in self.charts:
+            box.destroy()
+        self.charts = []
+
+    def set_results(self, results):
+        self.clear()
+        self.add(results)
+
+    def add(self, results):
+        """Append results: one table row and one small chart each"""
+        fresh = len(self.results)
+        for result in results:
+            index = len(self.results)
+            self.results.append(result)
+            box = ttk.LabelFrame(self.grid, text=f" {result.algorithm} ", padding=2)
+            box.grid(row=index // GRID_COLUMNS, column=index % GRID_COLUMNS,
+                     sticky='ew', padx=3, pady=3)
+            chart = GanttView(box, height=SMALL_GANTT_HEIGHT, axis_color=self.axis_color)
+            chart.pack(fill='x')
+            self.charts.append((box, chart))
+        self._refresh(fresh)
+
+    def _refresh(self, fresh):
+        """Rewrite the table (best marks can move) and draw the charts from
+        index fresh on, or all of them if the shared time span grew"""
+        self.tree.delete(*self.tree.get_children())
+        for index, (algorithm, cells) in enumerate(comparison_rows(self.results)):
+            self.tree.insert('', 'end', iid=str(index), text=algorithm, values=cells)
+        span = max((r.makespan for r in self.results), default=0)
+        if span != self.span:
+            self.span, fresh = span, 0
+        for result, (_, chart) in zip(self.results[fresh:], self.charts[fresh:]):
+            chart.set_result(result, span=span)
+
+    def _on_tree_select(self, event):
+        selection = self.tree.selection()
+        if selection and self.on_select is not None:
+            self.on_select(self.results[int(selection[0])])
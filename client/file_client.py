@@ -0,0 +1,351 @@
+"""
+Advanced OS Project - Async File Server Client
+asyncio client for the port-9091 file server with pooled, reused
+connections, GET bodies streamed straight to disk, resumable downloads and
+multi-connection ranged downloads of large files
+"""
+
+import asyncio
+import os
+import re
+from contextlib import asynccontextmanager
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 9091
+POOL_SIZE = 8
+CHUNK_SIZE = 256 * 1024
+CONNECT_TIMEOUT = 5
+RESPONSE_END = b'END_OF_RESPONSE'
+FILE_START = b'FILE_START|'
+FILE_END = b'\nFILE_END'
+_REPLY_END = b'\n' + RESPONSE_END + b'\n'
+# Ranges are clamped to the end of the file; the server takes up to 18 digits
+RANGE_TO_END = 10 ** 18 - 1
+MIN_SEGMENT_BYTES = 1024 * 1024
+SEGMENT_RETRIES = 3
+
+_LIST_LINE = re.compile(r'^\s*\[(\d+)\]\s+(.*) \(([\d.]+ [KM]?B)\) - (.+)$')
+
+
+class FileServerError(RuntimeError):
+    """Raised for ERROR replies and broken connections"""
+
+
+class FileEntry:
+    """One line of a LIST reply"""
+
+    def __init__(self, name, size_text, modified):
+        self.name = name
+        self.size_text = size_text
+        self.modified = modified
+
+    def __repr__(self):
+        return f"FileEntry({self.name!r}, {self.size_text!r}, {self.modified!r})"
+
+
+def parse_listing(text):
+    return [FileEntry(m.group(2), m.group(3), m.group(4))
+            for m in map(_LIST_LINE.match, text.splitlines()) if m]
+
+
+def parse_info(text):
+    """'Key: value' lines of an INFO reply as a dict"""
+    info = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition(': ')
+        if sep:
+            info[key.strip()] = value.strip()
+    return info
+
+
+class FileServerConnection:
+    """One TCP connection; commands run one at a time and the socket is reused"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.broken = False
+
+    @classmethod
+    async def open(cls, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=CONNECT_TIMEOUT):
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, limit=CHUNK_SIZE), timeout)
+        return cls(reader, writer)
+
+    async def close(self):
+        if not self.broken:
+            try:
+                self.writer.write(b'QUIT\n')
+                await self.writer.drain()
+            except (ConnectionError, OSError):
+                pass
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+    # ========== FRAMING ==========
+
+    async def _send(self, command):
+        self.writer.write(command.encode('utf-8') + b'\n')
+        await self.writer.drain()
+
+    async def _readline(self):
+        line = await self.reader.readline()
+        if not line:
+            self.broken = True
+            raise FileServerError("Connection closed by server")
+        return line
+
+    async def _read_reply(self, first=None):
+        """Everything up to the RESPONSE_END line, as text"""
+        if first is not None:
+            # The newline before RESPONSE_END went with the first line
+            if first.rstrip(b'\r\n') == RESPONSE_END:
+                return ''
+            return (first + await self._read_reply_lines()).decode('utf-8', 'replace')
+        try:
+            # Replies always end "\nEND_OF_RESPONSE\n": take them in one read
+            body = await self.reader.readuntil(_REPLY_END)
+            body = body[:-len(_REPLY_END) + 1]
+        except asyncio.LimitOverrunError:
+            body = await self._read_reply_lines()
+        except asyncio.IncompleteReadError:
+            self.broken = True
+            raise FileServerError("Connection closed by server") from None
+        return body.decode('utf-8', 'replace')
+
+    async def _read_reply_lines(self):
+        """Line-at-a-time fallback for replies larger than the stream limit"""
+        lines = []
+        while True:
+            line = await self._readline()
+            if line.rstrip(b'\r\n') == RESPONSE_END:
+                return b''.join(lines)
+            lines.append(line)
+
+    async def command(self, command):
+        """Send a text command and return its reply; ERROR replies raise"""
+        await self._send(command)
+        try:
+            reply = await self._read_reply()
+        except BaseException:
+            self.broken = True
+            raise
+        if reply.startswith('ERROR'):
+            raise FileServerError(reply.strip())
+        return reply
+
+    # ========== COMMANDS ==========
+
+    async def list(self):
+        return parse_listing(await self.command('LIST'))
+
+    async def info(self, name):
+        return parse_info(await self.command(f'INFO {name}'))
+
+    async def get(self, name, dest_path, chunk_size=CHUNK_SIZE, resume=False):
+        """Stream a file to dest_path chunk by chunk; returns the byte count
+
+        The body goes to dest_path + '.part' until complete. With resume, a
+        .part left by an interrupted download is continued with a range
+        request instead of starting from byte zero.
+        """
+        tmp_path = dest_path + '.part'
+        offset = os.path.getsize(tmp_path) if resume and os.path.exists(tmp_path) else 0
+        if offset:
+            await self._send(f'GET {name} {offset} {RANGE_TO_END}')
+        else:
+            await self._send(f'GET {name}')
+        try:
+            if offset:
+                length, _, _ = await self._file_header(3)
+            else:
+                length, = await self._file_header(1)
+            with open(tmp_path, 'ab' if offset else 'wb') as out:
+                await self._copy_body(out, length, chunk_size)
+            os.replace(tmp_path, dest_path)
+            return offset + length
+        except FileServerError:
+            raise
+        except BaseException:
+            self.broken = True
+            raise
+
+    async def get_range(self, name, path, offset, length, chunk_size=CHUNK_SIZE, progress=None):
+        """Write bytes [offset, offset + length) of name into the existing file
+        at path, at the same position; returns (bytes written, file size)
+
+        progress, if given, is called with the size of each chunk written.
+        """
+        await self._send(f'GET {name} {offset} {length}')
+        try:
+            length, _, total = await self._file_header(3)
+            with open(path, 'r+b') as out:
+                out.seek(offset)
+                await self._copy_body(out, length, chunk_size, progress)
+            return length, total
+        except FileServerError:
+            raise
+        except BaseException:
+            self.broken = True
+            raise
+
+    async def _file_header(self, fields):
+        """The numeric fields after the name in a FILE_START line: (size,) for
+        a whole file, (length, offset, total) for a range"""
+        header = await self._readline()
+        if not header.startswith(FILE_START):
+            reply = await self._read_reply(header)
+            raise FileServerError(reply.strip() or "Unexpected reply to GET")
+        try:
+            return [int(v) for v in header.rstrip(b'\r\n').rsplit(b'|', fields)[1:]]
+        except ValueError:
+            self.broken = True
+            raise FileServerError(f"Bad GET header {header!r}") from None
+
+    async def _copy_body(self, out, size, chunk_size, progress=None):
+        """Body of known length, then the FILE_END trailer line"""
+        remaining = size
+        while remaining:
+            chunk = await self.reader.read(min(chunk_size, remaining))
+            if not chunk:
+                self.broken = True
+                raise FileServerError(f"Connection closed with {remaining} bytes outstanding")
+            out.write(chunk)
+            remaining -= len(chunk)
+            if progress is not None:
+                progress(len(chunk))
+        trailer = await self.reader.readexactly(len(FILE_END) + 1)
+        if trailer.rstrip(b'\r\n') != FILE_END:
+            self.broken = True
+            raise FileServerError("Missing FILE_END after file body")
+        return size
+
+
+class FileServerPool:
+    """Bounded pool of reusable connections to one file server
+
+    At most `size` connections exist; callers beyond that wait for one to
+    be returned, which is also the concurrency limit for bulk downloads.
+    Connections that hit a protocol or socket error are discarded.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, size=POOL_SIZE):
+        self.host = host
+        self.port = port
+        self.size = size
+        self._idle = []
+        self._slots = asyncio.Semaphore(size)
+
+    @asynccontextmanager
+    async def connection(self):
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else await FileServerConnection.open(
+                self.host, self.port)
+            try:
+                yield conn
+            finally:
+                if conn.broken:
+                    await conn.close()
+                else:
+                    self._idle.append(conn)
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(conn.close() for conn in idle), return_exceptions=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def list(self):
+        async with self.connection() as conn:
+            return await conn.list()
+
+    async def info(self, name):
+        async with self.connection() as conn:
+            return await conn.info(name)
+
+    async def get(self, name, dest_path, chunk_size=CHUNK_SIZE, resume=False):
+        async with self.connection() as conn:
+            return await conn.get(name, dest_path, chunk_size, resume)
+
+    async def get_segmented(self, name, dest_path, segments=4, chunk_size=CHUNK_SIZE,
+                            retries=SEGMENT_RETRIES):
+        """Fetch one large file as several ranges over parallel connections
+
+        A segment whose connection drops is re-requested from the byte
+        where it stopped, up to `retries` times. Returns the file size.
+        """
+        size = int((await self.info(name))['Size'].split()[0])
+        segments = max(1, min(segments, self.size, size // MIN_SEGMENT_BYTES))
+        bounds = [size * k // segments for k in range(segments + 1)]
+        tmp_path = dest_path + '.part'
+        with open(tmp_path, 'wb') as out:
+            out.truncate(size)
+
+        async def fetch(start, end):
+            done = 0
+            attempts = 0
+            def advance(n):
+                nonlocal done
+                done += n
+            while start + done < end:
+                async with self.connection() as conn:
+                    try:
+                        _, total = await conn.get_range(name, tmp_path, start + done,
+                                                        end - start - done, chunk_size, advance)
+                    except (FileServerError, OSError, asyncio.IncompleteReadError):
+                        if not conn.broken or attempts >= retries:
+                            raise
+                        attempts += 1
+                        continue
+                if total != size:
+                    raise FileServerError(f"{name} changed size during download")
+
+        try:
+            await asyncio.gather(*(fetch(bounds[k], bounds[k + 1]) for k in range(segments)))
+        except BaseException:
+            os.remove(tmp_path)  # Has holes, so it cannot be resumed from its size
+            raise
+        os.replace(tmp_path, dest_path)
+        return size
+
+    async def download_many(self, names, dest_dir, chunk_size=CHUNK_SIZE):
+        """Fetch every name into dest_dir in parallel (bounded by the pool size)
+
+        Returns {name: byte count or the exception that stopped it}.
+        """
+        os.makedirs(dest_dir, exist_ok=True)
+        names = list(dict.fromkeys(names))
+
+        async def fetch(name):
+            try:
+                return await self.get(name, os.path.join(dest_dir, os.path.basename(name)),
+                                      chunk_size)
+            except (FileServerError, OSError, asyncio.IncompleteReadError) as e:
+                return e
+
+        results = await asyncio.gather(*(fetch(name) for name in names))
+        return dict(zip(names, results))
+
+
+async def wait_for_server(host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=5.0, interval=0.1):
+    """Poll until the server accepts connections (e.g. right after launch)"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        try:
+            conn = await FileServerConnection.open(host, port, timeout=interval * 5)
+        except (OSError, asyncio.TimeoutError):
+            if loop.time() >= deadline:
+                raise FileServerError(f"File server on {host}:{port} did not come up")
+            await asyncio.sleep(interval)
+        else:
+            await conn.close()
+            return
@@ -0,0 +1,588 @@
+"""
+Advanced OS Project - Level-of-Detail Gantt Chart
+Zoomable, pannable Gantt canvas that stays interactive for 100k-slice schedules,
+with one lane per CPU for multi-core runs, hover details, range zoom and
+per-process highlighting
+"""
+
+import math
+import tkinter as tk
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from tkinter import ttk
+
+import metrics
+from slice_index import SliceIndex
+
+
+MARGIN = 50            # canvas px left/right of the plotted area
+BAR_TOP = 30
+BAR_HEIGHT = 40
+AXIS_Y = 100
+LANE_GAP = 4           # px between CPU lanes
+LANES_PX = 240         # lanes share this much height before the canvas grows
+MIN_LANE_PX = 3
+TILE_PX = 256          # world px covered by one cached tile
+MIN_BLOCK_PX = 3       # slices narrower than this are merged
+CHAR_PX = 7            # rough width of one label character
+MIN_TICK_PX = 70
+ZOOM_STEP = 1.25
+MAX_PX_PER_UNIT = 400
+TILE_CACHE_SIZE = 512
+
+COLORS = ['#3498db', '#e74c3c', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c']
+MERGED_COLOR = '#95a5a6'
+HIGHLIGHT_OUTLINE = '#1a252f'
+CLICK_PX = 3           # a press and release closer than this is a click, not a drag
+
+
+def lod_blocks(slice_pid, slice_start, slice_end, scale, px0, px1, min_px=MIN_BLOCK_PX,
+               lo=0, hi=None):
+    """Drawable blocks for world pixels [px0, px1) at `scale` px per time unit
+
+    Slices must be in time order and non-overlapping (one CPU); lo and hi
+    restrict them to positions [lo, hi). Returns (x1, x2, pid, count)
+    tuples in world px; pid is None when the block merges slices of
+    different processes. Each sub-threshold run costs one bisect, so the
+    work is bounded by the pixel width, not the slice count.
+    """
+    t0, t1 = px0 / scale, px1 / scale
+    n = len(slice_start) if hi is None else hi
+    k = bisect_right(slice_end, t0, lo, n)
+    blocks = []
+    while k < n and slice_start[k] < t1:
+        x1 = max(slice_start[k] * scale, px0)
+        x2 = min(slice_end[k] * scale, px1)
+        if x2 - x1 >= min_px:
+            blocks.append((x1, x2, slice_pid[k], 1))
+            k += 1
+            continue
+
+        # Swallow every slice that starts inside the next min_px pixels,
+        # except a trailing slice wide enough to be drawn on its own
+        j = max(k + 1, bisect_left(slice_start, (x1 + min_px) / scale, k + 1, n))
+        if j - 1 > k and (slice_end[j - 1] - slice_start[j - 1]) * scale >= min_px:
+            j -= 1
+        x2 = min(max(slice_end[j - 1] * scale, x1 + 1), px1)
+        pids = set(slice_pid[k:j])
+        blocks.append((x1, x2, slice_pid[k] if len(pids) == 1 else None, j - k))
+        k = j
+    return blocks
+
+
+def lane_layout(lanes):
+    """(lane pitch, bar height, axis y) in canvas px for a number of lanes
+
+    One lane keeps the single-CPU layout; more lanes shrink to share
+    LANES_PX, down to MIN_LANE_PX each, after which the canvas grows.
+    """
+    pitch = max(MIN_LANE_PX, min(BAR_HEIGHT + LANE_GAP, LANES_PX // max(1, lanes)))
+    bar = pitch - LANE_GAP if pitch > 2 * LANE_GAP else pitch
+    return pitch, bar, AXIS_Y + lanes * pitch - (BAR_HEIGHT + LANE_GAP)
+
+
+def split_lanes(slice_pid, slice_start, slice_end, lanes):
+    """Per-lane (pid, start, end) columns from slices grouped by lane sizes"""
+    columns = []
+    start = 0
+    for count in lanes:
+        stop = start + count
+        columns.append((slice_pid[start:stop], slice_start[start:stop], slice_end[start:stop]))
+        start = stop
+    return columns
+
+
+def tick_step(scale, min_px=MIN_TICK_PX):
+    """Smallest 1/2/5 x 10^n time step whose ticks are at least min_px apart"""
+    raw = min_px / scale
+    magnitude = 10 ** max(0, math.floor(math.log10(raw))) if raw >= 1 else 1
+    for factor in (1, 2, 5, 10):
+        if magnitude * factor >= raw:
+            return magnitude * factor
+    return magnitude * 10
+
+
+class TileCache:
+    """LRU of computed tile geometry keyed by (zoom level, tile index)"""
+
+    def __init__(self, capacity=TILE_CACHE_SIZE):
+        self.capacity = capacity
+        self._tiles = OrderedDict()
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def get(self, key, build):
+        blocks = self._tiles.get(key)
+        if blocks is None:
+            blocks = self._tiles[key] = build()
+            if len(self._tiles) > self.capacity:
+                self._tiles.popitem(last=False)
+        else:
+            self._tiles.move_to_end(key)
+        return blocks
+
+    def clear(self):
+        self._tiles.clear()
+
+    def discard(self, predicate):
+        """Drop the tiles whose key matches predicate"""
+        for key in [key for key in self._tiles if predicate(key)]:
+            del self._tiles[key]
+
+
+class GanttView:
+    """Gantt chart canvas with zoom (wheel), pan (drag / Shift+wheel / scrollbar)
+
+    Only the tiles intersecting the viewport have canvas items. Panning
+    moves the existing items and draws just the newly exposed tiles; tile
+    geometry is cached so returning to a region or zoom level is free.
+    Multi-core results get one lane per CPU; a tile holds every lane's blocks.
+
+    A SliceIndex over the shown slices answers the interactive queries:
+    hovering shows the slice under the cursor, right-dragging zooms to a
+    time range, and clicking a slice highlights every slice of its process.
+    """
+
+    def __init__(self, parent, height=150, axis_color='#34495e'):
+        self.axis_color = axis_color
+        self.base_height = height
+        self.frame = ttk.Frame(parent)
+        self.canvas = tk.Canvas(self.frame, height=height, bg='white',
+                                highlightthickness=1, highlightbackground=axis_color)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient='horizontal', command=self._on_scroll)
+
+        self.slice_pid = self.slice_start = self.slice_end = ()
+        self.lanes = [((), (), ())]
+        self.index = SliceIndex((), (), ())
+        self.highlighted = None    # pid whose slices are outlined
+        self.cores = None
+        self.lane_pitch, self.bar_height, self.axis_y = lane_layout(1)
+        self.labels = {}
+        self.makespan = 0
+        self.last_end = 0
+        self.level = 0         # zoom steps above fit-to-width
+        self.scale = 1.0       # px per time unit
+        self.fit_scale = 1.0
+        self.view_px = 0
+        self.cache = TileCache()
+        self.drawn = set()
+        self._drag_x = None
+        self._press_x = None
+        self._band_x = None
+        self._redraw_pending = False
+
+        self.canvas.bind('<Configure>', lambda e: self._schedule_redraw(refit=True))
+        self.canvas.bind('<MouseWheel>', self._on_wheel)
+        self.canvas.bind('<Shift-MouseWheel>', self._on_shift_wheel)
+        self.canvas.bind('<Button-4>', lambda e: self.zoom(1, e.x))
+        self.canvas.bind('<Button-5>', lambda e: self.zoom(-1, e.x))
+        self.canvas.bind('<Shift-Button-4>', lambda e: self.pan(-self.width() // 10))
+        self.canvas.bind('<Shift-Button-5>', lambda e: self.pan(self.width() // 10))
+        self.canvas.bind('<ButtonPress-1>', self._on_press)
+        self.canvas.bind('<B1-Motion>', self._on_drag)
+        self.canvas.bind('<ButtonRelease-1>', self._on_release)
+        self.canvas.bind('<Double-Button-1>', lambda e: self.fit())
+        self.canvas.bind('<ButtonPress-3>', self._on_band_press)
+        self.canvas.bind('<B3-Motion>', self._on_band_drag)
+        self.canvas.bind('<ButtonRelease-3>', self._on_band_release)
+        self.canvas.bind('<Motion>', self._on_motion)
+        self.canvas.bind('<Leave>', lambda e: self.canvas.delete('hover'))
+
+    # ========== LAYOUT ==========
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+        self.canvas.pack(fill='x')
+        self.scrollbar.pack(fill='x')
+
+    def width(self):
+        """Plot width in px (canvas minus margins)"""
+        return max(1, self.canvas.winfo_width() - 2 * MARGIN)
+
+    # ========== DATA ==========
+
+    def set_slices(self, slice_pid, slice_start, slice_end, labels=None, cores=None, span=0):
+        """Show a schedule given as time-ordered pid/start/end columns
+
+        cores, a CoreStats, splits the slices into one lane per CPU. span
+        stretches the time axis past the last slice, so several charts can
+        share one scale.
+        """
+        self.slice_pid, self.slice_start, self.slice_end = slice_pid, slice_start, slice_end
+        self.cores = cores
+        if cores is None:
+            self.lanes = [(slice_pid, slice_start, slice_end)]
+        else:
+            self.lanes = split_lanes(slice_pid, slice_start, slice_end, cores.lanes)
+        self.index = SliceIndex(slice_pid, slice_start, slice_end,
+                                None if cores is None else cores.lanes)
+        self.labels = labels or {}
+        self.last_end = max(slice_end) if len(slice_end) else 0
+        self.makespan = max(self.last_end, span)
+        self.lane_pitch, self.bar_height, self.axis_y = lane_layout(len(self.lanes))
+        self.canvas.config(height=self.base_height + self.axis_y - AXIS_Y)
+        self.fit()
+
+    def set_result(self, result, span=0):
+        """Show a ScheduleResult's Gantt columns, one lane per CPU"""
+        self.set_slices(result.slice_pid, result.slice_start, result.slice_end,
+                        cores=result.cores, span=span)
+
+    def patch_result(self, result, from_time):
+        """Swap in a result that matches the shown one before from_time
+
+        Cached tiles wholly before from_time stay valid, so the view keeps
+        its zoom and position and only later tiles are rebuilt. A changed
+        end time or lane count rescales the chart, so that redraws in full.
+        """
+        cores = result.cores
+        last_end = max(result.slice_end) if len(result.slice_end) else 0
+        lanes = 1 if cores is None else cores.cpus
+        if last_end != self.last_end or lanes != len(self.lanes) or self.makespan != last_end:
+            self.set_result(result)
+            return
+        self.slice_pid, self.slice_start, self.slice_end = (result.slice_pid, result.slice_start,
+                                                            result.slice_end)
+        self.cores = cores
+        if cores is None:
+            self.lanes = [(result.slice_pid, result.slice_start, result.slice_end)]
+        else:
+            self.lanes = split_lanes(result.slice_pid, result.slice_start, result.slice_end,
+                                     cores.lanes)
+        self.index = SliceIndex(result.slice_pid, result.slice_start, result.slice_end,
+                                None if cores is None else cores.lanes)
+        # Blocks merge slices up to MIN_BLOCK_PX past a tile's right edge
+        self.cache.discard(lambda key: (key[1] + 1) * TILE_PX + MIN_BLOCK_PX
+                           > from_time * self._scale_for(key[0]))
+        self.redraw()
+
+    def set_entries(self, entries):
+        """Show {'pid', 'start', 'end'} dicts; pids may be any label"""
+        codes = {}
+        pid_column = [codes.setdefault(e['pid'], len(codes) + 1) for e in entries]
+        labels = {code: str(pid) for pid, code in codes.items()}
+        self.set_slices(pid_column, [e['start'] for e in entries],
+                        [e['end'] for e in entries], labels)
+
+    def clear(self):
+        self.set_slices((), (), ())
+
+    def label(self, pid):
+        return self.labels.get(pid) or f"P{pid}"
+
+    def highlight(self, pid):
+        """Outline every slice of pid (None clears); drawn above merged blocks"""
+        self.highlighted = pid
+        self._draw_highlight()
+        self._draw_overlay()
+
+    # ========== VIEWPORT ==========
+
+    def _refit(self):
+        """Recompute the fit-to-width scale; cached tiles are only valid for one"""
+        self.fit_scale = self.width() / self.makespan if self.makespan else 1.0
+        self.cache.clear()
+
+    def _scale_for(self, level):
+        return min(self.fit_scale * ZOOM_STEP ** level, max(MAX_PX_PER_UNIT, self.fit_scale))
+
+    def _max_view_px(self):
+        return max(0, int(self.makespan * self.scale) - self.width())
+
+    def zoom(self, steps, anchor_x=None):
+        """Zoom in (steps > 0) or out about a canvas x position (default: centre)"""
+        if not self.makespan:
+            return
+        level = max(0, self.level + steps)
+        scale = self._scale_for(level)
+        if scale == self.scale:
+            return
+        offset = (anchor_x - MARGIN) if anchor_x is not None else self.width() / 2
+        anchor_t = (self.view_px + offset) / self.scale
+        self.level, self.scale = level, scale
+        self.view_px = int(anchor_t * scale - offset)
+        self.redraw()
+
+    def zoom_to(self, t0, t1):
+        """Zoom to the deepest level at which [t0, t1) still fits, centred on it"""
+        if not self.makespan or t1 <= t0:
+            return
+        wanted = self.width() / (t1 - t0) / self.fit_scale
+        self.level = max(0, math.floor(math.log(wanted, ZOOM_STEP))) if wanted > 1 else 0
+        self.scale = self._scale_for(self.level)
+        self.view_px = int((t0 + t1) / 2 * self.scale - self.width() / 2)
+        self.redraw()
+
+    def fit(self):
+        """Show the whole schedule"""
+        self._refit()
+        self.level, self.view_px = 0, 0
+        self.scale = self.fit_scale
+        self.redraw()
+
+    def pan(self, dx):
+        """Scroll by dx px, redrawing only the tiles that come into view"""
+        view_px = max(0, min(int(self.view_px + dx), self._max_view_px()))
+        dx = view_px - self.view_px
+        if not dx:
+            return
+        self.view_px = view_px
+        self.canvas.move('tile', -dx, 0)
+        self.canvas.delete('hover')
+        self._sync_tiles()
+        self._draw_highlight()
+        self._draw_overlay()
+
+    # ========== RENDERING ==========
+
+    def _schedule_redraw(self, refit=False):
+        if refit:
+            # Keep the zoom level and the time at the left edge across resizes
+            left_t = self.view_px / self.scale
+            self._refit()
+            self.scale = self._scale_for(self.level)
+            self.view_px = int(left_t * self.scale)
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.canvas.after_idle(self.redraw)
+
+    def redraw(self):
+        """Throw away all canvas items and draw the viewport from the tile cache"""
+        self._redraw_pending = False
+        self.view_px = max(0, min(self.view_px, self._max_view_px()))
+        self.canvas.delete('all')
+        self.drawn = set()
+        if self.makespan:
+            self._sync_tiles()
+        self._draw_highlight()
+        self._draw_overlay()
+
+    def _build_tile(self, index):
+        metrics.counter('gantt_tiles_built', "Gantt tiles computed (tile cache misses)").inc()
+        px0 = index * TILE_PX
+        return [lod_blocks(pid, start, end, self.scale, px0, px0 + TILE_PX)
+                for pid, start, end in self.lanes]
+
+    def _sync_tiles(self):
+        """Draw missing tiles in the viewport and drop those outside it"""
+        with metrics.timer('gantt_draw_seconds', "Syncing Gantt canvas items to the viewport").time():
+            self._sync_tiles_now()
+
+    def _sync_tiles_now(self):
+        first = self.view_px // TILE_PX
+        last = (self.view_px + self.width() - 1) // TILE_PX
+        for index in list(self.drawn):
+            if index < first - 1 or index > last + 1:
+                self.canvas.delete(f'tile{index}')
+                self.drawn.discard(index)
+        for index in range(first, last + 1):
+            if index not in self.drawn:
+                blocks = self.cache.get((self.level, index), lambda: self._build_tile(index))
+                self._draw_tile(index, blocks)
+                self.drawn.add(index)
+
+    def _draw_tile(self, index, lanes):
+        tags = ('tile', f'tile{index}')
+        shift = MARGIN - self.view_px
+        for lane, blocks in enumerate(lanes):
+            top = BAR_TOP + lane * self.lane_pitch
+            bottom = top + self.bar_height
+            for x1, x2, pid, count in blocks:
+                if pid is None:
+                    color = MERGED_COLOR
+                else:
+                    color = COLORS[(pid - 1) % len(COLORS)]
+                self.canvas.create_rectangle(x1 + shift, top, x2 + shift, bottom,
+                                             fill=color, outline='', tags=tags)
+                if pid is not None and self.bar_height >= 14:
+                    text = self.label(pid)
+                    if x2 - x1 >= len(text) * CHAR_PX + 4:
+                        self.canvas.create_text((x1 + x2) / 2 + shift, (top + bottom) / 2,
+                                                text=text, fill='white',
+                                                font=('Arial', 10, 'bold'), tags=tags)
+
+    def _draw_highlight(self):
+        """Redraw the highlighted process's blocks in the viewport
+
+        Each lane's slices of one process are a contiguous, time-ordered
+        run of the index's process columns, so they go through lod_blocks
+        like a lane of their own: the cost is bounded by the pixel width.
+        """
+        self.canvas.delete('highlight')
+        if self.highlighted is None or not self.makespan:
+            return
+        pids, starts, ends = self.index.process_columns()
+        px0, px1 = self.view_px, self.view_px + self.width()
+        shift = MARGIN - self.view_px
+        color = COLORS[(self.highlighted - 1) % len(COLORS)]
+        for lane in range(self.index.lanes):
+            lo, hi = self.index.process_range(lane, self.highlighted)
+            if lo == hi:
+                continue
+            top = BAR_TOP + lane * self.lane_pitch
+            bottom = top + self.bar_height
+            for x1, x2, _, _ in lod_blocks(pids, starts, ends, self.scale, px0, px1,
+                                           lo=lo, hi=hi):
+                self.canvas.create_rectangle(x1 + shift, top, x2 + shift, bottom, fill=color,
+                                             outline=HIGHLIGHT_OUTLINE, width=2,
+                                             tags='highlight')
+
+    def _draw_overlay(self):
+        """Margins, time axis and scrollbar; cheap enough to redo on every pan"""
+        self.canvas.delete('overlay')
+        width = self.width()
+        height = int(self.canvas.cget('height')) + 2
+        total = self.canvas.winfo_width()
+        # Tiles overhang the viewport; cover them in the margins
+        self.canvas.create_rectangle(0, 0, MARGIN, height, fill='white', outline='', tags='overlay')
+        self.canvas.create_rectangle(MARGIN + width, 0, total, height,
+                                     fill='white', outline='', tags='overlay')
+        self.canvas.create_line(MARGIN, self.axis_y, MARGIN + width, self.axis_y,
+                                fill=self.axis_color, width=2, tags='overlay')
+        if len(self.lanes) > 1 and self.lane_pitch >= 10:
+            for lane in range(len(self.lanes)):
+                self.canvas.create_text(MARGIN - 4, BAR_TOP + lane * self.lane_pitch
+                                        + self.bar_height / 2, anchor='e', text=f"CPU {lane}",
+                                        font=('Arial', 8), tags='overlay')
+
+        if self.makespan:
+            step = tick_step(self.scale)
+            t = math.ceil(self.view_px / self.scale / step) * step
+            t_end = min(self.makespan, (self.view_px + width) / self.scale)
+            while t <= t_end:
+                x = MARGIN + t * self.scale - self.view_px
+                self.canvas.create_line(x, self.axis_y - 4, x, self.axis_y + 4,
+                                        fill=self.axis_color, tags='overlay')
+                self.canvas.create_text(x, self.axis_y + 15, text=str(t),
+                                        font=('Arial', 8), tags='overlay')
+                t += step
+            zoom = self.scale / self.fit_scale
+            visible = self.index.count_between(self.view_px / self.scale,
+                                               (self.view_px + width) / self.scale)
+            text = f"{visible:,} of {len(self.slice_start):,} slices in view  |  zoom {zoom:.1f}x"
+            if self.highlighted is not None:
+                text = f"{self.label(self.highlighted)} highlighted  |  {text}"
+            if self.cores is not None:
+                text = f"{self.utilization_text()}  |  {text}"
+            self.canvas.create_text(MARGIN + width, 12, anchor='e', font=('Arial', 8),
+                                    text=text, tags='overlay')
+
+        span = self.makespan * self.scale
+        if span <= width:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.view_px / span, (self.view_px + width) / span)
+
+    def utilization_text(self):
+        """Per-CPU busy share of the makespan, e.g. 'CPU util 92% 87%'"""
+        busy = self.cores.busy
+        end = self.last_end or 1
+        shares = [f"{b * 100 / end:.0f}%" for b in busy[:8]]
+        if len(busy) > 8:
+            shares.append(f"... avg {sum(busy) * 100 / (end * len(busy)):.0f}%")
+        return "CPU util " + ' '.join(shares)
+
+    # ========== QUERIES ==========
+
+    def time_at(self, x):
+        """Time under canvas x"""
+        return (x - MARGIN + self.view_px) / self.scale
+
+    def lane_at(self, y):
+        """Lane whose bar covers canvas y, or None"""
+        lane, offset = divmod(y - BAR_TOP, self.lane_pitch)
+        if 0 <= lane < len(self.lanes) and offset < self.bar_height:
+            return int(lane)
+        return None
+
+    def slice_at(self, x, y):
+        """(lane, slice position) under a canvas point, or None"""
+        lane = self.lane_at(y)
+        if lane is None or not self.makespan or not MARGIN <= x < MARGIN + self.width():
+            return None
+        k = self.index.slice_at(lane, self.time_at(x))
+        return None if k is None else (lane, k)
+
+    def describe_slice(self, lane, k, x=None):
+        """Tooltip text for one slice; with x, also counts the slices merged into its pixel"""
+        text = f"{self.label(self.slice_pid[k])}: {self.slice_start[k]}-{self.slice_end[k]}"
+        if len(self.lanes) > 1:
+            text = f"CPU {lane}  {text}"
+        if x is not None:
+            others = self.index.count_between(self.time_at(x), self.time_at(x + 1), lane) - 1
+            if others > 0:
+                text += f"  (+{others:,} more in this pixel)"
+        return text
+
+    # ========== INPUT ==========
+
+    def _on_wheel(self, event):
+        self.zoom(1 if event.delta > 0 else -1, event.x)
+        return 'break'
+
+    def _on_shift_wheel(self, event):
+        self.pan((-1 if event.delta > 0 else 1) * self.width() // 10)
+        return 'break'
+
+    def _on_press(self, event):
+        self._drag_x = self._press_x = event.x
+
+    def _on_release(self, event):
+        """A click (no drag) highlights the process under the cursor, or clears"""
+        press_x, self._press_x = self._press_x, None
+        if press_x is None or abs(event.x - press_x) >= CLICK_PX:
+            return
+        hit = self.slice_at(event.x, event.y)
+        pid = None if hit is None else self.slice_pid[hit[1]]
+        self.highlight(None if pid == self.highlighted else pid)
+
+    def _on_motion(self, event):
+        """Tooltip for the slice under the cursor: a few bisects per event"""
+        self.canvas.delete('hover')
+        hit = self.slice_at(event.x, event.y)
+        if hit is None:
+            return
+        text = self.canvas.create_text(event.x + 12, event.y - 12, anchor='w',
+                                       text=self.describe_slice(*hit, x=event.x),
+                                       font=('Arial', 8), tags='hover')
+        x1, y1, x2, y2 = self.canvas.bbox(text)
+        if x2 > self.canvas.winfo_width():
+            self.canvas.move(text, -(x2 - x1) - 24, 0)
+            x1, y1, x2, y2 = self.canvas.bbox(text)
+        box = self.canvas.create_rectangle(x1 - 3, y1 - 2, x2 + 3, y2 + 2, fill='#ffffe0',
+                                           outline=self.axis_color, tags='hover')
+        self.canvas.tag_raise(text, box)
+
+    def _on_band_press(self, event):
+        self._band_x = event.x
+
+    def _on_band_drag(self, event):
+        if self._band_x is None:
+            return
+        self.canvas.delete('band')
+        self.canvas.create_rectangle(self._band_x, BAR_TOP - 4, event.x, self.axis_y,
+                                     outline=self.axis_color, dash=(3, 2), tags='band')
+
+    def _on_band_release(self, event):
+        """Zoom to the time range dragged across with the right button"""
+        self.canvas.delete('band')
+        if self._band_x is None:
+            return
+        x0, x1 = sorted((self._band_x, event.x))
+        self._band_x = None
+        if x1 - x0 >= CLICK_PX:
+            self.zoom_to(self.time_at(max(x0, MARGIN)),
+                         self.time_at(min(x1, MARGIN + self.width())))
+
+    def _on_drag(self, event):
+        if self._drag_x is not None:
+            self.pan(self._drag_x - event.x)
+            self._drag_x = event.x
+
+    def _on_scroll(self, action, value, unit=None):
+        if action == 'moveto':
+            self.pan(float(value) * self.makespan * self.scale - self.view_px)
+        elif action == 'scroll':
+            step = self.width() if unit == 'pages' else self.width() // 10
+            self.pan(int(value) * step)
@@ -0,0 +1,251 @@
+"""
+Advanced OS Project - Allocator Trace Replay
+Builds alloc/free traces for the backend's TRACE command and decodes the
+delta-encoded heap map it streams back into a seekable timeline
+"""
+
+import math
+import random
+from array import array
+from bisect import bisect_left
+
+
+TRACE_HEADER = 'HEAPTRACE'
+TRACE_END = 'HEAPTRACE_END'
+KEYFRAME_EVERY = 1024   # steps between full heap-map copies
+MAX_HANDLE = 0xffffffff
+MAX_SIZE = 0x7fffffff
+POLICIES = ('SEGREGATED', 'BESTFIT', 'BUDDY')
+
+
+class TraceError(ValueError):
+    """Raised for malformed trace files and TRACE replies"""
+
+
+class Trace:
+    """Alloc/free operations as parallel columns; size 0 frees the handle"""
+
+    def __init__(self, handles=None, sizes=None):
+        self.handles = handles if handles is not None else array('L')
+        self.sizes = sizes if sizes is not None else array('L')
+
+    def __len__(self):
+        return len(self.handles)
+
+    def alloc(self, handle, size):
+        self.handles.append(handle)
+        self.sizes.append(size)
+
+    def free(self, handle):
+        self.handles.append(handle)
+        self.sizes.append(0)
+
+    def command(self):
+        """The trace as one TRACE command block"""
+        lines = [f"TRACE {len(self)}"]
+        lines.extend(f"A {h} {s}" if s else f"F {h}" for h, s in zip(self.handles, self.sizes))
+        return '\n'.join(lines) + '\n'
+
+
+def generate_trace(ops, max_live=1024, max_size=1024, seed=1):
+    """Random churn around max_live/2 live blocks with log-uniform sizes in
+    [8, max_size]; the same arguments always give the same trace"""
+    rng = random.Random(seed)
+    span = math.log(max(max_size, 9) / 8)
+    trace = Trace()
+    live = []
+    next_handle = 0
+    for _ in range(ops):
+        grow = rng.random() < (0.55 if len(live) < max_live // 2 else 0.45)
+        if not live or (grow and len(live) < max_live):
+            live.append(next_handle)
+            trace.alloc(next_handle, int(8 * math.exp(rng.random() * span)))
+            next_handle += 1
+        else:
+            pick = rng.randrange(len(live))
+            live[pick], live[-1] = live[-1], live[pick]
+            trace.free(live.pop())
+    return trace
+
+
+def load_trace(path):
+    """Read a trace file: "A <handle> <size>" or "F <handle>" per line
+
+    alloc/free are accepted for A/F; blank lines and # comments are skipped.
+    """
+    trace = Trace()
+    with open(path, 'r', encoding='utf-8') as f:
+        for lineno, line in enumerate(f, 1):
+            fields = line.split('#', 1)[0].split()
+            if not fields:
+                continue
+            kind = fields[0].upper()
+            try:
+                if kind in ('A', 'ALLOC') and len(fields) == 3:
+                    handle, size = int(fields[1]), int(fields[2])
+                    if not 0 < size <= MAX_SIZE:
+                        raise ValueError
+                elif kind in ('F', 'FREE') and len(fields) == 2:
+                    handle, size = int(fields[1]), 0
+                else:
+                    raise ValueError
+                if not 0 <= handle <= MAX_HANDLE:
+                    raise ValueError
+            except ValueError:
+                raise TraceError(f"{path}:{lineno}: expected 'A <handle> <size>' or "
+                                 f"'F <handle>', got {line.strip()!r}") from None
+            trace.handles.append(handle)
+            trace.sizes.append(size)
+    return trace
+
+
+def save_trace(path, trace):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(trace.command().split('\n', 1)[1])
+
+
+class HeapMap:
+    """Blocks tiling the heap: start offsets and signed sizes (negative = free)"""
+
+    def __init__(self, offsets, sizes):
+        self.offsets = offsets
+        self.sizes = sizes
+
+    def copy(self):
+        return HeapMap(array('q', self.offsets), array('q', self.sizes))
+
+    def apply(self, lo, sizes):
+        """Replace the blocks covering [lo, lo + total size) with sizes"""
+        hi = lo + sum(abs(s) for s in sizes)
+        i = bisect_left(self.offsets, lo)
+        j = bisect_left(self.offsets, hi, i)
+        offsets = array('q')
+        at = lo
+        for s in sizes:
+            offsets.append(at)
+            at += abs(s)
+        self.offsets[i:j] = offsets
+        self.sizes[i:j] = array('q', sizes)
+
+    def blocks_in(self, lo, hi):
+        """Index range of the blocks overlapping [lo, hi)"""
+        i = max(0, bisect_left(self.offsets, lo + 1) - 1)
+        return i, bisect_left(self.offsets, hi, i)
+
+    def free_blocks(self):
+        return sum(1 for s in self.sizes if s < 0)
+
+
+class HeapTimeline:
+    """Every step of a replayed trace, rebuilt on demand from deltas
+
+    Step 0 is the empty heap and step k the heap after operation k. A copy
+    of the map is kept every KEYFRAME_EVERY steps, so seeking replays at
+    most that many deltas.
+    """
+
+    def __init__(self, usable, policy, initial):
+        self.usable = usable
+        self.policy = policy
+        self.allocated = array('q', [0])
+        self.largest = array('q', [max((-s for s in initial.sizes if s < 0), default=0)])
+        # Step k's delta is delta_sizes[delta_start[k]:delta_start[k + 1]] at delta_lo[k]
+        self.failures = array('q', [0])     # Steps so far that changed nothing
+        self.delta_lo = array('q', [-1])
+        self.delta_start = array('q', [0, 0])
+        self.delta_sizes = array('q')
+        self.keyframes = [initial.copy()]
+        self._head = initial
+
+    @property
+    def steps(self):
+        return len(self.allocated) - 1
+
+    def add_step(self, allocated, largest, lo=-1, sizes=()):
+        self.allocated.append(allocated)
+        self.largest.append(largest)
+        self.failures.append(self.failures[-1] + (lo < 0))
+        self.delta_lo.append(lo)
+        self.delta_sizes.extend(sizes)
+        self.delta_start.append(len(self.delta_sizes))
+        if lo >= 0:
+            self._head.apply(lo, sizes)
+        if self.steps % KEYFRAME_EVERY == 0:
+            self.keyframes.append(self._head.copy())
+
+    def changed(self, step):
+        """False for steps that failed or freed an unknown handle"""
+        return self.delta_lo[step] >= 0
+
+    def delta(self, step):
+        """(offset, sizes) written by step, or None if it changed nothing"""
+        lo = self.delta_lo[step]
+        if lo < 0:
+            return None
+        return lo, self.delta_sizes[self.delta_start[step]:self.delta_start[step + 1]]
+
+    def advance(self, heap_map, step):
+        """Apply step's delta to heap_map; returns the changed byte range or None"""
+        delta = self.delta(step)
+        if delta is None:
+            return None
+        lo, sizes = delta
+        heap_map.apply(lo, sizes)
+        return lo, lo + sum(abs(s) for s in sizes)
+
+    def snapshot(self, step):
+        """A fresh HeapMap of the heap after step"""
+        step = max(0, min(step, self.steps))
+        base = step // KEYFRAME_EVERY
+        heap_map = self.keyframes[base].copy()
+        for k in range(base * KEYFRAME_EVERY + 1, step + 1):
+            self.advance(heap_map, k)
+        return heap_map
+
+    def external_fragmentation(self, step):
+        """Percent of free memory outside the largest free block"""
+        free = self.usable - self.allocated[step]
+        return (1 - self.largest[step] / free) * 100 if free else 0.0
+
+
+def _ints(fields):
+    try:
+        return [int(v) for v in fields]
+    except ValueError:
+        raise TraceError(f"Bad heap trace line {' '.join(fields)!r}") from None
+
+
+def decode_trace(output):
+    """Build a HeapTimeline from a complete TRACE response"""
+    lines = iter(output.splitlines())
+    for line in lines:
+        if line.startswith('ERROR'):
+            raise TraceError(line.strip())
+        if line.startswith(TRACE_HEADER + ' '):
+            break
+    else:
+        raise TraceError("No heap trace in backend response")
+
+    _, steps, usable, policy = line.split()
+    initial = _ints(next(lines, '').split())
+    if not initial or initial[0] != 0:
+        raise TraceError("Heap trace is missing its initial map")
+    heap_map = HeapMap(array('q'), array('q'))
+    heap_map.apply(0, initial[1:])
+    timeline = HeapTimeline(int(usable), policy, heap_map)
+
+    for line in lines:
+        if line == TRACE_END:
+            break
+        fields = _ints(line.split())
+        if len(fields) == 2:
+            timeline.add_step(fields[0], fields[1])
+        elif len(fields) > 3:
+            timeline.add_step(fields[0], fields[1], fields[2], fields[3:])
+        else:
+            raise TraceError(f"Bad heap trace line {line!r}")
+    else:
+        raise TraceError("Heap trace ended early")
+    if timeline.steps != int(steps):
+        raise TraceError(f"Expected {steps} heap trace steps, got {timeline.steps}")
+    return timeline
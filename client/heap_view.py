@@ -0,0 +1,241 @@
+"""
+Advanced OS Project - Heap Occupancy Map
+Scrollable cell map of the allocator heap that replays a HeapTimeline step
+by step, redrawing only the cells each step touched
+"""
+
+import tkinter as tk
+from array import array
+from tkinter import ttk
+
+import metrics
+from heap_trace import KEYFRAME_EVERY
+
+
+COLUMNS = 128          # cells per row
+CELL_PX = 5
+TARGET_ROWS = 256      # bytes per cell is chosen so the heap fills about this many rows
+MIN_CELL_BYTES = 8
+FRAME_MS = 30          # playback timer
+PLAYBACK_SECONDS = 20  # default speed plays any trace in about this long
+
+FREE_COLOR = (0xec, 0xf0, 0xf1)
+USED_COLOR = (0x29, 0x80, 0xb9)
+SHADES = 16
+
+
+def _shade(level):
+    t = level / SHADES
+    return '#%02x%02x%02x' % tuple(int(f + (u - f) * t) for f, u in zip(FREE_COLOR, USED_COLOR))
+
+
+PALETTE = [_shade(level) for level in range(SHADES + 1)]
+
+
+def cell_bytes_for(usable, columns=COLUMNS, target_rows=TARGET_ROWS):
+    """Smallest power of two >= MIN_CELL_BYTES that fits the heap in target_rows"""
+    cell = MIN_CELL_BYTES
+    while cell * columns * target_rows < usable:
+        cell *= 2
+    return cell
+
+
+def cell_occupancy(heap_map, cell_bytes, first, last):
+    """Allocated bytes in each cell first..last-1 (cell k covers
+    [k * cell_bytes, (k + 1) * cell_bytes))"""
+    used = array('q', bytes(8 * (last - first)))
+    lo, hi = first * cell_bytes, last * cell_bytes
+    i, j = heap_map.blocks_in(lo, hi)
+    offsets, sizes = heap_map.offsets, heap_map.sizes
+    for k in range(i, j):
+        if sizes[k] <= 0:
+            continue
+        start, end = max(offsets[k], lo), min(offsets[k] + sizes[k], hi)
+        c = start // cell_bytes
+        while start < end:
+            stop = min(end, (c + 1) * cell_bytes)
+            used[c - first] += stop - start
+            start = stop
+            c += 1
+    return used
+
+
+class HeapMapView:
+    """Heap map canvas with a step slider, play/pause and fragmentation readout
+
+    The map is one PhotoImage; each cell's shade is the share of its bytes
+    that are allocated. Stepping forward applies deltas to the current map
+    and repaints just the rows they touched; any other seek starts from the
+    nearest keyframe.
+    """
+
+    def __init__(self, parent, height=300, columns=COLUMNS, cell_px=CELL_PX):
+        self.columns = columns
+        self.cell_px = cell_px
+        self.timeline = None
+        self.heap_map = None
+        self.step = 0
+        self.cell_bytes = MIN_CELL_BYTES
+        self.rows = 0
+        self.playing = False
+        self._seeking = False
+
+        self.frame = ttk.Frame(parent)
+        map_frame = ttk.Frame(self.frame)
+        map_frame.pack(fill='both', expand=True)
+        self.canvas = tk.Canvas(map_frame, height=height, width=columns * cell_px,
+                                bg='white', highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(map_frame, orient='vertical', command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.canvas.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='left', fill='y')
+        self.image = tk.PhotoImage(width=1, height=1)
+        self.canvas.create_image(0, 0, image=self.image, anchor='nw')
+
+        controls = ttk.Frame(self.frame)
+        controls.pack(fill='x', pady=(5, 0))
+        self.play_button = ttk.Button(controls, text="Play", width=7, command=self.toggle_play)
+        self.play_button.pack(side='left')
+        self.slider = ttk.Scale(controls, from_=0, to=0, orient='horizontal',
+                                command=self._on_slider)
+        self.slider.pack(side='left', fill='x', expand=True, padx=5)
+        ttk.Label(controls, text="Steps/frame:").pack(side='left')
+        self.speed = tk.IntVar(value=1)
+        ttk.Spinbox(controls, from_=1, to=100000, width=7,
+                    textvariable=self.speed).pack(side='left', padx=(2, 0))
+
+        self.metrics = tk.StringVar(value="No trace replayed yet")
+        ttk.Label(self.frame, textvariable=self.metrics, font=('Consolas', 9)).pack(anchor='w')
+        self.hover = tk.StringVar(value="")
+        ttk.Label(self.frame, textvariable=self.hover, font=('Consolas', 9)).pack(anchor='w')
+
+        self.canvas.bind('<Motion>', self._on_motion)
+        self.canvas.bind('<MouseWheel>', lambda e: self.canvas.yview_scroll(-e.delta // 120, 'units'))
+        self.canvas.bind('<Button-4>', lambda e: self.canvas.yview_scroll(-1, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self.canvas.yview_scroll(1, 'units'))
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    # ========== DATA ==========
+
+    def set_timeline(self, timeline):
+        """Show a replayed trace, starting at its last step"""
+        self.pause()
+        self.timeline = timeline
+        self.cell_bytes = cell_bytes_for(timeline.usable, self.columns)
+        self.rows = -(-timeline.usable // (self.cell_bytes * self.columns))
+        self.image.configure(width=self.columns * self.cell_px, height=self.rows * self.cell_px)
+        self.canvas.configure(scrollregion=(0, 0, self.columns * self.cell_px,
+                                            self.rows * self.cell_px))
+        self.speed.set(max(1, timeline.steps * FRAME_MS // (PLAYBACK_SECONDS * 1000)))
+        self._seeking = True
+        self.slider.configure(to=timeline.steps)
+        self._seeking = False
+        self.seek(timeline.steps, force=True)
+
+    def seek(self, step, force=False):
+        """Show the heap after step"""
+        if self.timeline is None:
+            return
+        step = max(0, min(int(step), self.timeline.steps))
+        if not force and self.step < step <= self.step + KEYFRAME_EVERY:
+            # Forward and close: replay deltas, repainting only what they touch
+            lo = hi = None
+            for k in range(self.step + 1, step + 1):
+                changed = self.timeline.advance(self.heap_map, k)
+                if changed:
+                    lo = changed[0] if lo is None else min(lo, changed[0])
+                    hi = changed[1] if hi is None else max(hi, changed[1])
+            if lo is not None:
+                self._paint(lo // self.cell_bytes, -(-hi // self.cell_bytes))
+        elif force or step != self.step:
+            self.heap_map = self.timeline.snapshot(step)
+            self._paint(0, self.rows * self.columns)
+        self.step = step
+        self._seeking = True
+        self.slider.set(step)
+        self._seeking = False
+        self._show_metrics()
+
+    # ========== DRAWING ==========
+
+    def _paint(self, first, last):
+        """Repaint cells first..last-1, a row segment per put()"""
+        last = min(last, self.rows * self.columns)
+        if first >= last:
+            return
+        with metrics.timer('heap_map_paint_seconds', "Repainting heap map cells").time():
+            self._paint_cells(first, last)
+
+    def _paint_cells(self, first, last):
+        used = cell_occupancy(self.heap_map, self.cell_bytes, first, last)
+        px = self.cell_px
+        scale = SHADES / self.cell_bytes
+        cell = first
+        while cell < last:
+            row, col = divmod(cell, self.columns)
+            end = min(last, (row + 1) * self.columns)
+            colors = ' '.join(' '.join([PALETTE[round(used[c - first] * scale)]] * px)
+                              for c in range(cell, end))
+            # One pixel row, tiled down to the cell height
+            self.image.put('{' + colors + '}',
+                           to=(col * px, row * px, (col + end - cell) * px, (row + 1) * px))
+            cell = end
+
+    def _show_metrics(self):
+        t, k = self.timeline, self.step
+        allocated = t.allocated[k]
+        self.metrics.set(
+            f"Step {k:,}/{t.steps:,} ({t.policy})  |  Allocated {allocated:,} of {t.usable:,} bytes "
+            f"({allocated * 100 / t.usable:.1f}%)  |  Free blocks {self.heap_map.free_blocks():,}  |  "
+            f"Largest free {t.largest[k]:,}  |  External frag {t.external_fragmentation(k):.1f}%  |  "
+            f"No-op steps {t.failures[k]:,}  |  {self.cell_bytes} bytes/cell")
+
+    def _on_motion(self, event):
+        if self.heap_map is None:
+            return
+        col = int(event.x // self.cell_px)
+        row = int(self.canvas.canvasy(event.y) // self.cell_px)
+        if not (0 <= col < self.columns and 0 <= row < self.rows):
+            return
+        offset = (row * self.columns + col) * self.cell_bytes
+        i, _ = self.heap_map.blocks_in(offset, offset + 1)
+        if i < len(self.heap_map.offsets):
+            size = self.heap_map.sizes[i]
+            state = "allocated" if size > 0 else "free"
+            self.hover.set(f"Offset {offset:#x}: {state} block of {abs(size):,} bytes "
+                           f"at {self.heap_map.offsets[i]:#x}")
+
+    # ========== PLAYBACK ==========
+
+    def _on_slider(self, value):
+        if not self._seeking:
+            self.seek(float(value))
+
+    def toggle_play(self):
+        if self.playing:
+            self.pause()
+        elif self.timeline is not None:
+            if self.step >= self.timeline.steps:
+                self.seek(0)
+            self.playing = True
+            self.play_button.config(text="Pause")
+            self.canvas.after(FRAME_MS, self._tick)
+
+    def pause(self):
+        self.playing = False
+        self.play_button.config(text="Play")
+
+    def _tick(self):
+        if not self.playing:
+            return
+        try:
+            speed = max(1, self.speed.get())
+        except tk.TclError:
+            speed = 1
+        self.seek(self.step + speed)
+        if self.step >= self.timeline.steps:
+            self.pause()
+        else:
+            self.canvas.after(FRAME_MS, self._tick)
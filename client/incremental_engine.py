@@ -0,0 +1,171 @@
+"""
+Advanced OS Project - Incremental Re-Scheduling
+Keeps the last simulation of one algorithm with checkpoints along its
+timeline, so adding or editing a process re-simulates only from the
+earliest moment the change can affect
+"""
+
+import threading
+from array import array
+from bisect import bisect_left
+
+import metrics
+from result_protocol import ScheduleResult
+from scheduling_engine import (CHECKPOINT_STEPS, DEFAULT_QUANTUM, SmpSimulation,
+                               columns_from_processes)
+
+
+DIFF_CHUNK = 4096   # elements compared per slice while looking for the first change
+
+# Single-CPU SJF and Priority list stats rows by (arrival, key), like the backend
+ROW_KEYS = {'SJF': 'burst', 'Priority': 'priority'}
+
+
+def first_difference(old, new):
+    """Lowest index where two int columns differ, or the shorter length"""
+    n = min(len(old), len(new))
+    start = 0
+    while start < n:
+        stop = min(n, start + DIFF_CHUNK)
+        if old[start:stop] != new[start:stop]:
+            for k in range(start, stop):
+                if old[k] != new[k]:
+                    return k
+        start = stop
+    return n
+
+
+class ScheduleDelta:
+    """One update's result and how far it agrees with the previous one
+
+    Slices starting before slice_time are unchanged, as are the first
+    lane_prefix[c] slices of each lane and the first first_row stats rows.
+    resumed_from is the checkpoint time the simulation restarted at, or
+    None after a full run.
+    """
+
+    def __init__(self, result, previous=None, slice_time=0, lane_prefix=None, first_row=0,
+                 resumed_from=None):
+        self.result = result
+        self.previous = previous
+        self.slice_time = slice_time
+        self.lane_prefix = lane_prefix or [0] * (result.cpus if result.cores else 1)
+        self.first_row = first_row
+        self.resumed_from = resumed_from
+
+    @property
+    def full(self):
+        return self.previous is None
+
+    @property
+    def unchanged(self):
+        return self.result is self.previous
+
+
+class IncrementalSchedule:
+    """One algorithm's schedule, kept up to date across workload edits
+
+    update() takes the arrival-sorted columns after an edit, finds the
+    first position where they differ from the last run, and resumes the
+    simulation from the latest checkpoint before that process arrives.
+    Everything placed by then is untouched by the edit, so the prefix of
+    the Gantt lanes and stats rows is reused as is.
+    """
+
+    def __init__(self, algorithm, quantum=DEFAULT_QUANTUM, cpus=1,
+                 checkpoint_steps=CHECKPOINT_STEPS):
+        self.algorithm = algorithm
+        self.quantum = quantum
+        self.cpus = cpus
+        self.checkpoint_steps = checkpoint_steps
+        self.simulation = None
+        self.result = None
+        self._lock = threading.Lock()
+
+    def update_processes(self, processes):
+        return self.update(*columns_from_processes(processes))
+
+    def update(self, arrival, burst, priority):
+        """Re-schedule the arrival-sorted columns; returns a ScheduleDelta"""
+        with self._lock, metrics.timer('incremental_update_seconds',
+                                       "Incremental re-scheduling updates").time():
+            previous = self.simulation
+            if previous is None or not previous.checkpoints:
+                return self._full(arrival, burst, priority)
+            changed = min(first_difference(old, new) for old, new in
+                          zip((previous.arrival, previous.burst, previous.priority),
+                              (arrival, burst, priority)))
+            n = len(arrival)
+            if changed == n == len(previous.arrival):
+                return ScheduleDelta(self.result, self.result, self.result.makespan,
+                                     [len(lane[0]) for lane in previous.lanes], n)
+
+            # Latest checkpoint taken before the first changed process arrives
+            arrivals = [a[changed] for a in (previous.arrival, arrival) if changed < len(a)]
+            times = [c.time for c in previous.checkpoints]
+            checkpoint = previous.checkpoints[bisect_left(times, min(arrivals)) - 1]
+            simulation = self._simulation(arrival, burst, priority)
+            simulation.resume(previous, checkpoint)
+            simulation.run()
+            metrics.counter('incremental_resumes', "Incremental updates resumed from a checkpoint").inc()
+
+            first = min(changed, first_difference(previous.completion, simulation.completion))
+            row_start, rows = self._row_order(simulation, first, previous.arrival)
+            running = [start for start, pos in zip(checkpoint.run_start, checkpoint.run_pos)
+                       if pos >= 0]
+            slice_time = max(0, min(running + [checkpoint.time]))
+            result = self._result(simulation, self.result, row_start, rows)
+            delta = ScheduleDelta(result, self.result, slice_time, checkpoint.lane_lengths,
+                                  row_start, checkpoint.time if checkpoint.time > 0 else 0)
+            self.simulation, self.result = simulation, result
+            return delta
+
+    def _simulation(self, arrival, burst, priority):
+        return SmpSimulation(self.algorithm, arrival, burst, priority, self.quantum, self.cpus,
+                             order=range(len(arrival)), checkpoint_steps=self.checkpoint_steps)
+
+    def _full(self, arrival, burst, priority):
+        simulation = self._simulation(arrival, burst, priority).run()
+        _, rows = self._row_order(simulation, 0, arrival)
+        self.simulation = simulation
+        self.result = self._result(simulation, None, 0, rows)
+        return ScheduleDelta(self.result)
+
+    def _row_order(self, simulation, first, old_arrival):
+        """(first stats row that may change, process indices for the rows from there)
+
+        Rows follow arrival position, except that single-CPU SJF and
+        Priority sort each group of equal arrivals by their key, so the
+        patch has to start at the group holding the first changed process,
+        old or new.
+        """
+        arrival = simulation.arrival
+        n = len(arrival)
+        field = ROW_KEYS.get(self.algorithm) if self.cpus == 1 else None
+        if field is None:
+            return first, range(first, n)
+        # The group may have started earlier in either workload
+        first = min([first] + [bisect_left(a, a[first]) for a in (arrival, old_arrival)
+                               if first < len(a)])
+        key = getattr(simulation, field)
+        return first, sorted(range(first, n), key=lambda k: (arrival[k], key[k]))
+
+    def _result(self, simulation, previous, row_start, rows):
+        """ScheduleResult reusing the previous result's stats rows before row_start"""
+        arrival, burst, completion = simulation.arrival, simulation.burst, simulation.completion
+
+        def column(name, values):
+            patched = getattr(previous, name)[:row_start] if previous is not None else array('q')
+            patched.extend(values)
+            return patched
+
+        pid = column('pid', (k + 1 for k in rows))
+        at = column('arrival', (arrival[k] for k in rows))
+        bt = column('burst', (burst[k] for k in rows))
+        ct = column('completion', (completion[k] for k in rows))
+        tat = column('turnaround', (completion[k] - arrival[k] for k in rows))
+        wt = column('waiting', (completion[k] - arrival[k] - burst[k] for k in rows))
+        n = len(pid) or 1
+        cores = simulation.core_stats() if self.cpus > 1 else None
+        return ScheduleResult(self.algorithm, simulation.quantum, *simulation.slices(),
+                              pid, at, bt, ct, tat, wt, sum(wt) / n, sum(tat) / n, cores)
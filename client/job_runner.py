@@ -0,0 +1,249 @@
+"""
+Advanced OS Project - Background Job Runner
+Runs backend requests on a worker pool and streams their output back
+"""
+
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+import scheduling_engine
+from heap_trace import decode_trace
+from backend_session import BackendError, BackendSession, JobCancelled, ServiceSession
+from result_protocol import FrameDecoder
+
+
+def snapshot(processes):
+    """Copy a workload so later edits in the GUI cannot race the worker"""
+    if hasattr(processes, 'snapshot'):
+        return processes.snapshot()
+    return list(processes)
+
+
+class BackendJob:
+    """One queued backend request and the output it has streamed so far"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, option, tab_name, processes, quantum=scheduling_engine.DEFAULT_QUANTUM,
+                 cpus=1):
+        self.id = next(self._ids)
+        self.option = option
+        self.tab_name = tab_name
+        self.processes = processes
+        self.quantum = quantum
+        self.cpus = cpus
+        self.lines = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.done = threading.Event()
+        self.output = None
+        self.stderr = ''
+        self.error = None
+        self.future = None
+        self.submitted = time.perf_counter()
+        # Filled in by the consumer: decoded results and their cache key
+        self.results = []
+        self.cache_key = None
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        """Request cancellation; the worker kills the backend mid-response"""
+        self.cancel_event.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def drain(self, limit=500):
+        """Return up to limit streamed lines without blocking"""
+        lines = []
+        while len(lines) < limit:
+            try:
+                lines.append(self.lines.get_nowait())
+            except queue.Empty:
+                break
+        return lines
+
+
+class JobRunner:
+    """Thread pool where every worker owns its own backend session
+
+    With shared_memory set the sessions exchange workloads and results
+    through mapped files, and workers decode result frames themselves
+    (the next run reuses the result segment), so jobs stream
+    ScheduleResults rather than raw frame lines. With service set (an
+    address of scheduler_service.py) workers connect to that shared
+    service instead of spawning backends.
+    """
+
+    def __init__(self, exe_path, max_workers=2, timeout=10, init_payloads=(),
+                 shared_memory=False, service=None):
+        self.exe_path = exe_path
+        self.timeout = timeout
+        self.init_payloads = list(init_payloads)
+        self.shared_memory = shared_memory
+        self.service = service
+        self.executor = ThreadPoolExecutor(max_workers=max_workers,
+                                           thread_name_prefix='backend-job')
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+        self._active = set()
+
+    def _session(self):
+        """Return the calling worker's session, creating it on first use"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            if self.service is not None:
+                session = ServiceSession(self.service, timeout=self.timeout,
+                                         init_payloads=self.init_payloads)
+            elif self.exe_path is None:
+                raise BackendError("Backend executable is not available")
+            else:
+                session = BackendSession(self.exe_path, timeout=self.timeout,
+                                         init_payloads=self.init_payloads,
+                                         shared_memory=self.shared_memory)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    def ping(self):
+        """Health-check a worker's backend, starting it; a Future of the round trip"""
+        return self.executor.submit(self._ping)
+
+    def _ping(self):
+        return self._session().ping()
+
+    def submit(self, option, tab_name, processes, quantum=scheduling_engine.DEFAULT_QUANTUM,
+               cpus=1):
+        """Queue a backend run; the workload is snapshotted immediately"""
+        job = BackendJob(option, tab_name, snapshot(processes), quantum, cpus)
+        self._active.add(job)
+        job.future = self.executor.submit(self._run, job)
+        job.future.add_done_callback(lambda _f: self._finish(job))
+        return job
+
+    def submit_engine(self, option, tab_name, processes,
+                      quantum=scheduling_engine.DEFAULT_QUANTUM, cpus=1):
+        """Queue a scheduling run on the in-process engine; no backend needed"""
+        job = BackendJob(option, tab_name, snapshot(processes), quantum, cpus)
+        self._active.add(job)
+        job.future = self.executor.submit(self._run_engine, job)
+        job.future.add_done_callback(lambda _f: self._finish(job))
+        return job
+
+    def submit_incremental(self, schedule, option, tab_name, processes):
+        """Queue an update of an IncrementalSchedule; its ScheduleDelta is
+        the one item the job streams"""
+        job = BackendJob(option, tab_name, snapshot(processes), schedule.quantum, schedule.cpus)
+        job.schedule = schedule
+        self._active.add(job)
+        job.future = self.executor.submit(self._run_incremental, job)
+        job.future.add_done_callback(lambda _f: self._finish(job))
+        return job
+
+    def submit_trace(self, trace, tab_name, heap=None):
+        """Queue an allocator trace replay; the decoded HeapTimeline ends up
+        in job.results. heap is an optional (size, policy) pair."""
+        job = BackendJob('TRACE', tab_name, trace)
+        job.heap = heap
+        self._active.add(job)
+        job.future = self.executor.submit(self._run_trace, job)
+        job.future.add_done_callback(lambda _f: self._finish(job))
+        return job
+
+    def _run_engine(self, job):
+        """Worker body for engine jobs: results go to the queue as they finish"""
+        try:
+            columns = scheduling_engine.columns_from_processes(job.processes)
+            for name in scheduling_engine.option_algorithms(job.option):
+                if job.cancelled:
+                    raise JobCancelled("Engine run cancelled")
+                job.lines.put(scheduling_engine.schedule(name, *columns, quantum=job.quantum,
+                                                         cpus=job.cpus))
+        except Exception as e:
+            job.error = e
+
+    def _run_incremental(self, job):
+        try:
+            job.lines.put(job.schedule.update_processes(job.processes))
+        except Exception as e:
+            job.error = e
+
+    def _run(self, job):
+        """Worker body: stream the response line by line into the job"""
+        if job.cancelled:
+            job.error = JobCancelled("Backend request cancelled")
+            return
+        try:
+            session = self._session()
+        except BackendError as e:
+            job.error = e
+            return
+        on_line = job.lines.put
+        if session.segment is not None:
+            decoder = FrameDecoder(session.segment)
+
+            def decode_line(line):
+                item = decoder.feed(line)
+                if item is not None:
+                    job.lines.put(item)
+            on_line = decode_line
+        try:
+            job.output = session.run_algorithm(job.option, job.processes,
+                                               on_line=on_line,
+                                               cancel_event=job.cancel_event,
+                                               quantum=job.quantum, cpus=job.cpus)
+        except Exception as e:
+            job.error = e
+        job.stderr = session.drain_stderr()
+
+    def _run_trace(self, job):
+        """Worker body for trace replays: decoding stays off the Tk thread"""
+        if job.cancelled:
+            job.error = JobCancelled("Backend request cancelled")
+            return
+        try:
+            session = self._session()
+            job.output = session.replay_trace(job.processes.command(), job.heap,
+                                              cancel_event=job.cancel_event)
+            with metrics.timer('trace_decode_seconds', "Decoding a TRACE reply").time():
+                job.results.append(decode_trace(job.output))
+        except Exception as e:
+            job.error = e
+
+    def _finish(self, job):
+        """Mark the job done whether it completed, failed or never started"""
+        if job.future.cancelled() and job.error is None:
+            job.error = JobCancelled("Backend request cancelled")
+        if job.error is None:
+            metrics.counter('jobs_completed', "Jobs that finished successfully").inc()
+            metrics.timer('job_seconds', "Job latency from submit to finish").observe(
+                time.perf_counter() - job.submitted)
+        elif isinstance(job.error, JobCancelled):
+            metrics.counter('jobs_cancelled', "Jobs cancelled before finishing").inc()
+        else:
+            metrics.counter('jobs_failed', "Jobs that ended with an error").inc()
+        self._active.discard(job)
+        job.done.set()
+
+    def active_jobs(self):
+        return list(self._active)
+
+    def cancel_all(self):
+        for job in self.active_jobs():
+            job.cancel()
+
+    def shutdown(self):
+        """Cancel pending work and close every worker's backend"""
+        self.cancel_all()
+        self.executor.shutdown(wait=False)
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions = []
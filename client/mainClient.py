@@ -3,13 +3,45 @@ Advanced OS Project - Enhanced GUI Frontend
 Fully connected to backend C++ for CPU scheduling and memory allocation
 """
 
+import time
+
+STARTED = time.perf_counter()   # Time-to-interactive is measured from here
+
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, filedialog
 import subprocess
 import os
-import sys
 import threading
+import queue
 import json
+import asyncio
+import tempfile
+import functools
+
+import metrics
+from backend_launcher import (FILE_SERVER_ENV, FILE_SERVER_NAME, SERVICE_ENV, describe_search,
+                              locate_backend, locate_file_server, open_in_terminal, popen_kwargs)
+from backend_session import BackendError, JobCancelled
+from file_client import DEFAULT_PORT, FileServerError, FileServerPool, wait_for_server
+from job_runner import JobRunner
+from process_store import ProcessStore, SAMPLE_PROCESSES
+from process_table import VirtualProcessTable
+from gantt_view import GanttView
+from comparison_view import ComparisonView
+from heap_trace import POLICIES, TraceError, generate_trace, load_trace
+from heap_view import HeapMapView
+from workload_io import FORMATS, WorkloadFormatError, check_process, read_workload, save_workload
+from scheduling_engine import (ALL_OPTION, DEFAULT_QUANTUM, MAX_CPUS, OPTION_ALGORITHMS,
+                               is_scheduling_option, option_algorithms)
+from incremental_engine import IncrementalSchedule, ScheduleDelta
+from result_cache import ResultCache
+from result_protocol import (FORMAT_COMMAND, REPORT_HEADER_LINES, FrameDecoder, ScheduleResult,
+                             decode_results)
+
+
+JOB_POLL_MS = 50
+METRICS_REFRESH_MS = 1000
+GANTT_HEIGHT = 150
 
 
 class CPUSchedulerGUI:
@@ -39,9 +71,33 @@ class CPUSchedulerGUI:
         
         # Backend connection
         self.backend_process = None
+        self.file_server_process = None
+        self.job_runner = None
+        self.current_job = None
+        self.gantt_result = None
+        self.import_cancel = None
+        self.result_cache = ResultCache.from_environment()
         self.backend_ready = False
         self.processes_from_backend = []
-        self.custom_processes = []  # User-added processes
+        # Seeded with the samples once; the backend's answer never touches it
+        self.custom_processes = ProcessStore(SAMPLE_PROCESSES)  # Workload (column store)
+        self.custom_processes.add_listener(self._on_workload_change)
+        self.incremental = {}    # (option, quantum, cores) -> IncrementalSchedule
+        self.shown_results = {}  # tab -> result an incremental run last wrote there
+        self.profiler = metrics.Profiler()
+        self.startup_seconds = None
+        
+        # Built on first use (see build_tab and get_gantt_view)
+        self.tab_builders = {}
+        self.comparison_view = None
+        self.heap_view = None
+        self.metrics_tree = None
+        self.gantt_view = None
+        self.gantt_canvas = None
+        
+        # Warm the backend up while the window is being built
+        self.use_shared_memory = tk.BooleanVar(value=False)
+        backend_ping = self.start_backend_connection()
         
         # Configure styles
         self.setup_styles()
@@ -49,9 +105,12 @@ class CPUSchedulerGUI:
         # Create UI
         self.create_header()
         self.create_main_container()
+        self.update_process_list()
         
-        # Start backend connection
-        self.start_backend_connection()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(JOB_POLL_MS, self._pump_backend_ping, backend_ping)
+        self.root.after(METRICS_REFRESH_MS, self.refresh_metrics)
+        self.root.after_idle(self._on_interactive)
         
     def setup_styles(self):
         """Configure modern ttk styles"""
@@ -156,6 +215,29 @@ class CPUSchedulerGUI:
         self.status_indicator.pack(side='right')
         self.status_indicator.create_oval(2, 2, 18, 18, fill=self.colors['warning'], outline='')
         
+        # Job progress and cancellation
+        job_frame = ttk.Frame(status_frame)
+        job_frame.pack(fill='x', pady=(8, 0))
+        
+        self.job_progress = ttk.Progressbar(job_frame, mode='indeterminate', length=200)
+        self.job_progress.pack(side='left', fill='x', expand=True)
+        
+        self.cancel_button = ttk.Button(job_frame, text="Cancel",
+                                        command=self.cancel_backend_jobs,
+                                        style='Danger.TButton', state='disabled')
+        self.cancel_button.pack(side='left', padx=(10, 0))
+        
+        self.job_label = tk.Label(status_frame, text="Idle",
+                                  font=('Segoe UI', 9), bg=self.colors['bg'],
+                                  fg=self.colors['text'])
+        self.job_label.pack(anchor='w', pady=(5, 0))
+        
+        # One-line digest of the Metrics tab
+        self.metrics_label = tk.Label(status_frame, text="Metrics: no requests yet",
+                                      font=('Segoe UI', 9), bg=self.colors['bg'],
+                                      fg=self.colors['text'])
+        self.metrics_label.pack(anchor='w', pady=(2, 0))
+        
     def create_process_section(self, parent):
         """Create process input section"""
         input_frame = ttk.LabelFrame(parent, text="  Process Management (From Backend)  ", padding=15)
@@ -193,6 +275,14 @@ class CPUSchedulerGUI:
                    command=self.add_custom_process,
                    style='Success.TButton').pack(side='left', padx=5)
         
+        ttk.Button(btn_frame, text="Update Selected", 
+                   command=self.update_selected_process,
+                   style='Primary.TButton').pack(side='left', padx=5)
+        
+        ttk.Button(btn_frame, text="Delete Selected", 
+                   command=self.delete_selected_processes,
+                   style='Danger.TButton').pack(side='left', padx=5)
+        
         ttk.Button(btn_frame, text="Clear All", 
                    command=self.clear_all_processes,
                    style='Warning.TButton').pack(side='left', padx=5)
@@ -205,9 +295,21 @@ class CPUSchedulerGUI:
                    command=self.refresh_process_list,
                    style='Primary.TButton').pack(side='left', padx=5)
         
+        # Bulk workload files
+        io_frame = ttk.Frame(input_frame)
+        io_frame.pack(fill='x', pady=(5, 0))
+        
+        ttk.Button(io_frame, text="Import Workload...", 
+                   command=self.import_workload,
+                   style='Accent.TButton').pack(side='left', padx=5)
+        
+        ttk.Button(io_frame, text="Export Workload...", 
+                   command=self.export_workload,
+                   style='Accent.TButton').pack(side='left', padx=5)
+        
         # Info label
         info_label = tk.Label(input_frame, 
-                             text="Add custom processes or load sample data from backend.",
+                             text="Add custom processes, load sample data, or import CSV / JSONL / binary workloads.",
                              font=('Segoe UI', 9), bg=self.colors['bg'],
                              fg=self.colors['text'], justify='left')
         info_label.pack(anchor='w', pady=(10, 0))
@@ -222,6 +324,9 @@ class CPUSchedulerGUI:
             ("SJF", self.run_sjf_backend, '#9b59b6'),
             ("Priority", self.run_priority_backend, '#e67e22'),
             ("Round Robin", self.run_rr_backend, '#1abc9c'),
+            ("SRTF", self.run_srtf_backend, '#2980b9'),
+            ("Priority + Aging", self.run_preemptive_priority_backend, '#d35400'),
+            ("MLFQ", self.run_mlfq_backend, '#16a085'),
         ]
         
         btn_frame = ttk.Frame(algo_frame)
@@ -229,12 +334,42 @@ class CPUSchedulerGUI:
         
         for i, (text, cmd, color) in enumerate(buttons):
             btn = ttk.Button(btn_frame, text=text, command=cmd, style='Primary.TButton')
-            btn.grid(row=0, column=i, padx=5, pady=5, sticky='ew')
-            btn_frame.columnconfigure(i, weight=1)
-        
-        ttk.Button(algo_frame, text="Run All Algorithms via Backend", 
+            btn.grid(row=i // 4, column=i % 4, padx=5, pady=5, sticky='ew')
+            btn_frame.columnconfigure(i % 4, weight=1)
+        
+        # Round Robin quantum; MLFQ uses it as the top level's quantum
+        quantum_frame = ttk.Frame(btn_frame)
+        quantum_frame.grid(row=1, column=3, padx=5, pady=5, sticky='ew')
+        ttk.Label(quantum_frame, text="Quantum:").pack(side='left')
+        self.quantum_var = tk.IntVar(value=DEFAULT_QUANTUM)
+        ttk.Spinbox(quantum_frame, from_=1, to=1000, width=5,
+                    textvariable=self.quantum_var).pack(side='left', padx=(5, 0))
+        
+        # Simulated cores; more than one gives per-CPU run queues and Gantt lanes
+        ttk.Label(quantum_frame, text="Cores:").pack(side='left', padx=(10, 0))
+        self.cores_var = tk.IntVar(value=1)
+        ttk.Spinbox(quantum_frame, from_=1, to=MAX_CPUS, width=4,
+                    textvariable=self.cores_var).pack(side='left', padx=(5, 0))
+        
+        ttk.Button(algo_frame, text="Compare All Algorithms", 
                    command=self.run_all_backend, style='Accent.TButton').pack(fill='x', pady=(10, 0))
         
+        # Fast path: schedule in-process instead of round-tripping to main_system
+        self.use_local_engine = tk.BooleanVar(value=False)
+        ttk.Checkbutton(algo_frame, text="Use in-process engine (no backend round trip)",
+                        variable=self.use_local_engine).pack(anchor='w', pady=(10, 0))
+        
+        # What-if edits: resume the last run from the first process an edit touches
+        self.use_incremental = tk.BooleanVar(value=False)
+        ttk.Checkbutton(algo_frame, text="Incremental re-scheduling (patch the last run after an edit)",
+                        variable=self.use_incremental,
+                        command=self.incremental.clear).pack(anchor='w')
+        
+        # Large workloads: hand columns over in mapped files rather than text pipes
+        ttk.Checkbutton(algo_frame, text="Shared-memory transfer (backend reads and writes arrays in place)",
+                        variable=self.use_shared_memory,
+                        command=self.reset_job_runner).pack(anchor='w')
+        
     def create_enhanced_section(self, parent):
         """Create enhanced backend controls"""
         enhanced_frame = ttk.LabelFrame(parent, text="  Enhanced Backend Features  ", padding=15)
@@ -242,8 +377,9 @@ class CPUSchedulerGUI:
         
         # Info
         info_text = "Run enhanced backend features:\n" \
-                   "- Memory Allocator Test: Tests the custom 1MB memory allocator\n" \
-                   "- File Server: Starts TCP server on port 9090"
+                   "- Memory Allocator Test: Tests the custom memory allocator (1MB heap by default)\n" \
+                   "- Heap Map: Replays an allocation trace and shows the heap step by step\n" \
+                   f"- File Server: Starts the TCP file server on port {DEFAULT_PORT} and lists its files"
         info_label = tk.Label(enhanced_frame, text=info_text,
                              font=('Segoe UI', 9), bg=self.colors['bg'],
                              fg=self.colors['text'], justify='left')
@@ -256,6 +392,10 @@ class CPUSchedulerGUI:
                    command=self.run_memory_test_backend,
                    style='Warning.TButton').pack(side='left', padx=5)
         
+        ttk.Button(btn_frame, text="Replay Heap Trace", 
+                   command=self.replay_generated_trace,
+                   style='Warning.TButton').pack(side='left', padx=5)
+        
         ttk.Button(btn_frame, text="Start File Server", 
                    command=self.start_file_server_backend,
                    style='Primary.TButton').pack(side='left', padx=5)
@@ -272,54 +412,141 @@ class CPUSchedulerGUI:
         self.results_notebook = ttk.Notebook(results_frame)
         self.results_notebook.pack(fill='both', expand=True)
         
-        # Create tabs
+        # Create tabs: empty frames now, contents when a tab is first shown
         self.result_tabs = {}
-        tabs = ['FCFS', 'SJF', 'Priority', 'Round Robin', 'Memory', 'File Server']
-        
-        for algo in tabs:
+        self.result_frames = {}
+        tabs = ['FCFS', 'SJF', 'Priority', 'Round Robin', 'SRTF', 'Preemptive Priority', 'MLFQ',
+                'Compare', 'Memory', 'File Server', 'Heap Map', 'Metrics']
+        labels = {'Preemptive Priority': 'Aging'}
+        builders = {'Compare': self.create_compare_tab, 'Heap Map': self.create_heap_tab,
+                    'Metrics': self.create_metrics_tab}
+        self.report_tabs = [name for name in tabs if name not in builders]
+        
+        for name in tabs:
             tab = ttk.Frame(self.results_notebook)
-            self.results_notebook.add(tab, text=f" {algo} ")
+            self.results_notebook.add(tab, text=f" {labels.get(name, name)} ")
+            self.result_frames[name] = tab
+            self.tab_builders[name] = builders.get(name, functools.partial(self.create_text_tab,
+                                                                           name))
+        self.results_notebook.bind('<<NotebookTabChanged>>', self._on_result_tab_changed)
+        self.build_tab(tabs[0])
+        
+        # Gantt chart; the frame holds its height until the first draw builds the view
+        self.gantt_frame = ttk.LabelFrame(parent, text="  Gantt Chart Visualization  ", padding=15)
+        self.gantt_frame.pack(fill='x')
+        self.gantt_placeholder = ttk.Frame(self.gantt_frame, height=GANTT_HEIGHT)
+        self.gantt_placeholder.pack(fill='x', pady=5)
+        
+    def build_tab(self, tab_name):
+        """Fill a results tab the first time it is needed"""
+        builder = self.tab_builders.pop(tab_name, None)
+        if builder is not None:
+            builder(self.result_frames[tab_name])
             
-            text_widget = scrolledtext.ScrolledText(tab, wrap='word',
-                                                   font=('Consolas', 10),
-                                                   bg='white', fg=self.colors['text'])
-            text_widget.pack(fill='both', expand=True, padx=5, pady=5)
-            self.result_tabs[algo] = text_widget
+    def _on_result_tab_changed(self, event):
+        frame = self.results_notebook.select()
+        for name, tab in self.result_frames.items():
+            if str(tab) == frame:
+                self.build_tab(name)
+                return
             
-        # Gantt chart
-        gantt_frame = ttk.LabelFrame(parent, text="  Gantt Chart Visualization  ", padding=15)
-        gantt_frame.pack(fill='x')
+    def create_text_tab(self, tab_name, tab):
+        """Report tab: a scrolled text widget the run output goes to"""
+        text_widget = scrolledtext.ScrolledText(tab, wrap='word',
+                                               font=('Consolas', 10),
+                                               bg='white', fg=self.colors['text'])
+        text_widget.pack(fill='both', expand=True, padx=5, pady=5)
+        self.result_tabs[tab_name] = text_widget
+        
+    def get_gantt_view(self):
+        """Return the Gantt chart, building it on first use"""
+        if self.gantt_view is None:
+            self.gantt_placeholder.destroy()
+            # Level-of-detail renderer: wheel zooms, drag or Shift+wheel pans, double-click fits
+            self.gantt_view = GanttView(self.gantt_frame, height=GANTT_HEIGHT,
+                                        axis_color=self.colors['secondary'])
+            self.gantt_canvas = self.gantt_view.canvas
+            self.gantt_view.pack(fill='x', pady=5)
+        return self.gantt_view
+        
+    def create_compare_tab(self, tab):
+        """Compare tab, next to the algorithm tabs: filled by Run All"""
+        self.comparison_view = ComparisonView(tab, axis_color=self.colors['secondary'],
+                                              on_select=self.show_in_gantt)
+        self.comparison_view.pack(fill='both', expand=True)
+        
+    def create_heap_tab(self, tab):
+        """Heap Map tab: trace settings plus the replay view"""
+        settings = ttk.Frame(tab)
+        settings.pack(fill='x', padx=5, pady=5)
+        self.trace_settings = {}
+        for column, (label, default, width) in enumerate((
+                ("Ops:", "100000", 8), ("Max live:", "1024", 6), ("Max size:", "1024", 6),
+                ("Seed:", "1", 4), ("Heap:", "1M", 5))):
+            ttk.Label(settings, text=label).grid(row=0, column=2 * column, padx=(5, 2))
+            entry = ttk.Entry(settings, width=width)
+            entry.insert(0, default)
+            entry.grid(row=0, column=2 * column + 1)
+            self.trace_settings[label.rstrip(':')] = entry
+        
+        self.heap_policy = tk.StringVar(value=POLICIES[0])
+        ttk.Combobox(settings, textvariable=self.heap_policy, values=POLICIES,
+                     state='readonly', width=11).grid(row=0, column=10, padx=5)
+        
+        buttons = ttk.Frame(tab)
+        buttons.pack(fill='x', padx=5)
+        ttk.Button(buttons, text="Generate & Replay", command=self.replay_generated_trace,
+                   style='Primary.TButton').pack(side='left', padx=5)
+        ttk.Button(buttons, text="Replay Trace File...", command=self.replay_trace_file,
+                   style='Accent.TButton').pack(side='left', padx=5)
+        
+        self.heap_view = HeapMapView(tab, height=260)
+        self.heap_view.pack(fill='both', expand=True, padx=5, pady=5)
+        
+    def create_metrics_tab(self, tab):
+        """Metrics tab: live timers, counters and memory plus profiling toggles"""
+        buttons = ttk.Frame(tab)
+        buttons.pack(fill='x', padx=5, pady=5)
+        self.profile_button = ttk.Button(buttons, text="Start Profile", command=self.toggle_profile,
+                                         style='Primary.TButton')
+        self.profile_button.pack(side='left', padx=5)
+        self.tracemalloc_button = ttk.Button(buttons, text="Trace Memory",
+                                             command=self.toggle_tracemalloc,
+                                             style='Primary.TButton')
+        self.tracemalloc_button.pack(side='left', padx=5)
+        ttk.Button(buttons, text="Export Metrics...", command=self.export_metrics,
+                   style='Accent.TButton').pack(side='left', padx=5)
         
-        self.gantt_canvas = tk.Canvas(gantt_frame, height=150, bg='white',
-                                     highlightthickness=1,
-                                     highlightbackground=self.colors['secondary'])
-        self.gantt_canvas.pack(fill='x', pady=5)
+        self.metrics_tree = ttk.Treeview(tab, columns=('count', 'p50', 'p95', 'rate'),
+                                         show='tree headings', height=8)
+        self.metrics_tree.heading('#0', text='Metric')
+        self.metrics_tree.column('#0', width=220)
+        for column, heading in (('count', 'Count'), ('p50', 'p50 ms'),
+                                ('p95', 'p95 ms'), ('rate', 'Rate/s')):
+            self.metrics_tree.heading(column, text=heading)
+            self.metrics_tree.column(column, width=80, anchor='e')
+        self.metrics_tree.pack(fill='both', expand=True, padx=5)
+        
+        # Profiler and tracemalloc reports
+        self.metrics_report = scrolledtext.ScrolledText(tab, wrap='none', height=8,
+                                                        font=('Consolas', 9),
+                                                        bg='white', fg=self.colors['text'])
+        self.metrics_report.pack(fill='both', expand=True, padx=5, pady=5)
+        self.update_metrics_tree()
         
     def create_process_list(self, parent):
         """Create process list table"""
         list_frame = ttk.LabelFrame(parent, text="  Backend Processes  ", padding=15)
         list_frame.pack(fill='x')
         
-        columns = ('pid', 'arrival', 'burst', 'priority')
-        self.process_tree = ttk.Treeview(list_frame, columns=columns,
-                                        show='headings', height=6)
-        
-        self.process_tree.heading('pid', text='Process ID')
-        self.process_tree.heading('arrival', text='Arrival Time')
-        self.process_tree.heading('burst', text='Burst Time')
-        self.process_tree.heading('priority', text='Priority')
-        
-        self.process_tree.column('pid', width=100, anchor='center')
-        self.process_tree.column('arrival', width=120, anchor='center')
-        self.process_tree.column('burst', width=120, anchor='center')
-        self.process_tree.column('priority', width=120, anchor='center')
-        
-        scrollbar = ttk.Scrollbar(list_frame, orient='vertical',
-                                command=self.process_tree.yview)
-        self.process_tree.configure(yscrollcommand=scrollbar.set)
-        
-        self.process_tree.pack(side='left', fill='x', expand=True)
-        scrollbar.pack(side='right', fill='y')
+        # Only the visible rows exist in the Treeview; the data lives in the store
+        self.process_table = VirtualProcessTable(
+            list_frame, self.custom_processes,
+            columns=('pid', 'arrival', 'burst', 'priority'),
+            headings=('Process ID', 'Arrival Time', 'Burst Time', 'Priority'),
+            widths=(100, 120, 120, 120), height=6)
+        self.process_tree = self.process_table.tree
+        self.process_table.pack()
         
         # Status label
         self.process_count_label = tk.Label(list_frame, text="No processes loaded",
@@ -330,34 +557,79 @@ class CPUSchedulerGUI:
     # ========== BACKEND CONNECTION METHODS ==========
     
     def start_backend_connection(self):
-        """Start backend connection in background"""
-        self.status_label.config(text="Initializing backend connection...", fg=self.colors['warning'])
-        threading.Thread(target=self._backend_thread, daemon=True).start()
-        
-    def _backend_thread(self):
-        """Backend connection thread"""
-        import time
-        time.sleep(1)  # Simulate connection
-        self.root.after(0, self._on_backend_ready)
-        
-    def _on_backend_ready(self):
-        """Called when backend is ready"""
+        """Spawn a worker's backend and PING it off the Tk thread; returns the Future"""
+        return self.get_job_runner().ping()
+        
+    def _pump_backend_ping(self, ping):
+        """Report the backend's status once the health check answers"""
+        if not ping.done():
+            self.root.after(JOB_POLL_MS, self._pump_backend_ping, ping)
+            return
+        try:
+            round_trip = ping.result()
+        except (BackendError, OSError) as e:
+            self._on_backend_unavailable(e)
+            return
+        self._on_backend_ready(round_trip)
+        
+    def get_backend_exe_path(self):
+        """Resolve main_system: $OSNEXUS_BACKEND, server/, then PATH (None if missing)"""
+        return locate_backend()
+        
+    def get_job_runner(self):
+        """Return the worker pool, creating it on first use"""
+        if self.job_runner is None:
+            # Engine jobs still work when no backend is found (exe_path None).
+            # With $OSNEXUS_SERVICE set, runs go to that shared scheduling service.
+            exe_path = self.get_backend_exe_path()
+            self.job_runner = JobRunner(exe_path, max_workers=2, timeout=10,
+                                        init_payloads=[FORMAT_COMMAND],
+                                        shared_memory=self.use_shared_memory.get(),
+                                        service=os.environ.get(SERVICE_ENV) or None)
+        return self.job_runner
+        
+    def reset_job_runner(self):
+        """Close the worker pool so the next run starts one with the current settings"""
+        if self.job_runner is not None:
+            self.job_runner.shutdown()
+            self.job_runner = None
+        
+    def on_close(self):
+        """Shut down the backend workers before closing the window"""
+        if self.job_runner is not None:
+            self.job_runner.shutdown()
+        if self.file_server_process is not None and self.file_server_process.poll() is None:
+            self.file_server_process.terminate()
+        self.root.destroy()
+        
+    def _on_backend_ready(self, round_trip):
+        """Called when the backend has answered its health check"""
         self.backend_ready = True
-        self.status_label.config(text="✓ Connected to Enhanced Backend", fg=self.colors['success'])
+        elapsed = time.perf_counter() - STARTED
+        metrics.timer('startup_backend_seconds', "Process start to the backend's first PONG").observe(
+            elapsed)
+        self.status_label.config(
+            text=f"✓ Connected to Enhanced Backend in {elapsed:.2f} s "
+                 f"(ping {round_trip * 1000:.1f} ms)",
+            fg=self.colors['success'])
         self.status_indicator.delete("all")
         self.status_indicator.create_oval(2, 2, 18, 18, fill=self.colors['success'], outline='')
-        self.load_processes_from_backend()
+        
+    def _on_backend_unavailable(self, error):
+        """Called when the health check fails; the in-process engine still works"""
+        self.status_label.config(text=f"✗ Backend unavailable: {error}", fg=self.colors['warning'])
+        
+    def _on_interactive(self):
+        """First idle moment after the window is built: record time-to-interactive"""
+        self.startup_seconds = time.perf_counter() - STARTED
+        metrics.timer('startup_interactive_seconds', "Process start to the first idle window").observe(
+            self.startup_seconds)
+        self.job_label.config(text=f"Idle (interactive in {self.startup_seconds * 1000:.0f} ms)")
         
     def load_processes_from_backend(self):
         """Load initial sample processes from backend (used as starting point)"""
         # Load sample processes as default
-        self.custom_processes = [
-            {'id': 'P1', 'arrival': 0, 'burst': 5, 'priority': 2},
-            {'id': 'P2', 'arrival': 1, 'burst': 3, 'priority': 1},
-            {'id': 'P3', 'arrival': 2, 'burst': 8, 'priority': 4},
-            {'id': 'P4', 'arrival': 3, 'burst': 6, 'priority': 3},
-            {'id': 'P5', 'arrival': 5, 'burst': 4, 'priority': 2},
-        ]
+        self.custom_processes.replace(SAMPLE_PROCESSES)
         self.update_process_list()
         self.status_label.config(
             text=f"✓ Loaded {len(self.custom_processes)} processes from backend", 
@@ -368,31 +640,46 @@ class CPUSchedulerGUI:
         """Refresh process list from backend"""
         self.load_processes_from_backend()
         
+    def read_process_form(self):
+        """Process dict from the entry fields, or None (after a warning) if invalid"""
+        # Get values from entry fields
+        pid = self.pid_entry.get().strip()
+        arrival = self.arrival_entry.get().strip()
+        burst = self.burst_entry.get().strip()
+        priority = self.priority_entry.get().strip()
+        
+        # Validate inputs
+        if not pid or not arrival or not burst or not priority:
+            messagebox.showwarning("Input Error", "Please fill in all fields")
+            return None
+        
+        if not arrival.isdigit() or not burst.isdigit() or not priority.isdigit():
+            messagebox.showwarning("Input Error", "AT, BT, and Priority must be numbers")
+            return None
+        
+        record = {
+            'id': pid,
+            'arrival': int(arrival),
+            'burst': int(burst),
+            'priority': int(priority)
+        }
+        # Same limits as imported workloads, so the backend never rejects the LOAD
+        try:
+            check_process(record['arrival'], record['burst'], record['priority'], pid)
+        except WorkloadFormatError as e:
+            messagebox.showwarning("Input Error", str(e))
+            return None
+        return record
+        
     def add_custom_process(self):
         """Add a custom process to the frontend's process list"""
         try:
-            # Get values from entry fields
-            pid = self.pid_entry.get().strip()
-            arrival = self.arrival_entry.get().strip()
-            burst = self.burst_entry.get().strip()
-            priority = self.priority_entry.get().strip()
-            
-            # Validate inputs
-            if not pid or not arrival or not burst or not priority:
-                messagebox.showwarning("Input Error", "Please fill in all fields")
-                return
-            
-            if not arrival.isdigit() or not burst.isdigit() or not priority.isdigit():
-                messagebox.showwarning("Input Error", "AT, BT, and Priority must be numbers")
+            new_process = self.read_process_form()
+            if new_process is None:
                 return
+            pid = new_process['id']
             
             # Add to frontend's process list
-            new_process = {
-                'id': pid,
-                'arrival': int(arrival),
-                'burst': int(burst),
-                'priority': int(priority)
-            }
             self.custom_processes.append(new_process)
             
             # Clear entry fields
@@ -417,7 +704,7 @@ class CPUSchedulerGUI:
                 return
             
             # Clear frontend's process list
-            self.custom_processes = []
+            self.custom_processes.clear()
             
             # Update the process list
             self.update_process_list()
@@ -431,13 +718,7 @@ class CPUSchedulerGUI:
         """Load sample processes to the frontend"""
         try:
             # Load sample processes
-            self.custom_processes = [
-                {'id': 'P1', 'arrival': 0, 'burst': 5, 'priority': 2},
-                {'id': 'P2', 'arrival': 1, 'burst': 3, 'priority': 1},
-                {'id': 'P3', 'arrival': 2, 'burst': 8, 'priority': 4},
-                {'id': 'P4', 'arrival': 3, 'burst': 6, 'priority': 3},
-                {'id': 'P5', 'arrival': 5, 'burst': 4, 'priority': 2},
-            ]
+            self.custom_processes.replace(SAMPLE_PROCESSES)
             
             # Update the process list
             self.update_process_list()
@@ -447,14 +728,142 @@ class CPUSchedulerGUI:
         except Exception as e:
             messagebox.showerror("Error", f"Error loading sample processes: {str(e)}")
         
-    def update_process_list(self):
-        """Update the process treeview"""
-        for item in self.process_tree.get_children():
-            self.process_tree.delete(item)
+    def update_selected_process(self):
+        """Overwrite the one selected process with the entry fields"""
+        indices = self.process_table.selected_indices()
+        if len(indices) != 1:
+            messagebox.showwarning("No Selection", "Select exactly one process to update")
+            return
+        record = self.read_process_form()
+        if record is None:
+            return
+        self.custom_processes.update(indices[0], record)
+        self.update_process_list()
+        
+    def _on_workload_change(self, event, start, count):
+        """A replaced workload shares nothing with the last incremental runs"""
+        if event == 'reset':
+            self.incremental.clear()
+        
+    def delete_selected_processes(self):
+        """Delete the processes selected in the table"""
+        indices = self.process_table.selected_indices()
+        if not indices:
+            messagebox.showwarning("No Selection", "Select one or more processes to delete")
+            return
+        self.custom_processes.delete(indices)
+        self.update_process_list()
+        
+    # ========== WORKLOAD IMPORT / EXPORT ==========
+    
+    def workload_filetypes(self):
+        """File dialog filters for the supported workload formats"""
+        patterns = ' '.join(f"*{ext}" for ext in sorted(FORMATS))
+        return [("Workload files", patterns), ("CSV", "*.csv"),
+                ("JSON Lines", "*.jsonl *.ndjson"), ("Binary workload", "*.bin")]
+        
+    def import_workload(self):
+        """Replace the workload with a file, parsed on a background thread"""
+        if self.import_cancel is not None:
+            messagebox.showwarning("Import Running", "Wait for the current import to finish")
+            return
+        path = filedialog.askopenfilename(title="Import Workload",
+                                          filetypes=self.workload_filetypes())
+        if not path:
+            return
+        
+        self.custom_processes.clear()
+        self.update_process_list()
+        
+        # Bounded so the reader cannot run far ahead of the Tk thread
+        chunks = queue.Queue(maxsize=8)
+        self.import_cancel = threading.Event()
+        threading.Thread(target=self._import_thread,
+                         args=(path, chunks, self.import_cancel), daemon=True).start()
+        
+        self.job_progress.stop()
+        self.job_progress.config(mode='determinate', maximum=100, value=0)
+        self.cancel_button.config(state='normal')
+        self.job_label.config(text=f"Importing {os.path.basename(path)}...")
+        self.root.after(JOB_POLL_MS, self._pump_import, chunks, path)
+        
+    def _import_thread(self, path, chunks, cancel_event):
+        """Reader thread: parse the file into column chunks"""
+        try:
+            for chunk in read_workload(path):
+                if cancel_event.is_set():
+                    break
+                chunks.put(chunk)
+        except Exception as e:
+            chunks.put(e)
+            return
+        chunks.put(None)
+        
+    def _pump_import(self, chunks, path):
+        """Append parsed chunks to the store on the Tk thread"""
+        while True:
+            try:
+                item = chunks.get_nowait()
+            except queue.Empty:
+                self.root.after(JOB_POLL_MS, self._pump_import, chunks, path)
+                return
             
-        for p in self.custom_processes:
-            self.process_tree.insert('', 'end', values=(p['id'], p['arrival'], p['burst'], p['priority']))
+            if item is None or isinstance(item, Exception):
+                break
+            if not self.import_cancel.is_set():
+                self.custom_processes.extend_columns(item.ids, item.arrival,
+                                                     item.burst, item.priority)
+            self.job_progress.config(value=item.progress * 100)
+            self.job_label.config(text=f"Importing {os.path.basename(path)}... "
+                                       f"{len(self.custom_processes):,} processes")
+        
+        cancelled = self.import_cancel.is_set()
+        self.import_cancel = None
+        self.job_progress.config(mode='indeterminate', value=0)
+        self.cancel_button.config(state='disabled')
+        self.update_process_list()
+        
+        if isinstance(item, Exception):
+            self.job_label.config(text="Import failed")
+            messagebox.showerror("Import Error", f"Failed to import workload: {str(item)}")
+        elif cancelled:
+            self.job_label.config(text=f"Import cancelled after {len(self.custom_processes):,} processes")
+        else:
+            self.job_label.config(text=f"Imported {len(self.custom_processes):,} processes")
             
+    def export_workload(self):
+        """Write the current workload to a file on a background thread"""
+        if not self.custom_processes:
+            messagebox.showwarning("No Processes", "There are no processes to export")
+            return
+        path = filedialog.asksaveasfilename(title="Export Workload", defaultextension='.csv',
+                                            filetypes=self.workload_filetypes())
+        if not path:
+            return
+        
+        snapshot = self.custom_processes.snapshot()
+        self.job_label.config(text=f"Exporting {len(snapshot):,} processes...")
+        
+        def worker():
+            error = None
+            try:
+                save_workload(path, snapshot)
+            except Exception as e:
+                error = e
+            self.root.after(0, self._on_export_done, path, len(snapshot), error)
+        
+        threading.Thread(target=worker, daemon=True).start()
+        
+    def _on_export_done(self, path, count, error):
+        """Report an export result on the Tk thread"""
+        if error is not None:
+            self.job_label.config(text="Export failed")
+            messagebox.showerror("Export Error", f"Failed to export workload: {str(error)}")
+        else:
+            self.job_label.config(text=f"Exported {count:,} processes to {os.path.basename(path)}")
+        
+    def update_process_list(self):
+        """Update the process count; the virtual table patches its own rows"""
         self.process_count_label.config(
             text=f"Showing {len(self.custom_processes)} processes (Sample + Custom)")
     
@@ -484,164 +893,521 @@ class CPUSchedulerGUI:
         """Run Round Robin via backend"""
         self.run_algorithm_backend(5, 'Round Robin')
         
+    def run_srtf_backend(self):
+        """Run Shortest Remaining Time First via backend"""
+        self.run_algorithm_backend(13, 'SRTF')
+        
+    def run_preemptive_priority_backend(self):
+        """Run preemptive Priority with aging via backend"""
+        self.run_algorithm_backend(14, 'Preemptive Priority')
+        
+    def run_mlfq_backend(self):
+        """Run the multilevel feedback queue via backend"""
+        self.run_algorithm_backend(15, 'MLFQ')
+        
     def run_all_backend(self):
-        """Run all algorithms via backend"""
+        """Compare every algorithm on one workload snapshot in the Compare tab"""
         self.run_algorithm_backend(6, 'All')
         
+    def current_quantum(self):
+        """Quantum from the algorithm section, or None (after a warning) if invalid"""
+        try:
+            quantum = int(self.quantum_var.get())
+        except (tk.TclError, ValueError):
+            quantum = 0
+        if quantum < 1:
+            messagebox.showwarning("Invalid Quantum", "The quantum must be a whole number of at least 1")
+            return None
+        return quantum
+        
+    def current_cores(self):
+        """Core count from the algorithm section, or None (after a warning) if invalid"""
+        try:
+            cores = int(self.cores_var.get())
+        except (tk.TclError, ValueError):
+            cores = 0
+        if not 1 <= cores <= MAX_CPUS:
+            messagebox.showwarning("Invalid Cores", f"The core count must be between 1 and {MAX_CPUS}")
+            return None
+        return cores
+        
     def run_algorithm_backend(self, option, tab_name):
-        """Run algorithm by sending input to backend"""
+        """Queue an algorithm run on a backend worker and stream its output"""
         try:
             # Check if there are processes to run
             if not self.custom_processes:
                 messagebox.showwarning("No Processes", "Please add some processes first!")
                 return
+            quantum = self.current_quantum()
+            if quantum is None:
+                return
+            cpus = self.current_cores()
+            if cpus is None:
+                return
             
-            # Get executable path
-            if getattr(sys, 'frozen', False):
-                base_path = os.path.dirname(sys.executable)
-            else:
-                base_path = os.path.dirname(os.path.abspath(__file__))
+            if self.use_incremental.get() and option in OPTION_ALGORITHMS:
+                self.run_incremental(option, tab_name, quantum, cpus)
+                return
             
-            exe_path = os.path.join(base_path, '..', 'server', 'main_system.exe')
-            exe_path = os.path.normpath(exe_path)
+            # Unchanged workload, option, quantum and cores: answer from the cache
+            cache_key = None
+            if is_scheduling_option(option):
+                cache_key = self.result_cache.key(self.custom_processes, option, quantum, cpus)
+                cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    self.show_cached_results(tab_name, cached)
+                    return
             
-            if not os.path.exists(exe_path):
-                messagebox.showerror("Error", f"Backend not found: {exe_path}")
+            runner = self.get_job_runner()
+            use_engine = self.use_local_engine.get() and is_scheduling_option(option)
+            if not use_engine and runner.exe_path is None and runner.service is None:
+                messagebox.showerror("Error", f"Backend not found (searched {describe_search()})")
                 return
             
-            # Prepare input: send processes to backend, then select option, then exit
-            # Format: n (num processes) + n lines of (arrival burst priority) + option + 8
-            n = len(self.custom_processes)
-            input_data = str(n) + "\n"
+            # A newer run replaces whatever is still streaming
+            if self.current_job is not None:
+                self.current_job.cancel()
             
-            for p in sorted(self.custom_processes, key=lambda x: x['arrival']):
-                input_data += f"{p['arrival']} {p['burst']} {p['priority']}\n"
+            if use_engine:
+                job = runner.submit_engine(option, tab_name, self.custom_processes, quantum, cpus)
+            else:
+                job = runner.submit(option, tab_name, self.custom_processes, quantum, cpus)
+            job.cache_key = cache_key
+            self.current_job = job
             
-            input_data += f"{option}\n8\n"
+            self.clear_results(tab_name)
+            self.select_result_tab(tab_name)
+            self.gantt_result = None
+            if self.gantt_view is not None:
+                self.gantt_view.clear()
             
-            # Run backend
-            process = subprocess.Popen(
-                [exe_path],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW
-            )
+            self.cancel_button.config(state='normal')
+            self.job_progress.start(15)
+            self.job_label.config(text=f"Running {tab_name}...")
+            self.root.after(JOB_POLL_MS, self._pump_job, job, FrameDecoder(), 0)
             
-            stdout, stderr = process.communicate(input=input_data, timeout=10)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to run backend: {str(e)}")
             
-            if stderr:
-                messagebox.showwarning("Warning", f"Backend stderr: {stderr}")
+    def run_incremental(self, option, tab_name, quantum, cpus):
+        """Update the kept schedule for this option; only what changed is redrawn"""
+        key = (option, quantum, cpus)
+        schedule = self.incremental.get(key)
+        if schedule is None:
+            schedule = self.incremental[key] = IncrementalSchedule(OPTION_ALGORITHMS[option],
+                                                                   quantum, cpus)
+        if self.current_job is not None:
+            self.current_job.cancel()
+        
+        job = self.get_job_runner().submit_incremental(schedule, option, tab_name,
+                                                       self.custom_processes)
+        self.current_job = job
+        self.select_result_tab(tab_name)
+        
+        self.cancel_button.config(state='normal')
+        self.job_progress.start(15)
+        self.job_label.config(text=f"Re-scheduling {tab_name}...")
+        self.root.after(JOB_POLL_MS, self._pump_job, job, FrameDecoder(), 0)
+        
+    def show_delta(self, tab_name, delta):
+        """Patch the results tab and Gantt chart from the first changed row and time"""
+        widget = self.result_widget(tab_name)
+        shown = self.shown_results.get(tab_name)
+        if delta.unchanged and shown is delta.result:
+            pass
+        elif not delta.full and shown is delta.previous and delta.first_row:
+            # Stats rows start after the report header; replace from the first changed one
+            widget.delete(f"{REPORT_HEADER_LINES + delta.first_row + 1}.0", 'end')
+            widget.insert('end', delta.result.format_report(delta.first_row) + '\n')
+        else:
+            widget.delete('1.0', 'end')
+            widget.insert('end', delta.result.format_report() + '\n')
+        self.shown_results[tab_name] = delta.result
+        
+        if self.gantt_result is delta.result:
+            return
+        if not delta.full and self.gantt_result is delta.previous:
+            self.gantt_result = delta.result
+            self.get_gantt_view().patch_result(delta.result, delta.slice_time)
+        else:
+            self.show_in_gantt(delta.result)
+        
+    def _pump_job(self, job, decoder, line_count):
+        """Move streamed frames from the worker into the results tab and Gantt chart"""
+        lines = job.drain()
+        if lines and job is self.current_job:
+            text = []
+            results = []
+            for line in lines:
+                if isinstance(line, ScheduleDelta):
+                    self.show_delta(job.tab_name, line)
+                    job.results.append(line.result)
+                    continue
+                # Engine jobs queue results directly; backend jobs queue text
+                item = line if isinstance(line, ScheduleResult) else decoder.feed(line)
+                if isinstance(item, ScheduleResult):
+                    results.append(item)
+                    if job.tab_name != 'All':
+                        text.append(item.format_report() + '\n')
+                elif item is not None:
+                    text.append(item)
             
-            # Display results
-            self.display_backend_results(tab_name, stdout)
+            if text:
+                self.result_widget(job.tab_name).insert('end', ''.join(text))
+            if results:
+                job.results.extend(results)
+                if job.tab_name == 'All':
+                    self.show_comparison(results)
+                self.draw_gantt_from_results(results)
             
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to run backend: {str(e)}")
+            line_count += len(lines)
+            self.job_label.config(text=f"Running {job.tab_name}... {line_count} lines received")
+            
+        if job.done.is_set() and job.lines.empty():
+            self._finish_job(job, line_count)
+        else:
+            self.root.after(JOB_POLL_MS, self._pump_job, job, decoder, line_count)
+            
+    def _finish_job(self, job, line_count):
+        """Called on the Tk thread once a job has stopped"""
+        if job is not self.current_job:
+            return
+        self.current_job = None
+        self.job_progress.stop()
+        self.cancel_button.config(state='disabled')
+        
+        if isinstance(job.error, JobCancelled):
+            self.job_label.config(text=f"{job.tab_name} cancelled after {line_count} lines")
+            return
+        if job.error is not None:
+            self.job_label.config(text=f"{job.tab_name} failed")
+            messagebox.showerror("Error", f"Failed to run backend: {str(job.error)}")
+            return
+        
+        self.job_label.config(text=f"{job.tab_name} finished ({line_count} lines)")
+        if job.cache_key is not None and len(job.results) == len(option_algorithms(job.option)):
+            self.result_cache.put(job.cache_key, job.results)
+        if job.stderr:
+            messagebox.showwarning("Warning", f"Backend stderr: {job.stderr}")
+            
+    def show_cached_results(self, tab_name, results):
+        """Display cached results without starting a job"""
+        if self.current_job is not None:
+            self.current_job.cancel()
+            self.current_job = None
+            self.job_progress.stop()
+            self.cancel_button.config(state='disabled')
+        
+        self.clear_results(tab_name)
+        if tab_name == 'All':
+            self.show_comparison(results)
+        else:
+            self.result_widget(tab_name).insert('end', ''.join(r.format_report() + '\n'
+                                                               for r in results))
+        self.select_result_tab(tab_name)
+        self.draw_gantt_from_results(results)
+        self.job_label.config(text=f"{tab_name} loaded from cache")
+        
+    def cancel_backend_jobs(self):
+        """Cancel every queued or running backend job and any running import"""
+        if self.job_runner is not None:
+            self.job_runner.cancel_all()
+        if self.import_cancel is not None:
+            self.import_cancel.set()
+            
+    def result_widget(self, tab_name):
+        """Results text widget for a run; other output of a Run All goes to FCFS"""
+        if tab_name not in self.report_tabs:
+            tab_name = 'FCFS'
+        self.build_tab(tab_name)
+        return self.result_tabs[tab_name]
+        
+    def select_result_tab(self, tab_name):
+        """Bring the tab for a run to the front; Run All shows the Compare tab"""
+        if tab_name == 'All':
+            tab_name = 'Compare'
+        if tab_name in self.result_frames:
+            self.build_tab(tab_name)
+            self.results_notebook.select(self.result_frames[tab_name])
+            
+    def clear_results(self, tab_name):
+        """Empty the tabs a run writes to; Run All fills every algorithm tab"""
+        if tab_name == 'All':
+            for name in option_algorithms(ALL_OPTION):
+                if name in self.result_tabs:   # Tabs not built yet are already empty
+                    self.result_tabs[name].delete('1.0', 'end')
+                self.shown_results.pop(name, None)
+            if self.comparison_view is not None:
+                self.comparison_view.clear()
+        else:
+            self.result_widget(tab_name).delete('1.0', 'end')
+            self.shown_results.pop(tab_name, None)
             
+    def show_comparison(self, results):
+        """Route Run All results to their own tabs and the comparison view"""
+        for result in results:
+            self.result_widget(result.algorithm).insert('end', result.format_report() + '\n')
+        self.build_tab('Compare')
+        self.comparison_view.add(results)
+        
     def display_backend_results(self, tab_name, output):
         """Display results from backend"""
-        widget = self.result_tabs[tab_name]
-        widget.delete('1.0', 'end')
-        widget.insert('end', output)
+        results, text = decode_results(output)
+        
+        self.clear_results(tab_name)
+        self.result_widget(tab_name).insert('end', text)
+        if tab_name == 'All':
+            self.show_comparison(results)
+        else:
+            for result in results:
+                self.result_widget(tab_name).insert('end', result.format_report() + '\n')
         
         # Select the tab
-        algo_index = {'FCFS': 0, 'SJF': 1, 'Priority': 2, 'Round Robin': 3, 'All': 0}
-        if tab_name in algo_index:
-            self.results_notebook.select(algo_index[tab_name])
+        self.select_result_tab(tab_name)
             
         # Draw Gantt chart if present
-        self.draw_gantt_from_output(output)
-        
-    def draw_gantt_from_output(self, output):
-        """Draw Gantt chart from backend output"""
-        self.gantt_canvas.delete("all")
-        
-        lines = output.split('\n')
-        gantt_data = []
-        
-        for line in lines:
-            if '->' in line and 'P' in line:
-                # Parse: "P1: 0 -> 5"
-                try:
-                    parts = line.split(':')[1].strip()
-                    times = parts.split('->')
-                    pid = line.split(':')[0].strip()
-                    start = int(times[0].strip())
-                    end = int(times[1].strip())
-                    gantt_data.append({'pid': pid, 'start': start, 'end': end})
-                except:
-                    pass
-        
-        if not gantt_data:
-            return
-            
-        # Calculate dimensions
-        max_time = max(d['end'] for d in gantt_data)
-        canvas_width = self.gantt_canvas.winfo_width() - 100
-        canvas_height = 120
+        if results:
+            self.draw_gantt_from_results(results)
         
-        if max_time == 0:
-            return
-            
-        scale = canvas_width / max_time if max_time > 0 else 1
-        bar_height = 40
-        start_y = (canvas_height - bar_height) / 2
+    def draw_gantt_from_results(self, results):
+        """Draw the Gantt chart for the most recent decoded result"""
+        self.show_in_gantt(results[-1])
         
-        # Draw timeline
-        self.gantt_canvas.create_line(50, canvas_height/2 + 20, 50 + canvas_width, 
-                                     canvas_height/2 + 20, fill=self.colors['secondary'], width=2)
+    def show_in_gantt(self, result):
+        """Draw one result in the main Gantt chart"""
+        self.gantt_result = result
+        self.get_gantt_view().set_result(result)
         
-        # Draw blocks
-        colors = ['#3498db', '#e74c3c', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c']
+    def draw_gantt(self, gantt_data):
+        """Draw Gantt chart slices given as {'pid', 'start', 'end'} dicts"""
+        self.get_gantt_view().set_entries(gantt_data)
         
-        for i, data in enumerate(gantt_data):
-            x1 = 50 + data['start'] * scale
-            x2 = 50 + data['end'] * scale
-            color = colors[i % len(colors)]
-            
-            # Draw block
-            self.gantt_canvas.create_rectangle(x1, start_y, x2, start_y + bar_height,
-                                             fill=color, outline='')
-            # Draw PID
-            self.gantt_canvas.create_text((x1 + x2)/2, start_y + bar_height/2,
-                                         text=data['pid'], fill='white', font=('Arial', 10, 'bold'))
-            
-            # Draw start time
-            self.gantt_canvas.create_text(x1, start_y + bar_height + 15,
-                                         text=str(data['start']), font=('Arial', 8))
-            
-        # Draw end time
-        if gantt_data:
-            self.gantt_canvas.create_text(50 + max_time * scale, start_y + bar_height + 15,
-                                         text=str(max_time), font=('Arial', 8))
+    # ========== METRICS ==========
+    
+    def refresh_metrics(self):
+        """Update the Metrics tab and summary line, then reschedule"""
+        metrics.sample_memory()
+        if self.metrics_tree is not None:
+            self.update_metrics_tree()
+        
+        request = metrics.timer('backend_request_seconds')
+        runs = metrics.counter('jobs_completed')
+        rss = metrics.gauge('process_resident_bytes').value
+        if request.count:
+            self.metrics_label.config(
+                text=f"Backend p50 {self._ms(request.percentile(0.5))} ms, "
+                     f"p95 {self._ms(request.percentile(0.95))} ms  |  "
+                     f"{runs.rate():.2f} runs/s  |  RSS {rss / 1e6:,.0f} MB")
+        else:
+            self.metrics_label.config(text=f"Metrics: no requests yet  |  RSS {rss / 1e6:,.0f} MB")
+        
+        # Dashboards scrape this file, e.g. via node_exporter's textfile collector
+        path = os.environ.get(metrics.METRICS_FILE_ENV)
+        if path:
+            try:
+                metrics.REGISTRY.write_prometheus(path)
+            except OSError:
+                pass
+        self.root.after(METRICS_REFRESH_MS, self.refresh_metrics)
+        
+    def update_metrics_tree(self):
+        """Put every metric's current values in the Metrics tab"""
+        for metric in metrics.REGISTRY.metrics():
+            if metric.kind == 'summary':
+                values = (f"{metric.count:,}", self._ms(metric.percentile(0.5)),
+                          self._ms(metric.percentile(0.95)), f"{metric.rate():.2f}")
+            elif metric.kind == 'counter':
+                values = (f"{metric.value:,}", '', '', f"{metric.rate():.2f}")
+            elif metric.name.endswith('_bytes'):
+                values = (f"{metric.value / 1e6:,.1f} MB", '', '', '')
+            else:
+                values = (f"{metric.value:,}", '', '', '')
+            if self.metrics_tree.exists(metric.name):
+                self.metrics_tree.item(metric.name, values=values)
+            else:
+                self.metrics_tree.insert('', 'end', iid=metric.name, text=metric.name, values=values)
+        
+    @staticmethod
+    def _ms(seconds):
+        return '' if seconds is None else f"{seconds * 1000:.2f}"
+        
+    def show_metrics_report(self, text):
+        """Put a profiler report in the Metrics tab"""
+        self.metrics_report.delete('1.0', 'end')
+        self.metrics_report.insert('end', text)
+        self.select_result_tab('Metrics')
+        
+    def toggle_profile(self):
+        """Start or stop cProfile on the Tk thread (decoding and drawing)"""
+        if not self.profiler.profiling:
+            self.profiler.start_profile()
+            self.profile_button.config(text="Stop Profile")
+            return
+        path = os.path.join(tempfile.gettempdir(), f"osnexus-{os.getpid()}.prof")
+        report = self.profiler.stop_profile(path)
+        self.profile_button.config(text="Start Profile")
+        self.show_metrics_report(f"Profile saved to {path}\n\n{report}")
+        
+    def toggle_tracemalloc(self):
+        """Start or stop tracemalloc and show the largest live allocation sites"""
+        if not self.profiler.tracing:
+            self.profiler.start_tracemalloc()
+            self.tracemalloc_button.config(text="Stop Tracing")
+            return
+        self.tracemalloc_button.config(text="Trace Memory")
+        self.show_metrics_report(self.profiler.stop_tracemalloc())
+        
+    def export_metrics(self):
+        """Write the metrics in Prometheus text format"""
+        path = filedialog.asksaveasfilename(title="Export Metrics", defaultextension='.prom',
+                                            filetypes=[("Prometheus text", "*.prom"),
+                                                       ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            metrics.REGISTRY.write_prometheus(path)
+        except OSError as e:
+            messagebox.showerror("Export Error", f"Failed to export metrics: {str(e)}")
+            return
+        self.job_label.config(text=f"Exported metrics to {os.path.basename(path)}")
         
     def run_memory_test_backend(self):
         """Run memory allocator test via backend"""
         self.run_algorithm_backend(1, 'Memory')
         
+    def replay_generated_trace(self):
+        """Generate a random trace from the Heap Map settings and replay it"""
+        self.build_tab('Heap Map')
+        try:
+            ops, max_live, max_size, seed = (int(self.trace_settings[name].get())
+                                             for name in ('Ops', 'Max live', 'Max size', 'Seed'))
+            if ops < 1 or max_live < 1 or max_size < 8:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Invalid Input", "Ops and Max live must be positive and "
+                                 "Max size at least 8")
+            return
+        self.replay_trace(generate_trace(ops, max_live, max_size, seed),
+                          f"{ops:,} generated operations")
+        
+    def replay_trace_file(self):
+        """Replay a trace file of "A <handle> <size>" / "F <handle>" lines"""
+        path = filedialog.askopenfilename(
+            title="Replay Allocation Trace",
+            filetypes=[("Allocation traces", "*.trace *.txt"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            trace = load_trace(path)
+        except (TraceError, OSError) as e:
+            messagebox.showerror("Error", f"Failed to read trace: {str(e)}")
+            return
+        self.replay_trace(trace, os.path.basename(path))
+        
+    def replay_trace(self, trace, description):
+        """Send a whole trace to the backend and show the heap map it streams back"""
+        runner = self.get_job_runner()
+        if runner.exe_path is None and runner.service is None:
+            messagebox.showerror("Error", f"Backend not found (searched {describe_search()})")
+            return
+        if self.current_job is not None:
+            self.current_job.cancel()
+        
+        heap = (self.trace_settings['Heap'].get().strip() or '1M', self.heap_policy.get())
+        job = runner.submit_trace(trace, 'Heap Map', heap)
+        self.current_job = job
+        self.select_result_tab('Heap Map')
+        self.cancel_button.config(state='normal')
+        self.job_progress.start(15)
+        self.job_label.config(text=f"Replaying {description}...")
+        self.root.after(JOB_POLL_MS, self._pump_trace, job)
+        
+    def _pump_trace(self, job):
+        """Hand the decoded timeline to the heap map once the replay is done"""
+        if not job.done.is_set():
+            self.root.after(JOB_POLL_MS, self._pump_trace, job)
+            return
+        if job is not self.current_job:
+            return
+        self.current_job = None
+        self.job_progress.stop()
+        self.cancel_button.config(state='disabled')
+        
+        if isinstance(job.error, JobCancelled):
+            self.job_label.config(text="Heap trace replay cancelled")
+        elif job.error is not None:
+            self.job_label.config(text="Heap trace replay failed")
+            messagebox.showerror("Error", f"Failed to replay trace: {str(job.error)}")
+        else:
+            timeline = job.results[0]
+            self.job_label.config(text=f"Replayed {timeline.steps:,} operations "
+                                       f"({timeline.failures[-1]:,} changed nothing)")
+            self.heap_view.set_timeline(timeline)
+        
     def start_file_server_backend(self):
-        """Start file server via backend"""
-        self.run_algorithm_backend(7, 'File Server')
+        """Launch file_server in the background and list its files"""
+        if self.file_server_process is None or self.file_server_process.poll() is not None:
+            exe_path = locate_file_server()
+            if exe_path is None:
+                messagebox.showerror("Error", "File server not found (searched "
+                                     f"{describe_search(name=FILE_SERVER_NAME, env=FILE_SERVER_ENV)})")
+                return
+            try:
+                # No stdin: the server keeps serving until it is terminated
+                self.file_server_process = subprocess.Popen(
+                    [exe_path], cwd=os.path.dirname(exe_path), stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **popen_kwargs())
+            except OSError as e:
+                messagebox.showerror("Error", f"Failed to start file server: {str(e)}")
+                return
+        
+        widget = self.result_widget('File Server')
+        widget.delete('1.0', 'end')
+        widget.insert('end', f"Connecting to file server on port {DEFAULT_PORT}...\n")
+        self.select_result_tab('File Server')
+        
+        replies = queue.Queue()
+        threading.Thread(target=self._file_server_thread, args=(replies,), daemon=True).start()
+        self.root.after(JOB_POLL_MS, self._pump_file_server, replies)
+        
+    def _file_server_thread(self, replies):
+        """Worker thread: wait for the server, then LIST over the async client"""
+        async def fetch():
+            await wait_for_server()
+            async with FileServerPool() as pool:
+                return await pool.list()
+        try:
+            replies.put(asyncio.run(fetch()))
+        except (FileServerError, OSError, asyncio.TimeoutError) as e:
+            replies.put(e)
+            
+    def _pump_file_server(self, replies):
+        """Show the listing once the worker thread has it"""
+        try:
+            reply = replies.get_nowait()
+        except queue.Empty:
+            self.root.after(JOB_POLL_MS, self._pump_file_server, replies)
+            return
+        
+        widget = self.result_widget('File Server')
+        if isinstance(reply, Exception):
+            widget.insert('end', f"ERROR: {reply}\n")
+            return
+        widget.insert('end', f"Serving {len(reply)} files on port {DEFAULT_PORT}:\n")
+        for entry in reply:
+            widget.insert('end', f"  {entry.name:<40} {entry.size_text:>10}  {entry.modified}\n")
         
     def open_backend_terminal(self):
         """Open backend in new terminal window"""
         try:
-            if getattr(sys, 'frozen', False):
-                base_path = os.path.dirname(sys.executable)
-            else:
-                base_path = os.path.dirname(os.path.abspath(__file__))
-            
-            exe_path = os.path.join(base_path, '..', 'server', 'main_system.exe')
-            exe_path = os.path.normpath(exe_path)
+            exe_path = self.get_backend_exe_path()
             
-            if not os.path.exists(exe_path):
-                messagebox.showerror("Error", f"Backend not found: {exe_path}")
+            if exe_path is None:
+                messagebox.showerror("Error", f"Backend not found (searched {describe_search()})")
                 return
             
-            # Open in new command prompt
-            subprocess.Popen(['cmd', '/k', exe_path])
+            # Open in a new command prompt / terminal window
+            open_in_terminal(exe_path)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open backend: {str(e)}")
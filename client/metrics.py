@@ -0,0 +1,311 @@
+"""
+Advanced OS Project - Client Instrumentation
+Timers, counters and gauges around the client's hot paths, optional cProfile
+and tracemalloc capture, and Prometheus text-format export
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+
+SAMPLE_WINDOW = 1024       # recent samples kept per timer for percentiles
+RATE_WINDOW = 60.0         # seconds over which rates are measured
+METRICS_FILE_ENV = 'OSNEXUS_METRICS_FILE'
+PREFIX = 'osnexus_'
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class _Rate:
+    """Events per second over the last RATE_WINDOW seconds
+
+    Events are bucketed per second, so memory stays bounded however hot
+    the metric is.
+    """
+
+    def __init__(self):
+        self._buckets = deque()    # [second, events]
+        self._total = 0
+
+    def mark(self, now, n=1):
+        second = int(now)
+        if self._buckets and self._buckets[-1][0] == second:
+            self._buckets[-1][1] += n
+        else:
+            self._expire(now)
+            self._buckets.append([second, n])
+        self._total += n
+
+    def rate(self, now):
+        self._expire(now)
+        return self._total / RATE_WINDOW
+
+    def _expire(self, now):
+        buckets = self._buckets
+        while buckets and buckets[0][0] <= now - RATE_WINDOW:
+            self._total -= buckets.popleft()[1]
+
+
+class Timer:
+    """Latency distribution: exact count and sum plus a window of recent samples"""
+
+    kind = 'summary'
+
+    def __init__(self, name, help_text=''):
+        self.name = name
+        self.help = help_text
+        self.count = 0
+        self.total = 0.0
+        self._samples = deque(maxlen=SAMPLE_WINDOW)
+        self._rate = _Rate()
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        now = time.monotonic()
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self._samples.append(seconds)
+            self._rate.mark(now)
+
+    @contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def percentile(self, q):
+        """Nearest-rank percentile of the recent samples, or None if empty"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def rate(self):
+        with self._lock:
+            return self._rate.rate(time.monotonic())
+
+
+class Counter:
+    """Monotonic count, e.g. cache hits or bytes sent"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help_text=''):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self._rate = _Rate()
+        self._lock = threading.Lock()
+
+    def inc(self, n=1):
+        now = time.monotonic()
+        with self._lock:
+            self.value += n
+            self._rate.mark(now, n)
+
+    def rate(self):
+        with self._lock:
+            return self._rate.rate(time.monotonic())
+
+
+class Gauge:
+    """A value that goes up and down, e.g. resident memory"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, help_text=''):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+
+class Registry:
+    """Named metrics, created on first use"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help_text):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(name, cls(name, help_text))
+        if not isinstance(metric, cls):
+            raise TypeError(f"Metric {name!r} is a {metric.kind}, not a {cls.kind}")
+        return metric
+
+    def timer(self, name, help_text=''):
+        return self._get(Timer, name, help_text)
+
+    def counter(self, name, help_text=''):
+        return self._get(Counter, name, help_text)
+
+    def gauge(self, name, help_text=''):
+        return self._get(Gauge, name, help_text)
+
+    def metrics(self):
+        with self._lock:
+            return sorted(self._metrics.values(), key=lambda m: m.name)
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+
+    # ========== EXPORT ==========
+
+    def to_prometheus(self):
+        """Prometheus text exposition format (timers as summaries in seconds)"""
+        lines = []
+        for metric in self.metrics():
+            name = PREFIX + metric.name
+            if metric.kind == 'counter':
+                name += '_total'
+            if metric.help:
+                lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            if metric.kind == 'summary':
+                for q in QUANTILES:
+                    value = metric.percentile(q)
+                    lines.append(f'{name}{{quantile="{q}"}} {"NaN" if value is None else repr(value)}')
+                lines.append(f"{name}_sum {metric.total!r}")
+                lines.append(f"{name}_count {metric.count}")
+            else:
+                lines.append(f"{name} {metric.value}")
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """Replace path atomically, so a textfile collector never reads half a file"""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.metrics-')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+REGISTRY = Registry()
+timer = REGISTRY.timer
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+
+
+# ========== MEMORY ==========
+
+def resident_bytes():
+    """Current resident set size of this process, or None if unknown"""
+    if sys.platform.startswith('linux'):
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError):
+            return None
+    if os.name == 'nt':
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+                (field, ctypes.c_size_t) for field in (
+                    'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage',
+                    'QuotaPagedPoolUsage', 'QuotaPeakNonPagedPoolUsage',
+                    'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current, but the best macOS offers without psutil
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def sample_memory(registry=REGISTRY):
+    """Refresh the memory gauges"""
+    rss = resident_bytes()
+    if rss is not None:
+        registry.gauge('process_resident_bytes', "Resident memory of the client").set(rss)
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        registry.gauge('tracemalloc_current_bytes', "Python heap traced by tracemalloc").set(current)
+        registry.gauge('tracemalloc_peak_bytes', "Peak Python heap since tracing began").set(peak)
+
+
+# ========== PROFILING ==========
+
+class Profiler:
+    """cProfile and tracemalloc capture that can be switched on and off at runtime
+
+    cProfile only sees the thread that started it; started from the GUI
+    that is the Tk thread, where decoding and drawing happen.
+    """
+
+    def __init__(self):
+        self._profile = None
+
+    @property
+    def profiling(self):
+        return self._profile is not None
+
+    def start_profile(self):
+        if self._profile is None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop_profile(self, path=None, limit=25):
+        """Stop, optionally dump .prof stats to path, and return a top-N report"""
+        profile, self._profile = self._profile, None
+        if profile is None:
+            return ''
+        profile.disable()
+        if path:
+            profile.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats('cumulative').print_stats(limit)
+        return out.getvalue()
+
+    @property
+    def tracing(self):
+        return tracemalloc.is_tracing()
+
+    def start_tracemalloc(self, frames=10):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop_tracemalloc(self, limit=15):
+        """Stop tracing and return the top allocation sites still live"""
+        if not tracemalloc.is_tracing():
+            return ''
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        lines = [f"Traced: {current / 1e6:.1f} MB current, {peak / 1e6:.1f} MB peak", ""]
+        for stat in snapshot.statistics('lineno')[:limit]:
+            lines.append(str(stat))
+        return '\n'.join(lines) + '\n'
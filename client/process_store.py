@@ -0,0 +1,184 @@
+"""
+Advanced OS Project - Process Column Store
+Compact columnar storage for the client's workload with change notifications
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+SAMPLE_PROCESSES = [
+    {'id': 'P1', 'arrival': 0, 'burst': 5, 'priority': 2},
+    {'id': 'P2', 'arrival': 1, 'burst': 3, 'priority': 1},
+    {'id': 'P3', 'arrival': 2, 'burst': 8, 'priority': 4},
+    {'id': 'P4', 'arrival': 3, 'burst': 6, 'priority': 3},
+    {'id': 'P5', 'arrival': 5, 'burst': 4, 'priority': 2},
+]
+
+
+class ProcessStore:
+    """Processes held as parallel columns instead of a list of dicts
+
+    Listeners are called as listener(event, start, count) after every
+    change, where event is 'append', 'update', 'delete' or 'reset'.
+    Iterating the store yields the same {'id', 'arrival', 'burst',
+    'priority'} dicts the rest of the client has always used.
+
+    The arrival-sorted copy the schedulers run on is kept between calls:
+    adding or editing one process moves one entry instead of re-sorting.
+    """
+
+    def __init__(self, records=()):
+        self.ids = []
+        self.arrival = array('q')
+        self.burst = array('q')
+        self.priority = array('q')
+        self.version = 0
+        self._listeners = []
+        self._sorted = None   # (store index, arrival, burst, priority) columns by arrival
+        for record in records:
+            self._append_row(record['id'], record['arrival'], record['burst'], record['priority'])
+
+    # ========== READ ACCESS ==========
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __bool__(self):
+        return bool(self.ids)
+
+    def __iter__(self):
+        for k in range(len(self.ids)):
+            yield self.record(k)
+
+    def __getitem__(self, index):
+        return self.record(index)
+
+    def record(self, index):
+        return {'id': self.ids[index], 'arrival': self.arrival[index],
+                'burst': self.burst[index], 'priority': self.priority[index]}
+
+    def row(self, index):
+        """Row as a (id, arrival, burst, priority) tuple for table display"""
+        return (self.ids[index], self.arrival[index], self.burst[index], self.priority[index])
+
+    def sorted_columns(self):
+        """Arrival/burst/priority columns stably sorted by arrival"""
+        if self._sorted is None:
+            order = sorted(range(len(self.ids)), key=self.arrival.__getitem__)
+            self._sorted = (array('q', order),
+                            array('q', (self.arrival[k] for k in order)),
+                            array('q', (self.burst[k] for k in order)),
+                            array('q', (self.priority[k] for k in order)))
+        return tuple(column[:] for column in self._sorted[1:])
+
+    def _sorted_insert(self, index):
+        """Place store row index in the sorted copy, after equal arrivals
+        with a lower index so the sort stays stable"""
+        order, arrival = self._sorted[0], self._sorted[1]
+        lo = bisect_left(arrival, self.arrival[index])
+        hi = bisect_right(arrival, self.arrival[index])
+        pos = lo + bisect_left(order[lo:hi], index)
+        for column, value in zip(self._sorted, (index, self.arrival[index], self.burst[index],
+                                                self.priority[index])):
+            column.insert(pos, value)
+
+    def snapshot(self):
+        """Independent copy, safe to hand to a worker thread"""
+        copy = ProcessStore()
+        copy.ids = list(self.ids)
+        copy.arrival = array('q', self.arrival)
+        copy.burst = array('q', self.burst)
+        copy.priority = array('q', self.priority)
+        copy.version = self.version
+        if self._sorted is not None:
+            copy._sorted = tuple(column[:] for column in self._sorted)
+        return copy
+
+    # ========== MUTATION ==========
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def _notify(self, event, start, count):
+        self.version += 1
+        for listener in self._listeners:
+            listener(event, start, count)
+
+    def _append_row(self, pid, arrival, burst, priority):
+        self.ids.append(pid)
+        self.arrival.append(arrival)
+        self.burst.append(burst)
+        self.priority.append(priority)
+
+    def append(self, record):
+        """Add one process given as a dict"""
+        start = len(self.ids)
+        self._append_row(record['id'], record['arrival'], record['burst'], record['priority'])
+        if self._sorted is not None:
+            self._sorted_insert(start)
+        self._notify('append', start, 1)
+
+    def update(self, index, record):
+        """Replace one process in place"""
+        self.ids[index] = record['id']
+        self.arrival[index] = record['arrival']
+        self.burst[index] = record['burst']
+        self.priority[index] = record['priority']
+        if self._sorted is not None:
+            pos = self._sorted[0].index(index)
+            for column in self._sorted:
+                del column[pos]
+            self._sorted_insert(index)
+        self._notify('update', index, 1)
+
+    def extend_columns(self, ids, arrival, burst, priority):
+        """Bulk append whole columns in one notification"""
+        start = len(self.ids)
+        self.ids.extend(ids)
+        self.arrival.extend(arrival)
+        self.burst.extend(burst)
+        self.priority.extend(priority)
+        self._sorted = None
+        if len(self.ids) > start:
+            self._notify('append', start, len(self.ids) - start)
+
+    def delete(self, indices):
+        """Remove rows by index; one notification from the first removed row"""
+        doomed = set(indices)
+        if not doomed:
+            return
+        first = min(doomed)
+        if len(doomed) == 1:
+            del self.ids[first]
+            del self.arrival[first]
+            del self.burst[first]
+            del self.priority[first]
+        else:
+            # One pass per column instead of an O(n) shift per removed row
+            keep = [k for k in range(first, len(self.ids)) if k not in doomed]
+            self.ids[first:] = [self.ids[k] for k in keep]
+            self.arrival[first:] = array('q', (self.arrival[k] for k in keep))
+            self.burst[first:] = array('q', (self.burst[k] for k in keep))
+            self.priority[first:] = array('q', (self.priority[k] for k in keep))
+        self._sorted = None
+        self._notify('delete', first, len(doomed))
+
+    def clear(self):
+        self.ids = []
+        self.arrival = array('q')
+        self.burst = array('q')
+        self.priority = array('q')
+        self._sorted = None
+        self._notify('reset', 0, 0)
+
+    def replace(self, records):
+        """Swap in a new workload given as dicts"""
+        self.ids = []
+        self.arrival = array('q')
+        self.burst = array('q')
+        self.priority = array('q')
+        for record in records:
+            self._append_row(record['id'], record['arrival'], record['burst'], record['priority'])
+        self._sorted = None
+        self._notify('reset', 0, len(self.ids))
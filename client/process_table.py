@@ -0,0 +1,160 @@
+"""
+Advanced OS Project - Virtualized Process Table
+Treeview that renders only the visible window of a ProcessStore
+"""
+
+from tkinter import ttk
+
+
+class VirtualProcessTable:
+    """Fixed pool of Treeview rows mapped onto a scrolling window of the store
+
+    The Treeview never holds more than `height` items, so adding, deleting
+    or loading 100k processes costs the same as five. Appends outside the
+    visible window only move the scrollbar.
+
+    The selection is kept as store indices, not Treeview items, since a
+    pooled item shows a different row after every scroll.
+    """
+
+    def __init__(self, parent, store, columns, headings, widths, height=6):
+        self.store = store
+        self.height = height
+        self.offset = 0
+        self.columns = columns
+        self.selected = set()   # Store indices, including rows scrolled out of view
+        self._replace_selection = False
+
+        self.tree = ttk.Treeview(parent, columns=columns, show='headings',
+                                 height=height, selectmode='extended')
+        for column, heading, width in zip(columns, headings, widths):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor='center')
+
+        self.scrollbar = ttk.Scrollbar(parent, orient='vertical', command=self._on_scroll)
+
+        self.tree.bind('<MouseWheel>', self._on_wheel)
+        self.tree.bind('<Button-4>', lambda e: self.scroll_to(self.offset - 1))
+        self.tree.bind('<Button-5>', lambda e: self.scroll_to(self.offset + 1))
+        self.tree.bind('<ButtonPress-1>', self._on_click, add='+')
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+
+        # Row slots are created once and only have their values swapped
+        self.slots = []
+        store.add_listener(self._on_store_change)
+        self.refresh()
+
+    # ========== LAYOUT ==========
+
+    def pack(self):
+        self.tree.pack(side='left', fill='x', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+
+    # ========== RENDERING ==========
+
+    def _max_offset(self):
+        return max(0, len(self.store) - self.height)
+
+    def _render_slot(self, slot):
+        """Show store row offset + slot in its Treeview item"""
+        index = self.offset + slot
+        self.tree.item(self.slots[slot], values=self.store.row(index))
+
+    def _sync_slots(self):
+        """Grow or shrink the slot pool to the number of visible rows"""
+        visible = min(self.height, len(self.store) - self.offset)
+        while len(self.slots) < visible:
+            self.slots.append(self.tree.insert('', 'end', values=()))
+        while len(self.slots) > visible:
+            self.tree.delete(self.slots.pop())
+
+    def refresh(self):
+        """Redraw the whole visible window"""
+        self.offset = min(self.offset, self._max_offset())
+        self._sync_slots()
+        for slot in range(len(self.slots)):
+            self._render_slot(slot)
+        self._apply_selection()
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        total = len(self.store)
+        if total <= self.height:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + self.height) / total)
+
+    def _on_store_change(self, event, start, count):
+        """Patch only what the change touches"""
+        if event in ('delete', 'reset') and self.selected:
+            # Surviving rows shift, so a kept index would name another process
+            self.selected.clear()
+            self.tree.selection_set(())
+        if event == 'append':
+            end = self.offset + self.height
+            if start < end:
+                # New rows land inside the window: fill the empty slots only
+                first_slot = len(self.slots)
+                self._sync_slots()
+                for slot in range(first_slot, len(self.slots)):
+                    self._render_slot(slot)
+            self._update_scrollbar()
+        elif event == 'delete' and start >= self.offset + self.height:
+            # Rows removed below the window cannot change what is shown
+            self._update_scrollbar()
+        elif event == 'update':
+            if self.offset <= start < self.offset + len(self.slots):
+                self._render_slot(start - self.offset)
+        else:
+            if event == 'reset':
+                self.offset = 0
+            self.refresh()
+
+    # ========== SCROLLING ==========
+
+    def scroll_to(self, offset):
+        offset = max(0, min(int(offset), self._max_offset()))
+        if offset != self.offset:
+            self.offset = offset
+            self.refresh()
+        return 'break'
+
+    def _on_scroll(self, action, value, unit=None):
+        if action == 'moveto':
+            self.scroll_to(float(value) * len(self.store))
+        elif action == 'scroll':
+            step = self.height if unit == 'pages' else 1
+            self.scroll_to(self.offset + int(value) * step)
+
+    def _on_wheel(self, event):
+        return self.scroll_to(self.offset - (1 if event.delta > 0 else -1) * 3)
+
+    # ========== SELECTION ==========
+
+    def _apply_selection(self):
+        """Select the slots now showing selected store rows"""
+        self.tree.selection_set([item for slot, item in enumerate(self.slots)
+                                 if self.offset + slot in self.selected])
+
+    def _on_click(self, event):
+        # Shift/Control clicks add to the selection; a plain click replaces
+        # it, including rows scrolled out of view. Only the select event the
+        # click itself raises sees the flag.
+        self._replace_selection = not event.state & 0x0005
+        self.tree.after_idle(self._end_click)
+
+    def _end_click(self):
+        self._replace_selection = False
+
+    def _on_select(self, event):
+        """Fold the Treeview selection of the visible window into selected"""
+        if self._replace_selection:
+            self.selected.clear()
+        visible = range(self.offset, self.offset + len(self.slots))
+        self.selected.difference_update(visible)
+        self.selected.update(self.offset + self.slots.index(item)
+                             for item in self.tree.selection() if item in self.slots)
+
+    def selected_indices(self):
+        """Store indices of the selected rows, in store order"""
+        return sorted(self.selected)
@@ -0,0 +1,259 @@
+"""
+Advanced OS Project - Scheduling Result Cache
+Content-addressed cache of ScheduleResults with an in-memory LRU tier and
+an optional size-bounded on-disk tier
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+
+import metrics
+from result_protocol import CoreStats, ScheduleResult
+from scheduling_engine import QUANTUM_ALGORITHMS, columns_from_processes, option_algorithms
+
+
+MEMORY_ENTRIES = 64
+MEMORY_BYTES = 256 * 1024 * 1024
+DISK_BYTES = 512 * 1024 * 1024
+DISK_SUFFIX = '.res'
+CACHE_DIR_ENV = 'OSNEXUS_CACHE_DIR'
+
+# Column attributes of a ScheduleResult, in serialization order
+COLUMNS = ('slice_pid', 'slice_start', 'slice_end', 'pid', 'arrival', 'burst',
+           'completion', 'turnaround', 'waiting')
+
+
+def workload_digest(processes):
+    """sha256 of the arrival-sorted (arrival, burst, priority) columns"""
+    digest = hashlib.sha256()
+    for column in columns_from_processes(processes):
+        column = array('q', column)
+        if sys.byteorder == 'big':
+            column.byteswap()
+        digest.update(len(column).to_bytes(8, 'little'))
+        digest.update(column.tobytes())
+    return digest.hexdigest()
+
+
+def result_key(digest, option, quantum, cpus=1):
+    """Cache key for one menu option; quantum only matters for RR and MLFQ"""
+    if not any(name in QUANTUM_ALGORITHMS for name in option_algorithms(option)):
+        quantum = 0
+    # Single-CPU keys keep their original form so existing disk entries stay valid
+    text = f"{digest}:{option}:{quantum}" + (f":{cpus}" if cpus > 1 else '')
+    return hashlib.sha256(text.encode('ascii')).hexdigest()
+
+
+def _result_bytes(result):
+    return sum(len(getattr(result, name)) * 8 for name in COLUMNS)
+
+
+def pack_results(results):
+    """Serialize results: one JSON header line, then raw little-endian int64 columns"""
+    header = [{'algorithm': r.algorithm, 'quantum': r.quantum, 'avg_wt': r.avg_wt,
+               'avg_tat': r.avg_tat, 'lengths': [len(getattr(r, name)) for name in COLUMNS]}
+              for r in results]
+    for entry, r in zip(header, results):
+        if r.cores is not None:
+            entry.update(r.cores.to_dict())
+    chunks = [json.dumps(header).encode('utf-8') + b'\n']
+    for r in results:
+        for name in COLUMNS:
+            column = array('q', getattr(r, name))
+            if sys.byteorder == 'big':
+                column.byteswap()
+            chunks.append(column.tobytes())
+    return b''.join(chunks)
+
+
+def unpack_results(data):
+    """Inverse of pack_results"""
+    newline = data.index(b'\n')
+    header = json.loads(data[:newline].decode('utf-8'))
+    offset = newline + 1
+    results = []
+    for entry in header:
+        columns = []
+        for length in entry['lengths']:
+            column = array('q')
+            column.frombytes(data[offset:offset + length * 8])
+            if sys.byteorder == 'big':
+                column.byteswap()
+            columns.append(column)
+            offset += length * 8
+        cores = CoreStats.from_dict(entry) if 'cpus' in entry else None
+        results.append(ScheduleResult(entry['algorithm'], entry['quantum'], *columns,
+                                      entry['avg_wt'], entry['avg_tat'], cores))
+    if offset != len(data):
+        raise ValueError("Trailing bytes after cached results")
+    return results
+
+
+class ResultCache:
+    """LRU of scheduling results keyed by workload content, option and quantum
+
+    Keys are content hashes, so a changed workload can never hit a stale
+    entry. The workload digest is memoized per ProcessStore version, so a
+    repeat view of an unchanged workload skips hashing entirely; any change
+    to the store bumps its version and the next lookup rehashes.
+    """
+
+    def __init__(self, disk_dir=None, max_entries=MEMORY_ENTRIES,
+                 max_bytes=MEMORY_BYTES, max_disk_bytes=DISK_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_dir = disk_dir
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk = OrderedDict()    # key -> file size, oldest first
+        self._disk_bytes = 0
+        self._digests = {}            # id(store) -> (store, version, digest)
+        self._lock = threading.Lock()
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._scan_disk()
+
+    @classmethod
+    def from_environment(cls):
+        """Memory-only cache, plus a disk tier when OSNEXUS_CACHE_DIR is set"""
+        return cls(disk_dir=os.environ.get(CACHE_DIR_ENV) or None)
+
+    # ========== KEYS ==========
+
+    def key(self, processes, option, quantum, cpus=1):
+        """Cache key for running option over processes on cpus cores"""
+        version = getattr(processes, 'version', None)
+        if version is None:
+            return result_key(workload_digest(processes), option, quantum, cpus)
+        memo = self._digests.get(id(processes))
+        if memo is None or memo[0] is not processes or memo[1] != version:
+            memo = (processes, version, workload_digest(processes))
+            self._digests[id(processes)] = memo
+        return result_key(memo[2], option, quantum, cpus)
+
+    # ========== LOOKUP ==========
+
+    def get(self, key):
+        """Cached results for key, or None"""
+        with self._lock:
+            results = self._memory.get(key)
+            if results is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                metrics.counter('result_cache_hits', "Result cache lookups served").inc()
+                return results
+        results = self._read_disk(key)
+        with self._lock:
+            if results is None:
+                self.misses += 1
+                metrics.counter('result_cache_misses', "Result cache lookups that missed").inc()
+                return None
+            self.hits += 1
+            metrics.counter('result_cache_hits', "Result cache lookups served").inc()
+            metrics.counter('result_cache_disk_hits', "Result cache hits read from disk").inc()
+            self._remember(key, results)
+        return results
+
+    def put(self, key, results):
+        """Store results in memory and, if enabled, on disk"""
+        results = list(results)
+        with self._lock:
+            self._remember(key, results)
+        self._write_disk(key, results)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def __len__(self):
+        return len(self._memory)
+
+    def _remember(self, key, results):
+        if key in self._memory:
+            self._memory_bytes -= sum(_result_bytes(r) for r in self._memory.pop(key))
+        size = sum(_result_bytes(r) for r in results)
+        if size > self.max_bytes:
+            return
+        self._memory[key] = results
+        self._memory_bytes += size
+        while len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= sum(_result_bytes(r) for r in evicted)
+
+    # ========== DISK TIER ==========
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, key + DISK_SUFFIX)
+
+    def _scan_disk(self):
+        """Index existing entries, oldest first by modification time"""
+        entries = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.is_file() and entry.name.endswith(DISK_SUFFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-len(DISK_SUFFIX)], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+    def _read_disk(self, key):
+        if not self.disk_dir or key not in self._disk:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                results = unpack_results(f.read())
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            self._forget_disk(key)
+            return None
+        with self._lock:
+            if key in self._disk:
+                self._disk.move_to_end(key)
+        return results
+
+    def _write_disk(self, key, results):
+        if not self.disk_dir:
+            return
+        data = pack_results(results)
+        if len(data) > self.max_disk_bytes:
+            return
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            return
+        with self._lock:
+            self._disk_bytes -= self._disk.pop(key, 0)
+            self._disk[key] = len(data)
+            self._disk_bytes += len(data)
+            doomed = []
+            while self._disk_bytes > self.max_disk_bytes:
+                old, size = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                doomed.append(old)
+        for old in doomed:
+            try:
+                os.remove(self._path(old))
+            except OSError:
+                pass
+
+    def _forget_disk(self, key):
+        with self._lock:
+            self._disk_bytes -= self._disk.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
@@ -0,0 +1,243 @@
+"""
+Advanced OS Project - Structured Result Protocol
+Decodes the backend's length-prefixed JSON frames into typed arrays
+"""
+
+import json
+from array import array
+
+import metrics
+
+
+FRAME_HEADER = 'RESULT_JSON'
+MAP_FRAME_HEADER = 'RESULT_MAP'   # Columns are in a result segment (see shm_transfer)
+FORMAT_COMMAND = 'FORMAT JSON\n'
+
+GANTT_FIELDS = 3   # pid, start, end
+STATS_FIELDS = 6   # pid, arrival, burst, completion, turnaround, waiting
+REPORT_HEADER_LINES = 3   # title, column headings, rule above a report's first row
+
+# Comparison figures in a result's summary, as the backend reports them
+SUMMARY_FIELDS = ('makespan', 'throughput', 'utilization', 'avg_response', 'max_waiting',
+                  'preemptions')
+
+
+class ProtocolError(ValueError):
+    """Raised when a result frame does not match its header"""
+
+
+class CoreStats:
+    """Per-CPU totals of a multi-core run
+
+    The run's Gantt slices are grouped by core: the first lanes[0] belong
+    to CPU 0, the next lanes[1] to CPU 1, and so on, each in time order.
+    """
+
+    def __init__(self, lanes, busy, completed, steals):
+        self.lanes = list(lanes)
+        self.busy = list(busy)
+        self.completed = list(completed)
+        self.steals = list(steals)
+
+    @classmethod
+    def from_dict(cls, doc):
+        return cls(doc['lanes'], doc['core_busy'], doc['core_completed'], doc['core_steals'])
+
+    def to_dict(self):
+        return {'cpus': self.cpus, 'lanes': self.lanes, 'core_busy': self.busy,
+                'core_completed': self.completed, 'core_steals': self.steals}
+
+    @property
+    def cpus(self):
+        return len(self.lanes)
+
+    def lane_bounds(self):
+        """(start, stop) slice index range of each core's lane"""
+        bounds = []
+        start = 0
+        for count in self.lanes:
+            bounds.append((start, start + count))
+            start += count
+        return bounds
+
+
+class ScheduleResult:
+    """One scheduling run held as parallel int64 columns"""
+
+    def __init__(self, algorithm, quantum, slice_pid, slice_start, slice_end,
+                 pid, arrival, burst, completion, turnaround, waiting, avg_wt, avg_tat,
+                 cores=None, summary=None):
+        self.algorithm = algorithm
+        self.quantum = quantum
+        self.avg_wt = avg_wt
+        self.avg_tat = avg_tat
+        self.cores = cores    # CoreStats for multi-CPU runs, None on one CPU
+        self._summary = summary
+
+        # Gantt slices in execution order, grouped by core on multi-CPU runs
+        self.slice_pid = slice_pid
+        self.slice_start = slice_start
+        self.slice_end = slice_end
+
+        # Per-process statistics in the backend's report order
+        self.pid = pid
+        self.arrival = arrival
+        self.burst = burst
+        self.completion = completion
+        self.turnaround = turnaround
+        self.waiting = waiting
+
+    @classmethod
+    def from_json(cls, payload, segment=None):
+        """Build a result from one decoded JSON document
+
+        Documents with a "segment" reference take their columns from
+        segment, the SharedTransfer the backend wrote them to.
+        """
+        with metrics.timer('result_parse_seconds', "Decoding one JSON result frame").time():
+            return cls._from_json(payload, segment)
+
+    @classmethod
+    def _from_json(cls, payload, segment):
+        doc = json.loads(payload)
+        if 'segment' in doc:
+            if segment is None:
+                raise ProtocolError("Result refers to a segment, but none is mapped")
+            columns = segment.read_result(*doc['segment'])
+            slices = len(columns[0])
+        else:
+            gantt = array('q', doc['gantt'])
+            stats = array('q', doc['stats'])
+            if len(gantt) % GANTT_FIELDS or len(stats) % STATS_FIELDS:
+                raise ProtocolError("Result arrays are not whole records")
+            # Flat triples/rows from the backend, split into columns by slicing
+            columns = ([gantt[k::GANTT_FIELDS] for k in range(GANTT_FIELDS)]
+                       + [stats[k::STATS_FIELDS] for k in range(STATS_FIELDS)])
+            slices = len(gantt) // GANTT_FIELDS
+        cores = CoreStats.from_dict(doc) if 'cpus' in doc else None
+        if cores is not None and sum(cores.lanes) != slices:
+            raise ProtocolError("Core lanes do not cover the Gantt slices")
+        return cls(doc['algorithm'], doc['quantum'], *columns,
+                   doc['avg_wt'], doc['avg_tat'], cores, doc.get('summary'))
+
+    @property
+    def cpus(self):
+        return self.cores.cpus if self.cores else 1
+
+    @property
+    def slice_count(self):
+        return len(self.slice_pid)
+
+    @property
+    def makespan(self):
+        return max(self.slice_end) if self.slice_end else 0
+
+    @property
+    def summary(self):
+        """SUMMARY_FIELDS as a dict: the backend's figures, or computed here"""
+        if self._summary is None:
+            self._summary = self._summarize()
+        return self._summary
+
+    def _summarize(self):
+        first = {}
+        for pid, start in zip(self.slice_pid, self.slice_start):
+            if start < first.get(pid, start + 1):
+                first[pid] = start
+        n = len(self.pid)
+        span = self.makespan or 1
+        response = sum(first.get(pid, 0) - at for pid, at in zip(self.pid, self.arrival))
+        return {
+            'makespan': self.makespan,
+            'throughput': round(n / span, 4),
+            'utilization': round(sum(self.burst) * 100 / (span * self.cpus), 2),
+            'avg_response': round(response / (n or 1), 2),
+            'max_waiting': max(self.waiting, default=0),
+            'preemptions': self.slice_count - n,
+        }
+
+    def gantt_entries(self):
+        """Slices as the {'pid', 'start', 'end'} dicts the Gantt chart draws"""
+        return [{'pid': f"P{pid}", 'start': start, 'end': end}
+                for pid, start, end in zip(self.slice_pid, self.slice_start, self.slice_end)]
+
+    def format_report(self, first_row=0):
+        """Human-readable report for the results tabs
+
+        With first_row set, the report starts at that stats row instead,
+        for patching a report already shown (REPORT_HEADER_LINES precede
+        the first row).
+        """
+        title = self.algorithm
+        if self.quantum:
+            title += f" (Quantum={self.quantum})"
+        if self.cores:
+            title += f" on {self.cpus} CPUs"
+        lines = []
+        if not first_row:
+            lines = [f"--- {title} ---", "ID\tAT\tBT\tCT\tTAT\tWT",
+                     "----------------------------------------"]
+        for row in zip(self.pid[first_row:], self.arrival[first_row:], self.burst[first_row:],
+                       self.completion[first_row:], self.turnaround[first_row:],
+                       self.waiting[first_row:]):
+            lines.append("P{}\t{}\t{}\t{}\t{}\t{}".format(*row))
+        lines.append("----------------------------------------")
+        lines.append(f"Avg Waiting Time: {self.avg_wt:.2f}")
+        lines.append(f"Avg Turnaround Time: {self.avg_tat:.2f}")
+        if self.cores:
+            lines.extend(self._core_report())
+        return '\n'.join(lines) + '\n'
+
+    def _core_report(self):
+        makespan = self.makespan or 1
+        lines = ["", "--- Per-CPU Statistics ---", "CPU\tBusy\tUtil%\tDone\tSteals\tJobs/100t",
+                 "----------------------------------------"]
+        for cpu, (busy, done, steals) in enumerate(zip(self.cores.busy, self.cores.completed,
+                                                       self.cores.steals)):
+            lines.append(f"{cpu}\t{busy}\t{busy * 100 / makespan:.1f}\t{done}\t{steals}"
+                         f"\t{done * 100 / makespan:.2f}")
+        lines.append("----------------------------------------")
+        total = sum(self.cores.busy)
+        lines.append(f"Overall Utilization: {total * 100 / (makespan * self.cpus):.1f}%")
+        return lines
+
+
+class FrameDecoder:
+    """Incremental decoder fed one stdout line at a time
+
+    feed() returns a ScheduleResult when a frame completes, the line
+    itself for ordinary text output, or None while a frame is pending.
+    segment is the SharedTransfer that RESULT_MAP frames refer to.
+    """
+
+    def __init__(self, segment=None):
+        self.segment = segment
+        self._expected = None
+
+    def feed(self, line):
+        if self._expected is not None:
+            size, self._expected = self._expected, None
+            payload = line.rstrip('\r\n')
+            if len(payload) != size:
+                raise ProtocolError(f"Expected {size} bytes of JSON, got {len(payload)}")
+            return ScheduleResult.from_json(payload, self.segment)
+
+        for header in (FRAME_HEADER, MAP_FRAME_HEADER):
+            if line.startswith(header + ' '):
+                self._expected = int(line[len(header) + 1:])
+                return None
+        return line
+
+
+def decode_results(output, segment=None):
+    """Split a complete response into its results and leftover text"""
+    decoder = FrameDecoder(segment)
+    results = []
+    text = []
+    for line in output.splitlines(keepends=True):
+        item = decoder.feed(line)
+        if isinstance(item, ScheduleResult):
+            results.append(item)
+        elif item is not None:
+            text.append(item)
+    return results, ''.join(text)
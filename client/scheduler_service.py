@@ -0,0 +1,465 @@
+"""
+Advanced OS Project - Scheduling Service
+Long-lived daemon that keeps a few main_system backends warm and serves
+scheduling requests from many clients over a local socket
+
+Usage:
+    python client/scheduler_service.py --listen 127.0.0.1:9092 --workers 4
+    OSNEXUS_SERVICE=127.0.0.1:9092 python client/mainClient.py
+"""
+
+import argparse
+import collections
+import os
+import socketserver
+import sys
+import threading
+import time
+
+import metrics
+from backend_launcher import (SERVICE_HOST, SERVICE_PORT, describe_search, locate_backend,
+                              parse_address)
+from backend_session import EXIT_OPTION, RESPONSE_DELIMITER, BackendError, BackendSession
+from scheduling_engine import OPTION_ALGORITHMS
+
+
+QUEUE_LIMIT = 256            # Queued runs beyond this are refused until workers catch up
+SMALL_JOB_PROCESSES = 2000   # Runs on workloads up to this size may share one backend write
+BATCH_MAX_JOBS = 32
+BATCH_MAX_PROCESSES = 20000
+BACKEND_TIMEOUT = 60
+MAX_LINES = 10_000_000       # LOAD and TRACE data lines one command may declare
+INT_MIN, INT_MAX = -2 ** 31, 2 ** 31 - 1
+
+FORMATS = ('TEXT', 'JSON')
+UNSUPPORTED = ('HEAP', 'ALLOCBENCH', 'LOADMAP')
+
+
+class Disconnect(Exception):
+    """Stop serving a connection: the client went away or cannot be resynced
+
+    The message, if any, is sent as a last reply.
+    """
+
+
+class ServiceJob:
+    """One RUN from one connection, with the settings it runs under"""
+
+    def __init__(self, option, workload, settings, on_line=None):
+        self.option = option
+        self.workload = workload      # Workload of the connection that sent it
+        self.settings = settings      # (format, quantum, cpus)
+        self.on_line = on_line        # Streams output when the job runs alone
+        self.response = None
+        self.streamed = False
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.done = threading.Event()
+        self.queued = time.perf_counter()
+
+    @property
+    def small(self):
+        return len(self.workload) <= SMALL_JOB_PROCESSES
+
+
+class Workload:
+    """A LOAD payload kept as the backend will be sent it"""
+
+    def __init__(self, payload, count):
+        self.payload = payload
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+
+class Worker:
+    """One warm backend and the settings last sent to it
+
+    Settings and the loaded workload are only re-sent when they change, so
+    a client running several algorithms on one workload pays for LOAD once
+    per backend.
+    """
+
+    def __init__(self, exe_path, timeout):
+        self.session = BackendSession(exe_path, timeout=timeout)
+        self.reset()
+
+    def reset(self):
+        self.format = self.quantum = self.cpus = self.loaded = None
+
+    def payloads(self, job):
+        """Commands that run job on this backend; only the last one's reply matters"""
+        fmt, quantum, cpus = job.settings
+        payloads = []
+        if fmt != self.format:
+            payloads.append(f"FORMAT {fmt}\n")
+        if quantum != self.quantum:
+            payloads.append(f"QUANTUM {quantum}\n")
+        if cpus != self.cpus:
+            payloads.append(f"CPUS {cpus}\n")
+        if job.workload is not self.loaded:
+            payloads.append(job.workload.payload)
+        payloads.append(f"RUN {job.option}\n")
+        self.format, self.quantum, self.cpus, self.loaded = fmt, quantum, cpus, job.workload
+        return payloads
+
+    def run(self, batch):
+        """Send every job of the batch in one pipelined write"""
+        if not self.session.is_alive():
+            self.reset()   # A restarted backend has default settings again
+        try:
+            if len(batch) == 1:
+                job = batch[0]
+                payloads = self.payloads(job)
+                job.streamed = job.on_line is not None
+                job.response = self.session.pipeline(payloads, on_line=job.on_line,
+                                                     cancel_event=job.cancel_event,
+                                                     skip=len(payloads) - 1)[0]
+                return
+            counts = []
+            payloads = []
+            for job in batch:
+                commands = self.payloads(job)
+                counts.append(len(commands))
+                payloads.extend(commands)
+            responses = self.session.pipeline(payloads)
+            end = 0
+            for job, count in zip(batch, counts):
+                end += count
+                job.response = responses[end - 1]
+        except BackendError as e:
+            self.reset()
+            for job in batch:
+                job.error = e
+
+    def close(self):
+        self.session.close()
+
+
+class SchedulingService:
+    """Request queue in front of a bounded pool of warm backends
+
+    Each worker thread owns one backend. A worker takes the oldest queued
+    run; if it is small, the small runs queued right behind it go in the
+    same backend write (micro-batching), so bursts of tiny requests cost
+    one pipe round trip per batch rather than per run. Batching never
+    waits for more work, so a lone request is not delayed. When the queue
+    holds queue_limit runs, new ones are refused.
+    """
+
+    def __init__(self, exe_path, workers=None, queue_limit=QUEUE_LIMIT, timeout=BACKEND_TIMEOUT):
+        self.exe_path = exe_path
+        self.queue_limit = queue_limit
+        count = max(1, workers or os.cpu_count() or 1)
+        self.workers = [Worker(exe_path, timeout) for _ in range(count)]
+        self.batches = 0
+        self.jobs = 0
+        self.running = 0
+        self._queue = collections.deque()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._threads = []
+
+    def start(self):
+        for k, worker in enumerate(self.workers):
+            thread = threading.Thread(target=self._work, args=(worker,),
+                                      name=f'service-worker-{k}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Finish nothing further: fail queued jobs and close the backends"""
+        with self._cond:
+            self._stopping = True
+            pending = list(self._queue)
+            self._queue.clear()
+            self._cond.notify_all()
+        for job in pending:
+            job.error = BackendError("Scheduling service is shutting down")
+            job.done.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        for worker in self.workers:
+            worker.close()
+
+    def submit(self, job):
+        """Queue a job; False if the queue is full"""
+        with self._cond:
+            if self._stopping or len(self._queue) >= self.queue_limit:
+                metrics.counter('service_rejected', "Runs refused because the queue was full").inc()
+                return False
+            self._queue.append(job)
+            self._cond.notify()
+        return True
+
+    def status(self):
+        with self._cond:
+            queued = len(self._queue)
+        return (f"OK: Workers {len(self.workers)}, running {self.running}, queued {queued}, "
+                f"jobs {self.jobs}, batches {self.batches}")
+
+    def _next_batch(self):
+        """Block for the oldest job, plus the small jobs queued right behind it"""
+        with self._cond:
+            while not self._queue and not self._stopping:
+                self._cond.wait()
+            if self._stopping:
+                return None
+            batch = [self._queue.popleft()]
+            if batch[0].small:
+                processes = len(batch[0].workload)
+                while (self._queue and self._queue[0].small and len(batch) < BATCH_MAX_JOBS
+                       and processes + len(self._queue[0].workload) <= BATCH_MAX_PROCESSES):
+                    job = self._queue.popleft()
+                    processes += len(job.workload)
+                    batch.append(job)
+            self.running += len(batch)
+            return batch
+
+    def _work(self, worker):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            now = time.perf_counter()
+            wait = metrics.timer('service_queue_seconds', "Time runs spent queued")
+            for job in batch:
+                wait.observe(now - job.queued)
+            worker.run(batch)
+            with self._cond:
+                self.running -= len(batch)
+                self.jobs += len(batch)
+                self.batches += 1
+            metrics.counter('service_batches', "Backend writes made by the service").inc()
+            metrics.counter('service_jobs', "Runs completed by the service").inc(len(batch))
+            for job in batch:
+                job.done.set()
+
+
+# ========== CONNECTIONS ==========
+
+class ConnectionHandler(socketserver.StreamRequestHandler):
+    """One client connection, speaking the backend's API protocol
+
+    FORMAT, QUANTUM, CPUS and LOAD only change this connection's state;
+    RUN queues a job with that state and answers when it finishes; STATUS
+    and PING answer without a backend. Every
+    reply ends with END_OF_RESPONSE, and RUN 8 closes the connection.
+    """
+
+    wbufsize = 64 * 1024
+
+    def setup(self):
+        super().setup()
+        self.format = 'TEXT'
+        self.quantum = 2
+        self.cpus = 1
+        self.workload = None
+
+    def handle(self):
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            words = line.decode('utf-8', 'replace').split()
+            if not words:
+                continue
+            if words[0] == 'RUN' and words[1:] == [str(EXIT_OPTION)]:
+                return
+            try:
+                reply = self.command(words)
+            except ValueError as e:
+                reply = f"ERROR: {e}\n"
+            except Disconnect as e:
+                if str(e):
+                    self.wfile.write(f"ERROR: {e}\n{RESPONSE_DELIMITER}\n".encode('utf-8'))
+                return
+            if reply is not None:
+                self.wfile.write(reply.encode('utf-8'))
+            self.wfile.write(f"{RESPONSE_DELIMITER}\n".encode('utf-8'))
+            self.wfile.flush()
+
+    def command(self, words):
+        """Reply text for one command; None when a RUN already streamed it"""
+        name, args = words[0], words[1:]
+        if name == 'FORMAT':
+            if len(args) != 1 or args[0] not in FORMATS:
+                raise ValueError("Unknown format. The service supports FORMAT TEXT or FORMAT JSON")
+            self.format = args[0]
+            return f"OK: Result format {self.format}\n"
+        if name == 'QUANTUM':
+            self.quantum = self._number(args, 1, INT_MAX, "QUANTUM <n> with n >= 1")
+            return f"OK: Quantum {self.quantum}\n"
+        if name == 'CPUS':
+            self.cpus = self._number(args, 1, 256, "CPUS <n> with 1 <= n <= 256")
+            return f"OK: CPUs {self.cpus}\n"
+        if name == 'LOAD':
+            count = self._number(args, 0, sys.maxsize, "LOAD <count> then count lines of "
+                                                       "arrival burst priority")
+            self._check_line_count(count)
+            self.workload = self._read_workload(count)
+            return f"OK: Loaded {count} processes\n"
+        if name == 'RUN':
+            return self._run(self._number(args, 0, INT_MAX, "RUN <option>"))
+        if name == 'STATUS':
+            return self.server.service.status() + '\n'
+        if name == 'PING':
+            return "OK: PONG\n"
+        if name in UNSUPPORTED:
+            raise ValueError(f"{name} is not available through the scheduling service")
+        if name == 'TRACE':
+            self._skip_lines(args)   # Its operation lines are not commands
+            raise ValueError("TRACE is not available through the scheduling service")
+        raise ValueError(f"Unknown command {name}")
+
+    @staticmethod
+    def _number(args, low, high, usage):
+        if len(args) != 1 or not args[0].lstrip('-').isdigit() or not low <= int(args[0]) <= high:
+            raise ValueError(f"Invalid input. Format: {usage}")
+        return int(args[0])
+
+    @staticmethod
+    def _check_line_count(count):
+        # Data lines that follow cannot be told apart from commands, so a
+        # count that is refused ends the connection rather than desyncing it
+        if count > MAX_LINES:
+            raise Disconnect(f"At most {MAX_LINES:,} lines per command")
+
+    def _readline(self):
+        """Next data line; an empty read means the client disconnected"""
+        line = self.rfile.readline()
+        if not line:
+            raise Disconnect()
+        return line
+
+    def _skip_lines(self, args):
+        if len(args) == 1 and args[0].isdigit():
+            self._check_line_count(int(args[0]))
+            for _ in range(int(args[0])):
+                self._readline()
+
+    def _read_workload(self, count):
+        """Read and check count process lines; the payload is rebuilt so
+        the backend always receives well-formed input"""
+        lines = [f"LOAD {count}"]
+        bad = None
+        for i in range(count):
+            fields = self._readline().split()
+            if bad is not None:
+                continue   # Consume the rest so the next command parses
+            try:
+                values = [int(v) for v in fields]
+            except ValueError:
+                values = []
+            if len(values) != 3 or not all(INT_MIN <= v <= INT_MAX for v in values):
+                bad = i
+                continue
+            lines.append(f"{values[0]} {values[1]} {values[2]}")
+        if bad is not None:
+            raise ValueError(f"Bad process line {bad + 1} of {count}")
+        return Workload('\n'.join(lines) + '\n', count)
+
+    def _run(self, option):
+        if option != 6 and option not in OPTION_ALGORITHMS:
+            raise ValueError(f"Option {option} is not a scheduling algorithm")
+        if self.workload is None:
+            raise ValueError("No workload. Send LOAD first")
+        job = ServiceJob(option, self.workload, (self.format, self.quantum, self.cpus))
+
+        def stream(line):
+            # A client that went away cancels the run, killing its backend
+            try:
+                self.wfile.write(line.encode('utf-8'))
+            except OSError:
+                job.cancel_event.set()
+
+        job.on_line = stream
+        if not self.server.service.submit(job):
+            raise ValueError("Scheduling service is busy, retry later")
+        job.done.wait()
+        if job.error is not None:
+            return f"ERROR: {job.error}\n"
+        return None if job.streamed else job.response
+
+    def finish(self):
+        try:
+            super().finish()
+        except OSError:
+            pass
+
+
+class _Server(socketserver.ThreadingMixIn):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128   # Listen backlog; the default 5 stalls bursts of connects
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], (ConnectionError, OSError)):
+            super().handle_error(request, client_address)
+
+
+class ServiceTCPServer(_Server, socketserver.TCPServer):
+    pass
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class ServiceUnixServer(_Server, socketserver.UnixStreamServer):
+        pass
+
+
+def make_server(address, service):
+    """Listening server for a parse_address spec; the service handles its runs"""
+    family, target = parse_address(address)
+    if family == 'unix':
+        if os.path.exists(target):
+            os.remove(target)   # Left behind by a previous run
+        server = ServiceUnixServer(target, ConnectionHandler)
+    else:
+        server = ServiceTCPServer(target, ConnectionHandler)
+    server.service = service
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared scheduling service in front of warm "
+                                                 "main_system backends")
+    parser.add_argument('--listen', default=f"{SERVICE_HOST}:{SERVICE_PORT}",
+                        help=f"HOST:PORT or unix:PATH (default: {SERVICE_HOST}:{SERVICE_PORT})")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="Backends running at once (default: every core)")
+    parser.add_argument('--queue', type=int, default=QUEUE_LIMIT,
+                        help=f"Queued runs before new ones are refused (default: {QUEUE_LIMIT})")
+    parser.add_argument('--backend', help="Path to main_system "
+                        "(default: $OSNEXUS_BACKEND, server/, then PATH)")
+    parser.add_argument('--timeout', type=float, default=BACKEND_TIMEOUT,
+                        help="Backend idle timeout per run, seconds")
+    args = parser.parse_args(argv)
+
+    exe_path = args.backend or locate_backend()
+    if exe_path is None:
+        parser.error(f"main_system not found (searched {describe_search()}); "
+                     "build it or pass --backend")
+    try:
+        parse_address(args.listen)
+    except ValueError as e:
+        parser.error(str(e))
+
+    service = SchedulingService(exe_path, args.workers, args.queue, args.timeout)
+    service.start()
+    server = make_server(args.listen, service)
+    print(f"Scheduling service on {args.listen}: {len(service.workers)} workers, "
+          f"backend {exe_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+        if isinstance(server.server_address, str) and os.path.exists(server.server_address):
+            os.remove(server.server_address)   # The Unix socket file
+
+
+if __name__ == '__main__':
+    main()
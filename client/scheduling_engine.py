@@ -0,0 +1,651 @@
+"""
+Advanced OS Project - In-Process Scheduling Engine
+FCFS, SJF, Priority, Round Robin, SRTF, preemptive Priority and MLFQ over
+columnar workloads, on one CPU or many, matching the C++ EnhancedScheduler
+result for result without a backend round trip
+"""
+
+import heapq
+from array import array
+from bisect import bisect_right
+from collections import deque
+
+from result_protocol import CoreStats, ScheduleResult
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python paths cover everything
+    np = None
+
+
+DEFAULT_QUANTUM = 2
+AGING_INTERVAL = 5   # waiting this long raises a ready process one priority level
+MLFQ_LEVELS = 3      # level L runs round robin with quantum << L
+MAX_CPUS = 256
+MLFQ_LEVEL_KEY = 1 << 40   # MLFQ run-queue key = level * MLFQ_LEVEL_KEY + sequence
+
+# Menu option -> algorithm name, as used by main_system
+OPTION_ALGORITHMS = {
+    2: 'FCFS',
+    3: 'SJF',
+    4: 'Priority',
+    5: 'Round Robin',
+    13: 'SRTF',
+    14: 'Preemptive Priority',
+    15: 'MLFQ',
+}
+ALL_OPTION = 6
+# Algorithms whose result depends on the quantum
+QUANTUM_ALGORITHMS = ('Round Robin', 'MLFQ')
+
+
+def _column(values):
+    """Copy any int sequence (list, array, NumPy array) into an int64 array"""
+    if np is not None and isinstance(values, np.ndarray):
+        return array('q', values.astype(np.int64).tobytes())
+    return array('q', values)
+
+
+def _stable_order(keys):
+    """Indices sorted by key, ties kept in input order (std::stable_sort)"""
+    return sorted(range(len(keys)), key=keys.__getitem__)
+
+
+def _result(algorithm, quantum, slices, order, arrival, burst, completion, cores=None):
+    """Assemble a ScheduleResult with stats rows listed in the given order"""
+    slice_pid, slice_start, slice_end = slices
+    pid = array('q', (k + 1 for k in order))
+    at = array('q', (arrival[k] for k in order))
+    bt = array('q', (burst[k] for k in order))
+    ct = array('q', (completion[k] for k in order))
+    tat = array('q', (c - a for c, a in zip(ct, at)))
+    wt = array('q', (t - b for t, b in zip(tat, bt)))
+    n = len(order) or 1
+    return ScheduleResult(algorithm, quantum, slice_pid, slice_start, slice_end,
+                          pid, at, bt, ct, tat, wt, sum(wt) / n, sum(tat) / n, cores)
+
+
+def fcfs(arrival, burst, priority=None):
+    """First Come First Serve; process i gets pid i + 1"""
+    if np is not None and len(arrival) > 0:
+        return _fcfs_numpy(np.asarray(arrival, dtype=np.int64),
+                           np.asarray(burst, dtype=np.int64))
+
+    arrival, burst = _column(arrival), _column(burst)
+    order = _stable_order(arrival)
+    completion = array('q', bytes(8 * len(arrival)))
+    slice_pid, slice_start, slice_end = array('q'), array('q'), array('q')
+
+    time = 0
+    for k in order:
+        if time < arrival[k]:
+            time = arrival[k]
+        slice_pid.append(k + 1)
+        slice_start.append(time)
+        time += burst[k]
+        slice_end.append(time)
+        completion[k] = time
+    return _result('FCFS', 0, (slice_pid, slice_start, slice_end),
+                   order, arrival, burst, completion)
+
+
+def _fcfs_numpy(arrival, burst):
+    """Vectorised FCFS: end_i = C_i + max(0, max_{j<=i}(a_j - C_{j-1}))"""
+    order = np.argsort(arrival, kind='stable')
+    a = arrival[order]
+    b = burst[order]
+    cumulative = np.cumsum(b)
+    slack = np.maximum.accumulate(a - (cumulative - b))
+    end = cumulative + np.maximum(slack, 0)
+    start = end - b
+    tat = end - a
+    wt = tat - b
+
+    as_array = lambda values: array('q', values.astype(np.int64).tobytes())
+    pid = as_array(order + 1)
+    return ScheduleResult(
+        'FCFS', 0, pid, as_array(start), as_array(end),
+        pid, as_array(a), as_array(b), as_array(end), as_array(tat), as_array(wt),
+        float(wt.mean()), float(tat.mean()))
+
+
+def _non_preemptive(algorithm, arrival, burst, key):
+    """Shared SJF/Priority loop: pick the smallest (key, position) ready job"""
+    arrival, burst, key = _column(arrival), _column(burst), _column(key)
+    n = len(arrival)
+    # Backend sorts by (arrival, key) and breaks heap ties on sorted position
+    order = sorted(range(n), key=lambda k: (arrival[k], key[k]))
+    completion = array('q', bytes(8 * n))
+    slice_pid, slice_start, slice_end = array('q'), array('q'), array('q')
+
+    ready = []
+    time = 0
+    i = 0
+    while i < n or ready:
+        while i < n and arrival[order[i]] <= time:
+            heapq.heappush(ready, (key[order[i]], i))
+            i += 1
+        if ready:
+            _, pos = heapq.heappop(ready)
+            k = order[pos]
+            slice_pid.append(k + 1)
+            slice_start.append(time)
+            time += burst[k]
+            slice_end.append(time)
+            completion[k] = time
+        else:
+            time = arrival[order[i]]
+    return _result(algorithm, 0, (slice_pid, slice_start, slice_end),
+                   order, arrival, burst, completion)
+
+
+def sjf(arrival, burst, priority=None):
+    """Non-preemptive Shortest Job First"""
+    return _non_preemptive('SJF', arrival, burst, burst)
+
+
+def priority_schedule(arrival, burst, priority):
+    """Non-preemptive Priority (lower number runs first)"""
+    return _non_preemptive('Priority', arrival, burst, priority)
+
+
+def round_robin(arrival, burst, priority=None, quantum=DEFAULT_QUANTUM):
+    """Round Robin; arrivals during a slice queue ahead of the preempted job"""
+    arrival, burst = _column(arrival), _column(burst)
+    quantum = max(1, int(quantum))
+    n = len(arrival)
+    order = _stable_order(arrival)
+    remaining = array('q', burst)
+    completion = array('q', bytes(8 * n))
+    slice_pid, slice_start, slice_end = array('q'), array('q'), array('q')
+
+    ready = deque()
+    time = 0
+    i = 0
+    done = 0
+    while done < n:
+        if not ready and time < arrival[order[i]]:
+            time = arrival[order[i]]
+        while i < n and arrival[order[i]] <= time:
+            ready.append(order[i])
+            i += 1
+
+        k = ready.popleft()
+        run = min(quantum, remaining[k])
+        slice_pid.append(k + 1)
+        slice_start.append(time)
+        time += run
+        slice_end.append(time)
+        remaining[k] -= run
+
+        while i < n and arrival[order[i]] <= time:
+            ready.append(order[i])
+            i += 1
+
+        if remaining[k] > 0:
+            ready.append(k)
+        else:
+            completion[k] = time
+            done += 1
+    return _result('Round Robin', quantum, (slice_pid, slice_start, slice_end),
+                   range(n), arrival, burst, completion)
+
+
+def _preemptive(algorithm, arrival, burst, priority, aging):
+    """Event-driven preemptive core shared by SRTF and preemptive Priority
+
+    Time jumps from arrival to arrival or to the running process finishing,
+    and only arrivals preempt, so this is O(n log n) with at most 2n slices.
+    Heap entries are (key, arrival position); SRTF keys on remaining burst,
+    aging keys on priority * AGING_INTERVAL + time the process became ready.
+    """
+    arrival, burst = _column(arrival), _column(burst)
+    priority = _column(priority) if aging else None
+    n = len(arrival)
+    order = _stable_order(arrival)
+    remaining = array('q', burst)
+    completion = array('q', bytes(8 * n))
+    slice_pid, slice_start, slice_end = array('q'), array('q'), array('q')
+
+    def key_at(pos, now):
+        if aging:
+            return priority[order[pos]] * AGING_INTERVAL + now
+        return remaining[order[pos]]
+
+    ready = []
+    current = None
+    slice_from = 0
+    time = 0
+    i = 0
+    done = 0
+    while done < n:
+        if current is None and not ready and time < arrival[order[i]]:
+            time = arrival[order[i]]
+        while i < n and arrival[order[i]] <= time:
+            heapq.heappush(ready, (key_at(i, time), i))
+            i += 1
+
+        if current is not None:
+            if not aging:
+                current = (remaining[order[current[1]]], current[1])
+            if ready and ready[0] < current:
+                # A better process arrived: requeue the running one
+                slice_pid.append(order[current[1]] + 1)
+                slice_start.append(slice_from)
+                slice_end.append(time)
+                heapq.heappush(ready, (key_at(current[1], time), current[1]))
+                current = None
+        if current is None:
+            current = heapq.heappop(ready)
+            slice_from = time
+
+        k = order[current[1]]
+        end = time + remaining[k]
+        if i < n and arrival[order[i]] < end:
+            end = arrival[order[i]]
+        remaining[k] -= end - time
+        time = end
+
+        if remaining[k] == 0:
+            slice_pid.append(k + 1)
+            slice_start.append(slice_from)
+            slice_end.append(time)
+            completion[k] = time
+            current = None
+            done += 1
+    return _result(algorithm, 0, (slice_pid, slice_start, slice_end),
+                   range(n), arrival, burst, completion)
+
+
+def srtf(arrival, burst, priority=None):
+    """Shortest Remaining Time First (preemptive SJF)"""
+    return _preemptive('SRTF', arrival, burst, None, aging=False)
+
+
+def preemptive_priority(arrival, burst, priority):
+    """Preemptive Priority with aging: a ready process gains one level per
+    AGING_INTERVAL waited, restarting when it is preempted"""
+    return _preemptive('Preemptive Priority', arrival, burst, priority, aging=True)
+
+
+def mlfq(arrival, burst, priority=None, quantum=DEFAULT_QUANTUM):
+    """Multilevel feedback queue: MLFQ_LEVELS round-robin levels with
+    quantum << level; using a whole quantum drops a level, and arrivals
+    preempt processes running below level 0"""
+    arrival, burst = _column(arrival), _column(burst)
+    quantum = max(1, int(quantum))
+    n = len(arrival)
+    order = _stable_order(arrival)
+    remaining = array('q', burst)
+    completion = array('q', bytes(8 * n))
+    slice_pid, slice_start, slice_end = array('q'), array('q'), array('q')
+
+    levels = [deque() for _ in range(MLFQ_LEVELS)]
+    queued = 0
+    time = 0
+    i = 0
+    done = 0
+    while done < n:
+        if not queued and time < arrival[order[i]]:
+            time = arrival[order[i]]
+        while i < n and arrival[order[i]] <= time:
+            levels[0].append(order[i])
+            i += 1
+            queued += 1
+
+        level = 0
+        while not levels[level]:
+            level += 1
+        k = levels[level].popleft()
+        queued -= 1
+
+        quantum_at = quantum << level
+        end = time + min(quantum_at, remaining[k])
+        if level and i < n and arrival[order[i]] < end:
+            end = arrival[order[i]]
+        slice_pid.append(k + 1)
+        slice_start.append(time)
+        slice_end.append(end)
+        used = end - time
+        remaining[k] -= used
+        time = end
+
+        while i < n and arrival[order[i]] <= time:
+            levels[0].append(order[i])
+            i += 1
+            queued += 1
+
+        if remaining[k] > 0:
+            if used == quantum_at and level < MLFQ_LEVELS - 1:
+                level += 1
+            levels[level].append(k)
+            queued += 1
+        else:
+            completion[k] = time
+            done += 1
+    return _result('MLFQ', quantum, (slice_pid, slice_start, slice_end),
+                   range(n), arrival, burst, completion)
+
+
+# ========== MULTI-CORE ==========
+
+# Policies the SMP core knows: algorithm -> (preemptive, uses quantum)
+SMP_POLICIES = {
+    'FCFS': (False, False),
+    'SJF': (False, False),
+    'Priority': (False, False),
+    'Round Robin': (False, True),
+    'SRTF': (True, False),
+    'Preemptive Priority': (True, False),
+    'MLFQ': (True, True),
+}
+
+
+CHECKPOINT_STEPS = 512   # minimum loop iterations between SmpSimulation checkpoints
+
+
+class Checkpoint:
+    """SmpSimulation state at the top of the event loop
+
+    time is the last event time already handled, so the state depends
+    only on processes arriving by then. remaining and level are kept just
+    for the processes queued or running; every other placed process has
+    finished and every unplaced one still has its full burst.
+    """
+
+    __slots__ = ('time', 'i', 'done', 'queued', 'seq', 'queues', 'events', 'run_pos',
+                 'run_key', 'run_start', 'token', 'lane_lengths', 'busy', 'completed',
+                 'steals', 'live')
+
+    def __init__(self, sim, time):
+        self.time = time
+        self.i, self.done, self.queued, self.seq = sim.i, sim.done, sim.queued, sim.seq
+        self.queues = [list(queue) for queue in sim.queues]
+        self.events = list(sim.events)
+        self.run_pos = list(sim.run_pos)
+        self.run_key = list(sim.run_key)
+        self.run_start = list(sim.run_start)
+        self.token = list(sim.token)
+        self.lane_lengths = [len(lane[0]) for lane in sim.lanes]
+        self.busy = list(sim.busy)
+        self.completed = list(sim.completed)
+        self.steals = list(sim.steals)
+        live = [pos for queue in sim.queues for _, pos in queue]
+        live.extend(pos for pos in sim.run_pos if pos >= 0)
+        self.live = [(k, sim.remaining[k], sim.level[k]) for k in map(sim.order.__getitem__, live)]
+
+    def size(self):
+        """Entries copied to take this checkpoint"""
+        return len(self.events) + len(self.live) + len(self.run_pos)
+
+
+class SmpSimulation:
+    """Resumable state of one smp_schedule run
+
+    run() drives the event loop to the end. With checkpoint_steps set it
+    saves a Checkpoint every so often along the timeline, spaced so the
+    copying stays proportional to the simulation itself; resume() starts
+    a run over an edited workload from one of them instead of from zero.
+    """
+
+    def __init__(self, algorithm, arrival, burst, priority, quantum=DEFAULT_QUANTUM, cpus=2,
+                 order=None, checkpoint_steps=None):
+        self.algorithm = algorithm
+        self.preemptive, uses_quantum = SMP_POLICIES[algorithm]
+        self.arrival, self.burst = _column(arrival), _column(burst)
+        n = len(self.arrival)
+        self.priority = _column(priority) if priority is not None else array('q', bytes(8 * n))
+        self.quantum = max(1, int(quantum)) if uses_quantum else 0
+        self.cpus = cpus
+        self.order = _stable_order(self.arrival) if order is None else order
+        self.checkpoint_steps = checkpoint_steps
+        self.checkpoints = []
+
+        self.remaining = array('q', self.burst)
+        self.level = [0] * n
+        self.completion = array('q', bytes(8 * n))
+        self.seq = 0
+        self.queues = [[] for _ in range(cpus)]
+        self.run_pos = [-1] * cpus
+        self.run_key = [0] * cpus
+        self.run_start = [0] * cpus
+        self.token = [0] * cpus
+        self.lanes = [(array('q'), array('q'), array('q')) for _ in range(cpus)]
+        self.busy = [0] * cpus
+        self.completed = [0] * cpus
+        self.steals = [0] * cpus
+        self.events = []   # (end, cpu, token); stale once the core's token moves on
+        self.queued = 0
+        self.i = 0
+        self.done = 0
+
+    def resume(self, previous, checkpoint):
+        """Continue from a checkpoint of an earlier run (previous)
+
+        Both workloads must be sorted by arrival and agree on every
+        position below checkpoint.i, which holds for any checkpoint taken
+        before the earliest arrival that differs.
+        """
+        n = len(self.arrival)
+        for name in ('queued', 'seq', 'i', 'done'):
+            setattr(self, name, getattr(checkpoint, name))
+        self.queues = [list(queue) for queue in checkpoint.queues]
+        self.events = list(checkpoint.events)
+        for name in ('run_pos', 'run_key', 'run_start', 'token', 'busy', 'completed', 'steals'):
+            setattr(self, name, list(getattr(checkpoint, name)))
+        self.lanes = [tuple(column[:length] for column in lane)
+                      for lane, length in zip(previous.lanes, checkpoint.lane_lengths)]
+        self.completion = previous.completion[:checkpoint.i]
+        self.completion.extend(array('q', bytes(8 * (n - checkpoint.i))))
+        for k, remaining, level in checkpoint.live:
+            self.remaining[k] = remaining
+            self.level[k] = level
+        kept = bisect_right([c.time for c in previous.checkpoints], checkpoint.time)
+        self.checkpoints = previous.checkpoints[:kept]
+
+    def _enqueue_key(self, pos, now):
+        algorithm = self.algorithm
+        k = self.order[pos]
+        if algorithm == 'FCFS':
+            return pos
+        if algorithm == 'SJF':
+            return self.burst[k]
+        if algorithm == 'Priority':
+            return self.priority[k]
+        if algorithm == 'SRTF':
+            return self.remaining[k]
+        if algorithm == 'Preemptive Priority':
+            return self.priority[k] * AGING_INTERVAL + now
+        self.seq += 1
+        if algorithm == 'MLFQ':
+            return self.level[k] * MLFQ_LEVEL_KEY + self.seq
+        return self.seq   # Round Robin: FIFO
+
+    def _stop(self, c, now):
+        k = self.order[self.run_pos[c]]
+        lane_pid, lane_start, lane_end = self.lanes[c]
+        lane_pid.append(k + 1)
+        lane_start.append(self.run_start[c])
+        lane_end.append(now)
+        self.busy[c] += now - self.run_start[c]
+        self.remaining[k] -= now - self.run_start[c]
+        self.run_pos[c] = -1
+        return k
+
+    def run(self):
+        """Simulate to the last completion"""
+        algorithm, preemptive, quantum, cpus = (self.algorithm, self.preemptive,
+                                                self.quantum, self.cpus)
+        arrival, order, remaining, level = self.arrival, self.order, self.remaining, self.level
+        completion, queues, events = self.completion, self.queues, self.events
+        run_pos, run_key, run_start, token = self.run_pos, self.run_key, self.run_start, self.token
+        completed, steals = self.completed, self.steals
+        enqueue_key, stop = self._enqueue_key, self._stop
+        n = len(arrival)
+        last_time = self.checkpoints[-1].time if self.checkpoints else None
+        steps = 0
+        interval = self.checkpoint_steps
+        while self.done < n:
+            if interval is not None and (last_time is None or steps >= interval):
+                checkpoint = Checkpoint(self, float('-inf') if last_time is None else last_time)
+                self.checkpoints.append(checkpoint)
+                interval = max(self.checkpoint_steps, checkpoint.size())
+                steps = 0
+            steps += 1
+
+            while events and (run_pos[events[0][1]] < 0 or events[0][2] != token[events[0][1]]):
+                heapq.heappop(events)
+            i = self.i
+            time = arrival[order[i]] if i < n else None
+            if events and (time is None or events[0][0] < time):
+                time = events[0][0]
+            last_time = time
+
+            # Slices ending now: finished, or out of quantum
+            expired = []
+            while events and events[0][0] == time:
+                _, c, tok = heapq.heappop(events)
+                if run_pos[c] < 0 or tok != token[c]:
+                    continue
+                pos = run_pos[c]
+                k = stop(c, time)
+                if remaining[k] == 0:
+                    completion[k] = time
+                    completed[c] += 1
+                    self.done += 1
+                else:
+                    if algorithm == 'MLFQ' and level[k] < MLFQ_LEVELS - 1:
+                        level[k] += 1
+                    expired.append((c, pos))
+
+            # Arrivals join the least loaded core
+            while i < n and arrival[order[i]] <= time:
+                c = min(range(cpus), key=lambda cc: (len(queues[cc]) + (run_pos[cc] >= 0), cc))
+                entry = (enqueue_key(i, time), i)
+                if preemptive and run_pos[c] >= 0:
+                    current = (run_key[c], run_pos[c])
+                    if algorithm == 'SRTF':
+                        current = (remaining[order[run_pos[c]]] - (time - run_start[c]), run_pos[c])
+                    if current > entry:
+                        stop(c, time)
+                        heapq.heappush(queues[c], (enqueue_key(current[1], time), current[1]))
+                        self.queued += 1
+                heapq.heappush(queues[c], entry)
+                self.queued += 1
+                i += 1
+            self.i = i
+
+            for c, pos in expired:
+                heapq.heappush(queues[c], (enqueue_key(pos, time), pos))
+                self.queued += 1
+
+            # Idle cores dispatch, stealing when their own queue is empty
+            for c in range(cpus):
+                if not self.queued:
+                    break
+                if run_pos[c] >= 0:
+                    continue
+                source = c
+                if not queues[c]:
+                    longest = 0
+                    for cc in range(cpus):
+                        if len(queues[cc]) > longest:
+                            longest = len(queues[cc])
+                            source = cc
+                    steals[c] += 1
+                key, pos = heapq.heappop(queues[source])
+                self.queued -= 1
+                k = order[pos]
+                run_pos[c] = pos
+                run_key[c] = key
+                run_start[c] = time
+                token[c] += 1
+                run = remaining[k]
+                if algorithm == 'Round Robin':
+                    run = min(run, quantum)
+                elif algorithm == 'MLFQ':
+                    run = min(run, quantum << level[k])
+                heapq.heappush(events, (time + run, c, token[c]))
+        return self
+
+    def slices(self):
+        """Flat pid/start/end columns, grouped by core"""
+        slice_pid, slice_start, slice_end = array('q'), array('q'), array('q')
+        for lane_pid, lane_start, lane_end in self.lanes:
+            slice_pid.extend(lane_pid)
+            slice_start.extend(lane_start)
+            slice_end.extend(lane_end)
+        return slice_pid, slice_start, slice_end
+
+    def core_stats(self):
+        return CoreStats([len(lane[0]) for lane in self.lanes], self.busy, self.completed,
+                         self.steals)
+
+    def result(self):
+        return _result(self.algorithm, self.quantum, self.slices(), range(len(self.arrival)),
+                       self.arrival, self.burst, self.completion, self.core_stats())
+
+
+def smp_schedule(algorithm, arrival, burst, priority, quantum=DEFAULT_QUANTUM, cpus=2):
+    """Run an algorithm on cpus cores with per-CPU run queues
+
+    Mirrors EnhancedScheduler::runSmp. Each core keeps a heap of
+    (key, arrival position) ordered by the algorithm; an arrival joins the
+    least loaded core (running + queued, lowest index on ties) and may
+    preempt it under SRTF, preemptive Priority and MLFQ, and a core with an
+    empty queue steals the best process from the longest one. At each
+    event time finished slices retire, arrivals are placed, expired quanta
+    requeue behind them, then idle cores dispatch in index order. Slices
+    come back grouped by core, with the totals in result.cores.
+    """
+    return SmpSimulation(algorithm, arrival, burst, priority, quantum, cpus).run().result()
+
+
+ALGORITHMS = {
+    'FCFS': fcfs,
+    'SJF': sjf,
+    'Priority': priority_schedule,
+    'Round Robin': round_robin,
+    'SRTF': srtf,
+    'Preemptive Priority': preemptive_priority,
+    'MLFQ': mlfq,
+}
+
+
+def columns_from_processes(processes):
+    """Arrival/burst/priority columns in the order the backend receives them"""
+    if hasattr(processes, 'sorted_columns'):
+        return processes.sorted_columns()
+    ordered = sorted(processes, key=lambda x: x['arrival'])
+    return (array('q', (p['arrival'] for p in ordered)),
+            array('q', (p['burst'] for p in ordered)),
+            array('q', (p['priority'] for p in ordered)))
+
+
+def schedule(algorithm, arrival, burst, priority, quantum=DEFAULT_QUANTUM, cpus=1):
+    """Run one algorithm by name over workload columns on cpus cores"""
+    if cpus > 1:
+        return smp_schedule(algorithm, arrival, burst, priority, quantum, cpus)
+    if algorithm in QUANTUM_ALGORITHMS:
+        return ALGORITHMS[algorithm](arrival, burst, priority, quantum)
+    return ALGORITHMS[algorithm](arrival, burst, priority)
+
+
+def option_algorithms(option):
+    """Algorithm names a scheduler menu option (2-6, 13-15) runs, in backend order"""
+    if option == ALL_OPTION:
+        return list(OPTION_ALGORITHMS.values())
+    if option in OPTION_ALGORITHMS:
+        return [OPTION_ALGORITHMS[option]]
+    raise ValueError(f"Option {option} is not a scheduling algorithm")
+
+
+def is_scheduling_option(option):
+    return option == ALL_OPTION or option in OPTION_ALGORITHMS
+
+
+def run_option(option, processes, quantum=DEFAULT_QUANTUM, cpus=1):
+    """Run a scheduler menu option (2-6, 13-15) the way main_system would"""
+    columns = columns_from_processes(processes)
+    return [schedule(name, *columns, quantum=quantum, cpus=cpus)
+            for name in option_algorithms(option)]
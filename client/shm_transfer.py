@@ -0,0 +1,122 @@
+"""
+Advanced OS Project - Shared-Memory Transfer
+Hands workloads to the backend and takes results back through
+memory-mapped files instead of text on its stdin and stdout
+"""
+
+import mmap
+import os
+import sys
+import tempfile
+from array import array
+
+import metrics
+from result_protocol import ProtocolError
+from scheduling_engine import columns_from_processes
+
+
+# Workload segment: the 8-byte magic, the process count as int64, then the
+# arrival, burst and priority columns (arrival-sorted), count int64 each
+WORKLOAD_MAGIC = b'OSNXWL1\0'
+WORKLOAD_HEADER = 16
+INT_BYTES = 8
+
+# Result segment: per result, slice pid/start/end (slices values each),
+# then pid, arrival, burst, completion, turnaround, waiting (rows each)
+SLICE_COLUMNS = 3
+ROW_COLUMNS = 6
+
+SHM_DIR = '/dev/shm'   # tmpfs on Linux, so the files never reach a disk
+WORKLOAD_PREFIX = 'osnexus-wl-'
+RESULT_PREFIX = 'osnexus-res-'
+
+
+def segment_dir():
+    """Directory for segment files: /dev/shm when usable, else the temp dir"""
+    if os.path.isdir(SHM_DIR) and os.access(SHM_DIR, os.W_OK):
+        return SHM_DIR
+    return tempfile.gettempdir()
+
+
+def _little_endian(column):
+    column = array('q', column)
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column
+
+
+def write_workload(path, columns):
+    """Write (arrival, burst, priority) columns as a workload segment"""
+    arrival, burst, priority = columns
+    n = len(arrival)
+    size = WORKLOAD_HEADER + len(columns) * n * INT_BYTES
+    with open(path, 'r+b') as f:
+        f.truncate(size)
+        with mmap.mmap(f.fileno(), size) as mm:
+            mm[:WORKLOAD_HEADER] = WORKLOAD_MAGIC + n.to_bytes(INT_BYTES, 'little')
+            offset = WORKLOAD_HEADER
+            for column in columns:
+                data = memoryview(_little_endian(column)).cast('B')
+                mm[offset:offset + len(data)] = data
+                offset += len(data)
+
+
+class SharedTransfer:
+    """A pair of segment files owned by one backend session
+
+    load_command() writes a workload and returns the LOADMAP command that
+    points the backend at it; after FORMAT MAP the backend appends each
+    result's columns to the result file, and read_result() copies them
+    out. The backend truncates the result file at the start of every RUN,
+    so a response must be decoded before the session's next run.
+    """
+
+    def __init__(self, directory=None):
+        directory = directory or segment_dir()
+        fd, self.workload_path = tempfile.mkstemp(prefix=WORKLOAD_PREFIX, dir=directory)
+        os.close(fd)
+        fd, self.result_path = tempfile.mkstemp(prefix=RESULT_PREFIX, dir=directory)
+        os.close(fd)
+
+    def format_command(self):
+        return f"FORMAT MAP {self.result_path}\n"
+
+    def load_command(self, processes):
+        """Write processes to the workload segment; returns the LOADMAP command"""
+        with metrics.timer('workload_map_seconds', "Writing a workload segment").time():
+            write_workload(self.workload_path, columns_from_processes(processes))
+        return f"LOADMAP {self.workload_path}\n"
+
+    def read_result(self, offset, slices, rows):
+        """The nine int64 columns of one result written at offset"""
+        size = (SLICE_COLUMNS * slices + ROW_COLUMNS * rows) * INT_BYTES
+        if offset < 0 or slices < 0 or rows < 0:
+            raise ProtocolError("Negative result segment reference")
+        if size == 0:
+            return [array('q') for _ in range(SLICE_COLUMNS + ROW_COLUMNS)]
+        with open(self.result_path, 'rb') as f:
+            length = os.fstat(f.fileno()).st_size
+            if offset + size > length:
+                raise ProtocolError(f"Result segment holds {length} bytes, frame needs "
+                                    f"{offset + size}")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                columns = []
+                start = offset
+                for count in [slices] * SLICE_COLUMNS + [rows] * ROW_COLUMNS:
+                    column = array('q')
+                    column.frombytes(view[start:start + count * INT_BYTES])
+                    if sys.byteorder == 'big':
+                        column.byteswap()
+                    columns.append(column)
+                    start += count * INT_BYTES
+                view.release()
+        return columns
+
+    def close(self):
+        """Remove both segment files; safe to call more than once"""
+        for path in (self.workload_path, self.result_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,150 @@
+"""
+Advanced OS Project - Gantt Slice Index
+Sorted-array index over a schedule's Gantt slices, per CPU and per
+process, so hover lookups, time-range queries and highlighting cost a
+few bisects instead of a scan
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+
+import metrics
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; it only speeds up the per-process index
+    np = None
+
+
+def _gather(column, order):
+    """column[k] for every k in order, as an int64 array"""
+    if len(order) == 1:
+        return array('q', [column[order[0]]])
+    return array('q', itemgetter(*order)(column) if order else ())
+
+
+def _process_order(slice_pid, bounds):
+    """Slice positions sorted by lane, then pid, keeping time order within a pid"""
+    if np is not None and len(slice_pid) > 0:
+        pids = np.asarray(slice_pid, dtype=np.int64)
+        order = np.concatenate([lo + np.argsort(pids[lo:hi], kind='stable')
+                                for lo, hi in bounds])
+        return array('q', order.astype(np.int64).tobytes())
+    order = array('q')
+    for lo, hi in bounds:
+        # Stable, so each process keeps its slices in time order
+        order.extend(sorted(range(lo, hi), key=slice_pid.__getitem__))
+    return order
+
+
+class SliceIndex:
+    """Lookups over time-ordered pid/start/end columns grouped into lanes
+
+    lanes gives the slice count of each CPU lane (the layout of
+    CoreStats.lanes); None means a single lane. Slices within a lane are
+    in time order and never overlap, so the time index is the columns
+    themselves. The per-process index is built on first use: slice
+    positions sorted by lane, then pid, then start. A process runs on one
+    CPU at a time, so within a lane its slices are also in time order.
+    """
+
+    def __init__(self, slice_pid, slice_start, slice_end, lanes=None):
+        self.slice_pid, self.slice_start, self.slice_end = slice_pid, slice_start, slice_end
+        self.bounds = []
+        offset = 0
+        for count in lanes if lanes is not None else [len(slice_start)]:
+            self.bounds.append((offset, offset + count))
+            offset += count
+        self._lane_starts = [lo for lo, _ in self.bounds]
+        self._order = None
+        self._columns = None
+
+    def __len__(self):
+        return len(self.slice_start)
+
+    @property
+    def lanes(self):
+        return len(self.bounds)
+
+    def lane_of(self, k):
+        """Lane holding slice position k"""
+        # The last lane starting at or before k; an empty lane before it
+        # starts at the same position, but bisect_right skips past it
+        return bisect_right(self._lane_starts, k) - 1
+
+    # ========== TIME QUERIES ==========
+
+    def slice_at(self, lane, t):
+        """Position of the slice running on lane at time t, or None"""
+        lo, hi = self.bounds[lane]
+        k = bisect_right(self.slice_start, t, lo, hi) - 1
+        if k >= lo and self.slice_end[k] > t:
+            return k
+        return None
+
+    def running_at(self, t):
+        """(lane, position) of every slice running at time t"""
+        found = []
+        for lane in range(len(self.bounds)):
+            k = self.slice_at(lane, t)
+            if k is not None:
+                found.append((lane, k))
+        return found
+
+    def between(self, lane, t0, t1):
+        """Position range [lo, hi) of the lane's slices overlapping [t0, t1)"""
+        lo, hi = self.bounds[lane]
+        first = bisect_right(self.slice_end, t0, lo, hi)
+        return first, max(first, bisect_left(self.slice_start, t1, first, hi))
+
+    def count_between(self, t0, t1, lane=None):
+        """Slices overlapping [t0, t1) on one lane, or on all of them"""
+        lanes = range(len(self.bounds)) if lane is None else [lane]
+        total = 0
+        for lane in lanes:
+            lo, hi = self.between(lane, t0, t1)
+            total += hi - lo
+        return total
+
+    # ========== PROCESS QUERIES ==========
+
+    def process_columns(self):
+        """(pid, start, end) columns in lane, pid, start order"""
+        if self._columns is None:
+            timer = metrics.timer('gantt_process_index_seconds',
+                                  "Building the per-process Gantt slice index")
+            with timer.time():
+                order = self._order = _process_order(self.slice_pid, self.bounds)
+                if np is not None and len(order) > 0:
+                    take = np.asarray(order, dtype=np.int64)
+                    self._columns = tuple(
+                        array('q', np.asarray(column, dtype=np.int64)[take].tobytes())
+                        for column in (self.slice_pid, self.slice_start, self.slice_end))
+                else:
+                    self._columns = tuple(_gather(column, order) for column in
+                                          (self.slice_pid, self.slice_start, self.slice_end))
+        return self._columns
+
+    def process_range(self, lane, pid, t0=None, t1=None):
+        """Range [lo, hi) of process_columns() holding pid's slices on lane
+
+        With t0 and t1, only the slices overlapping [t0, t1).
+        """
+        pids, starts, ends = self.process_columns()
+        lo, hi = self.bounds[lane]
+        lo = bisect_left(pids, pid, lo, hi)
+        hi = bisect_right(pids, pid, lo, hi)
+        if t0 is not None:
+            lo = bisect_right(ends, t0, lo, hi)
+            hi = max(lo, bisect_left(starts, t1, lo, hi))
+        return lo, hi
+
+    def process_slices(self, pid):
+        """Positions (in the original columns) of every slice of pid, lane by lane"""
+        self.process_columns()
+        positions = []
+        for lane in range(len(self.bounds)):
+            lo, hi = self.process_range(lane, pid)
+            positions.extend(self._order[lo:hi])
+        return positions
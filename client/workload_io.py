@@ -0,0 +1,279 @@
+"""
+Advanced OS Project - Workload Import/Export
+Streaming CSV and JSON Lines readers/writers plus a memory-mapped
+fixed-width binary format for multi-million-process traces
+"""
+
+import csv
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+
+CHUNK_ROWS = 65536
+
+# Binary layout (little-endian, column-oriented so every column is one slice):
+#   header   : magic(8) | count(uint64) | id_width(uint32) | reserved(uint32)
+#   ids      : count * id_width bytes, UTF-8, NUL padded
+#   arrival  : count * int32
+#   burst    : count * int32
+#   priority : count * int32
+BINARY_MAGIC = b'OSNXWL01'
+BINARY_HEADER = struct.Struct('<8sQII')
+ID_WIDTH = 16
+INT_SIZE = 4
+
+FORMATS = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.bin': 'binary',
+}
+CSV_FIELDS = ('id', 'arrival', 'burst', 'priority')
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1   # the backend keeps every field in an int
+
+
+class WorkloadFormatError(ValueError):
+    """Raised when a workload file cannot be parsed"""
+
+
+def check_process(arrival, burst, priority, where):
+    """Reject values the backend cannot hold: 0 <= arrival, burst <= INT32_MAX,
+    priority within int32"""
+    if not (0 <= arrival <= INT32_MAX and 0 <= burst <= INT32_MAX):
+        raise WorkloadFormatError(f"{where}: arrival and burst must be between 0 and {INT32_MAX}")
+    if not INT32_MIN <= priority <= INT32_MAX:
+        raise WorkloadFormatError(f"{where}: priority must be between {INT32_MIN} and {INT32_MAX}")
+
+
+def _check_columns(arrival, burst, priority, first_row, where):
+    """check_process over whole columns; min/max first, so valid chunks cost no loop"""
+    if not len(arrival):
+        return
+    if (min(arrival) >= 0 and min(burst) >= 0 and max(arrival) <= INT32_MAX
+            and max(burst) <= INT32_MAX and INT32_MIN <= min(priority)
+            and max(priority) <= INT32_MAX):
+        return
+    for k, values in enumerate(zip(arrival, burst, priority)):
+        check_process(*values, where=f"{where}: record {first_row + k + 1}")
+
+
+def detect_format(path):
+    fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise WorkloadFormatError(f"Unknown workload format for {path} "
+                                  f"(use {', '.join(sorted(FORMATS))})")
+    return fmt
+
+
+class Chunk:
+    """A block of rows as columns, plus how far through the file it reached"""
+
+    def __init__(self, ids, arrival, burst, priority, progress):
+        self.ids = ids
+        self.arrival = arrival
+        self.burst = burst
+        self.priority = priority
+        self.progress = progress
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class _ChunkBuilder:
+    """Accumulate rows and cut them into Chunks"""
+
+    def __init__(self, chunk_rows, first_row=0):
+        self.chunk_rows = chunk_rows
+        self.row = first_row
+        self._reset()
+
+    def _reset(self):
+        self.ids = []
+        self.arrival = array('q')
+        self.burst = array('q')
+        self.priority = array('q')
+
+    def add(self, pid, arrival, burst, priority, where):
+        self.row += 1
+        try:
+            arrival, burst, priority = int(arrival), int(burst), int(priority)
+        except (TypeError, ValueError):
+            raise WorkloadFormatError(f"{where}: arrival, burst and priority must be integers")
+        check_process(arrival, burst, priority, where)
+        self.ids.append(pid if pid else f"P{self.row}")
+        self.arrival.append(arrival)
+        self.burst.append(burst)
+        self.priority.append(priority)
+
+    def full(self):
+        return len(self.ids) >= self.chunk_rows
+
+    def take(self, progress):
+        chunk = Chunk(self.ids, self.arrival, self.burst, self.priority, progress)
+        self._reset()
+        return chunk
+
+
+def _progress(stream, total):
+    return min(1.0, stream.tell() / total) if total else 1.0
+
+
+# ========== READERS ==========
+
+def read_csv(path, chunk_rows=CHUNK_ROWS):
+    """Stream a CSV with an id,arrival,burst,priority header (id optional)"""
+    total = os.path.getsize(path)
+    with open(path, 'rb') as raw:
+        text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+        reader = csv.reader(text)
+        header = [name.strip().lower() for name in next(reader, [])]
+        missing = [name for name in CSV_FIELDS[1:] if name not in header]
+        if missing:
+            raise WorkloadFormatError(f"{path}: CSV header is missing {', '.join(missing)}")
+        id_col = header.index('id') if 'id' in header else None
+        cols = [header.index(name) for name in CSV_FIELDS[1:]]
+
+        builder = _ChunkBuilder(chunk_rows)
+        for line_no, row in enumerate(reader, start=2):
+            if not row:
+                continue
+            try:
+                pid = row[id_col].strip() if id_col is not None else ''
+                values = [row[c] for c in cols]
+            except IndexError:
+                raise WorkloadFormatError(f"{path}:{line_no}: expected {len(header)} fields")
+            builder.add(pid, *values, where=f"{path}:{line_no}")
+            if builder.full():
+                yield builder.take(_progress(raw, total))
+        if builder.ids:
+            yield builder.take(1.0)
+
+
+def read_jsonl(path, chunk_rows=CHUNK_ROWS):
+    """Stream JSON Lines, one {"id", "arrival", "burst", "priority"} object per line"""
+    total = os.path.getsize(path)
+    with open(path, 'rb') as raw:
+        builder = _ChunkBuilder(chunk_rows)
+        for line_no, line in enumerate(raw, start=1):
+            if not line.strip():
+                continue
+            where = f"{path}:{line_no}"
+            try:
+                record = json.loads(line)
+                builder.add(str(record.get('id', '')), record['arrival'],
+                            record['burst'], record['priority'], where=where)
+            except (ValueError, KeyError, AttributeError) as e:
+                if isinstance(e, WorkloadFormatError):
+                    raise
+                raise WorkloadFormatError(f"{where}: invalid record ({e})")
+            if builder.full():
+                yield builder.take(_progress(raw, total))
+        if builder.ids:
+            yield builder.take(1.0)
+
+
+def _int_column(view, offset, start, stop):
+    """Copy a little-endian int32 column slice out of the mapping"""
+    column = array('i')
+    column.frombytes(view[offset + start * INT_SIZE:offset + stop * INT_SIZE])
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return array('q', column)
+
+
+def read_binary(path, chunk_rows=CHUNK_ROWS):
+    """Stream the fixed-width binary format straight out of a memory map"""
+    with open(path, 'rb') as f:
+        if os.path.getsize(path) < BINARY_HEADER.size:
+            raise WorkloadFormatError(f"{path}: file is too small for a workload header")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            magic, count, id_width, _ = BINARY_HEADER.unpack_from(mapped, 0)
+            if magic != BINARY_MAGIC:
+                raise WorkloadFormatError(f"{path}: not an OS Nexus workload file")
+            ids_at = BINARY_HEADER.size
+            arrival_at = ids_at + count * id_width
+            burst_at = arrival_at + count * INT_SIZE
+            priority_at = burst_at + count * INT_SIZE
+            if len(mapped) < priority_at + count * INT_SIZE:
+                raise WorkloadFormatError(f"{path}: truncated, expected {count} records")
+
+            view = memoryview(mapped)
+            try:
+                for start in range(0, count, chunk_rows):
+                    stop = min(count, start + chunk_rows)
+                    raw_ids = view[ids_at + start * id_width:ids_at + stop * id_width].tobytes()
+                    ids = [raw_ids[k:k + id_width].rstrip(b'\0').decode('utf-8')
+                           or f"P{start + n + 1}"
+                           for n, k in enumerate(range(0, len(raw_ids), id_width))]
+                    columns = [_int_column(view, at, start, stop)
+                               for at in (arrival_at, burst_at, priority_at)]
+                    _check_columns(*columns, first_row=start, where=path)
+                    yield Chunk(ids, *columns, stop / count)
+            finally:
+                view.release()
+
+
+READERS = {'csv': read_csv, 'jsonl': read_jsonl, 'binary': read_binary}
+
+
+def read_workload(path, chunk_rows=CHUNK_ROWS):
+    """Yield Chunks from any supported workload file"""
+    return READERS[detect_format(path)](path, chunk_rows)
+
+
+def load_workload(path, store, cancel_event=None):
+    """Read a whole file into a ProcessStore (for scripts and tests)"""
+    for chunk in read_workload(path):
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        store.extend_columns(chunk.ids, chunk.arrival, chunk.burst, chunk.priority)
+    return store
+
+
+# ========== WRITERS ==========
+
+def write_csv(path, store):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_FIELDS)
+        writer.writerows(zip(store.ids, store.arrival, store.burst, store.priority))
+
+
+def write_jsonl(path, store):
+    with open(path, 'w', encoding='utf-8') as f:
+        for pid, a, b, p in zip(store.ids, store.arrival, store.burst, store.priority):
+            f.write(json.dumps({'id': pid, 'arrival': a, 'burst': b, 'priority': p}) + '\n')
+
+
+def _int32_bytes(column):
+    packed = array('i', column)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def write_binary(path, store):
+    count = len(store)
+    with open(path, 'wb') as f:
+        f.write(BINARY_HEADER.pack(BINARY_MAGIC, count, ID_WIDTH, 0))
+        for pid in store.ids:
+            # Truncate on a character boundary so the id still decodes
+            encoded = pid.encode('utf-8')[:ID_WIDTH].decode('utf-8', 'ignore').encode('utf-8')
+            f.write(encoded.ljust(ID_WIDTH, b'\0'))
+        for column in (store.arrival, store.burst, store.priority):
+            try:
+                f.write(_int32_bytes(column))
+            except OverflowError:
+                raise WorkloadFormatError("Binary workloads store 32-bit values only")
+
+
+WRITERS = {'csv': write_csv, 'jsonl': write_jsonl, 'binary': write_binary}
+
+
+def save_workload(path, store):
+    WRITERS[detect_format(path)](path, store)
@@ -2,17 +2,24 @@
  * OS-Nexus-Studio File Server
  * TCP-based multi-client file server with LIST, GET, and INFO commands
  * Cross-platform compatible (Windows/MinGW/GCC)
+ * Linux: epoll event loop + worker pool, sendfile(2) for GET bodies,
+ * inotify-invalidated metadata cache; ranged GET for resumable downloads
  */
 
 #include <iostream>
 #include <fstream>
 #include <vector>
+#include <deque>
+#include <map>
+#include <memory>
+#include <chrono>
 #include <string>
 #include <sstream>
 #include <iomanip>
 #include <ctime>
 #include <algorithm>
 #include <cstring>
+#include <cerrno>
 #include <sys/stat.h>
 
 #ifdef _WIN32
@@ -23,18 +30,40 @@
     #define SOCKET_ERROR_CODE WSAGetLastError()
 #else
     #include <sys/socket.h>
+    #include <sys/mman.h>
     #include <netinet/in.h>
+    #include <netinet/tcp.h>
     #include <arpa/inet.h>
     #include <unistd.h>
+    #include <fcntl.h>
     #include <dirent.h>
+    #include <pthread.h>
+    #include <signal.h>
+    #ifdef __linux__
+        #include <sys/epoll.h>
+        #include <sys/sendfile.h>
+        #include <sys/inotify.h>
+    #endif
     #define CLOSE_SOCKET close
     #define SOCKET_ERROR_CODE errno
     #define INVALID_SOCKET -1
+    #define SOCKET_ERROR -1
     typedef int SOCKET;
 #endif
 
 #define PORT 9091
 #define BUFFER_SIZE 4096
+#define MAX_COMMAND_SIZE 65536   // Longest command line buffered while waiting for its newline
+#define FILE_CHUNK (64 * 1024)
+#define MIN_WORKERS 4
+#define MAX_WORKERS 64
+#define MAX_EVENTS 64
+#define METADATA_TTL_MS 1000
+#define MAX_CACHED_FILES 256
+
+// Ends every reply except a GET body, which is framed by
+// FILE_START|name|size ... FILE_END, so a client can reuse one connection
+#define RESPONSE_END "END_OF_RESPONSE"
 
 using namespace std;
 
@@ -51,18 +80,35 @@ string getCurrentTime() {
     return ss.str();
 }
 
+// send() may write less than asked; loop until everything is out
+bool sendAll(SOCKET sock, const char* data, size_t length) {
+    while (length > 0) {
+        int sent = send(sock, data, (int)min(length, (size_t)1 << 20), 0);
+        if (sent == SOCKET_ERROR || sent == 0) {
+            return false;
+        }
+        data += sent;
+        length -= sent;
+    }
+    return true;
+}
+
 bool sendResponse(SOCKET sock, const string& response) {
-#ifdef _WIN32
-    if (send(sock, response.c_str(), response.size(), 0) == SOCKET_ERROR) {
-#else
-    if (send(sock, response.c_str(), response.size(), 0) == -1) {
-#endif
+    if (!sendAll(sock, response.c_str(), response.size())) {
         cerr << "Send failed" << endl;
         return false;
     }
     return true;
 }
 
+// A complete reply: the text, a newline if missing, then RESPONSE_END
+bool sendReply(SOCKET sock, string response) {
+    if (response.empty() || response.back() != '\n') {
+        response += "\n";
+    }
+    return sendResponse(sock, response + RESPONSE_END + "\n");
+}
+
 string formatFileSize(long long bytes) {
     if (bytes < 1024) return to_string(bytes) + " B";
     if (bytes < 1024 * 1024) return to_string(bytes / 1024) + " KB";
@@ -198,156 +244,445 @@ string getFileInfo(const string& filename) {
     return ss.str();
 }
 
-bool sendFile(SOCKET sock, const string& filename) {
-    ifstream file(filename, ios::binary);
+// ============== METADATA CACHE ==============
+// LIST and INFO replies, and on POSIX open file descriptors, shared by
+// every client. On Linux an inotify watch on the served directory drops
+// entries as soon as files change; elsewhere entries expire after
+// METADATA_TTL_MS. Only names in the served directory itself are cached.
+
+#ifndef _WIN32
+// A descriptor shared by concurrent GETs. sendfile and mmap take explicit
+// offsets, so readers never move each other's file position.
+struct OpenFile {
+    int fd;
+    long long size;
+    OpenFile(int fd, long long size) : fd(fd), size(size) {}
+    ~OpenFile() { close(fd); }
+};
+typedef shared_ptr<OpenFile> FileHandle;
+
+FileHandle openFile(const string& filename) {
+    int fd = open(filename.c_str(), O_RDONLY | O_CLOEXEC);
+    struct stat st;
+    if (fd < 0 || fstat(fd, &st) != 0 || !S_ISREG(st.st_mode)) {
+        if (fd >= 0) close(fd);
+        return FileHandle();
+    }
+    return make_shared<OpenFile>(fd, (long long)st.st_size);
+}
+#endif
+
+class MetadataCache {
+private:
+    bool listingValid;
+    string listing;
+    map<string, string> infos;
+#ifndef _WIN32
+    map<string, FileHandle> handles;
+#endif
+    int watchFd;
+    chrono::steady_clock::time_point validatedAt;
+#ifdef _WIN32
+    CRITICAL_SECTION mutex;
+    void lock() { EnterCriticalSection(&mutex); }
+    void unlock() { LeaveCriticalSection(&mutex); }
+#else
+    pthread_mutex_t mutex;
+    void lock() { pthread_mutex_lock(&mutex); }
+    void unlock() { pthread_mutex_unlock(&mutex); }
+#endif
     
-    if (!file.is_open()) {
-        sendResponse(sock, "ERROR: Cannot open file - " + filename);
-        return false;
+    static bool cacheable(const string& name) {
+        return !name.empty() && name != "." && name != ".."
+            && name.find('/') == string::npos && name.find('\\') == string::npos;
     }
     
-    // Send header
-    stringstream header;
-    header << "FILE_START|" << filename << "|" << endl;
-    sendResponse(sock, header.str());
+    void clear() {
+        listingValid = false;
+        listing.clear();
+        infos.clear();
+#ifndef _WIN32
+        handles.clear();  // In-flight GETs keep their own reference
+#endif
+    }
     
-    // Send file content in chunks
-    char buffer[BUFFER_SIZE];
+    void forget(const string& name) {
+        listingValid = false;
+        infos.erase(name);
+#ifndef _WIN32
+        handles.erase(name);
+#endif
+    }
     
-    while (file.read(buffer, BUFFER_SIZE)) {
-        streamsize bytesRead = file.gcount();
-#ifdef _WIN32
-        if (send(sock, buffer, bytesRead, 0) == SOCKET_ERROR) {
-#else
-        if (send(sock, buffer, bytesRead, 0) == -1) {
+    // Drop whatever changed since the last lookup; caller holds the lock
+    void revalidate() {
+#ifdef __linux__
+        if (watchFd >= 0) {
+            alignas(inotify_event) char buffer[4096];
+            ssize_t n;
+            while ((n = read(watchFd, buffer, sizeof(buffer))) > 0) {
+                for (char* p = buffer; p < buffer + n; ) {
+                    inotify_event* event = (inotify_event*)p;
+                    if ((event->mask & IN_Q_OVERFLOW) || event->len == 0) {
+                        clear();  // Lost events, or the directory itself changed
+                    } else {
+                        forget(event->name);
+                    }
+                    p += sizeof(inotify_event) + event->len;
+                }
+            }
+            return;
+        }
 #endif
-            file.close();
-            return false;
+        chrono::steady_clock::time_point now = chrono::steady_clock::now();
+        if (now - validatedAt > chrono::milliseconds(METADATA_TTL_MS)) {
+            clear();
+            validatedAt = now;
         }
     }
     
-    if (file.gcount() > 0) {
+public:
+    MetadataCache() : listingValid(false), watchFd(-1), validatedAt(chrono::steady_clock::now()) {
 #ifdef _WIN32
-        if (send(sock, buffer, file.gcount(), 0) == SOCKET_ERROR) {
+        InitializeCriticalSection(&mutex);
 #else
-        if (send(sock, buffer, file.gcount(), 0) == -1) {
+        pthread_mutex_init(&mutex, NULL);
 #endif
-            file.close();
+#ifdef __linux__
+        watchFd = inotify_init1(IN_NONBLOCK | IN_CLOEXEC);
+        if (watchFd >= 0 && inotify_add_watch(watchFd, ".",
+                IN_CREATE | IN_DELETE | IN_MODIFY | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO
+                | IN_DELETE_SELF | IN_MOVE_SELF) < 0) {
+            close(watchFd);
+            watchFd = -1;
+        }
+#endif
+    }
+    
+    bool watching() const { return watchFd >= 0; }
+    
+    string list() {
+        lock();
+        revalidate();
+        if (!listingValid) {
+            // Concurrent misses wait here for one directory walk
+            listing = listDirectory();
+            listingValid = true;
+        }
+        string reply = listing;
+        unlock();
+        return reply;
+    }
+    
+    string info(const string& filename) {
+        if (!cacheable(filename)) return getFileInfo(filename);
+        lock();
+        revalidate();
+        map<string, string>::iterator it = infos.find(filename);
+        if (it == infos.end()) {
+            if (infos.size() >= MAX_CACHED_FILES) infos.clear();
+            it = infos.insert(make_pair(filename, getFileInfo(filename))).first;
+        }
+        string reply = it->second;
+        unlock();
+        return reply;
+    }
+    
+#ifndef _WIN32
+    // Shared descriptor for a regular file, or null if it cannot be opened
+    FileHandle open(const string& filename) {
+        if (!cacheable(filename)) return openFile(filename);
+        lock();
+        revalidate();
+        FileHandle file = handles[filename];
+        if (!file) {
+            if (handles.size() > MAX_CACHED_FILES) handles.clear();
+            file = openFile(filename);
+            if (file) {
+                handles[filename] = file;
+            } else {
+                handles.erase(filename);
+            }
+        }
+        unlock();
+        return file;
+    }
+#endif
+};
+
+static MetadataCache metadata;
+
+// Body of a GET, without copying through user space where the OS allows:
+// sendfile(2) on Linux, a read-only mapping on other POSIX systems and
+// 64 KB reads on Windows
+#ifdef _WIN32
+bool sendFileBody(SOCKET sock, ifstream& file, long long offset, long long length) {
+    vector<char> buffer(FILE_CHUNK);
+    file.seekg(offset);
+    while (length > 0 && file.read(buffer.data(), (streamsize)min(length, (long long)FILE_CHUNK))) {
+        if (!sendAll(sock, buffer.data(), (size_t)file.gcount())) {
             return false;
         }
+        length -= file.gcount();
+    }
+    return length == 0;
+}
+#elif defined(__linux__)
+bool sendFileBody(SOCKET sock, int fd, long long offset, long long length) {
+    off_t position = (off_t)offset;
+    long long end = offset + length;
+    while (position < end) {
+        ssize_t sent = sendfile(sock, fd, &position, (size_t)min(end - (long long)position, 1LL << 30));
+        if (sent < 0 && errno == EINTR) continue;
+        if (sent <= 0) {
+            return false;  // Error, or the file shrank under us
+        }
+    }
+    return true;
+}
+#else
+bool sendFileBody(SOCKET sock, int fd, long long offset, long long length) {
+    if (length == 0) return true;
+    // mmap offsets must be page aligned
+    long long aligned = offset - offset % sysconf(_SC_PAGESIZE);
+    size_t mapped = (size_t)(length + offset - aligned);
+    void* data = mmap(NULL, mapped, PROT_READ, MAP_PRIVATE, fd, (off_t)aligned);
+    if (data == MAP_FAILED) {
+        return false;
     }
+    bool ok = sendAll(sock, (const char*)data + (offset - aligned), (size_t)length);
+    munmap(data, mapped);
+    return ok;
+}
+#endif
+
+// Hold back partial segments while a reply is built from several writes,
+// so the header, body and trailer leave as full packets (Linux only)
+void corkSocket(SOCKET sock, int on) {
+#ifdef __linux__
+    setsockopt(sock, IPPROTO_TCP, TCP_CORK, &on, sizeof(on));
+#else
+    (void)sock;
+    (void)on;
+#endif
+}
+
+// Sends a whole file, or with ranged set, at most length bytes from offset.
+// A ranged reply's header is FILE_START|name|length|offset|total.
+bool sendFile(SOCKET sock, const string& filename, bool ranged = false,
+              long long offset = 0, long long length = 0) {
+#ifdef _WIN32
+    ifstream file(filename, ios::binary | ios::ate);
+    if (!file.is_open()) {
+        sendReply(sock, "ERROR: Cannot open file - " + filename);
+        return false;
+    }
+    long long size = (long long)file.tellg();
+#else
+    FileHandle handle = metadata.open(filename);
+    if (!handle) {
+        sendReply(sock, "ERROR: Cannot open file - " + filename);
+        return false;
+    }
+    int file = handle->fd;
+    long long size = handle->size;
+#endif
     
-    file.close();
-    sendResponse(sock, "\nFILE_END");
+    if (!ranged) {
+        length = size;
+    } else if (offset > size) {
+        sendReply(sock, "ERROR: Range out of bounds - " + filename);
+        return false;
+    } else {
+        length = min(length, size - offset);
+    }
+    
+    // Header carries the byte count so clients need not scan for FILE_END
+    stringstream header;
+    header << "FILE_START|" << filename << "|" << length;
+    if (ranged) {
+        header << "|" << offset << "|" << size;
+    }
+    header << "\n";
+    corkSocket(sock, 1);
+    bool sent = sendResponse(sock, header.str())
+        && sendFileBody(sock, file, offset, length)
+        && sendResponse(sock, "\nFILE_END\n");
+    corkSocket(sock, 0);
+    return sent;
+}
+
+// Splits "GET" arguments: "<file>" or "<file> <offset> <length>".
+// Returns true for a range request.
+bool parseGetArguments(const string& args, string& filename, long long& offset, long long& length) {
+    filename = args;
+    size_t lengthStart = args.find_last_of(' ');
+    if (lengthStart == string::npos) return false;
+    size_t offsetStart = args.find_last_of(' ', lengthStart - 1);
+    if (offsetStart == string::npos || offsetStart == 0) return false;
+    
+    string offsetText = args.substr(offsetStart + 1, lengthStart - offsetStart - 1);
+    string lengthText = args.substr(lengthStart + 1);
+    const char* digits = "0123456789";
+    if (offsetText.empty() || lengthText.empty() || offsetText.size() > 18 || lengthText.size() > 18
+        || offsetText.find_first_not_of(digits) != string::npos
+        || lengthText.find_first_not_of(digits) != string::npos) {
+        return false;
+    }
     
+    size_t nameEnd = args.find_last_not_of(' ', offsetStart);
+    filename = args.substr(0, nameEnd + 1);
+    offset = stoll(offsetText);
+    length = stoll(lengthText);
     return true;
 }
 
-void handleClient(SOCKET sock, sockaddr_in* clientAddr) {
-    char clientIP[INET_ADDRSTRLEN];
+// Runs one client command. Returns false when the client asked to disconnect.
+bool handleCommand(SOCKET sock, string command, const char* clientIP) {
+    // Trim whitespace
+    size_t start = command.find_first_not_of(" \r\n\t");
+    size_t end = command.find_last_not_of(" \r\n\t");
+    if (start != string::npos && end != string::npos) {
+        command = command.substr(start, end - start + 1);
+    } else {
+        command = "";
+    }
+    
+    if (command.empty()) {
+        return true;
+    }
+    
+    cout << "[" << getCurrentTime() << "] Command from " << clientIP << ": " << command << endl;
+    
+    if (command == "LIST") {
+        sendReply(sock, metadata.list());
+    }
+    else if (command.substr(0, 4) == "GET ") {
+        string args = command.substr(4);
+        size_t start = args.find_first_not_of(" \r\n\t");
+        size_t end = args.find_last_not_of(" \r\n\t");
+        if (start != string::npos && end != string::npos) {
+            args = args.substr(start, end - start + 1);
+        } else {
+            args = "";
+        }
+        
+        string filename;
+        long long offset = 0, length = 0;
+        bool ranged = parseGetArguments(args, filename, offset, length);
+        cout << "[" << getCurrentTime() << "] Sending file: " << filename;
+        if (ranged) cout << " [" << offset << ", +" << length << "]";
+        cout << endl;
+        
+        if (!sendFile(sock, filename, ranged, offset, length)) {
+            cout << "[" << getCurrentTime() << "] Failed to send file: " << filename << endl;
+        }
+    }
+    else if (command.substr(0, 5) == "INFO ") {
+        string filename = command.substr(5);
+        size_t start = filename.find_first_not_of(" \r\n\t");
+        size_t end = filename.find_last_not_of(" \r\n\t");
+        if (start != string::npos && end != string::npos) {
+            filename = filename.substr(start, end - start + 1);
+        } else {
+            filename = "";
+        }
+        
+        sendReply(sock, metadata.info(filename));
+    }
+    else if (command == "HELP") {
+        string response = 
+            "=== File Server Commands ===\n"
+            "LIST           - List all files\n"
+            "GET <filename> - Download a file\n"
+            "GET <filename> <offset> <length> - Download part of a file\n"
+            "INFO <filename> - Get file info\n"
+            "HELP           - Show help\n"
+            "QUIT           - Disconnect\n";
+        sendReply(sock, response);
+    }
+    else if (command == "QUIT" || command == "EXIT") {
+        sendReply(sock, "Goodbye!\n");
+        return false;
+    }
+    else {
+        sendReply(sock, "ERROR: Unknown command. Type HELP for available commands.\n");
+    }
+    return true;
+}
+
+// Runs every complete command buffered in pending. Commands are
+// newline-terminated, so several can arrive in one read and one can be
+// split across reads; a partial line stays buffered for the next read.
+// Once the client has half-closed (peerClosed), trailing input with no
+// newline runs as one bare command (older clients).
+// Returns false once the client has asked to disconnect.
+bool runCommands(SOCKET sock, string& pending, const char* clientIP, bool peerClosed) {
+    vector<string> commands;
+    size_t newline;
+    while ((newline = pending.find('\n')) != string::npos) {
+        commands.push_back(pending.substr(0, newline));
+        pending.erase(0, newline + 1);
+    }
+    if (peerClosed && !pending.empty()) {
+        commands.push_back(pending);
+        pending.clear();
+    }
     
+    for (size_t k = 0; k < commands.size(); k++) {
+        if (!handleCommand(sock, commands[k], clientIP)) {
+            return false;
+        }
+    }
+    if (pending.size() > MAX_COMMAND_SIZE) {
+        sendReply(sock, "ERROR: Command too long\n");
+        return false;
+    }
+    return true;
+}
+
+void clientAddress(sockaddr_in* clientAddr, char* clientIP) {
 #ifdef _WIN32
     strncpy(clientIP, inet_ntoa(clientAddr->sin_addr), INET_ADDRSTRLEN - 1);
     clientIP[INET_ADDRSTRLEN - 1] = '\0';
 #else
     inet_ntop(AF_INET, &(clientAddr->sin_addr), clientIP, INET_ADDRSTRLEN);
 #endif
+}
+
+// Replies are written whole, so Nagle would only delay them
+void tuneClientSocket(SOCKET sock) {
+    int on = 1;
+    setsockopt(sock, IPPROTO_TCP, TCP_NODELAY, (const char*)&on, sizeof(on));
+}
+
+// Thread-per-connection fallback: blocks in recv until the client sends
+void handleClient(SOCKET sock, sockaddr_in* clientAddr) {
+    char clientIP[INET_ADDRSTRLEN];
+    clientAddress(clientAddr, clientIP);
     
     cout << "[" << getCurrentTime() << "] Client connected: " << clientIP << endl;
     
     char buffer[BUFFER_SIZE];
-    int bytesReceived;
+    string pending;
     
     while (true) {
-#ifdef _WIN32
-        bytesReceived = recv(sock, buffer, BUFFER_SIZE - 1, 0);
+        int bytesReceived = recv(sock, buffer, BUFFER_SIZE, 0);
         if (bytesReceived == SOCKET_ERROR) {
-            if (WSAGetLastError() == WSAEWOULDBLOCK) {
-                Sleep(100);
-                continue;
-            }
-            cout << "[" << getCurrentTime() << "] Client disconnected (error)" << endl;
-            break;
-        }
-#else
-        bytesReceived = recv(sock, buffer, BUFFER_SIZE - 1, 0);
-        if (bytesReceived == -1) {
-            if (errno == EAGAIN || errno == EWOULDBLOCK) {
-                usleep(100000);
-                continue;
-            }
+            if (SOCKET_ERROR_CODE == EINTR) continue;
             cout << "[" << getCurrentTime() << "] Client disconnected (error)" << endl;
             break;
         }
-#endif
-        
         if (bytesReceived == 0) {
             cout << "[" << getCurrentTime() << "] Client disconnected: " << clientIP << endl;
+            runCommands(sock, pending, clientIP, true);   // A bare command before the half-close
             break;
         }
         
-        buffer[bytesReceived] = '\0';
-        string command(buffer);
-        
-        // Trim whitespace
-        size_t start = command.find_first_not_of(" \r\n\t");
-        size_t end = command.find_last_not_of(" \r\n\t");
-        if (start != string::npos && end != string::npos) {
-            command = command.substr(start, end - start + 1);
-        } else {
-            command = "";
-        }
-        
-        cout << "[" << getCurrentTime() << "] Command from " << clientIP << ": " << command << endl;
-        
-        if (command == "LIST") {
-            sendResponse(sock, listDirectory());
-        }
-        else if (command.substr(0, 4) == "GET ") {
-            string filename = command.substr(4);
-            size_t start = filename.find_first_not_of(" \r\n\t");
-            size_t end = filename.find_last_not_of(" \r\n\t");
-            if (start != string::npos && end != string::npos) {
-                filename = filename.substr(start, end - start + 1);
-            } else {
-                filename = "";
-            }
-            
-            cout << "[" << getCurrentTime() << "] Sending file: " << filename << endl;
-            
-            if (!sendFile(sock, filename)) {
-                cout << "[" << getCurrentTime() << "] Failed to send file: " << filename << endl;
-            }
-        }
-        else if (command.substr(0, 5) == "INFO ") {
-            string filename = command.substr(5);
-            size_t start = filename.find_first_not_of(" \r\n\t");
-            size_t end = filename.find_last_not_of(" \r\n\t");
-            if (start != string::npos && end != string::npos) {
-                filename = filename.substr(start, end - start + 1);
-            } else {
-                filename = "";
-            }
-            
-            sendResponse(sock, getFileInfo(filename));
-        }
-        else if (command == "HELP") {
-            string response = 
-                "=== File Server Commands ===\n"
-                "LIST           - List all files\n"
-                "GET <filename> - Download a file\n"
-                "INFO <filename> - Get file info\n"
-                "HELP           - Show help\n"
-                "QUIT           - Disconnect\n";
-            sendResponse(sock, response);
-        }
-        else if (command == "QUIT" || command == "EXIT") {
-            sendResponse(sock, "Goodbye!\n");
+        pending.append(buffer, bytesReceived);
+        if (!runCommands(sock, pending, clientIP, false)) {
             break;
         }
-        else {
-            sendResponse(sock, "ERROR: Unknown command. Type HELP for available commands.\n");
-        }
     }
     
     CLOSE_SOCKET(sock);
@@ -369,6 +704,206 @@ void* clientThread(void* param) {
 }
 #endif
 
+// Accepts clients for the life of the process, one thread per connection
+void acceptLoop(SOCKET server_fd) {
+    while (true) {
+        ClientInfo* client = new ClientInfo;
+#ifdef _WIN32
+        int addrLen = sizeof(client->addr);
+#else
+        socklen_t addrLen = sizeof(client->addr);
+#endif
+        client->sock = accept(server_fd, (sockaddr*)&client->addr, &addrLen);
+        if (client->sock == INVALID_SOCKET) {
+            delete client;
+            if (SOCKET_ERROR_CODE == EINTR) continue;
+            break;  // Listening socket closed
+        }
+        tuneClientSocket(client->sock);
+#ifdef _WIN32
+        HANDLE thread = CreateThread(NULL, 0, clientThread, client, 0, NULL);
+        if (thread) {
+            CloseHandle(thread);
+        } else {
+            CLOSE_SOCKET(client->sock);
+            delete client;
+        }
+#else
+        pthread_t thread;
+        if (pthread_create(&thread, NULL, clientThread, client) == 0) {
+            pthread_detach(thread);
+        } else {
+            CLOSE_SOCKET(client->sock);
+            delete client;
+        }
+#endif
+    }
+}
+
+#ifdef __linux__
+// ============== EPOLL EVENT LOOP (Linux) ==============
+// One thread waits on every socket with epoll and hands ready clients to a
+// fixed worker pool. Idle keep-alive connections hold no thread, and
+// EPOLLONESHOT keeps a connection on one worker at a time, so its
+// pipelined commands still run in order.
+
+struct Connection {
+    SOCKET sock;
+    string pending;
+    char ip[INET_ADDRSTRLEN];
+};
+
+static int epollFd = -1;
+static deque<Connection*> readyQueue;
+static pthread_mutex_t readyLock = PTHREAD_MUTEX_INITIALIZER;
+static pthread_cond_t readyCond = PTHREAD_COND_INITIALIZER;
+
+bool armConnection(Connection* conn, int op) {
+    epoll_event ev;
+    ev.events = EPOLLIN | EPOLLRDHUP | EPOLLONESHOT;
+    ev.data.ptr = conn;
+    return epoll_ctl(epollFd, op, conn->sock, &ev) == 0;
+}
+
+void closeConnection(Connection* conn) {
+    epoll_ctl(epollFd, EPOLL_CTL_DEL, conn->sock, NULL);
+    CLOSE_SOCKET(conn->sock);
+    delete conn;
+}
+
+// Read everything the client has sent so far, run the complete commands,
+// then either re-arm the connection or close it
+void serviceConnection(Connection* conn) {
+    char buffer[BUFFER_SIZE];
+    bool open = true;
+    bool peerClosed = false;
+    while (true) {
+        ssize_t received = recv(conn->sock, buffer, sizeof(buffer), MSG_DONTWAIT);
+        if (received > 0) {
+            conn->pending.append(buffer, received);
+            continue;
+        }
+        if (received == 0) {
+            cout << "[" << getCurrentTime() << "] Client disconnected: " << conn->ip << endl;
+            open = false;
+            peerClosed = true;
+        } else if (errno == EINTR) {
+            continue;
+        } else if (errno != EAGAIN && errno != EWOULDBLOCK) {
+            cout << "[" << getCurrentTime() << "] Client disconnected (error)" << endl;
+            open = false;
+        }
+        break;
+    }
+    
+    // Commands that arrived just before a half-close are still answered
+    if (!conn->pending.empty()
+        && !runCommands(conn->sock, conn->pending, conn->ip, peerClosed)) {
+        open = false;
+    }
+    if (!open || !armConnection(conn, EPOLL_CTL_MOD)) {
+        closeConnection(conn);
+    }
+}
+
+void* workerThread(void*) {
+    while (true) {
+        pthread_mutex_lock(&readyLock);
+        while (readyQueue.empty()) {
+            pthread_cond_wait(&readyCond, &readyLock);
+        }
+        Connection* conn = readyQueue.front();
+        readyQueue.pop_front();
+        pthread_mutex_unlock(&readyLock);
+        serviceConnection(conn);
+    }
+    return nullptr;
+}
+
+int workerCount() {
+    long cpus = sysconf(_SC_NPROCESSORS_ONLN);
+    return (int)max((long)MIN_WORKERS, min((long)MAX_WORKERS, cpus * 2));
+}
+
+void acceptClients(SOCKET server_fd) {
+    while (true) {
+        sockaddr_in addr;
+        socklen_t addrLen = sizeof(addr);
+        SOCKET sock = accept4(server_fd, (sockaddr*)&addr, &addrLen, SOCK_CLOEXEC);
+        if (sock == INVALID_SOCKET) {
+            if (errno == EINTR || errno == ECONNABORTED) continue;
+            return;  // EAGAIN: backlog drained
+        }
+        tuneClientSocket(sock);
+        Connection* conn = new Connection;
+        conn->sock = sock;
+        clientAddress(&addr, conn->ip);
+        cout << "[" << getCurrentTime() << "] Client connected: " << conn->ip << endl;
+        if (!armConnection(conn, EPOLL_CTL_ADD)) {
+            CLOSE_SOCKET(sock);
+            delete conn;
+        }
+    }
+}
+
+// Returns false if epoll could not be set up
+bool eventLoop(SOCKET server_fd) {
+    epollFd = epoll_create1(EPOLL_CLOEXEC);
+    if (epollFd < 0) return false;
+    
+    fcntl(server_fd, F_SETFL, fcntl(server_fd, F_GETFL) | O_NONBLOCK);
+    epoll_event listenEvent;
+    listenEvent.events = EPOLLIN;
+    listenEvent.data.ptr = NULL;  // NULL marks the listening socket
+    if (epoll_ctl(epollFd, EPOLL_CTL_ADD, server_fd, &listenEvent) != 0) {
+        return false;
+    }
+    
+    int workers = workerCount();
+    for (int k = 0; k < workers; k++) {
+        pthread_t thread;
+        if (pthread_create(&thread, NULL, workerThread, NULL) == 0) {
+            pthread_detach(thread);
+        }
+    }
+    cout << "[" << getCurrentTime() << "] epoll event loop with " << workers << " workers" << endl;
+    
+    epoll_event events[MAX_EVENTS];
+    while (true) {
+        int ready = epoll_wait(epollFd, events, MAX_EVENTS, -1);
+        if (ready < 0) {
+            if (errno == EINTR) continue;
+            break;
+        }
+        pthread_mutex_lock(&readyLock);
+        for (int k = 0; k < ready; k++) {
+            if (events[k].data.ptr == NULL) {
+                acceptClients(server_fd);
+            } else {
+                readyQueue.push_back((Connection*)events[k].data.ptr);
+            }
+        }
+        pthread_cond_broadcast(&readyCond);
+        pthread_mutex_unlock(&readyLock);
+    }
+    return true;
+}
+#endif
+
+#ifdef _WIN32
+DWORD WINAPI acceptThread(LPVOID lpParam) {
+#else
+void* acceptThread(void* lpParam) {
+#endif
+    SOCKET server_fd = *(SOCKET*)lpParam;
+#ifdef __linux__
+    if (eventLoop(server_fd)) return 0;
+    cerr << "epoll unavailable; serving with a thread per connection" << endl;
+#endif
+    acceptLoop(server_fd);
+    return 0;
+}
+
 void handleTerminalCommand(const string& command) {
     if (command == "LIST") {
         cout << listDirectory();
@@ -432,6 +967,11 @@ int main() {
     cout << "    OS-Nexus-Studio File Server" << endl;
     cout << "========================================" << endl;
     
+#ifndef _WIN32
+    // A client that disconnects mid-transfer must not kill the server
+    signal(SIGPIPE, SIG_IGN);
+#endif
+    
 #ifdef _WIN32
     WSADATA wsaData;
     if (WSAStartup(MAKEWORD(2, 2), &wsaData) != 0) {
@@ -471,7 +1011,7 @@ int main() {
         return 1;
     }
     
-    if (listen(server_fd, 10) == SOCKET_ERROR) {
+    if (listen(server_fd, SOMAXCONN) == SOCKET_ERROR) {
         cerr << "Listen failed" << endl;
         CLOSE_SOCKET(server_fd);
 #ifdef _WIN32
@@ -482,6 +1022,21 @@ int main() {
     
     cout << "[" << getCurrentTime() << "] Server started on port " << PORT << endl;
     cout << "[" << getCurrentTime() << "] Listening for connections..." << endl;
+    
+#ifdef _WIN32
+    HANDLE acceptHandle = CreateThread(NULL, 0, acceptThread, &server_fd, 0, NULL);
+    if (!acceptHandle) {
+#else
+    pthread_t acceptHandle;
+    if (pthread_create(&acceptHandle, NULL, acceptThread, &server_fd) != 0) {
+#endif
+        cerr << "Failed to start the accept thread" << endl;
+        CLOSE_SOCKET(server_fd);
+#ifdef _WIN32
+        WSACleanup();
+#endif
+        return 1;
+    }
     cout << "\n========================================" << endl;
     cout << "    INTERACTIVE MODE" << endl;
     cout << "========================================" << endl;
@@ -508,7 +1063,12 @@ int main() {
         cout.flush();
         
         if (!getline(cin, input)) {
-            // EOF or error
+            // No terminal (e.g. launched in the background): keep serving
+#ifdef _WIN32
+            WaitForSingleObject(acceptHandle, INFINITE);
+#else
+            pthread_join(acceptHandle, NULL);
+#endif
             break;
         }
         
@@ -11,13 +11,41 @@
 #include <algorithm>
 #include <chrono>
 #include <cstring>
-#include <winsock2.h>
-#include <ws2tcpip.h>
+#include <cstdint>
+#include <cmath>
 #include <iomanip>
 #include <sstream>
-#include <windows.h>
+#include <cstdlib>
+#include <cctype>
+#include <cerrno>
+#include <atomic>
+#include <deque>
+#include <unordered_map>
+#include <limits>
+#include <sys/stat.h>
 
-#pragma comment(lib, "ws2_32.lib")
+#ifdef _WIN32
+    #include <winsock2.h>
+    #include <ws2tcpip.h>
+    #include <windows.h>
+    #pragma comment(lib, "ws2_32.lib")
+#else
+    #include <sys/socket.h>
+    #include <sys/mman.h>
+    #include <netinet/in.h>
+    #include <unistd.h>
+    #include <fcntl.h>
+    #include <dirent.h>
+    #include <pthread.h>
+    #include <signal.h>
+    #ifdef __linux__
+        #include <sys/sendfile.h>
+    #endif
+    #define closesocket close
+    #define INVALID_SOCKET -1
+    #define SOCKET_ERROR -1
+    typedef int SOCKET;
+#endif
 
 using namespace std;
 
@@ -31,115 +59,1093 @@ using namespace std;
 #define BOLD    ""
 
 #define PORT 9090
+#define SERVER_WORKERS 8
+#define FILE_CHUNK (64 * 1024)
+
+// Marks the end of every response in API mode so a long-lived client
+// can pipeline commands over one stdin/stdout pair
+#define API_RESPONSE_END "END_OF_RESPONSE"
+
+// ============== PLATFORM HELPERS ==============
+
+// Reserve and commit a zeroed region for the allocator heap
+uint8_t* mapHeap(size_t size) {
+#ifdef _WIN32
+    return (uint8_t*)VirtualAlloc(NULL, size, MEM_COMMIT | MEM_RESERVE, PAGE_READWRITE);
+#else
+    void* p = mmap(NULL, size, PROT_READ | PROT_WRITE, MAP_PRIVATE | MAP_ANONYMOUS, -1, 0);
+    return p == MAP_FAILED ? NULL : (uint8_t*)p;
+#endif
+}
+
+void unmapHeap(uint8_t* heap, size_t size) {
+#ifdef _WIN32
+    (void)size;
+    VirtualFree(heap, 0, MEM_RELEASE);
+#else
+    munmap(heap, size);
+#endif
+}
+
+// API mode: stdin is a pipe from a client rather than a terminal
+bool stdinIsPipe() {
+#ifdef _WIN32
+    return GetFileType(GetStdHandle(STD_INPUT_HANDLE)) == FILE_TYPE_PIPE;
+#else
+    if (isatty(STDIN_FILENO)) return false;
+    struct stat st;
+    if (fstat(STDIN_FILENO, &st) != 0) return false;
+    return S_ISFIFO(st.st_mode) || S_ISSOCK(st.st_mode);
+#endif
+}
+
+// Regular files in the working directory
+vector<string> listFiles() {
+    vector<string> files;
+#ifdef _WIN32
+    WIN32_FIND_DATAA findFileData;
+    HANDLE hFind = FindFirstFileA("*", &findFileData);
+    if (hFind != INVALID_HANDLE_VALUE) {
+        do {
+            if (!(findFileData.dwFileAttributes & FILE_ATTRIBUTE_DIRECTORY)) {
+                files.push_back(findFileData.cFileName);
+            }
+        } while (FindNextFileA(hFind, &findFileData));
+        FindClose(hFind);
+    }
+#else
+    DIR* dir = opendir(".");
+    if (dir) {
+        struct dirent* entry;
+        while ((entry = readdir(dir)) != NULL) {
+            struct stat st;
+            if (stat(entry->d_name, &st) == 0 && S_ISREG(st.st_mode)) {
+                files.push_back(entry->d_name);
+            }
+        }
+        closedir(dir);
+    }
+#endif
+    return files;
+}
+
+// Run fn(arg) on a detached thread
+struct ThreadStart {
+    void (*fn)(void*);
+    void* arg;
+};
+
+#ifdef _WIN32
+DWORD WINAPI threadTrampoline(LPVOID param) {
+#else
+void* threadTrampoline(void* param) {
+#endif
+    ThreadStart* start = (ThreadStart*)param;
+    start->fn(start->arg);
+    delete start;
+    return 0;
+}
+
+bool startDetachedThread(void (*fn)(void*), void* arg) {
+    ThreadStart* start = new ThreadStart{fn, arg};
+#ifdef _WIN32
+    HANDLE thread = CreateThread(NULL, 0, threadTrampoline, start, 0, NULL);
+    if (thread) {
+        CloseHandle(thread);
+        return true;
+    }
+#else
+    pthread_t thread;
+    if (pthread_create(&thread, NULL, threadTrampoline, start) == 0) {
+        pthread_detach(thread);
+        return true;
+    }
+#endif
+    delete start;
+    return false;
+}
+
+// Processors available to this process
+int cpuCount() {
+#ifdef _WIN32
+    SYSTEM_INFO info;
+    GetSystemInfo(&info);
+    return max(1, (int)info.dwNumberOfProcessors);
+#else
+    long n = sysconf(_SC_NPROCESSORS_ONLN);
+    return n > 0 ? (int)n : 1;
+#endif
+}
+
+// Run fn(args[k]) on one thread per argument and wait for all of them; an
+// argument whose thread cannot be started runs on the calling thread
+void runJoined(void (*fn)(void*), const vector<void*>& args) {
+#ifdef _WIN32
+    vector<HANDLE> threads;
+#else
+    vector<pthread_t> threads;
+#endif
+    for (size_t k = 0; k < args.size(); k++) {
+        ThreadStart* start = new ThreadStart{fn, args[k]};
+#ifdef _WIN32
+        HANDLE thread = CreateThread(NULL, 0, threadTrampoline, start, 0, NULL);
+        if (thread) {
+            threads.push_back(thread);
+            continue;
+        }
+#else
+        pthread_t thread;
+        if (pthread_create(&thread, NULL, threadTrampoline, start) == 0) {
+            threads.push_back(thread);
+            continue;
+        }
+#endif
+        delete start;
+        fn(args[k]);
+    }
+    for (size_t k = 0; k < threads.size(); k++) {
+#ifdef _WIN32
+        WaitForSingleObject(threads[k], INFINITE);
+        CloseHandle(threads[k]);
+#else
+        pthread_join(threads[k], NULL);
+#endif
+    }
+}
+
+// Blocking FIFO of accepted sockets shared by the server's workers
+class SocketQueue {
+private:
+    deque<SOCKET> sockets;
+#ifdef _WIN32
+    CRITICAL_SECTION lock;
+    CONDITION_VARIABLE ready;
+#else
+    pthread_mutex_t lock;
+    pthread_cond_t ready;
+#endif
+    
+public:
+    SocketQueue() {
+#ifdef _WIN32
+        InitializeCriticalSection(&lock);
+        InitializeConditionVariable(&ready);
+#else
+        pthread_mutex_init(&lock, NULL);
+        pthread_cond_init(&ready, NULL);
+#endif
+    }
+    
+    void push(SOCKET sock) {
+#ifdef _WIN32
+        EnterCriticalSection(&lock);
+        sockets.push_back(sock);
+        LeaveCriticalSection(&lock);
+        WakeConditionVariable(&ready);
+#else
+        pthread_mutex_lock(&lock);
+        sockets.push_back(sock);
+        pthread_mutex_unlock(&lock);
+        pthread_cond_signal(&ready);
+#endif
+    }
+    
+    SOCKET pop() {
+#ifdef _WIN32
+        EnterCriticalSection(&lock);
+        while (sockets.empty()) SleepConditionVariableCS(&ready, &lock, INFINITE);
+        SOCKET sock = sockets.front();
+        sockets.pop_front();
+        LeaveCriticalSection(&lock);
+#else
+        pthread_mutex_lock(&lock);
+        while (sockets.empty()) pthread_cond_wait(&ready, &lock);
+        SOCKET sock = sockets.front();
+        sockets.pop_front();
+        pthread_mutex_unlock(&lock);
+#endif
+        return sock;
+    }
+};
+
+// send() may write less than asked; loop until everything is out
+bool sendAll(SOCKET sock, const char* data, size_t length) {
+    while (length > 0) {
+        int sent = send(sock, data, (int)min(length, (size_t)1 << 20), 0);
+        if (sent == SOCKET_ERROR || sent == 0) return false;
+        data += sent;
+        length -= sent;
+    }
+    return true;
+}
+
+// Stream a regular file to a socket without holding it in memory:
+// sendfile(2) on Linux, a read-only mapping on other POSIX systems and
+// 64 KB reads on Windows. Returns false if the file cannot be opened.
+bool sendFileTo(SOCKET sock, const string& path) {
+#ifdef _WIN32
+    ifstream file(path, ios::binary);
+    if (!file.is_open()) return false;
+    vector<char> buffer(FILE_CHUNK);
+    while (file.read(buffer.data(), FILE_CHUNK) || file.gcount() > 0) {
+        if (!sendAll(sock, buffer.data(), (size_t)file.gcount())) break;
+    }
+    return true;
+#else
+    int fd = open(path.c_str(), O_RDONLY | O_CLOEXEC);
+    struct stat st;
+    if (fd < 0 || fstat(fd, &st) != 0 || !S_ISREG(st.st_mode)) {
+        if (fd >= 0) close(fd);
+        return false;
+    }
+    long long size = (long long)st.st_size;
+#ifdef __linux__
+    off_t offset = 0;
+    while (offset < size) {
+        ssize_t sent = sendfile(sock, fd, &offset, (size_t)min(size - (long long)offset, 1LL << 30));
+        if (sent < 0 && errno == EINTR) continue;
+        if (sent <= 0) break;
+    }
+#else
+    if (size > 0) {
+        void* data = mmap(NULL, (size_t)size, PROT_READ, MAP_PRIVATE, fd, 0);
+        if (data != MAP_FAILED) {
+            sendAll(sock, (const char*)data, (size_t)size);
+            munmap(data, (size_t)size);
+        }
+    }
+#endif
+    close(fd);
+    return true;
+#endif
+}
+
+// ============== SHARED-MEMORY TRANSFER ==============
+
+// Instead of text on stdin/stdout a client can hand over the workload in a
+// memory-mapped file (LOADMAP) and take results back from another one
+// (FORMAT MAP). Both hold little-endian int64 columns; the layout is
+// documented in client/shm_transfer.py.
+#define WORKLOAD_MAGIC "OSNXWL1"   // 8 bytes with the terminating NUL
+#define WORKLOAD_HEADER 16         // magic, then the process count
+#define RESULT_MAP_HEADER "RESULT_MAP"
+
+// Read-only mapping of a whole file
+class MappedFile {
+private:
+    const uint8_t* data;
+    size_t size;
+#ifdef _WIN32
+    HANDLE file;
+    HANDLE mapping;
+#endif
+    
+public:
+#ifdef _WIN32
+    MappedFile() : data(NULL), size(0), file(INVALID_HANDLE_VALUE), mapping(NULL) {}
+#else
+    MappedFile() : data(NULL), size(0) {}
+#endif
+    ~MappedFile() { close(); }
+    
+    bool open(const string& path) {
+        close();
+#ifdef _WIN32
+        file = CreateFileA(path.c_str(), GENERIC_READ,
+                           FILE_SHARE_READ | FILE_SHARE_WRITE | FILE_SHARE_DELETE, NULL,
+                           OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL, NULL);
+        LARGE_INTEGER length;
+        if (file == INVALID_HANDLE_VALUE || !GetFileSizeEx(file, &length)) return false;
+        size = (size_t)length.QuadPart;
+        if (size == 0) return true;
+        mapping = CreateFileMappingA(file, NULL, PAGE_READONLY, 0, 0, NULL);
+        if (mapping == NULL) return false;
+        data = (const uint8_t*)MapViewOfFile(mapping, FILE_MAP_READ, 0, 0, 0);
+        return data != NULL;
+#else
+        int fd = ::open(path.c_str(), O_RDONLY | O_CLOEXEC);
+        struct stat st;
+        if (fd < 0 || fstat(fd, &st) != 0 || !S_ISREG(st.st_mode)) {
+            if (fd >= 0) ::close(fd);
+            return false;
+        }
+        size = (size_t)st.st_size;
+        if (size > 0) {
+            void* p = mmap(NULL, size, PROT_READ, MAP_SHARED, fd, 0);
+            data = p == MAP_FAILED ? NULL : (const uint8_t*)p;
+        }
+        ::close(fd);
+        return size == 0 || data != NULL;
+#endif
+    }
+    
+    void close() {
+#ifdef _WIN32
+        if (data != NULL) UnmapViewOfFile(data);
+        if (mapping != NULL) CloseHandle(mapping);
+        if (file != INVALID_HANDLE_VALUE) CloseHandle(file);
+        mapping = NULL;
+        file = INVALID_HANDLE_VALUE;
+#else
+        if (data != NULL) munmap((void*)data, size);
+#endif
+        data = NULL;
+        size = 0;
+    }
+    
+    const uint8_t* bytes() const { return data; }
+    size_t length() const { return size; }
+};
+
+// Little-endian int64 at p, whatever the host byte order
+long long readInt64(const uint8_t* p) {
+    uint64_t v = 0;
+    for (int b = 7; b >= 0; b--) v = (v << 8) | p[b];
+    return (long long)v;
+}
+
+void writeInt64(uint8_t* p, long long value) {
+    uint64_t v = (uint64_t)value;
+    for (int b = 0; b < 8; b++, v >>= 8) p[b] = (uint8_t)v;
+}
+
+// File that results are appended to: each append grows the file and maps
+// just the new region, so arrays are written straight into the pages the
+// client maps. Appends from comparison workers are serialized only while
+// the file grows; the copying runs in parallel.
+class ResultSegment {
+private:
+    string path;
+    uint64_t used;
+#ifdef _WIN32
+    HANDLE file;
+    CRITICAL_SECTION lock;
+#else
+    int fd;
+    pthread_mutex_t lock;
+#endif
+    
+    // Reserve bytes at the end of the file; returns the offset or -1
+    long long grow(size_t bytes) {
+        long long offset = -1;
+#ifdef _WIN32
+        EnterCriticalSection(&lock);
+        LARGE_INTEGER end;
+        end.QuadPart = (LONGLONG)(used + bytes);
+        if (SetFilePointerEx(file, end, NULL, FILE_BEGIN) && SetEndOfFile(file)) {
+            offset = (long long)used;
+            used += bytes;
+        }
+        LeaveCriticalSection(&lock);
+#else
+        pthread_mutex_lock(&lock);
+        if (ftruncate(fd, (off_t)(used + bytes)) == 0) {
+            offset = (long long)used;
+            used += bytes;
+        }
+        pthread_mutex_unlock(&lock);
+#endif
+        return offset;
+    }
+    
+public:
+    ResultSegment() : used(0) {
+#ifdef _WIN32
+        file = INVALID_HANDLE_VALUE;
+        InitializeCriticalSection(&lock);
+#else
+        fd = -1;
+        pthread_mutex_init(&lock, NULL);
+#endif
+    }
+    
+    ~ResultSegment() { close(); }
+    
+    bool isOpen() const {
+#ifdef _WIN32
+        return file != INVALID_HANDLE_VALUE;
+#else
+        return fd >= 0;
+#endif
+    }
+    
+    const string& getPath() const { return path; }
+    
+    // Create or truncate the file at p
+    bool open(const string& p) {
+        close();
+#ifdef _WIN32
+        file = CreateFileA(p.c_str(), GENERIC_READ | GENERIC_WRITE,
+                           FILE_SHARE_READ | FILE_SHARE_WRITE | FILE_SHARE_DELETE, NULL,
+                           CREATE_ALWAYS, FILE_ATTRIBUTE_NORMAL, NULL);
+#else
+        fd = ::open(p.c_str(), O_RDWR | O_CREAT | O_TRUNC | O_CLOEXEC, 0600);
+#endif
+        if (!isOpen()) return false;
+        path = p;
+        used = 0;
+        return true;
+    }
+    
+    void close() {
+#ifdef _WIN32
+        if (file != INVALID_HANDLE_VALUE) CloseHandle(file);
+        file = INVALID_HANDLE_VALUE;
+#else
+        if (fd >= 0) ::close(fd);
+        fd = -1;
+#endif
+        path.clear();
+        used = 0;
+    }
+    
+    // Drop the previous run's results; the file is rewritten from offset 0
+    void reset() {
+        if (!isOpen()) return;
+#ifdef _WIN32
+        LARGE_INTEGER start;
+        start.QuadPart = 0;
+        if (SetFilePointerEx(file, start, NULL, FILE_BEGIN)) SetEndOfFile(file);
+#else
+        if (ftruncate(fd, 0) != 0) return;
+#endif
+        used = 0;
+    }
+    
+    // Append bytes, calling fill(pointer) to write them in place.
+    // Returns the offset of the block, or -1 if it cannot be mapped.
+    template <class Fill>
+    long long append(size_t bytes, Fill fill) {
+        long long offset = grow(bytes);
+        if (offset < 0 || bytes == 0) return offset;
+#ifdef _WIN32
+        SYSTEM_INFO info;
+        GetSystemInfo(&info);
+        uint64_t start = (uint64_t)offset / info.dwAllocationGranularity * info.dwAllocationGranularity;
+        uint64_t end = (uint64_t)offset + bytes;
+        HANDLE mapping = CreateFileMappingA(file, NULL, PAGE_READWRITE, (DWORD)(end >> 32),
+                                           (DWORD)end, NULL);
+        if (mapping == NULL) return -1;
+        uint8_t* view = (uint8_t*)MapViewOfFile(mapping, FILE_MAP_WRITE, (DWORD)(start >> 32),
+                                                (DWORD)start, (SIZE_T)(end - start));
+        if (view != NULL) {
+            fill(view + (offset - start));
+            UnmapViewOfFile(view);
+        }
+        CloseHandle(mapping);
+        return view != NULL ? offset : -1;
+#else
+        uint64_t page = (uint64_t)sysconf(_SC_PAGESIZE);
+        uint64_t start = (uint64_t)offset / page * page;
+        size_t length = (size_t)((uint64_t)offset + bytes - start);
+        void* view = mmap(NULL, length, PROT_READ | PROT_WRITE, MAP_SHARED, fd, (off_t)start);
+        if (view == MAP_FAILED) return -1;
+        fill((uint8_t*)view + (offset - start));
+        munmap(view, length);
+        return offset;
+#endif
+    }
+};
 
 // ============== CUSTOM MEMORY ALLOCATOR ==============
 
+#define DEFAULT_HEAP_SIZE (1024 * 1024)   // 1 MB unless HEAP says otherwise
+#define MIN_HEAP_SIZE 4096
+#define MAX_HEAP_SIZE ((size_t)1 << 40)
+
+// How a free block is chosen:
+//   SEGREGATED - two-level segregated free lists (TLSF); O(1) good fit
+//   BESTFIT    - same lists, but the smallest block that fits wins
+//   BUDDY      - power-of-two blocks split and merged with their buddy
+enum AllocPolicy { POLICY_SEGREGATED, POLICY_BEST_FIT, POLICY_BUDDY };
+
+const char* policyName(AllocPolicy policy) {
+    switch (policy) {
+        case POLICY_BEST_FIT: return "BESTFIT";
+        case POLICY_BUDDY: return "BUDDY";
+        default: return "SEGREGATED";
+    }
+}
+
+bool parsePolicy(const string& name, AllocPolicy& policy) {
+    if (name == "SEGREGATED") policy = POLICY_SEGREGATED;
+    else if (name == "BESTFIT") policy = POLICY_BEST_FIT;
+    else if (name == "BUDDY") policy = POLICY_BUDDY;
+    else return false;
+    return true;
+}
+
+inline int highestBit(uint64_t x) { return 63 - __builtin_clzll(x); }
+inline int lowestBit(uint64_t x) { return __builtin_ctzll(x); }
+
 class CustomAllocator {
 private:
-    static const size_t HEAP_SIZE = 1024 * 1024; // 1MB heap
+    // Every block starts with an 8-byte header: the block size, whose low
+    // bits hold ALLOCATED and PREV_ALLOCATED. A free block also keeps its
+    // free-list links in the payload and a copy of its size in its last
+    // word (the boundary tag), so both neighbours are found in O(1).
+    static const size_t HEADER = sizeof(size_t);
+    static const size_t ALIGN = 8;
+    static const size_t MIN_BLOCK = 32;       // Header + two links + footer
+    static const size_t ALLOCATED = 1;
+    static const size_t PREV_ALLOCATED = 2;
+    static const size_t FLAGS = 7;
+    
+    // Size classes: first level is the power of two, second level splits
+    // it into SL_COUNT linear ranges. Sizes below SMALL_BLOCK share FL 0.
+    static const int SL_LOG2 = 3;
+    static const int SL_COUNT = 1 << SL_LOG2;
+    static const int FL_SHIFT = SL_LOG2 + 3;
+    static const size_t SMALL_BLOCK = (size_t)1 << FL_SHIFT;
+    static const int FL_COUNT = 48;
     
-    struct Block {
-        bool allocated;
-        size_t size;
-        Block* next;
+    // Buddy blocks are 2^order bytes; the header holds the order
+    static const int MIN_ORDER = 5;
+    static const int MAX_ORDERS = 64;
+    
+    struct Links {
+        uint8_t* prev;
+        uint8_t* next;
     };
     
+    AllocPolicy policy;
+    size_t heap_size;       // Bytes mapped
+    size_t usable;          // Bytes managed (excludes the epilogue / buddy tail)
     uint8_t* heap;
-    Block* free_list;
-    size_t total_allocated;
-    size_t total_free;
+    
+    uint64_t fl_bitmap;
+    uint32_t sl_bitmap[FL_COUNT];
+    uint8_t* bins[FL_COUNT][SL_COUNT];
+    
+    int max_order;
+    uint64_t order_bitmap;
+    uint8_t* order_bins[MAX_ORDERS];
+    
+    size_t total_allocated;  // Block bytes in use, headers included
+    size_t live_blocks;
+    size_t peak_allocated;
+    size_t failed_allocs;
+    size_t invalid_frees;
+    
+    // Byte range [changed_lo, changed_hi) rewritten by the last call to
+    // allocate or deallocate; always whole blocks, empty if it failed
+    size_t changed_lo;
+    size_t changed_hi;
+    
+    // ----- Block fields -----
+    static size_t& header(uint8_t* b) { return *(size_t*)b; }
+    static size_t blockSize(uint8_t* b) { return header(b) & ~FLAGS; }
+    static bool isAllocated(uint8_t* b) { return header(b) & ALLOCATED; }
+    static Links* links(uint8_t* b) { return (Links*)(b + HEADER); }
+    static void setFooter(uint8_t* b) { *(size_t*)(b + blockSize(b) - HEADER) = blockSize(b); }
+    
+    // ----- Segregated lists -----
+    static void mapping(size_t size, int& fl, int& sl) {
+        if (size < SMALL_BLOCK) {
+            fl = 0;
+            sl = (int)(size / (SMALL_BLOCK / SL_COUNT));
+        } else {
+            int msb = highestBit(size);
+            sl = (int)((size >> (msb - SL_LOG2)) ^ SL_COUNT);
+            fl = msb - (FL_SHIFT - 1);
+        }
+    }
+    
+    void insertFree(uint8_t* b) {
+        int fl, sl;
+        mapping(blockSize(b), fl, sl);
+        Links* l = links(b);
+        l->prev = NULL;
+        l->next = bins[fl][sl];
+        if (l->next) links(l->next)->prev = b;
+        bins[fl][sl] = b;
+        fl_bitmap |= (uint64_t)1 << fl;
+        sl_bitmap[fl] |= 1u << sl;
+    }
+    
+    void removeFree(uint8_t* b) {
+        int fl, sl;
+        mapping(blockSize(b), fl, sl);
+        Links* l = links(b);
+        if (l->prev) links(l->prev)->next = l->next;
+        else bins[fl][sl] = l->next;
+        if (l->next) links(l->next)->prev = l->prev;
+        if (!bins[fl][sl]) {
+            sl_bitmap[fl] &= ~(1u << sl);
+            if (!sl_bitmap[fl]) fl_bitmap &= ~((uint64_t)1 << fl);
+        }
+    }
+    
+    // First non-empty bin at or after (fl, sl), or false
+    bool nextBin(int& fl, int& sl) {
+        if (fl >= FL_COUNT) return false;
+        uint32_t sl_map = sl < SL_COUNT ? sl_bitmap[fl] & (~0u << sl) : 0;
+        if (!sl_map) {
+            uint64_t fl_map = fl + 1 < 64 ? fl_bitmap & (~(uint64_t)0 << (fl + 1)) : 0;
+            if (!fl_map) return false;
+            fl = lowestBit(fl_map);
+            sl_map = sl_bitmap[fl];
+        }
+        sl = lowestBit(sl_map);
+        return true;
+    }
+    
+    uint8_t* findFree(size_t size) {
+        int fl, sl;
+        if (policy == POLICY_BEST_FIT) {
+            // Bins only grow from here on, so the best block in the first
+            // bin holding any fit is the best block overall
+            mapping(size, fl, sl);
+            while (nextBin(fl, sl)) {
+                uint8_t* best = NULL;
+                for (uint8_t* b = bins[fl][sl]; b; b = links(b)->next) {
+                    if (blockSize(b) >= size && (!best || blockSize(b) < blockSize(best))) {
+                        best = b;
+                        if (blockSize(b) == size) break;
+                    }
+                }
+                if (best) return best;
+                if (++sl == SL_COUNT) { sl = 0; fl++; }
+            }
+            return NULL;
+        }
+        
+        // Good fit: round the request up to the next class boundary, so the
+        // head of any bin found is guaranteed to fit
+        size_t rounded = size;
+        if (size >= SMALL_BLOCK) rounded += ((size_t)1 << (highestBit(size) - SL_LOG2)) - 1;
+        mapping(rounded, fl, sl);
+        if (nextBin(fl, sl)) return bins[fl][sl];
+        // Only the request's own class may still hold a large enough block
+        mapping(size, fl, sl);
+        for (uint8_t* b = bins[fl][sl]; b; b = links(b)->next) {
+            if (blockSize(b) >= size) return b;
+        }
+        return NULL;
+    }
+    
+    void* allocateSegregated(size_t size) {
+        size_t need = max((size_t)MIN_BLOCK, (size + HEADER + ALIGN - 1) & ~(ALIGN - 1));
+        uint8_t* b = findFree(need);
+        if (!b) return NULL;
+        removeFree(b);
+        
+        size_t have = blockSize(b);
+        size_t prev_flag = header(b) & PREV_ALLOCATED;
+        noteChange(b, have);
+        if (have - need >= MIN_BLOCK) {
+            uint8_t* rest = b + need;
+            header(rest) = (have - need) | PREV_ALLOCATED;
+            setFooter(rest);
+            insertFree(rest);
+            have = need;
+        } else {
+            header(b + have) |= PREV_ALLOCATED;
+        }
+        header(b) = have | ALLOCATED | prev_flag;
+        noteAllocated(have);
+        return b + HEADER;
+    }
+    
+    void deallocateSegregated(uint8_t* b) {
+        size_t size = blockSize(b);
+        noteFreed(size);
+        size_t prev_flag = header(b) & PREV_ALLOCATED;
+        
+        uint8_t* next = b + size;
+        if (!isAllocated(next)) {
+            removeFree(next);
+            size += blockSize(next);
+        }
+        if (!prev_flag) {
+            // The previous block is free, so its footer sits just before us
+            uint8_t* prev = b - *(size_t*)(b - HEADER);
+            removeFree(prev);
+            size += blockSize(prev);
+            prev_flag = header(prev) & PREV_ALLOCATED;
+            b = prev;
+        }
+        header(b) = size | prev_flag;
+        setFooter(b);
+        header(b + size) &= ~PREV_ALLOCATED;
+        insertFree(b);
+        noteChange(b, size);
+    }
+    
+    // ----- Buddy system -----
+    static int blockOrder(uint8_t* b) { return (int)(header(b) >> 8); }
+    
+    void pushOrder(uint8_t* b, int order) {
+        header(b) = (size_t)order << 8;
+        Links* l = links(b);
+        l->prev = NULL;
+        l->next = order_bins[order];
+        if (l->next) links(l->next)->prev = b;
+        order_bins[order] = b;
+        order_bitmap |= (uint64_t)1 << order;
+    }
+    
+    void removeOrder(uint8_t* b, int order) {
+        Links* l = links(b);
+        if (l->prev) links(l->prev)->next = l->next;
+        else order_bins[order] = l->next;
+        if (l->next) links(l->next)->prev = l->prev;
+        if (!order_bins[order]) order_bitmap &= ~((uint64_t)1 << order);
+    }
+    
+    void* allocateBuddy(size_t size) {
+        size_t need = size + HEADER;
+        int order = max((int)MIN_ORDER, need <= 1 ? 0 : highestBit(need - 1) + 1);
+        if (order > max_order) return NULL;
+        uint64_t candidates = order_bitmap & (~(uint64_t)0 << order);
+        if (!candidates) return NULL;
+        
+        int have = lowestBit(candidates);
+        uint8_t* b = order_bins[have];
+        removeOrder(b, have);
+        noteChange(b, (size_t)1 << have);
+        while (have > order) {
+            have--;
+            pushOrder(b + ((size_t)1 << have), have);
+        }
+        header(b) = ((size_t)order << 8) | ALLOCATED;
+        noteAllocated((size_t)1 << order);
+        return b + HEADER;
+    }
+    
+    void deallocateBuddy(uint8_t* b) {
+        int order = blockOrder(b);
+        noteFreed((size_t)1 << order);
+        while (order < max_order) {
+            uint8_t* buddy = heap + ((size_t)(b - heap) ^ ((size_t)1 << order));
+            // A split buddy's first word is a smaller block's header
+            if (isAllocated(buddy) || blockOrder(buddy) != order) break;
+            removeOrder(buddy, order);
+            b = min(b, buddy);
+            order++;
+        }
+        pushOrder(b, order);
+        noteChange(b, (size_t)1 << order);
+    }
+    
+    // ----- Bookkeeping -----
+    void noteAllocated(size_t bytes) {
+        total_allocated += bytes;
+        live_blocks++;
+        peak_allocated = max(peak_allocated, total_allocated);
+    }
+    
+    void noteFreed(size_t bytes) {
+        total_allocated -= bytes;
+        live_blocks--;
+    }
+    
+    void noteChange(uint8_t* b, size_t bytes) {
+        changed_lo = b - heap;
+        changed_hi = changed_lo + bytes;
+    }
+    
+    size_t blockBytes(uint8_t* b) const {
+        return policy == POLICY_BUDDY ? (size_t)1 << blockOrder(b) : blockSize(b);
+    }
+    
+    void format() {
+        fl_bitmap = 0;
+        memset(sl_bitmap, 0, sizeof(sl_bitmap));
+        memset(bins, 0, sizeof(bins));
+        order_bitmap = 0;
+        memset(order_bins, 0, sizeof(order_bins));
+        total_allocated = live_blocks = peak_allocated = failed_allocs = invalid_frees = 0;
+        changed_lo = changed_hi = 0;
+        
+        if (policy == POLICY_BUDDY) {
+            max_order = highestBit(heap_size);
+            usable = (size_t)1 << max_order;
+            pushOrder(heap, max_order);
+        } else {
+            // One free block, then a zero-size allocated epilogue header
+            // that stops coalescing at the end of the heap
+            usable = (heap_size - HEADER) & ~(ALIGN - 1);
+            header(heap) = usable | PREV_ALLOCATED;
+            setFooter(heap);
+            header(heap + usable) = ALLOCATED;
+            insertFree(heap);
+        }
+    }
     
 public:
-    CustomAllocator() {
-        heap = (uint8_t*)VirtualAlloc(NULL, HEAP_SIZE, MEM_COMMIT | MEM_RESERVE, PAGE_READWRITE);
+    CustomAllocator(size_t heapSize = DEFAULT_HEAP_SIZE, AllocPolicy allocPolicy = POLICY_SEGREGATED)
+        : policy(allocPolicy), heap_size(heapSize), heap(NULL) {
+        heap = mapHeap(heap_size);
         if (!heap) {
             cerr << "Failed to allocate heap" << endl;
             exit(1);
         }
-        free_list = (Block*)heap;
-        free_list->allocated = false;
-        free_list->size = HEAP_SIZE;
-        free_list->next = NULL;
-        total_allocated = 0;
-        total_free = HEAP_SIZE;
+        format();
     }
     
     ~CustomAllocator() {
-        if (heap) VirtualFree(heap, 0, MEM_RELEASE);
+        if (heap) unmapHeap(heap, heap_size);
+    }
+    
+    // Replace the heap with a fresh one; on failure the old heap stays
+    bool reset(size_t heapSize, AllocPolicy allocPolicy) {
+        if (heapSize < MIN_HEAP_SIZE || heapSize > MAX_HEAP_SIZE) return false;
+        uint8_t* fresh = mapHeap(heapSize);
+        if (!fresh) return false;
+        unmapHeap(heap, heap_size);
+        heap = fresh;
+        heap_size = heapSize;
+        policy = allocPolicy;
+        format();
+        return true;
     }
     
     void* allocate(size_t size) {
-        // Align to 8 bytes
-        size = ((size + 7) / 8) * 8;
-        size += sizeof(Block); // Space for block header
-        
-        Block* prev = NULL;
-        Block* current = free_list;
-        
-        while (current) {
-            if (!current->allocated && current->size >= size) {
-                // Found suitable block
-                if (current->size > size + sizeof(Block) + 16) {
-                    // Split block
-                    Block* new_block = (Block*)((uint8_t*)current + size);
-                    new_block->allocated = false;
-                    new_block->size = current->size - size;
-                    new_block->next = current->next;
-                    
-                    current->allocated = true;
-                    current->size = size;
-                    current->next = new_block;
-                    
-                    if (prev) prev->next = new_block;
-                    else free_list = new_block;
-                } else {
-                    // Use whole block
-                    current->allocated = true;
-                    if (prev) prev->next = current->next;
-                    else free_list = current->next;
-                }
-                
-                total_allocated += size;
-                total_free -= size;
-                return (void*)((uint8_t*)current + sizeof(Block));
-            }
-            prev = current;
-            current = current->next;
+        changed_lo = changed_hi = 0;
+        void* p = NULL;
+        if (size <= usable) {
+            p = policy == POLICY_BUDDY ? allocateBuddy(size) : allocateSegregated(size);
         }
-        
-        return NULL; // No suitable block found
+        if (!p) failed_allocs++;
+        return p;
     }
     
     void deallocate(void* ptr) {
+        changed_lo = changed_hi = 0;
         if (!ptr) return;
-        
-        Block* block = (Block*)((uint8_t*)ptr - sizeof(Block));
-        block->allocated = false;
-        
-        total_allocated -= block->size;
-        total_free += block->size;
-        
-        // Merge with next block if free
-        Block* current = (Block*)heap;
-        while (current) {
-            if (!current->allocated && current->next && !current->next->allocated) {
-                current->size += current->next->size;
-                current->next = current->next->next;
-            }
-            current = current->next;
+        uint8_t* b = (uint8_t*)ptr - HEADER;
+        // Ignore pointers we never handed out and double frees
+        if (b < heap || b >= heap + usable || (size_t)(b - heap) % ALIGN != 0 || !isAllocated(b)) {
+            invalid_frees++;
+            return;
+        }
+        if (policy == POLICY_BUDDY) deallocateBuddy(b);
+        else deallocateSegregated(b);
+    }
+    
+    AllocPolicy getPolicy() const { return policy; }
+    size_t heapSize() const { return heap_size; }
+    size_t usableBytes() const { return usable; }
+    size_t allocatedBytes() const { return total_allocated; }
+    size_t freeBytes() const { return usable - total_allocated; }
+    size_t liveBlocks() const { return live_blocks; }
+    size_t peakAllocated() const { return peak_allocated; }
+    size_t failedAllocations() const { return failed_allocs; }
+    size_t invalidFrees() const { return invalid_frees; }
+    size_t changedFrom() const { return changed_lo; }
+    size_t changedTo() const { return changed_hi; }
+    
+    // Writes " <size>" for every block in [lo, hi), negated for free
+    // blocks; lo must be a block boundary
+    void writeBlocks(ostream& out, size_t lo, size_t hi) const {
+        for (size_t off = lo; off < hi; ) {
+            uint8_t* b = heap + off;
+            size_t bytes = blockBytes(b);
+            out << ' ' << (isAllocated(b) ? "" : "-") << bytes;
+            off += bytes;
         }
     }
     
+    size_t largestFreeBlock() {
+        if (policy == POLICY_BUDDY) {
+            return order_bitmap ? (size_t)1 << highestBit(order_bitmap) : 0;
+        }
+        if (!fl_bitmap) return 0;
+        int fl = highestBit(fl_bitmap);
+        int sl = highestBit(sl_bitmap[fl]);
+        size_t largest = 0;
+        for (uint8_t* b = bins[fl][sl]; b; b = links(b)->next) {
+            largest = max(largest, blockSize(b));
+        }
+        return largest;
+    }
+    
+    // Share of free memory outside the largest free block: 0% means one
+    // request could use all of it
+    double externalFragmentation() {
+        size_t free_bytes = freeBytes();
+        return free_bytes ? (1.0 - largestFreeBlock() / (double)free_bytes) * 100 : 0;
+    }
+    
     void printStats() {
         cout << BOLD << CYAN << "\n=== Memory Allocator Stats ===" << RESET << endl;
-        cout << "Total Heap Size: " << HEAP_SIZE / 1024 << " KB" << endl;
-        cout << "Allocated: " << total_allocated / 1024 << " KB" << endl;
-        cout << "Free: " << total_free / 1024 << " KB" << endl;
-        double frag = (total_free > 0) ? (1.0 - (total_free / (double)HEAP_SIZE)) * 100 : 0;
-        cout << "Fragmentation: " << fixed << setprecision(2) << frag << "%" << endl;
+        cout << "Policy: " << policyName(policy) << endl;
+        cout << "Total Heap Size: " << heap_size / 1024 << " KB (" << usable << " bytes managed)" << endl;
+        cout << "Allocated: " << total_allocated << " bytes in " << live_blocks << " blocks" << endl;
+        cout << "Free: " << freeBytes() << " bytes" << endl;
+        cout << "Largest Free Block: " << largestFreeBlock() << " bytes" << endl;
+        cout << "Fragmentation: " << fixed << setprecision(2) << externalFragmentation() << "%" << endl;
     }
 };
 
+// ============== ALLOCATOR DRIVER ==============
+
+// One step of an allocation trace: size > 0 allocates into slot, 0 frees it
+struct AllocOp {
+    uint32_t slot;
+    uint32_t size;
+};
+
+// Random churn around a steady state of about maxLive/2 live blocks, with
+// log-uniform sizes in [8, maxSize]; deterministic for a given seed
+vector<AllocOp> generateAllocTrace(size_t ops, uint32_t maxLive, uint32_t maxSize, uint64_t seed) {
+    vector<AllocOp> trace;
+    trace.reserve(ops);
+    vector<uint32_t> live, free_slots;
+    for (uint32_t k = maxLive; k > 0; k--) free_slots.push_back(k - 1);
+    
+    uint64_t state = seed * 6364136223846793005ULL + 1442695040888963407ULL;
+    double span = log((double)max(maxSize, 9u) / 8.0);
+    for (size_t i = 0; i < ops; i++) {
+        state ^= state >> 12; state ^= state << 25; state ^= state >> 27;
+        uint64_t r = state * 2685821657736338717ULL;
+        bool wantAlloc = live.size() < maxLive / 2 ? (r & 0xff) < 140 : (r & 0xff) < 116;
+        if (live.empty() || (wantAlloc && !free_slots.empty())) {
+            uint32_t slot = free_slots.back();
+            free_slots.pop_back();
+            double u = (r >> 11) / (double)(1ULL << 53);
+            live.push_back(slot);
+            trace.push_back({slot, (uint32_t)(8.0 * exp(u * span))});
+        } else {
+            size_t pick = (r >> 16) % live.size();
+            uint32_t slot = live[pick];
+            live[pick] = live.back();
+            live.pop_back();
+            free_slots.push_back(slot);
+            trace.push_back({slot, 0});
+        }
+    }
+    return trace;
+}
+
+// Replays a trace and prints throughput and fragmentation. Generation is
+// not timed. Everything still live is freed afterwards and the heap must
+// come back as one free block.
+void runAllocBench(CustomAllocator& allocator, size_t ops, uint32_t maxLive, uint32_t maxSize,
+                   uint64_t seed) {
+    vector<AllocOp> trace = generateAllocTrace(ops, maxLive, maxSize, seed);
+    vector<void*> slots(maxLive, (void*)NULL);
+    vector<uint32_t> requested(maxLive, 0);
+    size_t requested_live = 0, allocs = 0, frees = 0;
+    size_t failed_before = allocator.failedAllocations();
+    
+    // Fragmentation is sampled 100 times; sampling is outside the timed spans
+    size_t sample_every = max((size_t)1, ops / 100);
+    double external_sum = 0, internal_sum = 0;
+    int samples = 0;
+    chrono::duration<double> elapsed(0);
+    
+    for (size_t start = 0; start < trace.size(); start += sample_every) {
+        size_t end = min(trace.size(), start + sample_every);
+        auto t0 = chrono::steady_clock::now();
+        for (size_t i = start; i < end; i++) {
+            const AllocOp& op = trace[i];
+            if (op.size) {
+                slots[op.slot] = allocator.allocate(op.size);
+                allocs++;
+            } else {
+                allocator.deallocate(slots[op.slot]);
+                slots[op.slot] = NULL;
+                frees++;
+            }
+        }
+        elapsed += chrono::steady_clock::now() - t0;
+        
+        requested_live = 0;
+        for (size_t i = start; i < end; i++) {
+            if (trace[i].size) requested[trace[i].slot] = trace[i].size;
+        }
+        for (uint32_t s = 0; s < maxLive; s++) {
+            if (slots[s]) requested_live += requested[s];
+        }
+        if (allocator.allocatedBytes()) {
+            internal_sum += (1.0 - requested_live / (double)allocator.allocatedBytes()) * 100;
+        }
+        external_sum += allocator.externalFragmentation();
+        samples++;
+    }
+    
+    double final_external = allocator.externalFragmentation();
+    for (uint32_t s = 0; s < maxLive; s++) {
+        allocator.deallocate(slots[s]);
+    }
+    bool heap_ok = allocator.liveBlocks() == 0 && allocator.largestFreeBlock() == allocator.usableBytes();
+    
+    double seconds = elapsed.count();
+    cout << "=== Allocator Benchmark ===" << endl;
+    cout << "Policy: " << policyName(allocator.getPolicy()) << endl;
+    cout << "Heap: " << allocator.heapSize() << " bytes" << endl;
+    cout << "Operations: " << trace.size() << " (" << allocs << " allocs, " << frees << " frees)" << endl;
+    cout << "Failed allocations: " << allocator.failedAllocations() - failed_before << endl;
+    cout << "Seconds: " << fixed << setprecision(4) << seconds << endl;
+    cout << "Ops/sec: " << fixed << setprecision(0) << (seconds > 0 ? trace.size() / seconds : 0) << endl;
+    cout << "Peak allocated: " << allocator.peakAllocated() << " bytes" << endl;
+    cout << "Internal fragmentation (avg): " << fixed << setprecision(2)
+         << (samples ? internal_sum / samples : 0) << "%" << endl;
+    cout << "External fragmentation (avg): " << (samples ? external_sum / samples : 0) << "%" << endl;
+    cout << "External fragmentation (final): " << final_external << "%" << endl;
+    cout << "Heap check: " << (heap_ok ? "OK" : "FAILED") << endl;
+}
+
+// Replays a client-supplied trace from a fresh heap and prints the heap
+// map as deltas, so a viewer can rebuild any step without full dumps:
+//   HEAPTRACE <steps> <managed bytes> <policy>
+//   0 <block> <block> ...              - initial map from offset 0
+//   <allocated> <largest free> [<offset> <block> ...]   - one line per step
+//   HEAPTRACE_END
+// A block is its size in bytes, negative when free. A step's blocks
+// replace everything in [offset, offset + their total); a step that
+// changed nothing (failed allocation, unknown handle) has no offset.
+// Blocks still live at the end are freed and the heap is left empty.
+void runAllocTrace(CustomAllocator& allocator, const vector<AllocOp>& trace) {
+    allocator.reset(allocator.heapSize(), allocator.getPolicy());
+    unordered_map<uint32_t, void*> live;
+    ostringstream out;
+    out << "HEAPTRACE " << trace.size() << ' ' << allocator.usableBytes() << ' '
+        << policyName(allocator.getPolicy()) << '\n' << 0;
+    allocator.writeBlocks(out, 0, allocator.usableBytes());
+    out << '\n';
+    
+    for (size_t i = 0; i < trace.size(); i++) {
+        const AllocOp& op = trace[i];
+        bool changed = false;
+        if (op.size) {
+            // Re-allocating a live handle is refused rather than leaked
+            if (!live.count(op.slot)) {
+                void* p = allocator.allocate(op.size);
+                if (p) {
+                    live[op.slot] = p;
+                    changed = true;
+                }
+            }
+        } else {
+            unordered_map<uint32_t, void*>::iterator it = live.find(op.slot);
+            if (it != live.end()) {
+                allocator.deallocate(it->second);
+                live.erase(it);
+                changed = true;
+            }
+        }
+        out << allocator.allocatedBytes() << ' ' << allocator.largestFreeBlock();
+        if (changed) {
+            out << ' ' << allocator.changedFrom();
+            allocator.writeBlocks(out, allocator.changedFrom(), allocator.changedTo());
+        }
+        out << '\n';
+        // Keep the buffer small on 100k-step traces
+        if ((i & 4095) == 4095) {
+            cout << out.str();
+            out.str("");
+        }
+    }
+    for (unordered_map<uint32_t, void*>::iterator it = live.begin(); it != live.end(); ++it) {
+        allocator.deallocate(it->second);
+    }
+    out << "HEAPTRACE_END\n";
+    cout << out.str() << flush;
+}
+
 // ============== PROCESS SCHEDULER ==============
 
 struct Process {
@@ -164,20 +1170,121 @@ struct GanttEntry {
     int end;
 };
 
+// How scheduler results are written to stdout
+enum ResultFormat {
+    FORMAT_TEXT,   // Human-readable tables (terminal and legacy API clients)
+    FORMAT_JSON,   // Length-prefixed JSON frames for the GUI client
+    FORMAT_MAP     // JSON frames whose columns are written to a ResultSegment
+};
+
+#define RESULT_FRAME_HEADER "RESULT_JSON"
+#define DEFAULT_QUANTUM 2
+#define AGING_INTERVAL 5   // Waiting this long raises a ready process one priority level
+#define MLFQ_LEVELS 3      // Level L runs round robin with quantum << L
+
+// Ready-queue entry for the event-driven simulations: the lowest key runs
+// first, ties go to the earlier arrival (pos is the index in arrival order)
+struct ReadyEntry {
+    long long key;
+    size_t pos;
+    
+    bool operator>(const ReadyEntry& other) const {
+        return key > other.key || (key == other.key && pos > other.pos);
+    }
+};
+
+typedef priority_queue<ReadyEntry, vector<ReadyEntry>, greater<ReadyEntry>> ReadyHeap;
+
+enum PreemptPolicy {
+    PREEMPT_SRTF,    // key = remaining burst
+    PREEMPT_AGING    // key = priority * AGING_INTERVAL + time the process became ready
+};
+
+// ============== MULTI-CORE SIMULATION ==============
+
+#define MAX_CPUS 256
+#define MLFQ_LEVEL_KEY (1LL << 40)   // MLFQ run-queue key = level * MLFQ_LEVEL_KEY + sequence
+
+enum SchedPolicy {
+    POLICY_FCFS,
+    POLICY_SJF,
+    POLICY_PRIORITY,
+    POLICY_RR,
+    POLICY_SRTF,
+    POLICY_AGING,
+    POLICY_MLFQ
+};
+
+// Per-core results of a multi-CPU run; the run's Gantt slices are grouped
+// by core, lanes[c] of them for core c, each lane in time order
+struct CoreStats {
+    vector<size_t> lanes;
+    vector<long long> busy;     // Time spent running processes
+    vector<int> completed;      // Processes that finished on the core
+    vector<int> steals;         // Processes taken from another core's queue
+};
+
+// End of the slice a core is running; stale entries (the slice was
+// preempted) are recognised by their token and skipped
+struct SliceEvent {
+    int time;
+    int cpu;
+    unsigned token;
+    
+    bool operator>(const SliceEvent& other) const {
+        return time != other.time ? time > other.time : cpu > other.cpu;
+    }
+};
+
+class EnhancedScheduler;
+
+// One algorithm of a comparison run, executed on its own thread
+struct CompareJob {
+    EnhancedScheduler* worker;
+    int option;
+};
+
+// Menu options compared by RUN 6, in report order
+static const int COMPARE_OPTIONS[] = {2, 3, 4, 5, 13, 14, 15};
+
 class EnhancedScheduler {
 private:
     vector<Process> processes;
+    const vector<Process>* shared;   // Another scheduler's workload, for comparison workers
     vector<GanttEntry> gantt;
     bool running;
     int current_time;
+    ResultFormat format;
+    int quantum;
+    int cpus;
+    ostream* out;                    // Where JSON result frames go
+    ResultSegment* segment;          // Where FORMAT_MAP columns go
+    
+    bool textOutput() const { return format == FORMAT_TEXT; }
+    const vector<Process>& workload() const { return shared != NULL ? *shared : processes; }
     
 public:
-    EnhancedScheduler() : running(false), current_time(0) {}
+    EnhancedScheduler() : shared(NULL), running(false), current_time(0), format(FORMAT_TEXT),
+                          quantum(DEFAULT_QUANTUM), cpus(1), out(&cout), segment(NULL) {}
+    
+    void setFormat(ResultFormat f) { format = f; }
+    void setSegment(ResultSegment* s) { segment = s; }
+    ResultFormat getFormat() const { return format; }
+    
+    void setQuantum(int q) { quantum = q; }
+    int getQuantum() const { return quantum; }
+    
+    void setCpus(int n) { cpus = n; }
+    int getCpus() const { return cpus; }
     
     void addProcess(int id, int arrival, int burst, int priority) {
         processes.emplace_back(id, arrival, burst, priority);
     }
     
+    void reserve(size_t n) {
+        processes.reserve(n);
+    }
+    
     vector<Process> getProcesses() {
         return processes;
     }
@@ -189,9 +1296,13 @@ public:
     }
     
     void runFCFS() {
-        cout << BOLD << GREEN << "\n--- Running FCFS Scheduler ---" << RESET << endl;
-        vector<Process> sorted = processes;
-        sort(sorted.begin(), sorted.end(), [](const Process& a, const Process& b) {
+        if (cpus > 1) return runSmp(POLICY_FCFS, "FCFS", 0);
+        if (textOutput()) {
+            cout << BOLD << GREEN << "\n--- Running FCFS Scheduler ---" << RESET << endl;
+        }
+        size_t first = gantt.size();
+        vector<Process> sorted = workload();
+        stable_sort(sorted.begin(), sorted.end(), [](const Process& a, const Process& b) {
             return a.arrival < b.arrival;
         });
         
@@ -203,16 +1314,22 @@ public:
             sorted[i].completion = time;
             sorted[i].turnaround = sorted[i].completion - sorted[i].arrival;
             sorted[i].waiting = sorted[i].turnaround - sorted[i].burst;
-            cout << "P" << sorted[i].id << ": " << sorted[i].arrival << " -> " << sorted[i].completion 
-                 << " | Waiting: " << sorted[i].waiting << endl;
+            if (textOutput()) {
+                cout << "P" << sorted[i].id << ": " << sorted[i].arrival << " -> " << sorted[i].completion 
+                     << " | Waiting: " << sorted[i].waiting << endl;
+            }
         }
-        printStats(sorted);
+        report("FCFS", 0, sorted, first);
     }
     
     void runSJF() {
-        cout << BOLD << GREEN << "\n--- Running SJF Scheduler ---" << RESET << endl;
-        vector<Process> sorted = processes;
-        sort(sorted.begin(), sorted.end(), [](const Process& a, const Process& b) {
+        if (cpus > 1) return runSmp(POLICY_SJF, "SJF", 0);
+        if (textOutput()) {
+            cout << BOLD << GREEN << "\n--- Running SJF Scheduler ---" << RESET << endl;
+        }
+        size_t first = gantt.size();
+        vector<Process> sorted = workload();
+        stable_sort(sorted.begin(), sorted.end(), [](const Process& a, const Process& b) {
             if (a.arrival == b.arrival) return a.burst < b.burst;
             return a.arrival < b.arrival;
         });
@@ -236,18 +1353,24 @@ public:
                 sorted[idx].completion = time;
                 sorted[idx].turnaround = sorted[idx].completion - sorted[idx].arrival;
                 sorted[idx].waiting = sorted[idx].turnaround - sorted[idx].burst;
-                cout << "P" << sorted[idx].id << ": " << time - burst << " -> " << time << endl;
+                if (textOutput()) {
+                    cout << "P" << sorted[idx].id << ": " << time - burst << " -> " << time << endl;
+                }
             } else {
                 time = sorted[i].arrival;
             }
         }
-        printStats(sorted);
+        report("SJF", 0, sorted, first);
     }
     
     void runPriority() {
-        cout << BOLD << GREEN << "\n--- Running Priority Scheduler ---" << RESET << endl;
-        vector<Process> sorted = processes;
-        sort(sorted.begin(), sorted.end(), [](const Process& a, const Process& b) {
+        if (cpus > 1) return runSmp(POLICY_PRIORITY, "Priority", 0);
+        if (textOutput()) {
+            cout << BOLD << GREEN << "\n--- Running Priority Scheduler ---" << RESET << endl;
+        }
+        size_t first = gantt.size();
+        vector<Process> sorted = workload();
+        stable_sort(sorted.begin(), sorted.end(), [](const Process& a, const Process& b) {
             if (a.arrival == b.arrival) return a.priority < b.priority;
             return a.arrival < b.arrival;
         });
@@ -271,64 +1394,642 @@ public:
                 sorted[idx].completion = time;
                 sorted[idx].turnaround = sorted[idx].completion - sorted[idx].arrival;
                 sorted[idx].waiting = sorted[idx].turnaround - sorted[idx].burst;
-                cout << "P" << sorted[idx].id << " (Pri:" << pri << "): " 
-                     << time - sorted[idx].burst << " -> " << time << endl;
+                if (textOutput()) {
+                    cout << "P" << sorted[idx].id << " (Pri:" << pri << "): " 
+                         << time - sorted[idx].burst << " -> " << time << endl;
+                }
             } else {
                 time = sorted[i].arrival;
             }
         }
-        printStats(sorted);
+        report("Priority", 0, sorted, first);
     }
     
     void runRoundRobin(int quantum) {
-        cout << BOLD << GREEN << "\n--- Running Round Robin (Quantum=" << quantum << ") ---" << RESET << endl;
+        if (cpus > 1) return runSmp(POLICY_RR, "Round Robin", quantum);
+        if (textOutput()) {
+            cout << BOLD << GREEN << "\n--- Running Round Robin (Quantum=" << quantum << ") ---" << RESET << endl;
+        }
+        size_t first = gantt.size();
+        if (quantum < 1) quantum = 1;
+        
+        // Work on a copy so the loaded workload keeps its burst times
+        vector<Process> procs = workload();
+        vector<int> remaining(procs.size());
+        vector<size_t> order(procs.size());
+        for (size_t j = 0; j < procs.size(); j++) {
+            remaining[j] = procs[j].burst;
+            order[j] = j;
+        }
+        stable_sort(order.begin(), order.end(), [&procs](size_t a, size_t b) {
+            return procs[a].arrival < procs[b].arrival;
+        });
+        
         queue<size_t> q;
-        vector<bool> in_queue;
-        in_queue.assign(processes.size(), false);
         int time = 0;
         size_t i = 0;
+        size_t done = 0;
         
-        for (size_t j = 0; j < processes.size(); j++) {
-            if (processes[j].arrival == time) {
-                q.push(j);
-                in_queue[j] = true;
-            }
-        }
-        
-        while (i < processes.size() || !q.empty()) {
-            if (!q.empty()) {
-                size_t idx = q.front();
-                q.pop();
-                in_queue[idx] = false;
-                
-                int exec = min(quantum, processes[idx].burst);
-                gantt.push_back({processes[idx].id, time, time + exec});
-                cout << "P" << processes[idx].id << ": " << time << " -> " << time + exec << endl;
-                
-                time += exec;
-                processes[idx].burst -= exec;
-                
-                while (i < processes.size() && processes[i].arrival <= time) {
-                    if (!in_queue[i]) {
-                        q.push(i);
-                        in_queue[i] = true;
-                    }
-                    i++;
+        while (done < procs.size()) {
+            if (q.empty() && time < procs[order[i]].arrival) {
+                time = procs[order[i]].arrival;  // CPU idle until next arrival
+            }
+            while (i < order.size() && procs[order[i]].arrival <= time) {
+                q.push(order[i++]);
+            }
+            
+            size_t idx = q.front();
+            q.pop();
+            
+            int exec = min(quantum, remaining[idx]);
+            gantt.push_back({procs[idx].id, time, time + exec});
+            if (textOutput()) {
+                cout << "P" << procs[idx].id << ": " << time << " -> " << time + exec << endl;
+            }
+            
+            time += exec;
+            remaining[idx] -= exec;
+            
+            // Arrivals during the slice queue ahead of the preempted process
+            while (i < order.size() && procs[order[i]].arrival <= time) {
+                q.push(order[i++]);
+            }
+            
+            if (remaining[idx] > 0) {
+                q.push(idx);
+            } else {
+                procs[idx].completion = time;
+                procs[idx].turnaround = procs[idx].completion - procs[idx].arrival;
+                procs[idx].waiting = procs[idx].turnaround - procs[idx].burst;
+                done++;
+            }
+        }
+        report("Round Robin", quantum, procs, first);
+    }
+    
+    // Event-driven core for the preemptive policies. Time jumps from event
+    // to event (an arrival or the running process finishing) rather than
+    // tick by tick, and only arrivals can preempt, so n processes cost
+    // O(n log n) and give at most 2n slices. With PREEMPT_AGING a process
+    // gains a priority level per AGING_INTERVAL spent waiting; it keeps the
+    // key it was dispatched with while running and restarts aging when
+    // preempted.
+    void runPreemptive(const string& algorithm, PreemptPolicy policy) {
+        if (cpus > 1) {
+            return runSmp(policy == PREEMPT_SRTF ? POLICY_SRTF : POLICY_AGING, algorithm, 0);
+        }
+        if (textOutput()) {
+            cout << BOLD << GREEN << "\n--- Running " << algorithm << " Scheduler ---" << RESET << endl;
+        }
+        size_t first = gantt.size();
+        vector<Process> procs = workload();
+        size_t n = procs.size();
+        vector<int> remaining(n);
+        vector<size_t> order(n);
+        for (size_t j = 0; j < n; j++) {
+            remaining[j] = procs[j].burst;
+            order[j] = j;
+        }
+        stable_sort(order.begin(), order.end(), [&procs](size_t a, size_t b) {
+            return procs[a].arrival < procs[b].arrival;
+        });
+        auto keyAt = [&](size_t pos, int now) -> long long {
+            size_t k = order[pos];
+            if (policy == PREEMPT_SRTF) return remaining[k];
+            return (long long)procs[k].priority * AGING_INTERVAL + now;
+        };
+        
+        ReadyHeap ready;
+        ReadyEntry current = {0, 0};
+        bool running = false;
+        int time = 0;
+        int sliceStart = 0;
+        size_t i = 0;
+        size_t done = 0;
+        
+        while (done < n) {
+            if (!running && ready.empty() && time < procs[order[i]].arrival) {
+                time = procs[order[i]].arrival;  // CPU idle until next arrival
+            }
+            while (i < n && procs[order[i]].arrival <= time) {
+                ready.push({keyAt(i, time), i});
+                i++;
+            }
+            
+            if (running) {
+                if (policy == PREEMPT_SRTF) current.key = remaining[order[current.pos]];
+                if (current > ready.top()) {
+                    // A better process arrived: requeue the running one
+                    addSlice(procs[order[current.pos]].id, sliceStart, time);
+                    ready.push({keyAt(current.pos, time), current.pos});
+                    running = false;
                 }
-                
-                if (processes[idx].burst > 0) {
-                    q.push(idx);
-                    in_queue[idx] = true;
+            }
+            if (!running) {
+                current = ready.top();
+                ready.pop();
+                running = true;
+                sliceStart = time;
+            }
+            
+            // Run until the process finishes or the next arrival, whichever is first
+            size_t k = order[current.pos];
+            int end = time + remaining[k];
+            if (i < n && procs[order[i]].arrival < end) end = procs[order[i]].arrival;
+            remaining[k] -= end - time;
+            time = end;
+            
+            if (remaining[k] == 0) {
+                addSlice(procs[k].id, sliceStart, time);
+                procs[k].completion = time;
+                procs[k].turnaround = procs[k].completion - procs[k].arrival;
+                procs[k].waiting = procs[k].turnaround - procs[k].burst;
+                running = false;
+                done++;
+            }
+        }
+        report(algorithm, 0, procs, first);
+    }
+    
+    void runSRTF() {
+        runPreemptive("SRTF", PREEMPT_SRTF);
+    }
+    
+    void runPreemptivePriority() {
+        runPreemptive("Preemptive Priority", PREEMPT_AGING);
+    }
+    
+    // Multilevel feedback queue: MLFQ_LEVELS round-robin levels, level L
+    // with quantum << L. Arrivals enter level 0. A process that uses its
+    // whole quantum drops a level (the last level keeps it); an arrival
+    // preempts a process running below level 0, which requeues at the back
+    // of its own level.
+    void runMLFQ(int quantum) {
+        if (cpus > 1) return runSmp(POLICY_MLFQ, "MLFQ", quantum);
+        if (textOutput()) {
+            cout << BOLD << GREEN << "\n--- Running MLFQ (Quantum=" << quantum << ") ---" << RESET << endl;
+        }
+        size_t first = gantt.size();
+        if (quantum < 1) quantum = 1;
+        
+        vector<Process> procs = workload();
+        size_t n = procs.size();
+        vector<int> remaining(n);
+        vector<size_t> order(n);
+        for (size_t j = 0; j < n; j++) {
+            remaining[j] = procs[j].burst;
+            order[j] = j;
+        }
+        stable_sort(order.begin(), order.end(), [&procs](size_t a, size_t b) {
+            return procs[a].arrival < procs[b].arrival;
+        });
+        
+        vector<queue<size_t>> levels(MLFQ_LEVELS);
+        size_t queued = 0;
+        int time = 0;
+        size_t i = 0;
+        size_t done = 0;
+        
+        while (done < n) {
+            if (queued == 0 && time < procs[order[i]].arrival) {
+                time = procs[order[i]].arrival;  // CPU idle until next arrival
+            }
+            for (; i < n && procs[order[i]].arrival <= time; i++, queued++) {
+                levels[0].push(order[i]);
+            }
+            
+            int level = 0;
+            while (levels[level].empty()) level++;
+            size_t idx = levels[level].front();
+            levels[level].pop();
+            queued--;
+            
+            long long slice = (long long)quantum << level;
+            int end = time + (int)min(slice, (long long)remaining[idx]);
+            if (level > 0 && i < n && procs[order[i]].arrival < end) {
+                end = procs[order[i]].arrival;
+            }
+            addSlice(procs[idx].id, time, end);
+            int used = end - time;
+            remaining[idx] -= used;
+            time = end;
+            
+            // As in Round Robin, arrivals during the slice queue first
+            for (; i < n && procs[order[i]].arrival <= time; i++, queued++) {
+                levels[0].push(order[i]);
+            }
+            
+            if (remaining[idx] > 0) {
+                if (used == slice && level < MLFQ_LEVELS - 1) level++;
+                levels[level].push(idx);
+                queued++;
+            } else {
+                procs[idx].completion = time;
+                procs[idx].turnaround = procs[idx].completion - procs[idx].arrival;
+                procs[idx].waiting = procs[idx].turnaround - procs[idx].burst;
+                done++;
+            }
+        }
+        report("MLFQ", quantum, procs, first);
+    }
+    
+    // Symmetric multiprocessing over `cpus` cores, each with its own run
+    // queue ordered by the policy's key (ties to the earlier arrival). An
+    // arrival joins the least loaded core (running + queued, lowest index on
+    // ties) and may preempt there under SRTF, aging Priority and MLFQ. A
+    // core that runs dry steals the best process from the longest queue.
+    // Time moves between events (arrivals and slice ends); at each instant
+    // finished slices are retired, arrivals placed, quantum expiries
+    // requeued behind them, then idle cores dispatched in index order.
+    void runSmp(SchedPolicy policy, const string& algorithm, int quantum) {
+        int ncpu = cpus;
+        if (textOutput()) {
+            cout << BOLD << GREEN << "\n--- Running " << algorithm << " on " << ncpu << " CPUs";
+            if (quantum) cout << " (Quantum=" << quantum << ")";
+            cout << " ---" << RESET << endl;
+        }
+        size_t first = gantt.size();
+        bool usesQuantum = policy == POLICY_RR || policy == POLICY_MLFQ;
+        if (usesQuantum && quantum < 1) quantum = 1;
+        bool preemptive = policy == POLICY_SRTF || policy == POLICY_AGING || policy == POLICY_MLFQ;
+        
+        vector<Process> procs = workload();
+        size_t n = procs.size();
+        vector<int> remaining(n);
+        vector<int> level(n, 0);
+        vector<size_t> order(n);
+        for (size_t j = 0; j < n; j++) {
+            remaining[j] = procs[j].burst;
+            order[j] = j;
+        }
+        stable_sort(order.begin(), order.end(), [&procs](size_t a, size_t b) {
+            return procs[a].arrival < procs[b].arrival;
+        });
+        
+        long long seq = 0;
+        auto enqueueKey = [&](size_t pos, int now) -> long long {
+            size_t k = order[pos];
+            switch (policy) {
+                case POLICY_FCFS: return (long long)pos;
+                case POLICY_SJF: return procs[k].burst;
+                case POLICY_PRIORITY: return procs[k].priority;
+                case POLICY_SRTF: return remaining[k];
+                case POLICY_AGING: return (long long)procs[k].priority * AGING_INTERVAL + now;
+                case POLICY_MLFQ: return level[k] * MLFQ_LEVEL_KEY + seq++;
+                default: return seq++;  // Round Robin: FIFO
+            }
+        };
+        
+        vector<ReadyHeap> queues(ncpu);
+        vector<long> runPos(ncpu, -1);     // Arrival position of the running process
+        vector<long long> runKey(ncpu, 0);
+        vector<int> runStart(ncpu, 0);
+        vector<unsigned> token(ncpu, 0);
+        vector<vector<GanttEntry>> lanes(ncpu);
+        CoreStats stats;
+        stats.busy.assign(ncpu, 0);
+        stats.completed.assign(ncpu, 0);
+        stats.steals.assign(ncpu, 0);
+        priority_queue<SliceEvent, vector<SliceEvent>, greater<SliceEvent>> events;
+        size_t queued = 0;
+        
+        // End core c's slice at now and return the process it was running
+        auto stop = [&](int c, int now) -> size_t {
+            size_t k = order[runPos[c]];
+            lanes[c].push_back({procs[k].id, runStart[c], now});
+            stats.busy[c] += now - runStart[c];
+            remaining[k] -= now - runStart[c];
+            runPos[c] = -1;
+            return k;
+        };
+        
+        int time = 0;
+        size_t i = 0;
+        size_t done = 0;
+        vector<pair<int, size_t>> expired;
+        
+        while (done < n) {
+            while (!events.empty() && (runPos[events.top().cpu] < 0 ||
+                                       events.top().token != token[events.top().cpu])) {
+                events.pop();
+            }
+            time = numeric_limits<int>::max();
+            if (i < n) time = procs[order[i]].arrival;
+            if (!events.empty()) time = min(time, events.top().time);
+            
+            // Slices ending now: finished, or out of quantum
+            expired.clear();
+            while (!events.empty() && events.top().time == time) {
+                SliceEvent ev = events.top();
+                events.pop();
+                if (runPos[ev.cpu] < 0 || ev.token != token[ev.cpu]) continue;
+                size_t pos = runPos[ev.cpu];
+                size_t k = stop(ev.cpu, time);
+                if (remaining[k] == 0) {
+                    procs[k].completion = time;
+                    procs[k].turnaround = procs[k].completion - procs[k].arrival;
+                    procs[k].waiting = procs[k].turnaround - procs[k].burst;
+                    stats.completed[ev.cpu]++;
+                    done++;
                 } else {
-                    processes[idx].completion = time;
-                    processes[idx].turnaround = processes[idx].completion - processes[idx].arrival;
-                    processes[idx].waiting = processes[idx].turnaround - (exec - (processes[idx].burst + exec));
+                    if (policy == POLICY_MLFQ && level[k] < MLFQ_LEVELS - 1) level[k]++;
+                    expired.push_back(make_pair(ev.cpu, pos));
+                }
+            }
+            
+            // Arrivals join the least loaded core
+            for (; i < n && procs[order[i]].arrival <= time; i++) {
+                int c = 0;
+                size_t best = numeric_limits<size_t>::max();
+                for (int cc = 0; cc < ncpu; cc++) {
+                    size_t load = queues[cc].size() + (runPos[cc] >= 0 ? 1 : 0);
+                    if (load < best) {
+                        best = load;
+                        c = cc;
+                    }
+                }
+                ReadyEntry entry = {enqueueKey(i, time), i};
+                if (preemptive && runPos[c] >= 0) {
+                    ReadyEntry current = {runKey[c], (size_t)runPos[c]};
+                    if (policy == POLICY_SRTF) {
+                        current.key = remaining[order[runPos[c]]] - (time - runStart[c]);
+                    }
+                    if (current > entry) {
+                        stop(c, time);
+                        queues[c].push({enqueueKey(current.pos, time), current.pos});
+                        queued++;
+                    }
+                }
+                queues[c].push(entry);
+                queued++;
+            }
+            
+            for (size_t e = 0; e < expired.size(); e++) {
+                queues[expired[e].first].push({enqueueKey(expired[e].second, time), expired[e].second});
+                queued++;
+            }
+            
+            // Idle cores dispatch, stealing when their own queue is empty
+            for (int c = 0; c < ncpu && queued > 0; c++) {
+                if (runPos[c] >= 0) continue;
+                int from = c;
+                if (queues[c].empty()) {
+                    size_t longest = 0;
+                    for (int cc = 0; cc < ncpu; cc++) {
+                        if (queues[cc].size() > longest) {
+                            longest = queues[cc].size();
+                            from = cc;
+                        }
+                    }
+                    stats.steals[c]++;
+                }
+                ReadyEntry entry = queues[from].top();
+                queues[from].pop();
+                queued--;
+                size_t k = order[entry.pos];
+                runPos[c] = (long)entry.pos;
+                runKey[c] = entry.key;
+                runStart[c] = time;
+                token[c]++;
+                long long run = remaining[k];
+                if (policy == POLICY_RR) run = min(run, (long long)quantum);
+                if (policy == POLICY_MLFQ) run = min(run, (long long)quantum << level[k]);
+                events.push({time + (int)run, c, token[c]});
+            }
+        }
+        
+        for (int c = 0; c < ncpu; c++) {
+            stats.lanes.push_back(lanes[c].size());
+            for (size_t e = 0; e < lanes[c].size(); e++) {
+                gantt.push_back(lanes[c][e]);
+                if (textOutput()) {
+                    cout << "CPU" << c << " P" << lanes[c][e].pid << ": " << lanes[c][e].start
+                         << " -> " << lanes[c][e].end << endl;
                 }
-            } else {
-                time = processes[i].arrival;
             }
         }
-        printStats(processes);
+        report(algorithm, usesQuantum ? quantum : 0, procs, first, &stats);
+    }
+    
+    // ============== COMPARISON MODE ==============
+    
+    // Run one scheduling menu option (2-5, 13-15)
+    void runOption(int option) {
+        switch (option) {
+            case 2: runFCFS(); break;
+            case 3: runSJF(); break;
+            case 4: runPriority(); break;
+            case 5: runRoundRobin(quantum); break;
+            case 13: runSRTF(); break;
+            case 14: runPreemptivePriority(); break;
+            case 15: runMLFQ(quantum); break;
+        }
+    }
+    
+    // Every algorithm concurrently, one thread each and at most one per
+    // processor at a time. Workers read this scheduler's workload in place
+    // rather than copying it and buffer their JSON frames; each wave's
+    // frames are written in menu order as soon as the wave finishes. On a
+    // single processor the workers run one by one and write directly.
+    void runCompare() {
+        const size_t count = sizeof(COMPARE_OPTIONS) / sizeof(COMPARE_OPTIONS[0]);
+        size_t wave = min(count, (size_t)cpuCount());
+        for (size_t first = 0; first < count; first += wave) {
+            size_t last = min(count, first + wave);
+            vector<EnhancedScheduler> workers(last - first);
+            vector<ostringstream> frames(last - first);
+            vector<CompareJob> jobs(last - first);
+            vector<void*> args;
+            for (size_t k = 0; k < workers.size(); k++) {
+                workers[k].shared = &workload();
+                workers[k].format = format;
+                workers[k].segment = segment;
+                workers[k].quantum = quantum;
+                workers[k].cpus = cpus;
+                workers[k].out = wave > 1 ? &frames[k] : out;
+                jobs[k].worker = &workers[k];
+                jobs[k].option = COMPARE_OPTIONS[first + k];
+                args.push_back(&jobs[k]);
+            }
+            runJoined(compareMain, args);
+            for (size_t k = 0; k < frames.size(); k++) {
+                *out << frames[k].str();
+            }
+            out->flush();
+        }
+    }
+    
+    static void compareMain(void* param) {
+        CompareJob* job = (CompareJob*)param;
+        job->worker->runOption(job->option);
+    }
+    
+    void addSlice(int pid, int start, int end) {
+        gantt.push_back({pid, start, end});
+        if (textOutput()) {
+            cout << "P" << pid << ": " << start << " -> " << end << endl;
+        }
+    }
+    
+    // Write one finished run in the active result format
+    void report(const string& algorithm, int quantum, const vector<Process>& procs, size_t first,
+                const CoreStats* cores = NULL) {
+        if (textOutput()) {
+            printStats(procs);
+            if (cores != NULL) printCoreStats(*cores, first);
+        } else {
+            printJson(algorithm, quantum, procs, first, cores);
+        }
+    }
+    
+    // Emit "RESULT_JSON <bytes>" followed by the JSON document on one line.
+    // Gantt slices are flat (pid, start, end) triples and stats are flat
+    // (pid, arrival, burst, completion, turnaround, waiting) rows so the
+    // client can load them straight into typed arrays. Multi-CPU runs add
+    // "cpus" and per-core arrays; their slices are grouped by core.
+    // In FORMAT_MAP the columns go to the result segment instead, and the
+    // frame ("RESULT_MAP <bytes>") carries "segment":[offset, slices, rows].
+    void printJson(const string& algorithm, int quantum, const vector<Process>& procs, size_t first,
+                   const CoreStats* cores = NULL) {
+        double total_wt = 0, total_tat = 0;
+        for (size_t k = 0; k < procs.size(); k++) {
+            total_wt += procs[k].waiting;
+            total_tat += procs[k].turnaround;
+        }
+        ostringstream body;
+        body << "{\"algorithm\":\"" << algorithm << "\",\"quantum\":" << quantum;
+        if (format == FORMAT_MAP) {
+            long long offset = writeSegment(procs, first);
+            if (offset < 0) {
+                *out << "ERROR: Cannot write result segment" << endl;
+                return;
+            }
+            body << ",\"segment\":[" << offset << "," << gantt.size() - first << ","
+                 << procs.size() << "]";
+        } else {
+            body << ",\"gantt\":[";
+            for (size_t k = first; k < gantt.size(); k++) {
+                if (k > first) body << ",";
+                body << gantt[k].pid << "," << gantt[k].start << "," << gantt[k].end;
+            }
+            body << "],\"stats\":[";
+            for (size_t k = 0; k < procs.size(); k++) {
+                const Process& p = procs[k];
+                if (k > 0) body << ",";
+                body << p.id << "," << p.arrival << "," << p.burst << ","
+                     << p.completion << "," << p.turnaround << "," << p.waiting;
+            }
+            body << "]";
+        }
+        double n = procs.empty() ? 1 : (double)procs.size();
+        body << ",\"avg_wt\":" << fixed << setprecision(2) << total_wt / n
+             << ",\"avg_tat\":" << total_tat / n;
+        writeJsonSummary(body, procs, first, cores != NULL ? (int)cores->lanes.size() : 1);
+        if (cores != NULL) {
+            body << ",\"cpus\":" << cores->lanes.size();
+            writeJsonArray(body, "lanes", cores->lanes);
+            writeJsonArray(body, "core_busy", cores->busy);
+            writeJsonArray(body, "core_completed", cores->completed);
+            writeJsonArray(body, "core_steals", cores->steals);
+        }
+        body << "}";
+        
+        string json = body.str();
+        *out << (format == FORMAT_MAP ? RESULT_MAP_HEADER : RESULT_FRAME_HEADER) << " "
+             << json.size() << "\n" << json << endl;
+    }
+    
+    // Append the run's columns to the result segment as int64 arrays:
+    // slice pid, start, end, then pid, arrival, burst, completion,
+    // turnaround, waiting. Returns the offset of the first one, or -1.
+    long long writeSegment(const vector<Process>& procs, size_t first) {
+        if (segment == NULL || !segment->isOpen()) return -1;
+        size_t slices = gantt.size() - first;
+        size_t rows = procs.size();
+        const vector<GanttEntry>& g = gantt;
+        return segment->append((3 * slices + 6 * rows) * 8, [&](uint8_t* p) {
+            uint8_t* cols[9];
+            for (int c = 0; c < 3; c++) cols[c] = p + c * slices * 8;
+            for (int c = 0; c < 6; c++) cols[3 + c] = p + (3 * slices + c * rows) * 8;
+            for (size_t k = 0; k < slices; k++) {
+                const GanttEntry& e = g[first + k];
+                writeInt64(cols[0] + k * 8, e.pid);
+                writeInt64(cols[1] + k * 8, e.start);
+                writeInt64(cols[2] + k * 8, e.end);
+            }
+            for (size_t k = 0; k < rows; k++) {
+                const Process& r = procs[k];
+                writeInt64(cols[3] + k * 8, r.id);
+                writeInt64(cols[4] + k * 8, r.arrival);
+                writeInt64(cols[5] + k * 8, r.burst);
+                writeInt64(cols[6] + k * 8, r.completion);
+                writeInt64(cols[7] + k * 8, r.turnaround);
+                writeInt64(cols[8] + k * 8, r.waiting);
+            }
+        });
+    }
+    
+    // Summary figures for comparing algorithms: response time is first
+    // dispatch minus arrival, preemptions are slices beyond one per process
+    void writeJsonSummary(ostream& body, const vector<Process>& procs, size_t first, int ncpu) {
+        // First dispatch per pid: an array when ids are small (1..n for
+        // loaded workloads), a hash map for hand-entered sparse ids
+        int minId = 0, maxId = 0;
+        for (size_t k = 0; k < procs.size(); k++) {
+            minId = min(minId, procs[k].id);
+            maxId = max(maxId, procs[k].id);
+        }
+        bool dense = minId >= 0 && (size_t)maxId <= 2 * procs.size() + 64;
+        vector<int> denseStart(dense ? maxId + 1 : 0, numeric_limits<int>::max());
+        unordered_map<int, int> sparseStart;
+        auto firstStart = [&](int pid) -> int& {
+            if (dense) return denseStart[pid];
+            return sparseStart.emplace(pid, numeric_limits<int>::max()).first->second;
+        };
+        int makespan = 0;
+        for (size_t k = first; k < gantt.size(); k++) {
+            makespan = max(makespan, gantt[k].end);
+            int& start = firstStart(gantt[k].pid);
+            start = min(start, gantt[k].start);
+        }
+        long long work = 0, response = 0;
+        int maxWaiting = 0;
+        for (size_t k = 0; k < procs.size(); k++) {
+            work += procs[k].burst;
+            response += firstStart(procs[k].id) - procs[k].arrival;
+            maxWaiting = max(maxWaiting, procs[k].waiting);
+        }
+        double n = procs.empty() ? 1 : (double)procs.size();
+        double span = makespan ? (double)makespan : 1;
+        body << ",\"summary\":{\"makespan\":" << makespan
+             << ",\"throughput\":" << fixed << setprecision(4) << procs.size() / span
+             << ",\"utilization\":" << setprecision(2) << work * 100.0 / (span * ncpu)
+             << ",\"avg_response\":" << response / n
+             << ",\"max_waiting\":" << maxWaiting
+             << ",\"preemptions\":" << (long long)(gantt.size() - first) - (long long)procs.size()
+             << "}";
+    }
+    
+    template <typename T>
+    static void writeJsonArray(ostream& out, const char* name, const vector<T>& values) {
+        out << ",\"" << name << "\":[";
+        for (size_t k = 0; k < values.size(); k++) {
+            if (k > 0) out << ",";
+            out << values[k];
+        }
+        out << "]";
+    }
+    
+    void printCoreStats(const CoreStats& cores, size_t first) {
+        int makespan = 0;
+        for (size_t k = first; k < gantt.size(); k++) makespan = max(makespan, gantt[k].end);
+        cout << BOLD << CYAN << "\n--- Per-CPU Statistics ---" << RESET << endl;
+        cout << "CPU\tBusy\tUtil%\tDone\tSteals" << endl;
+        for (size_t c = 0; c < cores.lanes.size(); c++) {
+            cout << c << "\t" << cores.busy[c] << "\t" << fixed << setprecision(1)
+                 << (makespan ? cores.busy[c] * 100.0 / makespan : 0.0) << "\t"
+                 << cores.completed[c] << "\t" << cores.steals[c] << endl;
+        }
     }
     
     void printStats(const vector<Process>& procs) {
@@ -349,6 +2050,8 @@ public:
     }
     
     void printGantt() {
+        if (!textOutput()) return;  // JSON frames already carry the slices
+        if (cpus > 1) return;       // Multi-CPU runs list their slices per core
         cout << BOLD << YELLOW << "\n--- Gantt Chart ---" << RESET << endl;
         cout << "|";
         for (size_t i = 0; i < gantt.size(); i++) {
@@ -374,23 +2077,45 @@ private:
     SOCKET server_fd;
     sockaddr_in address;
     bool running;
-    int client_count;
+    atomic<int> client_count;
+    SocketQueue clients;
+    
+    // Each worker serves accepted clients one after another, so a slow
+    // download never stalls the accept loop or the other workers
+    static void workerMain(void* param) {
+        EnhancedFileServer* server = (EnhancedFileServer*)param;
+        while (true) {
+            server->handleClient(server->clients.pop());
+        }
+    }
     
 public:
     EnhancedFileServer() : server_fd(INVALID_SOCKET), running(false), client_count(0) {
+#ifdef _WIN32
         WSADATA wsaData;
         WSAStartup(MAKEWORD(2, 2), &wsaData);
+#endif
     }
     
     ~EnhancedFileServer() {
         stop();
+#ifdef _WIN32
         WSACleanup();
+#endif
     }
     
     bool start() {
         server_fd = socket(AF_INET, SOCK_STREAM, 0);
         if (server_fd == INVALID_SOCKET) return false;
         
+#ifndef _WIN32
+        // Allow an immediate restart while old connections sit in TIME_WAIT
+        int reuse = 1;
+        setsockopt(server_fd, SOL_SOCKET, SO_REUSEADDR, &reuse, sizeof(reuse));
+        // A client that disconnects mid-download must not kill the process
+        signal(SIGPIPE, SIG_IGN);
+#endif
+        
         address.sin_family = AF_INET;
         address.sin_addr.s_addr = INADDR_ANY;
         address.sin_port = htons(PORT);
@@ -400,13 +2125,18 @@ public:
             return false;
         }
         
-        if (listen(server_fd, 10) == SOCKET_ERROR) {
+        if (listen(server_fd, SOMAXCONN) == SOCKET_ERROR) {
             closesocket(server_fd);
             return false;
         }
         
+        for (int k = 0; k < SERVER_WORKERS; k++) {
+            startDetachedThread(workerMain, this);
+        }
+        
         running = true;
-        cout << BOLD << GREEN << "[SERVER] File server started on port " << PORT << RESET << endl;
+        cout << BOLD << GREEN << "[SERVER] File server started on port " << PORT
+             << " (" << SERVER_WORKERS << " workers)" << RESET << endl;
         return true;
     }
     
@@ -419,45 +2149,33 @@ public:
     }
     
     void handleClient(SOCKET sock) {
-        client_count++;
-        cout << BOLD << BLUE << "[SERVER] Client " << client_count << " connected" << RESET << endl;
+        int client = ++client_count;
+        cout << BOLD << BLUE << "[SERVER] Client " << client << " connected" << RESET << endl;
         
         char buffer[1024] = {0};
-        recv(sock, buffer, 1024, 0);
+        int received = recv(sock, buffer, sizeof(buffer) - 1, 0);
         
-        string command(buffer);
+        string command(buffer, received > 0 ? received : 0);
+        // Tolerate the line ending that telnet and nc send
+        size_t end = command.find_last_not_of(" \r\n\t");
+        command = end == string::npos ? "" : command.substr(0, end + 1);
         string response;
         
         if (command == "LIST") {
             response = "Available files:\n";
-            WIN32_FIND_DATAA findFileData;
-            HANDLE hFind = FindFirstFileA("*", &findFileData);
-            if (hFind != INVALID_HANDLE_VALUE) {
-                do {
-                    if (!(findFileData.dwFileAttributes & FILE_ATTRIBUTE_DIRECTORY)) {
-                        response += "  - " + string(findFileData.cFileName) + "\n";
-                    }
-                } while (FindNextFileA(hFind, &findFileData));
-                FindClose(hFind);
+            for (const auto& name : listFiles()) {
+                response += "  - " + name + "\n";
             }
         } else if (command.substr(0, 4) == "GET ") {
             string filename = command.substr(4);
-            ifstream file(filename);
-            if (!file.is_open()) {
+            if (!sendFileTo(sock, filename)) {
                 response = "ERROR: File not found";
-            } else {
-                string line;
-                while (getline(file, line)) {
-                    response += line + "\n";
-                }
-                file.close();
             }
-        } else if (command.substr(0, 4) == "INFO ") {
-            string filename = command.substr(4);
-            ifstream file(filename, ios::binary | ios::ate);
-            if (file.is_open()) {
-                streamsize size = file.tellg();
-                response = "OK: " + to_string(size) + " bytes";
+        } else if (command.substr(0, 5) == "INFO ") {
+            string filename = command.substr(5);
+            struct stat st;
+            if (stat(filename.c_str(), &st) == 0 && (st.st_mode & S_IFMT) == S_IFREG) {
+                response = "OK: " + to_string((long long)st.st_size) + " bytes";
             } else {
                 response = "ERROR: File not found";
             }
@@ -465,9 +2183,9 @@ public:
             response = "ERROR: Unknown command. Use LIST, GET <filename>, or INFO <filename>";
         }
         
-        send(sock, response.c_str(), response.size(), 0);
+        sendAll(sock, response.c_str(), response.size());
         closesocket(sock);
-        cout << BLUE << "[SERVER] Client " << client_count << " disconnected" << RESET << endl;
+        cout << BLUE << "[SERVER] Client " << client << " disconnected" << RESET << endl;
     }
     
     void run() {
@@ -475,7 +2193,7 @@ public:
         while (running) {
             SOCKET new_socket = accept(server_fd, NULL, NULL);
             if (new_socket != INVALID_SOCKET) {
-                handleClient(new_socket);
+                clients.push(new_socket);
             }
         }
     }
@@ -500,6 +2218,9 @@ void printMenu() {
     cout << BOLD << "  3. CPU Scheduler (SJF)         " << RESET << endl;
     cout << BOLD << "  4. CPU Scheduler (Priority)    " << RESET << endl;
     cout << BOLD << "  5. CPU Scheduler (Round Robin)  " << RESET << endl;
+    cout << BOLD << " 13. CPU Scheduler (SRTF)        " << RESET << endl;
+    cout << BOLD << " 14. CPU Scheduler (Preemptive Priority)" << RESET << endl;
+    cout << BOLD << " 15. CPU Scheduler (MLFQ)        " << RESET << endl;
     cout << BOLD << "  6. Run All Schedulers          " << RESET << endl;
     cout << BOLD << "  7. Start File Server           " << RESET << endl;
     cout << BOLD << "  9. List Processes (API)        " << RESET << endl;
@@ -511,11 +2232,432 @@ void printMenu() {
     cout << BOLD << YELLOW << "Choose an option: " << RESET;
 }
 
+// ============== MENU ACTIONS ==============
+
+// Runs one menu option. Returns false when the option asks to exit.
+bool runMenuOption(int choice, CustomAllocator& allocator, EnhancedScheduler& scheduler,
+                   EnhancedFileServer& fileServer) {
+    switch (choice) {
+        case 1: {
+            cout << BOLD << GREEN << "\n=== Memory Allocator Test ===" << RESET << endl;
+            void* p1 = allocator.allocate(100);
+            void* p2 = allocator.allocate(200);
+            void* p3 = allocator.allocate(150);
+            allocator.printStats();
+            allocator.deallocate(p2);
+            cout << GREEN << "[OK] Freed block P2" << RESET << endl;
+            allocator.printStats();
+            allocator.deallocate(p1);
+            allocator.deallocate(p3);
+            allocator.printStats();
+            break;
+        }
+        case 2:
+            scheduler.runFCFS();
+            scheduler.printGantt();
+            break;
+        case 3:
+            scheduler.runSJF();
+            scheduler.printGantt();
+            break;
+        case 4:
+            scheduler.runPriority();
+            scheduler.printGantt();
+            break;
+        case 5:
+            scheduler.runRoundRobin(scheduler.getQuantum());
+            scheduler.printGantt();
+            break;
+        case 6:
+            if (scheduler.getFormat() != FORMAT_TEXT) {
+                scheduler.runCompare();   // Structured results: run the algorithms concurrently
+                break;
+            }
+            scheduler.runFCFS();
+            scheduler.printGantt();
+            cout << endl;
+            scheduler.runSJF();
+            scheduler.printGantt();
+            cout << endl;
+            scheduler.runPriority();
+            scheduler.printGantt();
+            cout << endl;
+            scheduler.runRoundRobin(scheduler.getQuantum());
+            scheduler.printGantt();
+            cout << endl;
+            scheduler.runSRTF();
+            scheduler.printGantt();
+            cout << endl;
+            scheduler.runPreemptivePriority();
+            scheduler.printGantt();
+            cout << endl;
+            scheduler.runMLFQ(scheduler.getQuantum());
+            scheduler.printGantt();
+            break;
+        case 13:
+            scheduler.runSRTF();
+            scheduler.printGantt();
+            break;
+        case 14:
+            scheduler.runPreemptivePriority();
+            scheduler.printGantt();
+            break;
+        case 15:
+            scheduler.runMLFQ(scheduler.getQuantum());
+            scheduler.printGantt();
+            break;
+        case 7:
+            if (fileServer.start()) {
+                fileServer.run();
+            }
+            break;
+        case 9:
+            // List processes in a parseable format for frontend
+            cout << "PROCESSES_START" << endl;
+            for (const auto& p : scheduler.getProcesses()) {
+                cout << "P" << p.id << ":" << p.arrival << ":" << p.burst << ":" << p.priority << endl;
+            }
+            cout << "PROCESSES_END" << endl;
+            break;
+        case 10:
+            // Add process: id arrival burst priority
+            {
+                int id, arrival, burst, priority;
+                if (cin >> id >> arrival >> burst >> priority) {
+                    scheduler.addProcess(id, arrival, burst, priority);
+                    cout << "OK: Added process P" << id << endl;
+                } else {
+                    cout << "ERROR: Invalid input. Format: id arrival burst priority" << endl;
+                }
+            }
+            break;
+        case 11:
+            // Clear all processes
+            scheduler.clear();
+            cout << "OK: Cleared all processes" << endl;
+            break;
+        case 12:
+            // Load sample processes
+            scheduler.clear();
+            scheduler.addProcess(1, 0, 5, 2);
+            scheduler.addProcess(2, 1, 3, 1);
+            scheduler.addProcess(3, 2, 8, 4);
+            scheduler.addProcess(4, 3, 6, 3);
+            scheduler.addProcess(5, 5, 4, 2);
+            cout << "OK: Loaded 5 sample processes" << endl;
+            break;
+        case 8:
+            cout << BOLD << GREEN << "\nGoodbye!" << RESET << endl;
+            return false;
+        default:
+            cout << RED << "Invalid option!" << RESET << endl;
+    }
+    return true;
+}
+
+// ============== API COMMANDS ==============
+
+// The remainder of the current input line, trimmed; used for paths
+string restOfLine() {
+    string line;
+    getline(cin, line);
+    size_t start = line.find_first_not_of(" \t");
+    size_t end = line.find_last_not_of(" \t\r");
+    return start == string::npos ? "" : line.substr(start, end - start + 1);
+}
+
+// After a malformed command: clear any failed extraction and drop the rest
+// of its line, so the next command still parses
+void skipLine() {
+    cin.clear();
+    cin.ignore(numeric_limits<streamsize>::max(), '\n');
+}
+
+// One "arrival burst priority" line: exactly three ints, nothing else
+bool parseProcessLine(const string& line, int& arrival, int& burst, int& priority) {
+    istringstream fields(line);
+    string extra;
+    return (bool)(fields >> arrival >> burst >> priority) && !(fields >> extra);
+}
+
+// One "A <handle> <size>" or "F <handle>" line; a free has size 0
+bool parseTraceLine(const string& line, AllocOp& op) {
+    istringstream fields(line);
+    string kind, extra;
+    long long handle, size = 0;
+    if (!(fields >> kind >> handle)) return false;
+    if (kind == "A") {
+        if (!(fields >> size) || size <= 0 || size > 0x7fffffff) return false;
+    } else if (kind != "F") {
+        return false;
+    }
+    if (fields >> extra || handle < 0 || handle > 0xffffffffLL) return false;
+    op.slot = (uint32_t)handle;
+    op.size = (uint32_t)size;
+    return true;
+}
+
+// Unsigned decimal with no sign, spaces or suffix; false if empty or out of range
+bool parseUnsigned(const string& text, unsigned long long& value) {
+    if (text.empty() || text.find_first_not_of("0123456789") != string::npos) return false;
+    errno = 0;
+    value = strtoull(text.c_str(), NULL, 10);
+    return errno == 0;
+}
+
+bool isNumber(const string& token) {
+    if (token.empty()) return false;
+    size_t start = (token[0] == '-' || token[0] == '+') ? 1 : 0;
+    if (start == token.size()) return false;
+    for (size_t k = start; k < token.size(); k++) {
+        if (!isdigit((unsigned char)token[k])) return false;
+    }
+    return true;
+}
+
+// Keyword commands sit beside the numeric menu so they can never be
+// mistaken for a process count in API mode:
+//   FORMAT TEXT|JSON          - choose the scheduler result format
+//   FORMAT MAP <path>         - JSON frames, columns written to the file at path
+//   QUANTUM <n>               - Round Robin and MLFQ base quantum (default 2)
+//   CPUS <n>                  - simulate n CPUs with per-core run queues (default 1)
+//   LOAD <n> followed by n lines of "arrival burst priority"
+//                             - replace the workload (no size limit)
+//   LOADMAP <path>            - replace the workload with the columns in a
+//                               memory-mapped workload file
+//   RUN <option>              - run a menu option on the loaded workload
+//   HEAP <size>[K|M|G] [SEGREGATED|BESTFIT|BUDDY]
+//                             - fresh allocator heap of that size and policy
+//   ALLOCBENCH <ops> [maxLive] [maxSize] [seed]
+//                             - replay a random alloc/free trace on the heap
+//   TRACE <n> followed by n lines of "A <handle> <size>" or "F <handle>"
+//                             - replay a given trace and stream the heap map
+//   PING                      - health check; answers OK: PONG once ready
+// Returns false if the token is not a known keyword; keepRunning is
+// cleared when RUN selects the exit option.
+bool handleApiCommand(const string& command, CustomAllocator& allocator,
+                      EnhancedScheduler& scheduler, EnhancedFileServer& fileServer,
+                      ResultSegment& segment, bool& keepRunning) {
+    if (command == "PING") {
+        cout << "OK: PONG" << endl;
+        return true;
+    }
+    if (command == "FORMAT") {
+        string mode;
+        cin >> mode;
+        if (mode == "JSON") {
+            scheduler.setFormat(FORMAT_JSON);
+            cout << "OK: Result format JSON" << endl;
+        } else if (mode == "TEXT") {
+            scheduler.setFormat(FORMAT_TEXT);
+            cout << "OK: Result format TEXT" << endl;
+        } else if (mode == "MAP") {
+            string path = restOfLine();
+            if (path.empty() || !segment.open(path)) {
+                cout << "ERROR: Cannot open result segment. Format: FORMAT MAP <path>" << endl;
+                return true;
+            }
+            scheduler.setSegment(&segment);
+            scheduler.setFormat(FORMAT_MAP);
+            cout << "OK: Result format MAP " << path << endl;
+        } else {
+            cout << "ERROR: Unknown format. Use FORMAT TEXT, FORMAT JSON or FORMAT MAP <path>" << endl;
+        }
+        return true;
+    }
+    if (command == "QUANTUM") {
+        int q;
+        if (!(cin >> q) || q < 1) {
+            cout << "ERROR: Invalid input. Format: QUANTUM <n> with n >= 1" << endl;
+            skipLine();
+            return true;
+        }
+        scheduler.setQuantum(q);
+        cout << "OK: Quantum " << q << endl;
+        return true;
+    }
+    if (command == "CPUS") {
+        int n;
+        if (!(cin >> n) || n < 1 || n > MAX_CPUS) {
+            cout << "ERROR: Invalid input. Format: CPUS <n> with 1 <= n <= " << MAX_CPUS << endl;
+            skipLine();
+            return true;
+        }
+        scheduler.setCpus(n);
+        cout << "OK: CPUs " << n << endl;
+        return true;
+    }
+    if (command == "LOAD") {
+        long n;
+        if (!(cin >> n) || n < 0) {
+            cout << "ERROR: Invalid input. Format: LOAD <count> then count lines of arrival burst priority" << endl;
+            skipLine();
+            return true;
+        }
+        skipLine();   // The rest of the LOAD line
+        // Parse everything first: a bad line keeps the previous workload
+        struct Row { int arrival, burst, priority; };
+        vector<Row> rows;
+        rows.reserve((size_t)min(n, 10000000L));
+        string line;
+        for (long i = 0; i < n; i++) {
+            Row row;
+            if (!getline(cin, line)) {
+                cout << "ERROR: Expected " << n << " processes, got " << i << endl;
+                return true;
+            }
+            if (!parseProcessLine(line, row.arrival, row.burst, row.priority)) {
+                cout << "ERROR: Bad process line " << i + 1 << " of " << n << endl;
+                // Consume the remaining data lines so none is taken for a command
+                for (long k = i + 1; k < n && getline(cin, line); k++) {}
+                return true;
+            }
+            rows.push_back(row);
+        }
+        scheduler.clear();
+        scheduler.reserve(rows.size());
+        for (size_t i = 0; i < rows.size(); i++) {
+            scheduler.addProcess((int)(i + 1), rows[i].arrival, rows[i].burst, rows[i].priority);
+        }
+        cout << "OK: Loaded " << n << " processes" << endl;
+        return true;
+    }
+    if (command == "LOADMAP") {
+        // Header: the 8-byte magic and the count, then the arrival, burst
+        // and priority columns, each count little-endian int64 values
+        string path = restOfLine();
+        MappedFile file;
+        if (path.empty() || !file.open(path) || file.length() < WORKLOAD_HEADER
+            || memcmp(file.bytes(), WORKLOAD_MAGIC, sizeof(WORKLOAD_MAGIC)) != 0) {
+            cout << "ERROR: Cannot read workload segment. Format: LOADMAP <path>" << endl;
+            return true;
+        }
+        const uint8_t* data = file.bytes();
+        long long n = readInt64(data + 8);
+        if (n < 0 || (uint64_t)n > (file.length() - WORKLOAD_HEADER) / 24
+            || file.length() != WORKLOAD_HEADER + 24 * (size_t)n) {
+            cout << "ERROR: Workload segment size does not match its count" << endl;
+            return true;
+        }
+        const uint8_t* columns[3];
+        for (int c = 0; c < 3; c++) columns[c] = data + WORKLOAD_HEADER + c * 8 * (size_t)n;
+        for (long long i = 0; i < n; i++) {
+            for (int c = 0; c < 3; c++) {
+                long long v = readInt64(columns[c] + i * 8);
+                if (v < numeric_limits<int>::min() || v > numeric_limits<int>::max()) {
+                    cout << "ERROR: Process " << i + 1 << " has a value out of range" << endl;
+                    return true;
+                }
+            }
+        }
+        scheduler.clear();
+        scheduler.reserve((size_t)n);
+        for (long long i = 0; i < n; i++) {
+            scheduler.addProcess((int)(i + 1), (int)readInt64(columns[0] + i * 8),
+                                 (int)readInt64(columns[1] + i * 8),
+                                 (int)readInt64(columns[2] + i * 8));
+        }
+        cout << "OK: Loaded " << n << " processes" << endl;
+        return true;
+    }
+    if (command == "HEAP") {
+        // The policy is optional, so read just the rest of this line
+        string line, sizeText, policyText;
+        getline(cin, line);
+        istringstream args(line);
+        args >> sizeText >> policyText;
+        
+        // Anything malformed leaves size 0, which gets the usage ERROR below
+        size_t size = 0;
+        unsigned long long value = 0;
+        size_t digits = sizeText.find_first_not_of("0123456789");
+        if (digits > 0 && digits != string::npos && digits + 1 == sizeText.size()) {
+            char unit = (char)toupper((unsigned char)sizeText[digits]);
+            int shift = unit == 'K' ? 10 : unit == 'M' ? 20 : unit == 'G' ? 30 : -1;
+            if (shift >= 0 && digits <= 9 && parseUnsigned(sizeText.substr(0, digits), value)) {
+                size = (size_t)(value << shift);
+            }
+        } else if (sizeText.size() <= 15 && parseUnsigned(sizeText, value)) {
+            size = (size_t)value;
+        }
+        
+        AllocPolicy policy = allocator.getPolicy();
+        if (!policyText.empty() && !parsePolicy(policyText, policy)) {
+            cout << "ERROR: Unknown policy. Use SEGREGATED, BESTFIT or BUDDY" << endl;
+        } else if (size < MIN_HEAP_SIZE || size > MAX_HEAP_SIZE) {
+            cout << "ERROR: Invalid input. Format: HEAP <bytes>[K|M|G] [policy], at least "
+                 << MIN_HEAP_SIZE << " bytes" << endl;
+        } else if (!allocator.reset(size, policy)) {
+            cout << "ERROR: Cannot map a heap of " << size << " bytes" << endl;
+        } else {
+            cout << "OK: Heap " << size << " bytes, policy " << policyName(policy) << endl;
+        }
+        return true;
+    }
+    if (command == "ALLOCBENCH") {
+        string line;
+        getline(cin, line);
+        istringstream args(line);
+        long long ops = 0, maxLive = 1024, maxSize = 1024, seed = 1;
+        args >> ops;
+        if (args >> maxLive) {
+            if (args >> maxSize) args >> seed;
+        }
+        if (ops < 1 || ops > 1000000000LL || maxLive < 1 || maxLive > 10000000 || maxSize < 8
+            || maxSize > 0x7fffffff) {
+            cout << "ERROR: Invalid input. Format: ALLOCBENCH <ops> [maxLive] [maxSize] [seed]" << endl;
+            return true;
+        }
+        runAllocBench(allocator, (size_t)ops, (uint32_t)maxLive, (uint32_t)maxSize, (uint64_t)seed);
+        return true;
+    }
+    if (command == "TRACE") {
+        long n;
+        if (!(cin >> n) || n < 0) {
+            cout << "ERROR: Invalid input. Format: TRACE <count> then count lines of "
+                    "A <handle> <size> or F <handle>" << endl;
+            skipLine();
+            return true;
+        }
+        skipLine();   // The rest of the TRACE line
+        // Read the whole trace first, so a malformed line runs nothing
+        vector<AllocOp> trace;
+        trace.reserve(min(n, 10000000L));
+        string line;
+        for (long i = 0; i < n; i++) {
+            AllocOp op;
+            if (!getline(cin, line)) {
+                cout << "ERROR: Expected " << n << " trace operations, got " << i << endl;
+                return true;
+            }
+            if (!parseTraceLine(line, op)) {
+                cout << "ERROR: Bad trace operation " << i + 1 << " of " << n << endl;
+                // Consume the remaining op lines so none is taken for a command
+                for (long k = i + 1; k < n && getline(cin, line); k++) {}
+                return true;
+            }
+            trace.push_back(op);
+        }
+        runAllocTrace(allocator, trace);
+        return true;
+    }
+    if (command == "RUN") {
+        int choice;
+        if (!(cin >> choice)) {
+            cout << "ERROR: Invalid input. Format: RUN <option>" << endl;
+            skipLine();
+            return true;
+        }
+        if (scheduler.getFormat() == FORMAT_MAP) segment.reset();   // The client has read the previous run
+        keepRunning = runMenuOption(choice, allocator, scheduler, fileServer);
+        return true;
+    }
+    return false;
+}
+
 int main() {
-    // Check if stdin is a pipe (API mode) - GetFileType for stdin
-    HANDLE hStdin = GetStdHandle(STD_INPUT_HANDLE);
-    DWORD fileType = GetFileType(hStdin);
-    bool apiMode = (fileType == FILE_TYPE_PIPE);
+    // Check if stdin is a pipe (API mode)
+    bool apiMode = stdinIsPipe();
     
     if (!apiMode) {
         printBanner();
@@ -524,6 +2666,7 @@ int main() {
     CustomAllocator allocator;
     EnhancedScheduler scheduler;
     EnhancedFileServer fileServer;
+    ResultSegment segment;
     
     // Load sample processes
     scheduler.addProcess(1, 0, 5, 2);
@@ -536,123 +2679,48 @@ int main() {
         cout << GREEN << "[OK] Loaded 5 sample processes" << RESET << endl;
     }
     
-    while (true) {
+    bool keepRunning = true;
+    while (keepRunning) {
         if (!apiMode) {
             printMenu();
         }
         
         // In API mode, check if first input is number of processes
-        int firstInput;
-        if (!(cin >> firstInput)) {
+        string token;
+        if (!(cin >> token)) {
             break;  // No more input in API mode
         }
         
-        // Check if this is process count (only in API mode)
-        int choice = firstInput;
-        if (apiMode && firstInput > 0 && firstInput <= 100) {
-            // This is the number of processes, read them first
-            int n = firstInput;
-            scheduler.clear();
-            for (int i = 0; i < n; i++) {
-                int arrival, burst, priority;
-                cin >> arrival >> burst >> priority;
-                scheduler.addProcess(i + 1, arrival, burst, priority);
+        if (!isNumber(token)) {
+            if (!handleApiCommand(token, allocator, scheduler, fileServer, segment, keepRunning)) {
+                cout << RED << "Invalid option!" << RESET << endl;
             }
-            // Now read the actual choice
-            if (!(cin >> choice)) {
-                break;
+        } else {
+            int firstInput = atoi(token.c_str());
+            
+            // Legacy API input: a leading count of up to 100 processes.
+            // New clients use LOAD/RUN, which has no size limit.
+            int choice = firstInput;
+            if (apiMode && firstInput > 0 && firstInput <= 100) {
+                // This is the number of processes, read them first
+                int n = firstInput;
+                scheduler.clear();
+                for (int i = 0; i < n; i++) {
+                    int arrival, burst, priority;
+                    cin >> arrival >> burst >> priority;
+                    scheduler.addProcess(i + 1, arrival, burst, priority);
+                }
+                // Now read the actual choice
+                if (!(cin >> choice)) {
+                    break;
+                }
             }
+            
+            keepRunning = runMenuOption(choice, allocator, scheduler, fileServer);
         }
         
-        switch (choice) {
-            case 1: {
-                cout << BOLD << GREEN << "\n=== Memory Allocator Test ===" << RESET << endl;
-                void* p1 = allocator.allocate(100);
-                void* p2 = allocator.allocate(200);
-                void* p3 = allocator.allocate(150);
-                allocator.printStats();
-                allocator.deallocate(p2);
-                cout << GREEN << "[OK] Freed block P2" << RESET << endl;
-                allocator.printStats();
-                allocator.deallocate(p1);
-                allocator.deallocate(p3);
-                allocator.printStats();
-                break;
-            }
-            case 2:
-                scheduler.runFCFS();
-                scheduler.printGantt();
-                break;
-            case 3:
-                scheduler.runSJF();
-                scheduler.printGantt();
-                break;
-            case 4:
-                scheduler.runPriority();
-                scheduler.printGantt();
-                break;
-            case 5:
-                scheduler.runRoundRobin(2);
-                scheduler.printGantt();
-                break;
-            case 6:
-                scheduler.runFCFS();
-                scheduler.printGantt();
-                cout << endl;
-                scheduler.runSJF();
-                scheduler.printGantt();
-                cout << endl;
-                scheduler.runPriority();
-                scheduler.printGantt();
-                cout << endl;
-                scheduler.runRoundRobin(2);
-                scheduler.printGantt();
-                break;
-            case 7:
-                if (fileServer.start()) {
-                    fileServer.run();
-                }
-                break;
-            case 9:
-                // List processes in a parseable format for frontend
-                cout << "PROCESSES_START" << endl;
-                for (const auto& p : scheduler.getProcesses()) {
-                    cout << "P" << p.id << ":" << p.arrival << ":" << p.burst << ":" << p.priority << endl;
-                }
-                cout << "PROCESSES_END" << endl;
-                break;
-            case 10:
-                // Add process: id arrival burst priority
-                {
-                    int id, arrival, burst, priority;
-                    if (cin >> id >> arrival >> burst >> priority) {
-                        scheduler.addProcess(id, arrival, burst, priority);
-                        cout << "OK: Added process P" << id << endl;
-                    } else {
-                        cout << "ERROR: Invalid input. Format: id arrival burst priority" << endl;
-                    }
-                }
-                break;
-            case 11:
-                // Clear all processes
-                scheduler.clear();
-                cout << "OK: Cleared all processes" << endl;
-                break;
-            case 12:
-                // Load sample processes
-                scheduler.clear();
-                scheduler.addProcess(1, 0, 5, 2);
-                scheduler.addProcess(2, 1, 3, 1);
-                scheduler.addProcess(3, 2, 8, 4);
-                scheduler.addProcess(4, 3, 6, 3);
-                scheduler.addProcess(5, 5, 4, 2);
-                cout << "OK: Loaded 5 sample processes" << endl;
-                break;
-            case 8:
-                cout << BOLD << GREEN << "\nGoodbye!" << RESET << endl;
-                return 0;
-            default:
-                cout << RED << "Invalid option!" << RESET << endl;
+        if (apiMode && keepRunning) {
+            cout << API_RESPONSE_END << endl;
         }
     }
     
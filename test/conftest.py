@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The client modules are plain scripts, not a package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'client'))
@@ -1,48 +1,135 @@
 import subprocess
-import os
-
-exe_path = 'F:/_Code/OS-Nexus-Studio/server/main_system.exe'
-
-print("=== Test 1: List initial processes (option 9) ===")
-input_data = "9\n8\n"
-p = subprocess.Popen([exe_path], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-out, err = p.communicate(input=input_data, timeout=5)
-print(out)
-
-print("\n=== Test 2: Add a new process (option 10) ===")
-input_data = "10\n6 10 5 3\n9\n8\n"
-p = subprocess.Popen([exe_path], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-out, err = p.communicate(input=input_data, timeout=5)
-print(out)
-
-print("\n=== Test 3: List processes after adding (option 9) ===")
-input_data = "9\n8\n"
-p = subprocess.Popen([exe_path], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-out, err = p.communicate(input=input_data, timeout=5)
-print(out)
-
-print("\n=== Test 4: Clear all processes (option 11) ===")
-input_data = "11\n9\n8\n"
-p = subprocess.Popen([exe_path], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-out, err = p.communicate(input=input_data, timeout=5)
-print(out)
-
-print("\n=== Test 5: List processes after clearing (option 9) ===")
-input_data = "9\n8\n"
-p = subprocess.Popen([exe_path], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-out, err = p.communicate(input=input_data, timeout=5)
-print(out)
-
-print("\n=== Test 6: Load sample processes (option 12) ===")
-input_data = "12\n9\n8\n"
-p = subprocess.Popen([exe_path], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-out, err = p.communicate(input=input_data, timeout=5)
-print(out)
-
-print("\n=== Test 7: List final processes (option 9) ===")
-input_data = "9\n8\n"
-p = subprocess.Popen([exe_path], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-out, err = p.communicate(input=input_data, timeout=5)
-print(out)
-
-print("\n=== All API tests completed! ===")
+
+import pytest
+
+from backend_launcher import locate_backend, popen_kwargs
+from backend_session import BackendError, BackendSession
+
+
+exe_path = locate_backend()
+pytestmark = pytest.mark.skipif(exe_path is None, reason="main_system backend is not built")
+
+
+def run_backend(input_data):
+    p = subprocess.Popen([exe_path], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                         stderr=subprocess.PIPE, text=True, **popen_kwargs())
+    out, err = p.communicate(input=input_data, timeout=5)
+    return out
+
+
+def listed_processes(out):
+    block = out.split('PROCESSES_START\n', 1)[1].split('PROCESSES_END', 1)[0]
+    return block.split()
+
+
+def test_list_initial_processes():
+    out = run_backend("RUN 9\nRUN 8\n")
+    assert listed_processes(out) == ['P1:0:5:2', 'P2:1:3:1', 'P3:2:8:4', 'P4:3:6:3', 'P5:5:4:2']
+
+
+def test_add_process():
+    out = run_backend("RUN 10\n6 10 5 3\nRUN 9\nRUN 8\n")
+    assert "OK: Added process P6" in out
+    assert listed_processes(out)[-1] == 'P6:10:5:3'
+
+
+def test_clear_processes():
+    out = run_backend("RUN 11\nRUN 9\nRUN 8\n")
+    assert "OK: Cleared all processes" in out
+    assert listed_processes(out) == []
+
+
+def test_load_sample_processes():
+    out = run_backend("RUN 11\nRUN 12\nRUN 9\nRUN 8\n")
+    assert "OK: Loaded 5 sample processes" in out
+    assert len(listed_processes(out)) == 5
+
+
+def test_every_response_is_framed():
+    out = run_backend("LOAD 2\n0 3 1\n1 2 1\nRUN 2\nRUN 8\n")
+    assert out.count("END_OF_RESPONSE") == 2
+
+
+def test_bad_load_keeps_the_workload_and_the_backend():
+    out = run_backend("LOAD 3\n0 3 1\n3000000000 1 1\n5 2 1\nRUN 9\n"
+                      "QUANTUM x\nCPUS y\nRUN z\nPING\nRUN 8\n")
+    assert "ERROR: Bad process line 2 of 3" in out
+    assert len(listed_processes(out)) == 5
+    assert out.count("ERROR") == 4
+    assert "OK: PONG" in out
+
+
+def test_ping_answers_before_any_workload():
+    out = run_backend("PING\nRUN 8\n")
+    assert out.startswith("OK: PONG\nEND_OF_RESPONSE\n")
+
+
+def test_session_ping_starts_the_backend():
+    session = BackendSession(exe_path, timeout=5)
+    try:
+        assert session.ping() > 0
+        assert session.is_alive()
+    finally:
+        session.close()
+
+
+def test_rejected_settings_fail_the_run():
+    session = BackendSession(exe_path, timeout=5)
+    ok = [{'arrival': 0, 'burst': 2, 'priority': 1}]
+    try:
+        with pytest.raises(BackendError, match="QUANTUM"):
+            session.run_algorithm(5, ok, quantum=0)
+        with pytest.raises(BackendError, match="Bad process line"):
+            session.run_algorithm(2, ok + [{'arrival': 2 ** 31, 'burst': 1, 'priority': 1}])
+        assert "P1" in session.run_algorithm(2, ok)
+        assert session.restarts == 0
+    finally:
+        session.close()
+
+
+def test_allocator_stats_count_bytes():
+    out = run_backend("RUN 1\nRUN 8\n")
+    assert "Allocated: 480 bytes in 3 blocks" in out
+    assert "Allocated: 0 bytes in 0 blocks" in out
+
+
+@pytest.mark.parametrize("policy", ["SEGREGATED", "BESTFIT", "BUDDY"])
+def test_alloc_bench_keeps_heap_consistent(policy):
+    out = run_backend(f"HEAP 64K {policy}\nALLOCBENCH 20000 256 2048 5\nRUN 8\n")
+    assert f"OK: Heap 65536 bytes, policy {policy}" in out
+    assert "Heap check: OK" in out
+
+
+def test_invalid_heap_is_rejected():
+    out = run_backend("HEAP 12 SEGREGATED\nHEAP 1M FIRSTFIT\nHEAP\nHEAP K\n"
+                      "HEAP 99999999999999999999\nPING\nRUN 8\n")
+    assert out.count("ERROR") == 5
+    assert "OK: PONG" in out
+
+
+@pytest.mark.parametrize("policy", ["SEGREGATED", "BESTFIT", "BUDDY"])
+def test_trace_replay_streams_heap_deltas(policy):
+    from heap_trace import decode_trace, generate_trace
+    trace = generate_trace(2000, max_live=64, max_size=512, seed=3)
+    out = run_backend(f"HEAP 64K {policy}\n" + trace.command() + "RUN 1\nRUN 8\n")
+    timeline = decode_trace(out.split("END_OF_RESPONSE", 2)[1])
+    assert timeline.steps == 2000 and timeline.policy == policy
+    final = timeline.snapshot(timeline.steps)
+    assert sum(abs(s) for s in final.sizes) == timeline.usable
+    assert sum(s for s in final.sizes if s > 0) == timeline.allocated[-1]
+    # Leftover blocks are freed, so the memory test still starts from an empty heap
+    assert " bytes in 3 blocks" in out
+
+
+def test_bad_trace_is_rejected():
+    out = run_backend("TRACE 2\nA 1 64\nQ 2\nRUN 8\n")
+    assert "ERROR: Bad trace operation 2 of 2" in out
+    assert "HEAPTRACE" not in out
+
+
+def test_bad_trace_line_skips_the_rest_of_the_trace():
+    out = run_backend("TRACE 4\nA 1 100\nX 2\nA 3 50\nF 1\nPING\nRUN 8\n")
+    assert "ERROR: Bad trace operation 2 of 4" in out
+    assert out.count("ERROR") == 1
+    assert "Invalid option" not in out
+    assert "OK: PONG" in out
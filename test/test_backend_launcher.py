@@ -0,0 +1,51 @@
+import os
+import stat
+
+import backend_launcher
+from backend_launcher import BACKEND_ENV, locate_backend, popen_kwargs
+
+
+def make_executable(path):
+    path.write_text("#!/bin/sh\n")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+def test_environment_variable_wins(tmp_path, monkeypatch):
+    server = tmp_path / "server"
+    server.mkdir()
+    for name in backend_launcher.backend_names():
+        make_executable(server / name)
+    custom = make_executable(tmp_path / "custom_backend")
+    monkeypatch.setenv(BACKEND_ENV, custom)
+    assert locate_backend(str(server)) == custom
+
+    monkeypatch.delenv(BACKEND_ENV)
+    found = locate_backend(str(server))
+    assert os.path.dirname(found) == str(server)
+
+
+def test_falls_back_to_path(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    for name in backend_launcher.backend_names():
+        make_executable(bin_dir / name)
+    monkeypatch.delenv(BACKEND_ENV, raising=False)
+    monkeypatch.setenv('PATH', str(bin_dir))
+    assert os.path.dirname(locate_backend(str(tmp_path / "missing"))) == str(bin_dir)
+
+
+def test_popen_flags_match_platform():
+    flags = popen_kwargs()
+    if os.name == 'nt':
+        assert 'creationflags' in flags
+    else:
+        assert flags == {'start_new_session': True}
+
+
+def test_file_server_has_its_own_variable(tmp_path, monkeypatch):
+    custom = make_executable(tmp_path / "custom_file_server")
+    monkeypatch.setenv(backend_launcher.FILE_SERVER_ENV, custom)
+    monkeypatch.delenv(BACKEND_ENV, raising=False)
+    assert backend_launcher.locate_file_server(str(tmp_path / "missing")) == custom
+    assert locate_backend(str(tmp_path / "missing")) != custom
@@ -0,0 +1,44 @@
+import pytest
+
+from batch_runner import (SweepError, apply_variant, build_tasks, format_table,
+                          parse_algorithm, parse_variant, run_sweep)
+from process_store import ProcessStore, SAMPLE_PROCESSES
+from workload_io import save_workload
+
+
+def test_only_round_robin_sweeps_quantums():
+    tasks = build_tasks(['FCFS', 'Round Robin'], [1, 4], ['base', 'head:3'])
+    assert tasks == [('base', 'FCFS', 0), ('base', 'Round Robin', 1), ('base', 'Round Robin', 4),
+                     ('head:3', 'FCFS', 0), ('head:3', 'Round Robin', 1),
+                     ('head:3', 'Round Robin', 4)]
+
+
+def test_variants():
+    store = ProcessStore(SAMPLE_PROCESSES)
+    assert apply_variant(store, 'base') is store
+    assert list(apply_variant(store, 'head:2').burst) == [5, 3]
+    assert list(apply_variant(store, 'arrival*0.5').arrival) == [0, 0, 1, 1, 2]
+    assert list(apply_variant(store, 'burst*2').burst) == [10, 6, 16, 12, 8]
+
+
+def test_bad_spec_is_rejected():
+    assert parse_algorithm('rr') == 'Round Robin'
+    with pytest.raises(SweepError):
+        parse_algorithm('lottery')
+    for spec in ('burst*0', 'head:x', 'shuffle'):
+        with pytest.raises(SweepError):
+            parse_variant(spec)
+
+
+def test_engine_sweep_over_process_pool(tmp_path):
+    path = str(tmp_path / "workload.csv")
+    save_workload(path, ProcessStore(SAMPLE_PROCESSES))
+    tasks = build_tasks(['FCFS', 'Round Robin'], [2, 3], ['base'])
+
+    rows = run_sweep(path, tasks, workers=2)
+
+    assert [(r['algorithm'], r['quantum']) for r in rows] == \
+        [('FCFS', 0), ('Round Robin', 2), ('Round Robin', 3)]
+    assert rows[0]['avg_wt'] == pytest.approx(8.0)
+    assert rows[0]['throughput'] == pytest.approx(5 / 26)
+    assert 'Round Robin' in format_table(rows)
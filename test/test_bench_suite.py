@@ -0,0 +1,94 @@
+import json
+import statistics
+
+import pytest
+
+from backend_launcher import locate_backend
+from bench_suite import (SCHEDULER_STAGES, BenchError, compare, generate, parse_alloc_bench,
+                         parse_count, parse_sizes, run_suite)
+
+
+ALLOCBENCH_OUTPUT = """=== Allocator Benchmark ===
+Policy: BUDDY
+Ops/sec: 56700000
+Failed allocations: 3
+Peak allocated: 143728 bytes
+Internal fragmentation (avg): 29.50%
+External fragmentation (avg): 42.70%
+Heap check: OK
+"""
+
+
+def row(stage_seconds, n=1000, algorithm='FCFS'):
+    return {'generator': 'uniform', 'processes': n, 'algorithm': algorithm,
+            'stages': dict(stage_seconds)}
+
+
+def test_parse_sizes_accepts_suffixes():
+    assert parse_sizes('10, 1k,250K,1M') == [10, 1000, 250000, 1000000]
+    for bad in ('', '0', '1.5k', '10G'):
+        with pytest.raises(BenchError):
+            parse_sizes(bad)
+
+
+def test_parse_count_matches_the_sizes_syntax():
+    assert [parse_count(text) for text in ('2000', '64k', ' 1M')] == [2000, 64000, 1000000]
+    with pytest.raises(BenchError):
+        parse_count('0')
+
+
+@pytest.mark.parametrize('name', ['uniform', 'bursty', 'heavy_tailed'])
+def test_generators_are_reproducible(name):
+    store = generate(name, 2000, seed=4)
+    assert len(store) == 2000
+    assert list(store.burst) == list(generate(name, 2000, seed=4).burst)
+    assert list(store.arrival) != list(generate(name, 2000, seed=5).arrival)
+    assert min(store.burst) >= 1 and min(store.arrival) >= 0
+
+
+def test_generator_shapes():
+    # Bursty arrivals pile up on few instants; heavy-tailed bursts have outliers
+    assert len(set(generate('bursty', 5000, 1).arrival)) < 5000 / 5
+    assert len(set(generate('uniform', 5000, 1).arrival)) > 5000 / 2
+    burst = generate('heavy_tailed', 5000, 1).burst
+    assert max(burst) > 20 * statistics.median(burst)
+
+
+def test_compare_flags_slow_stages_only():
+    baseline = {'scheduler': [row({'parse': 0.100, 'render': 0.001}),
+                              row({'parse': 0.100}, n=10)]}
+    current = {'scheduler': [row({'parse': 0.200, 'render': 0.0025}),
+                             row({'parse': 0.110}, n=10),
+                             row({'parse': 9.0}, n=99)]}
+    regressions = compare(current, baseline)
+    # render grew 2.5x but by less than the noise floor; n=99 has no baseline
+    assert len(regressions) == 1
+    assert 'n=1000 FCFS parse' in regressions[0]
+
+
+def test_compare_flags_allocator_throughput_drop():
+    baseline = {'allocator': [{'policy': 'BUDDY', 'ops': 1000, 'ops_per_sec': 5e7}]}
+    assert compare({'allocator': [{'policy': 'BUDDY', 'ops': 1000, 'ops_per_sec': 4.5e7}]},
+                   baseline) == []
+    assert len(compare({'allocator': [{'policy': 'BUDDY', 'ops': 1000, 'ops_per_sec': 3e7}]},
+                       baseline)) == 1
+
+
+def test_parse_alloc_bench():
+    parsed = parse_alloc_bench(ALLOCBENCH_OUTPUT)
+    assert parsed == {'ops_per_sec': 56700000.0, 'failed': 3, 'peak_bytes': 143728,
+                      'internal_frag': 29.5, 'external_frag': 42.7, 'heap_check': 'OK'}
+
+
+@pytest.mark.skipif(locate_backend() is None, reason="main_system backend is not built")
+def test_suite_report_is_json():
+    report = run_suite(locate_backend(), [10, 300], ['bursty'], ['FCFS', 'Round Robin'],
+                       policies=['BUDDY'], alloc_ops=2000, heap='64K', repeat=2)
+    report = json.loads(json.dumps(report))
+    assert [(r['processes'], r['algorithm']) for r in report['scheduler']] == [
+        (10, 'FCFS'), (10, 'Round Robin'), (300, 'FCFS'), (300, 'Round Robin')]
+    for r in report['scheduler']:
+        assert set(r['stages']) == set(SCHEDULER_STAGES)
+        assert r['slices'] >= 1 and r['payload_bytes'] > 0
+    assert report['allocator'][0]['heap_check'] == 'OK'
+    assert compare(report, report) == []
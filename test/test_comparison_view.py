@@ -0,0 +1,26 @@
+from comparison_view import BEST_MARK, COLUMNS, comparison_rows
+from process_store import SAMPLE_PROCESSES
+from scheduling_engine import run_option
+
+
+def column(rows, key):
+    index = [c[0] for c in COLUMNS].index(key)
+    return {algorithm: cells[index] for algorithm, cells in rows}
+
+
+def test_rows_follow_result_order_and_mark_the_best():
+    results = run_option(6, SAMPLE_PROCESSES)
+    rows = comparison_rows(results)
+    assert [algorithm for algorithm, _ in rows] == [r.algorithm for r in results]
+    avg_wt = column(rows, 'avg_wt')
+    best = min(results, key=lambda r: r.avg_wt)
+    assert avg_wt[best.algorithm].endswith(BEST_MARK)
+    assert not avg_wt['FCFS'].endswith(BEST_MARK)
+    # Higher is better for throughput; every algorithm ties on this workload
+    assert all(cell.endswith(BEST_MARK) for cell in column(rows, 'throughput').values())
+
+
+def test_single_result_is_not_marked():
+    rows = comparison_rows(run_option(2, SAMPLE_PROCESSES))
+    assert not any(BEST_MARK in cell for cell in rows[0][1])
+    assert comparison_rows([]) == []
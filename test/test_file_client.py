@@ -0,0 +1,152 @@
+import asyncio
+import os
+
+import pytest
+
+from file_client import FileServerError, FileServerPool, parse_info, parse_listing
+
+
+FILES = {
+    'blob.bin': os.urandom(300_000),
+    'tricky.txt': b'hello\nFILE_END\nworld',
+    'empty.txt': b'',
+}
+FILES.update((f'part{k:03}.bin', os.urandom(5000 + k)) for k in range(200))
+FILES['large.bin'] = os.urandom(5 * 1024 * 1024 + 123)
+
+
+async def serve_one(reader, writer, stats):
+    """Minimal stand-in for server/file_server.cpp"""
+    stats['connections'] += 1
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        command, _, arg = line.decode().strip().partition(' ')
+        if command == 'QUIT':
+            break
+        if command == 'GET':
+            stats['gets'].append(arg)
+            name, offset, length = arg, None, None
+            parts = arg.rsplit(' ', 2)
+            if len(parts) == 3 and parts[1].isdigit() and parts[2].isdigit():
+                name, offset, length = parts[0], int(parts[1]), int(parts[2])
+            data = FILES.get(name)
+            if data is None:
+                writer.write(f"ERROR: Cannot open file - {name}\nEND_OF_RESPONSE\n".encode())
+            elif offset is None:
+                writer.write(f"FILE_START|{name}|{len(data)}\n".encode())
+                # Dribble the body so frames span several reads
+                for k in range(0, len(data), 7000):
+                    writer.write(data[k:k + 7000])
+                    await writer.drain()
+                writer.write(b"\nFILE_END\n")
+            else:
+                body = data[offset:offset + length]
+                writer.write(f"FILE_START|{name}|{len(body)}|{offset}|{len(data)}\n".encode())
+                if stats['drop_after'] is not None:
+                    # Simulate a dropped link part way through the body
+                    writer.write(body[:stats['drop_after']])
+                    stats['drop_after'] = None
+                    await writer.drain()
+                    break
+                writer.write(body + b"\nFILE_END\n")
+        elif command == 'LIST':
+            rows = ''.join(f"  [{k}] {name} ({len(data)} B) - 2024-01-01 10:00\n"
+                           for k, (name, data) in enumerate(FILES.items(), start=1))
+            writer.write(f"Files in current directory:\n{rows}END_OF_RESPONSE\n".encode())
+        elif command == 'INFO' and arg in FILES:
+            writer.write(f"Name: {arg}\nSize: {len(FILES[arg])} bytes (x KB)\nEND_OF_RESPONSE\n".encode())
+        else:
+            writer.write(b"ERROR: File not found\nEND_OF_RESPONSE\n")
+        await writer.drain()
+    writer.close()
+
+
+def run_with_server(scenario, drop_after=None):
+    async def main():
+        stats = {'connections': 0, 'gets': [], 'drop_after': drop_after}
+        server = await asyncio.start_server(lambda r, w: serve_one(r, w, stats), '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return await scenario(port), stats
+        finally:
+            server.close()
+            await server.wait_closed()
+    return asyncio.run(main())
+
+
+def test_get_streams_exact_bytes(tmp_path):
+    async def scenario(port):
+        async with FileServerPool(port=port, size=1) as pool:
+            for name in FILES:
+                assert await pool.get(name, str(tmp_path / name), chunk_size=4096) == len(FILES[name])
+    run_with_server(scenario)
+    for name, data in FILES.items():
+        assert (tmp_path / name).read_bytes() == data
+    assert not list(tmp_path.glob('*.part'))
+
+
+def test_connection_is_reused_across_commands(tmp_path):
+    async def scenario(port):
+        async with FileServerPool(port=port, size=1) as pool:
+            names = [entry.name for entry in await pool.list()]
+            info = await pool.info('blob.bin')
+            with pytest.raises(FileServerError):
+                await pool.get('missing', str(tmp_path / 'missing'))
+            await pool.get('tricky.txt', str(tmp_path / 'tricky.txt'))
+            return names, info
+    (names, info), stats = run_with_server(scenario)
+    assert names == list(FILES)
+    assert info['Size'] == f"{len(FILES['blob.bin'])} bytes (x KB)"
+    assert stats['connections'] == 1
+
+
+def test_download_many_is_bounded_by_pool(tmp_path):
+    names = list(FILES) + ['missing', 'blob.bin']
+
+    async def scenario(port):
+        async with FileServerPool(port=port, size=4) as pool:
+            return await pool.download_many(names, str(tmp_path))
+    results, stats = run_with_server(scenario)
+    assert isinstance(results['missing'], FileServerError)
+    assert results['blob.bin'] == len(FILES['blob.bin'])
+    assert stats['connections'] <= 4
+    for name, data in FILES.items():
+        assert (tmp_path / name).read_bytes() == data
+
+
+def test_resume_continues_from_partial_file(tmp_path):
+    data = FILES['blob.bin']
+    (tmp_path / 'blob.bin.part').write_bytes(data[:12345])
+
+    async def scenario(port):
+        async with FileServerPool(port=port, size=1) as pool:
+            return await pool.get('blob.bin', str(tmp_path / 'blob.bin'), resume=True)
+    written, stats = run_with_server(scenario)
+    assert written == len(data)
+    assert (tmp_path / 'blob.bin').read_bytes() == data
+    assert stats['gets'] == [f'blob.bin 12345 {10 ** 18 - 1}']
+
+
+def test_segmented_download_retries_dropped_segment(tmp_path):
+    async def scenario(port):
+        async with FileServerPool(port=port, size=4) as pool:
+            return await pool.get_segmented('large.bin', str(tmp_path / 'large.bin'), segments=4)
+    size, stats = run_with_server(scenario, drop_after=100_000)
+    data = FILES['large.bin']
+    assert size == len(data)
+    assert (tmp_path / 'large.bin').read_bytes() == data
+    ranges = [tuple(map(int, arg.split()[1:])) for arg in stats['gets']]
+    assert len(ranges) == 5
+    # The retried segment starts where the dropped connection stopped
+    starts = {len(data) * k // 4 for k in range(4)}
+    assert any(offset - 100_000 in starts for offset, _ in ranges)
+
+
+def test_parsers():
+    listing = parse_listing("Files in current directory:\n"
+                            "  [1] my file.txt (1.5 KB) - 2024-01-01 10:00\n"
+                            "  [2] b.bin (3 MB) - 2024-01-02 11:30\n")
+    assert [(e.name, e.size_text) for e in listing] == [('my file.txt', '1.5 KB'), ('b.bin', '3 MB')]
+    assert parse_info("Name: a.txt\nSize: 10 bytes (0.01 KB)\n")['Size'] == '10 bytes (0.01 KB)'
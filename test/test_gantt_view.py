@@ -0,0 +1,82 @@
+from array import array
+
+from gantt_view import AXIS_Y, BAR_HEIGHT, TileCache, lane_layout, lod_blocks, split_lanes, tick_step
+
+
+def columns(slices):
+    return tuple(array('q', column) for column in zip(*slices))
+
+
+def test_wide_slices_are_kept_and_clipped():
+    pid, start, end = columns([(1, 0, 10), (2, 10, 20), (1, 20, 30)])
+    blocks = lod_blocks(pid, start, end, scale=10, px0=50, px1=250)
+    assert blocks == [(50, 100, 1, 1), (100, 200, 2, 1), (200, 250, 1, 1)]
+
+
+def test_sub_pixel_slices_merge_per_pixel_run():
+    # 10k one-unit slices at 0.1 px per unit: far fewer blocks than slices
+    slices = [(k % 3 + 1, k, k + 1) for k in range(10000)]
+    pid, start, end = columns(slices)
+    blocks = lod_blocks(pid, start, end, scale=0.1, px0=0, px1=1000, min_px=3)
+    assert len(blocks) <= 1000 // 3 + 1
+    assert sum(count for _, _, _, count in blocks) == 10000
+    assert all(p is None for _, _, p, _ in blocks)
+
+
+def test_merged_run_of_one_process_keeps_its_pid():
+    pid, start, end = columns([(4, k, k + 1) for k in range(100)] + [(2, 100, 1000)])
+    blocks = lod_blocks(pid, start, end, scale=0.5, px0=0, px1=500, min_px=3)
+    assert {p for _, _, p, _ in blocks} == {4, 2}
+    assert blocks[-1][2:] == (2, 1)
+
+
+def test_blocks_can_be_limited_to_a_position_range():
+    pid, start, end = columns([(1, 0, 10), (2, 10, 20), (1, 20, 30), (3, 30, 40)])
+    blocks = lod_blocks(pid, start, end, scale=1, px0=0, px1=100, lo=1, hi=3)
+    assert blocks == [(10, 20, 2, 1), (20, 30, 1, 1)]
+
+
+def test_tick_step_is_round():
+    assert tick_step(100) == 1
+    assert tick_step(1) == 100
+    assert tick_step(0.003) == 50000
+
+
+def test_tile_cache_is_lru():
+    cache = TileCache(capacity=2)
+    builds = []
+    build = lambda key: lambda: builds.append(key) or [key]
+    cache.get('a', build('a'))
+    cache.get('b', build('b'))
+    cache.get('a', build('a'))
+    cache.get('c', build('c'))
+    cache.get('b', build('b'))
+    assert builds == ['a', 'b', 'c', 'b']
+    assert len(cache) == 2
+
+
+def test_tile_cache_discards_matching_tiles():
+    cache = TileCache()
+    for index in range(4):
+        cache.get((0, index), lambda: [])
+    cache.discard(lambda key: key[1] >= 2)
+    assert len(cache) == 2
+    rebuilt = []
+    cache.get((0, 1), lambda: rebuilt.append(1) or [])
+    cache.get((0, 3), lambda: rebuilt.append(3) or [])
+    assert rebuilt == [3]
+
+
+def test_lane_layout_shrinks_lanes_then_grows_canvas():
+    assert lane_layout(1) == (lane_layout(1)[0], BAR_HEIGHT, AXIS_Y)
+    pitch, bar, axis_y = lane_layout(8)
+    assert bar < BAR_HEIGHT and axis_y > AXIS_Y
+    small = lane_layout(256)
+    assert small[1] >= 1 and small[2] > axis_y
+
+
+def test_split_lanes_follows_lane_sizes():
+    pid, start, end = columns([(1, 0, 5), (3, 5, 13), (2, 1, 4), (4, 4, 10), (5, 10, 14)])
+    lanes = split_lanes(pid, start, end, [2, 3])
+    assert [list(lane[0]) for lane in lanes] == [[1, 3], [2, 4, 5]]
+    assert list(lanes[1][2]) == [4, 10, 14]
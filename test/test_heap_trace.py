@@ -0,0 +1,90 @@
+import pytest
+
+from heap_trace import (KEYFRAME_EVERY, TraceError, decode_trace, generate_trace, load_trace,
+                        save_trace)
+
+
+# The backend's reply to: A 1 100 / A 2 200 / F 1 / A 3 5000 / F 2 on a 4K heap
+SMALL_REPLY = """HEAPTRACE 5 4088 SEGREGATED
+0 -4088
+112 3976 0 112 -3976
+320 3768 112 208 -3768
+208 3768 0 -112
+208 3768
+0 4088 0 -4088
+HEAPTRACE_END
+"""
+
+
+def test_decode_rebuilds_every_step():
+    timeline = decode_trace(SMALL_REPLY)
+    assert timeline.steps == 5
+    assert timeline.policy == 'SEGREGATED'
+    assert list(timeline.snapshot(2).sizes) == [112, 208, -3768]
+    assert list(timeline.snapshot(2).offsets) == [0, 112, 320]
+    assert list(timeline.snapshot(3).sizes) == [-112, 208, -3768]
+    assert list(timeline.snapshot(5).sizes) == [-4088]
+    assert not timeline.changed(4)
+    assert list(timeline.failures) == [0, 0, 0, 0, 1, 1]
+    assert timeline.external_fragmentation(3) == pytest.approx((1 - 3768 / 3880) * 100)
+
+
+def test_snapshots_match_sequential_replay_across_keyframes():
+    # Each step carves one 16-byte block off the front of the free tail
+    lines = ["HEAPTRACE 3000 65536 SEGREGATED", "0 -65536"]
+    for k in range(1, 3001):
+        lines.append(f"{16 * k} {65536 - 16 * k} {16 * (k - 1)} 16 -{65536 - 16 * k}")
+    timeline = decode_trace('\n'.join(lines) + "\nHEAPTRACE_END\n")
+    assert len(timeline.keyframes) == 3000 // KEYFRAME_EVERY + 1
+
+    heap_map = timeline.snapshot(0)
+    for k in range(1, timeline.steps + 1):
+        timeline.advance(heap_map, k)
+        if k % 499 == 0 or k == timeline.steps:
+            snap = timeline.snapshot(k)
+            assert snap.offsets == heap_map.offsets and snap.sizes == heap_map.sizes
+    assert len(heap_map.sizes) == 3001
+
+
+def test_decode_rejects_errors_and_truncation():
+    with pytest.raises(TraceError, match="Bad trace operation"):
+        decode_trace("ERROR: Bad trace operation 1 of 2\n")
+    with pytest.raises(TraceError, match="ended early"):
+        decode_trace(SMALL_REPLY.replace("HEAPTRACE_END\n", ""))
+    with pytest.raises(TraceError, match="Expected 5"):
+        decode_trace(SMALL_REPLY.replace("208 3768\n", ""))
+
+
+def test_generated_trace_is_valid_and_repeatable():
+    trace = generate_trace(5000, max_live=64, max_size=4096, seed=7)
+    assert len(trace) == 5000
+    assert trace.command() == generate_trace(5000, max_live=64, max_size=4096, seed=7).command()
+    live = set()
+    for handle, size in zip(trace.handles, trace.sizes):
+        if size:
+            assert handle not in live and 8 <= size <= 4096
+            live.add(handle)
+        else:
+            live.remove(handle)
+        assert len(live) <= 64
+
+
+def test_trace_file_round_trip(tmp_path):
+    path = tmp_path / 'ops.trace'
+    path.write_text("# comment\nalloc 1 100\n\nA 2 50\nfree 1  # done with it\nF 2\n")
+    trace = load_trace(str(path))
+    assert trace.command() == "TRACE 4\nA 1 100\nA 2 50\nF 1\nF 2\n"
+
+    saved = tmp_path / 'saved.trace'
+    save_trace(str(saved), trace)
+    assert load_trace(str(saved)).command() == trace.command()
+
+
+def test_trace_file_errors_name_the_line(tmp_path):
+    path = tmp_path / 'bad.trace'
+    path.write_text("A 1 100\nA 2\n")
+    with pytest.raises(TraceError, match=r"bad\.trace:2:"):
+        load_trace(str(path))
+    path.write_text("A 1 0\n")
+    with pytest.raises(TraceError):
+        load_trace(str(path))
@@ -0,0 +1,29 @@
+from array import array
+
+from heap_trace import HeapMap
+from heap_view import cell_bytes_for, cell_occupancy
+
+
+def heap_map(*sizes):
+    offsets = array('q')
+    at = 0
+    for size in sizes:
+        offsets.append(at)
+        at += abs(size)
+    return HeapMap(offsets, array('q', sizes))
+
+
+def test_cell_size_fits_heap_in_target_rows():
+    assert cell_bytes_for(4096, columns=128, target_rows=256) == 8
+    assert cell_bytes_for(1 << 20, columns=128, target_rows=256) == 32
+    assert cell_bytes_for((1 << 20) + 1, columns=128, target_rows=256) == 64
+
+
+def test_occupancy_splits_blocks_across_cells():
+    blocks = heap_map(24, -16, 40, -48)
+    assert list(cell_occupancy(blocks, 16, 0, 8)) == [16, 8, 8, 16, 16, 0, 0, 0]
+
+
+def test_occupancy_of_a_window():
+    blocks = heap_map(-100, 300, -112)
+    assert list(cell_occupancy(blocks, 64, 1, 5)) == [28, 64, 64, 64]
@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+import scheduling_engine as engine
+from incremental_engine import IncrementalSchedule, first_difference
+from process_store import ProcessStore
+
+
+def columns(result):
+    return [list(col) for col in (
+        result.slice_pid, result.slice_start, result.slice_end,
+        result.pid, result.arrival, result.burst,
+        result.completion, result.turnaround, result.waiting)]
+
+
+def random_records(rng, n, span):
+    return [{'id': f"P{k + 1}", 'arrival': rng.randint(0, span),
+             'burst': rng.randint(1, 9), 'priority': rng.randint(0, 5)} for k in range(n)]
+
+
+def test_first_difference():
+    assert first_difference([1, 2, 3], [1, 2, 3]) == 3
+    assert first_difference([1, 2, 3], [1, 5, 3]) == 1
+    assert first_difference([1, 2], [1, 2, 3]) == 2
+    long = list(range(10000))
+    assert first_difference(long, long[:9000] + [-1] + long[9001:]) == 9000
+
+
+@pytest.mark.parametrize('cpus', [1, 3])
+@pytest.mark.parametrize('algorithm', list(engine.SMP_POLICIES))
+def test_updates_match_a_full_run(algorithm, cpus):
+    rng = random.Random(f"{algorithm}{cpus}")
+    store = ProcessStore(random_records(rng, 40, 60))
+    schedule = IncrementalSchedule(algorithm, quantum=2, cpus=cpus, checkpoint_steps=4)
+    for step in range(12):
+        delta = schedule.update_processes(store)
+        full = engine.schedule(algorithm, *store.sorted_columns(), quantum=2, cpus=cpus)
+        assert columns(delta.result) == columns(full)
+        assert (delta.result.avg_wt, delta.result.avg_tat) == (full.avg_wt, full.avg_tat)
+        assert (delta.result.cores is None) == (full.cores is None)
+        if full.cores is not None:
+            assert delta.result.cores.to_dict() == full.cores.to_dict()
+
+        if step % 3 == 0:
+            store.append(random_records(rng, 1, 60)[0])
+        elif step % 3 == 1:
+            store.update(rng.randrange(len(store)), random_records(rng, 1, 60)[0])
+        else:
+            store.delete([rng.randrange(len(store))])
+
+
+def test_late_edit_resumes_past_zero_and_keeps_the_prefix():
+    records = [{'id': f"P{k}", 'arrival': 3 * k, 'burst': 2, 'priority': 1} for k in range(200)]
+    store = ProcessStore(records)
+    schedule = IncrementalSchedule('Round Robin', quantum=1, checkpoint_steps=8)
+    first = schedule.update_processes(store)
+    assert first.full
+
+    store.append({'id': 'late', 'arrival': 550, 'burst': 4, 'priority': 1})
+    delta = schedule.update_processes(store)
+    assert not delta.full and delta.previous is first.result
+    assert 500 <= delta.resumed_from < 550
+    assert delta.slice_time <= 550
+    old, new = columns(first.result), columns(delta.result)
+    kept = delta.lane_prefix[0]
+    assert kept > 0 and [col[:kept] for col in old[:3]] == [col[:kept] for col in new[:3]]
+    assert all(start >= delta.slice_time for start in new[1][kept:])
+    assert delta.first_row > 150
+    assert [col[:delta.first_row] for col in old[3:]] == [col[:delta.first_row] for col in new[3:]]
+
+
+def test_unchanged_workload_returns_the_same_result():
+    store = ProcessStore(random_records(random.Random(3), 30, 20))
+    schedule = IncrementalSchedule('SRTF', cpus=2)
+    result = schedule.update_processes(store).result
+    delta = schedule.update_processes(store)
+    assert delta.unchanged and delta.result is result
+
+
+def test_sjf_rows_patch_from_the_whole_arrival_group():
+    # Rows list equal arrivals by burst, so P3 moving out of the group at
+    # time 4 reorders rows that sit before its position
+    store = ProcessStore([{'id': 'P1', 'arrival': 0, 'burst': 9, 'priority': 1},
+                          {'id': 'P2', 'arrival': 4, 'burst': 5, 'priority': 1},
+                          {'id': 'P3', 'arrival': 4, 'burst': 1, 'priority': 1}])
+    schedule = IncrementalSchedule('SJF', checkpoint_steps=1)
+    assert list(schedule.update_processes(store).result.pid) == [1, 3, 2]
+    store.update(2, {'id': 'P3', 'arrival': 5, 'burst': 1, 'priority': 1})
+    delta = schedule.update_processes(store)
+    assert delta.first_row == 1
+    assert list(delta.result.pid) == [1, 2, 3]
@@ -0,0 +1,99 @@
+import pytest
+
+import metrics
+from metrics import Profiler, Registry
+
+
+def test_timer_percentiles_and_totals():
+    registry = Registry()
+    timer = registry.timer('work_seconds')
+    for ms in range(1, 101):
+        timer.observe(ms / 1000)
+    assert timer.count == 100
+    assert timer.total == pytest.approx(5.05)
+    assert timer.percentile(0.5) == pytest.approx(0.051)
+    assert timer.percentile(0.95) == pytest.approx(0.096)
+    assert registry.timer('idle_seconds').percentile(0.5) is None
+
+
+def test_timer_context_manager_records_on_error():
+    timer = Registry().timer('failing_seconds')
+    with pytest.raises(ZeroDivisionError):
+        with timer.time():
+            1 / 0
+    assert timer.count == 1
+
+
+def test_counter_rate_covers_the_window():
+    counter = Registry().counter('bytes')
+    counter.inc(600)
+    counter.inc()
+    assert counter.value == 601
+    assert counter.rate() == pytest.approx(601 / metrics.RATE_WINDOW)
+
+
+def test_registry_reuses_and_type_checks_names():
+    registry = Registry()
+    assert registry.counter('hits') is registry.counter('hits')
+    with pytest.raises(TypeError):
+        registry.timer('hits')
+
+
+def test_prometheus_text_format():
+    registry = Registry()
+    registry.timer('request_seconds', "Round trip").observe(0.25)
+    registry.counter('cache_hits', "Hits").inc(3)
+    registry.gauge('resident_bytes').set(1024)
+    text = registry.to_prometheus()
+    assert "# HELP osnexus_request_seconds Round trip\n" in text
+    assert "# TYPE osnexus_request_seconds summary\n" in text
+    assert 'osnexus_request_seconds{quantile="0.95"} 0.25\n' in text
+    assert "osnexus_request_seconds_sum 0.25\n" in text
+    assert "osnexus_request_seconds_count 1\n" in text
+    assert "# TYPE osnexus_cache_hits_total counter\nosnexus_cache_hits_total 3\n" in text
+    assert "osnexus_resident_bytes 1024\n" in text
+
+
+def test_write_prometheus_replaces_the_file(tmp_path):
+    registry = Registry()
+    registry.counter('runs').inc()
+    path = tmp_path / 'osnexus.prom'
+    path.write_text('stale')
+    registry.write_prometheus(str(path))
+    assert path.read_text() == registry.to_prometheus()
+    assert [p.name for p in tmp_path.iterdir()] == ['osnexus.prom']
+
+
+def test_hot_paths_report_to_the_registry():
+    from backend_session import format_workload
+    before = metrics.timer('workload_format_seconds').count
+    format_workload([{'arrival': 0, 'burst': 3, 'priority': 1}])
+    assert metrics.timer('workload_format_seconds').count == before + 1
+
+
+def test_profiler_toggles(tmp_path):
+    profiler = Profiler()
+    assert profiler.stop_profile() == ''
+    profiler.start_profile()
+    assert profiler.profiling
+    sorted(range(1000), key=lambda x: -x)
+    path = tmp_path / 'run.prof'
+    report = profiler.stop_profile(str(path))
+    assert not profiler.profiling
+    assert 'cumulative' in report
+    assert path.stat().st_size > 0
+
+    profiler.start_tracemalloc()
+    assert profiler.tracing
+    kept = [bytearray(1000) for _ in range(100)]
+    report = profiler.stop_tracemalloc()
+    assert not profiler.tracing
+    assert report.startswith("Traced:")
+    assert kept
+
+
+def test_memory_gauge_is_sampled():
+    registry = Registry()
+    metrics.sample_memory(registry)
+    if metrics.resident_bytes() is not None:
+        assert registry.gauge('process_resident_bytes').value > 0
@@ -0,0 +1,69 @@
+import random
+
+from process_store import ProcessStore, SAMPLE_PROCESSES
+from scheduling_engine import columns_from_processes
+
+
+def test_iterates_as_records():
+    store = ProcessStore(SAMPLE_PROCESSES)
+    assert list(store) == SAMPLE_PROCESSES
+    assert len(store) == 5
+
+
+def test_listener_sees_incremental_changes():
+    store = ProcessStore(SAMPLE_PROCESSES)
+    events = []
+    store.add_listener(lambda *event: events.append(event))
+
+    store.append({'id': 'P6', 'arrival': 9, 'burst': 1, 'priority': 1})
+    store.extend_columns(['P7', 'P8'], [10, 11], [2, 2], [3, 3])
+    store.update(0, {'id': 'P1', 'arrival': 4, 'burst': 5, 'priority': 2})
+    store.delete([1, 3])
+    store.clear()
+
+    assert events == [('append', 5, 1), ('append', 6, 2), ('update', 0, 1), ('delete', 1, 2),
+                      ('reset', 0, 0)]
+    assert store.version == 5
+
+
+def test_delete_keeps_columns_aligned():
+    store = ProcessStore(SAMPLE_PROCESSES)
+    store.delete([0, 2, 4])
+    assert store.ids == ['P2', 'P4']
+    assert list(store.arrival) == [1, 3]
+    assert list(store.burst) == [3, 6]
+
+
+def test_snapshot_is_independent():
+    store = ProcessStore(SAMPLE_PROCESSES)
+    copy = store.snapshot()
+    store.clear()
+    assert len(copy) == 5
+
+
+def test_sorted_columns_match_dict_path():
+    records = [{'id': 'B', 'arrival': 4, 'burst': 2, 'priority': 1},
+               {'id': 'A', 'arrival': 0, 'burst': 3, 'priority': 2},
+               {'id': 'C', 'arrival': 4, 'burst': 1, 'priority': 3}]
+    by_store = [list(col) for col in columns_from_processes(ProcessStore(records))]
+    by_dicts = [list(col) for col in columns_from_processes(records)]
+    assert by_store == by_dicts == [[0, 4, 4], [3, 2, 1], [2, 1, 3]]
+
+
+def test_sorted_columns_follow_appends_and_updates():
+    rng = random.Random(7)
+    store = ProcessStore({'id': f"P{k}", 'arrival': rng.randint(0, 5), 'burst': k + 1,
+                          'priority': 1} for k in range(20))
+    store.sorted_columns()
+    for step in range(40):
+        record = {'id': f"Q{step}", 'arrival': rng.randint(0, 5), 'burst': 100 + step,
+                  'priority': 2}
+        if step % 2:
+            store.update(rng.randrange(len(store)), record)
+        else:
+            store.append(record)
+        assert [list(col) for col in store.sorted_columns()] == \
+            [list(col) for col in columns_from_processes(list(store))]
+    copy = store.snapshot()
+    store.append({'id': 'X', 'arrival': 0, 'burst': 1, 'priority': 1})
+    assert len(copy.sorted_columns()[0]) == len(store) - 1
@@ -0,0 +1,80 @@
+import os
+
+from process_store import ProcessStore, SAMPLE_PROCESSES
+from result_cache import ResultCache, pack_results, unpack_results
+from scheduling_engine import option_algorithms, run_option
+
+
+def test_key_depends_on_content_not_order():
+    cache = ResultCache()
+    store = ProcessStore(SAMPLE_PROCESSES)
+    shuffled = ProcessStore(reversed(SAMPLE_PROCESSES))
+    assert cache.key(store, 2, 2) == cache.key(shuffled, 2, 2)
+    # Quantum only matters for options that run Round Robin or MLFQ
+    assert cache.key(store, 2, 2) == cache.key(store, 2, 5)
+    assert cache.key(store, 13, 2) == cache.key(store, 13, 5)
+    assert cache.key(store, 5, 2) != cache.key(store, 5, 5)
+    assert cache.key(store, 15, 2) != cache.key(store, 15, 5)
+    assert cache.key(store, 2, 2) != cache.key(store, 3, 2)
+    assert cache.key(store, 2, 2) == cache.key(store, 2, 2, cpus=1)
+    assert cache.key(store, 2, 2, cpus=2) != cache.key(store, 2, 2, cpus=4)
+
+
+def test_store_change_changes_key():
+    cache = ResultCache()
+    store = ProcessStore(SAMPLE_PROCESSES)
+    before = cache.key(store, 6, 2)
+    cache.put(before, run_option(6, store))
+
+    store.append({'id': 'P6', 'arrival': 7, 'burst': 2, 'priority': 1})
+    after = cache.key(store, 6, 2)
+    assert after != before
+    assert cache.get(after) is None
+    store.delete([5])
+    assert cache.key(store, 6, 2) == before
+    assert len(cache.get(before)) == len(option_algorithms(6))
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2)
+    results = run_option(2, SAMPLE_PROCESSES)
+    for key in ('a', 'b'):
+        cache.put(key, results)
+    cache.get('a')
+    cache.put('c', results)
+    assert cache.get('b') is None
+    assert cache.get('a') == results and cache.get('c') == results
+
+
+def test_pack_round_trip():
+    results = run_option(6, SAMPLE_PROCESSES)
+    restored = unpack_results(pack_results(results))
+    for original, copy in zip(results, restored):
+        assert copy.algorithm == original.algorithm
+        assert copy.format_report() == original.format_report()
+        assert list(copy.slice_end) == list(original.slice_end)
+
+
+def test_pack_round_trip_keeps_core_stats():
+    results = run_option(6, SAMPLE_PROCESSES, cpus=3)
+    restored = unpack_results(pack_results(results))
+    for original, copy in zip(results, restored):
+        assert copy.cpus == 3
+        assert copy.cores.lanes == original.cores.lanes
+        assert copy.cores.steals == original.cores.steals
+        assert copy.format_report() == original.format_report()
+    assert unpack_results(pack_results(run_option(2, SAMPLE_PROCESSES)))[0].cores is None
+
+
+def test_disk_tier_survives_restart_and_is_bounded(tmp_path):
+    results = run_option(6, SAMPLE_PROCESSES)
+    entry_size = len(pack_results(results))
+    cache = ResultCache(disk_dir=str(tmp_path), max_disk_bytes=entry_size * 2)
+    for key in ('k1', 'k2', 'k3'):
+        cache.put(key, results)
+    assert sorted(os.listdir(tmp_path)) == ['k2.res', 'k3.res']
+
+    reopened = ResultCache(disk_dir=str(tmp_path))
+    hit = reopened.get('k3')
+    assert [r.avg_wt for r in hit] == [r.avg_wt for r in results]
+    assert reopened.get('k1') is None
@@ -0,0 +1,95 @@
+from result_protocol import (REPORT_HEADER_LINES, FrameDecoder, ProtocolError, ScheduleResult,
+                             decode_results)
+
+
+FCFS_JSON = ('{"algorithm":"FCFS","quantum":0,"gantt":[1,0,5,2,5,8],'
+             '"stats":[1,0,5,5,5,0,2,1,3,8,7,4],"avg_wt":2.00,"avg_tat":6.00}')
+
+
+SMP_JSON = ('{"algorithm":"FCFS","quantum":0,"gantt":[1,0,5,2,1,4],'
+            '"stats":[1,0,5,5,5,0,2,1,3,4,3,0],"avg_wt":0.00,"avg_tat":4.00,'
+            '"cpus":2,"lanes":[1,1],"core_busy":[5,3],"core_completed":[1,1],"core_steals":[0,0]}')
+
+
+def frame(payload):
+    return f"RESULT_JSON {len(payload)}\n{payload}\n"
+
+
+def test_decode_frame_into_columns():
+    results, text = decode_results(frame(FCFS_JSON))
+    assert text == ''
+    result = results[0]
+    assert result.algorithm == 'FCFS'
+    assert list(result.slice_pid) == [1, 2]
+    assert list(result.slice_start) == [0, 5]
+    assert list(result.slice_end) == [5, 8]
+    assert list(result.waiting) == [0, 4]
+    assert result.makespan == 8
+    assert result.avg_tat == 6.0
+
+
+def test_text_lines_pass_through():
+    decoder = FrameDecoder()
+    assert decoder.feed("=== Memory Allocator Test ===\n") == "=== Memory Allocator Test ===\n"
+    assert decoder.feed(f"RESULT_JSON {len(FCFS_JSON)}\n") is None
+    assert isinstance(decoder.feed(FCFS_JSON + '\n'), ScheduleResult)
+
+
+def test_length_mismatch_is_rejected():
+    decoder = FrameDecoder()
+    decoder.feed(f"RESULT_JSON {len(FCFS_JSON) + 1}\n")
+    try:
+        decoder.feed(FCFS_JSON + '\n')
+    except ProtocolError:
+        pass
+    else:
+        raise AssertionError("short frame was accepted")
+
+
+def test_report_lists_every_process():
+    result = decode_results(frame(FCFS_JSON))[0][0]
+    report = result.format_report()
+    assert "P2\t1\t3\t8\t7\t4" in report
+    assert "Avg Waiting Time: 2.00" in report
+
+
+def test_report_tail_replaces_lines_from_a_row():
+    result = decode_results(frame(FCFS_JSON))[0][0]
+    lines = result.format_report().splitlines()
+    tail = result.format_report(first_row=1)
+    assert tail.splitlines() == lines[REPORT_HEADER_LINES + 1:]
+    assert tail.startswith("P2\t1")
+
+
+def test_multi_core_frame_carries_core_stats():
+    result = decode_results(frame(SMP_JSON))[0][0]
+    assert result.cpus == 2
+    assert result.cores.lane_bounds() == [(0, 1), (1, 2)]
+    assert result.cores.busy == [5, 3]
+    report = result.format_report()
+    assert "--- FCFS on 2 CPUs ---" in report
+    assert "1\t3\t60.0\t1\t0" in report
+    assert decode_results(frame(FCFS_JSON))[0][0].cpus == 1
+
+
+def test_core_lanes_must_cover_the_slices():
+    try:
+        ScheduleResult.from_json(SMP_JSON.replace('"lanes":[1,1]', '"lanes":[1,2]'))
+    except ProtocolError:
+        pass
+    else:
+        raise AssertionError("lanes not matching the Gantt slices were accepted")
+
+
+def test_summary_is_computed_when_the_backend_sends_none():
+    result = decode_results(frame(FCFS_JSON))[0][0]
+    assert result.summary == {'makespan': 8, 'throughput': 0.25, 'utilization': 100.0,
+                              'avg_response': 2.0, 'max_waiting': 4, 'preemptions': 0}
+    sent = FCFS_JSON[:-1] + ',"summary":{"makespan":8,"throughput":0.2500}}'
+    assert decode_results(frame(sent))[0][0].summary == {'makespan': 8, 'throughput': 0.25}
+
+
+def test_multi_core_utilization_counts_every_cpu():
+    result = decode_results(frame(SMP_JSON))[0][0]
+    assert result.summary['utilization'] == 80.0
+    assert result.summary['makespan'] == 5
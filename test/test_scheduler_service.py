@@ -0,0 +1,135 @@
+import random
+import socket
+import threading
+
+import pytest
+
+from backend_launcher import locate_backend, parse_address
+from backend_session import BackendSession, ServiceSession
+from result_protocol import FORMAT_COMMAND, decode_results
+from scheduler_service import (SMALL_JOB_PROCESSES, SchedulingService, ServiceJob, Workload,
+                               make_server)
+
+
+def workload(count):
+    return Workload(f"LOAD {count}\n" + "0 1 1\n" * count, count)
+
+
+def random_workload(n, seed):
+    rng = random.Random(seed)
+    return [{'arrival': rng.randint(0, n // 2), 'burst': rng.randint(1, 12),
+             'priority': rng.randint(1, 5)} for _ in range(n)]
+
+
+@pytest.fixture
+def serve():
+    running = []
+
+    def start(exe_path, workers=2):
+        service = SchedulingService(exe_path, workers)
+        service.start()
+        server = make_server('127.0.0.1:0', service)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        running.append((server, service))
+        return f"127.0.0.1:{server.server_address[1]}", service
+
+    yield start
+    for server, service in running:
+        server.shutdown()
+        server.server_close()
+        service.stop()
+
+
+def test_parse_address():
+    assert parse_address('unix:/run/osnexus.sock') == ('unix', '/run/osnexus.sock')
+    assert parse_address('9092') == ('tcp', ('127.0.0.1', 9092))
+    assert parse_address('0.0.0.0:9092') == ('tcp', ('0.0.0.0', 9092))
+    with pytest.raises(ValueError):
+        parse_address('localhost:http')
+
+
+def test_small_jobs_queued_together_share_a_batch():
+    service = SchedulingService(None, workers=1)
+    small = [ServiceJob(2, workload(10), ('JSON', 2, 1)) for _ in range(3)]
+    big = ServiceJob(2, workload(SMALL_JOB_PROCESSES + 1), ('JSON', 2, 1))
+    for job in small + [big] + small[:1]:
+        assert service.submit(job)
+    assert service._next_batch() == small
+    assert service._next_batch() == [big]
+    assert service._next_batch() == small[:1]
+
+
+def test_full_queue_refuses_runs():
+    service = SchedulingService(None, workers=1, queue_limit=2)
+    jobs = [ServiceJob(2, workload(1), ('JSON', 2, 1)) for _ in range(3)]
+    assert [service.submit(job) for job in jobs] == [True, True, False]
+
+
+def test_commands_are_checked_before_queueing(serve):
+    address, _ = serve('/nonexistent/main_system')
+    session = ServiceSession(address, timeout=5)
+    try:
+        assert session.request("RUN 2\n").startswith("ERROR: No workload")
+        assert session.request("LOAD 1\n0 3 1\n") == "OK: Loaded 1 processes\n"
+        assert session.request("RUN 7\n").startswith("ERROR: Option 7")
+        assert session.request("FORMAT MAP /tmp/x\n").startswith("ERROR")
+        assert session.request("STATUS\n").startswith("OK: Workers 2")
+        assert session.ping() > 0
+        # Bad data lines are consumed, so the connection stays in step
+        assert session.request("LOAD 3\n0 1 1\nx\n0 1 1\n") == \
+            "ERROR: Bad process line 2 of 3\n"
+        assert session.request("TRACE 1\nA 1 8\n").startswith("ERROR: TRACE")
+        assert session.request("CPUS 300\n").startswith("ERROR")
+        assert session.restarts == 0
+    finally:
+        session.close()
+
+
+def test_oversized_or_abandoned_loads_end_the_connection(serve):
+    address, _ = serve('/nonexistent/main_system')
+    host, port = parse_address(address)[1]
+    with socket.create_connection((host, port), timeout=5) as client:
+        client.sendall(b"LOAD 9000000000000000000\n")
+        reply = client.makefile('rb').read()
+    assert reply.startswith(b"ERROR: At most") and reply.endswith(b"END_OF_RESPONSE\n")
+
+    with socket.create_connection((host, port), timeout=5) as client:
+        client.sendall(b"LOAD 1000000\n0 1 1\n")
+        client.shutdown(socket.SHUT_WR)
+        # The handler stops at end of input instead of reading a million empty lines
+        assert client.recv(1) == b""
+
+
+@pytest.mark.skipif(locate_backend() is None, reason="main_system backend is not built")
+def test_concurrent_clients_match_a_local_backend(serve):
+    address, service = serve(locate_backend())
+    processes = random_workload(200, seed=3)
+    local = BackendSession(locate_backend(), timeout=20, init_payloads=[FORMAT_COMMAND])
+    try:
+        expected = {option: decode_results(local.run_algorithm(option, processes, quantum=3,
+                                                               cpus=cpus))[0]
+                    for option, cpus in ((2, 1), (5, 1), (6, 2))}
+    finally:
+        local.close()
+
+    failures = []
+
+    def client():
+        session = ServiceSession(address, timeout=20, init_payloads=[FORMAT_COMMAND])
+        try:
+            for option, cpus in ((2, 1), (6, 2), (5, 1), (2, 1)):
+                results, _ = decode_results(session.run_algorithm(option, processes, quantum=3,
+                                                                  cpus=cpus))
+                if [list(r.completion) for r in results] != \
+                        [list(r.completion) for r in expected[option]]:
+                    failures.append(option)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=client) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert failures == []
+    assert service.jobs == 32
@@ -0,0 +1,185 @@
+import random
+
+import pytest
+
+import scheduling_engine as engine
+from backend_launcher import locate_backend
+from backend_session import BackendSession
+from result_protocol import FORMAT_COMMAND, decode_results
+
+
+SAMPLE = [
+    {'id': 'P1', 'arrival': 0, 'burst': 5, 'priority': 2},
+    {'id': 'P2', 'arrival': 1, 'burst': 3, 'priority': 1},
+    {'id': 'P3', 'arrival': 2, 'burst': 8, 'priority': 4},
+    {'id': 'P4', 'arrival': 3, 'burst': 6, 'priority': 3},
+    {'id': 'P5', 'arrival': 5, 'burst': 4, 'priority': 2},
+]
+
+def random_workload(n, seed):
+    rng = random.Random(seed)
+    return [{'id': f"P{k + 1}", 'arrival': rng.randint(0, n // 2),
+             'burst': rng.randint(1, 9), 'priority': rng.randint(1, 5)}
+            for k in range(n)]
+
+
+def columns(result):
+    return [list(col) for col in (
+        result.slice_pid, result.slice_start, result.slice_end,
+        result.pid, result.arrival, result.burst,
+        result.completion, result.turnaround, result.waiting)]
+
+
+def test_fcfs_sample():
+    result = engine.run_option(2, SAMPLE)[0]
+    assert list(result.completion) == [5, 8, 16, 22, 26]
+    assert list(result.waiting) == [0, 4, 6, 13, 17]
+    assert result.avg_wt == pytest.approx(8.0)
+
+
+def test_sjf_and_priority_sample():
+    sjf = engine.run_option(3, SAMPLE)[0]
+    assert list(sjf.slice_pid) == [1, 2, 5, 4, 3]
+    priority = engine.run_option(4, SAMPLE)[0]
+    assert list(priority.slice_pid) == [1, 2, 5, 4, 3]
+
+
+def test_round_robin_conserves_burst():
+    result = engine.run_option(5, SAMPLE, quantum=2)[0]
+    assert list(result.burst) == [5, 3, 8, 6, 4]
+    assert sum(e - s for s, e in zip(result.slice_start, result.slice_end)) == 26
+    assert result.makespan == 26
+    assert all(w >= 0 for w in result.waiting)
+    assert all(e - s <= 2 for s, e in zip(result.slice_start, result.slice_end))
+
+
+def test_srtf_preempts_for_shorter_arrival():
+    result = engine.run_option(13, SAMPLE)[0]
+    assert list(zip(result.slice_pid, result.slice_start, result.slice_end)) == [
+        (1, 0, 1), (2, 1, 4), (1, 4, 8), (5, 8, 12), (4, 12, 18), (3, 18, 26)]
+    assert result.avg_wt == pytest.approx(6.2)
+
+
+def test_priority_aging_prevents_starvation():
+    # A low-priority job against a stream of high-priority arrivals
+    workload = [{'id': 'low', 'arrival': 0, 'burst': 4, 'priority': 9}]
+    workload += [{'id': f"hi{t}", 'arrival': t, 'burst': 3, 'priority': 1} for t in range(0, 90, 3)]
+    result = engine.run_option(14, workload)[0]
+    assert result.completion[0] < 60
+    starved = engine.run_option(4, workload)[0]
+    assert starved.completion[list(starved.pid).index(1)] == starved.makespan
+
+
+def test_mlfq_demotes_long_jobs():
+    result = engine.run_option(15, SAMPLE, quantum=2)[0]
+    assert list(zip(result.slice_pid, result.slice_start, result.slice_end)) == [
+        (1, 0, 2), (2, 2, 4), (3, 4, 6), (4, 6, 8), (5, 8, 10),
+        (1, 10, 13), (2, 13, 14), (3, 14, 18), (4, 18, 22), (5, 22, 24), (3, 24, 26)]
+    assert result.quantum == 2
+
+
+def test_mlfq_arrival_preempts_lower_level():
+    workload = [{'id': 'A', 'arrival': 0, 'burst': 20, 'priority': 1},
+                {'id': 'B', 'arrival': 5, 'burst': 1, 'priority': 1}]
+    result = engine.run_option(15, workload, quantum=2)[0]
+    assert list(zip(result.slice_pid, result.slice_start, result.slice_end))[:3] == [
+        (1, 0, 2), (1, 2, 5), (2, 5, 6)]
+
+
+def test_preemptive_policies_are_event_driven():
+    workload = random_workload(20000, seed=3)
+    for option in (13, 14):
+        result = engine.run_option(option, workload)[0]
+        assert result.slice_count <= 2 * len(workload)
+        assert sum(e - s for s, e in zip(result.slice_start, result.slice_end)) == \
+            sum(p['burst'] for p in workload)
+
+
+def test_idle_gap_before_first_arrival():
+    workload = [{'id': 'A', 'arrival': 4, 'burst': 3, 'priority': 1}]
+    for option in (2, 3, 4, 5, 13, 14, 15):
+        result = engine.run_option(option, workload)[0]
+        assert result.slice_start[0] == 4
+        assert result.completion[0] == 7
+
+
+def lanes(result):
+    """Per-CPU (start, end) slices of a multi-core result"""
+    return [list(zip(result.slice_start[a:b], result.slice_end[a:b]))
+            for a, b in result.cores.lane_bounds()]
+
+
+def test_smp_conserves_work_and_lanes_never_overlap():
+    workload = random_workload(200, seed=3)
+    for option in (2, 3, 4, 5, 13, 14, 15):
+        result = engine.run_option(option, workload, cpus=4)[0]
+        assert result.cpus == 4
+        assert sum(result.cores.completed) == len(workload)
+        assert sum(result.cores.busy) == sum(p['burst'] for p in workload)
+        for lane, busy in zip(lanes(result), result.cores.busy):
+            assert all(end <= nxt for (_, end), (nxt, _) in zip(lane, lane[1:]))
+            assert sum(end - start for start, end in lane) == busy
+        assert all(w >= 0 for w in result.waiting)
+
+
+def test_smp_one_process_never_runs_on_two_cores_at_once():
+    result = engine.run_option(15, random_workload(100, seed=5), cpus=3)[0]
+    by_pid = {}
+    for pid, start, end in zip(result.slice_pid, result.slice_start, result.slice_end):
+        by_pid.setdefault(pid, []).append((start, end))
+    for slices in by_pid.values():
+        slices.sort()
+        assert all(end <= nxt for (_, end), (nxt, _) in zip(slices, slices[1:]))
+
+
+def test_smp_balances_arrivals_and_steals_when_idle():
+    burst = [9, 1, 1, 1]
+    result = engine.schedule('FCFS', [0, 0, 0, 0], burst, None, cpus=2)
+    # Arrivals alternate cores; CPU 1 empties its queue and takes P3 from CPU 0
+    assert lanes(result) == [[(0, 9)], [(0, 1), (1, 2), (2, 3)]]
+    assert result.cores.steals == [0, 1]
+    assert list(result.completion) == [9, 1, 3, 2]
+
+
+def test_smp_beats_one_cpu_on_a_parallel_workload():
+    workload = [{'arrival': 0, 'burst': 4, 'priority': 1} for _ in range(8)]
+    single = engine.run_option(2, workload)[0]
+    quad = engine.run_option(2, workload, cpus=4)[0]
+    assert single.makespan == 32
+    assert quad.makespan == 8
+    assert quad.cores.busy == [8, 8, 8, 8]
+
+
+@pytest.mark.skipif(locate_backend() is None, reason="main_system backend is not built")
+def test_smp_parity_with_backend():
+    workload = random_workload(300, seed=11)
+    session = BackendSession(locate_backend(), timeout=20, init_payloads=[FORMAT_COMMAND])
+    try:
+        backend_results, _ = decode_results(session.run_algorithm(6, workload, cpus=4))
+    finally:
+        session.close()
+
+    local_results = engine.run_option(6, workload, cpus=4)
+    assert [r.algorithm for r in backend_results] == [r.algorithm for r in local_results]
+    for remote, local in zip(backend_results, local_results):
+        assert columns(remote) == columns(local), remote.algorithm
+        assert remote.cores.to_dict() == local.cores.to_dict(), remote.algorithm
+        assert remote.summary == pytest.approx(local._summarize()), remote.algorithm
+
+
+@pytest.mark.skipif(locate_backend() is None, reason="main_system backend is not built")
+def test_parity_with_backend():
+    workload = random_workload(300, seed=7)
+    session = BackendSession(locate_backend(), timeout=20, init_payloads=[FORMAT_COMMAND])
+    try:
+        backend_results, _ = decode_results(session.run_algorithm(6, workload))
+    finally:
+        session.close()
+
+    local_results = engine.run_option(6, workload)
+    assert [r.algorithm for r in backend_results] == [r.algorithm for r in local_results]
+    for remote, local in zip(backend_results, local_results):
+        assert columns(remote) == columns(local), remote.algorithm
+        assert remote.avg_wt == pytest.approx(local.avg_wt, abs=0.005)
+        assert remote.avg_tat == pytest.approx(local.avg_tat, abs=0.005)
+        assert remote.summary == pytest.approx(local.summary), remote.algorithm
@@ -0,0 +1,106 @@
+import os
+import random
+import struct
+
+import pytest
+
+from backend_launcher import locate_backend
+from backend_session import BackendSession
+from result_protocol import FORMAT_COMMAND, ProtocolError, decode_results
+from shm_transfer import WORKLOAD_HEADER, WORKLOAD_MAGIC, SharedTransfer, write_workload
+
+
+def columns(result):
+    return [list(getattr(result, name)) for name in
+            ('slice_pid', 'slice_start', 'slice_end', 'pid', 'arrival', 'burst',
+             'completion', 'turnaround', 'waiting')]
+
+
+def random_workload(n, seed):
+    rng = random.Random(seed)
+    return [{'arrival': rng.randint(0, n), 'burst': rng.randint(1, 20),
+             'priority': rng.randint(1, 5)} for _ in range(n)]
+
+
+@pytest.fixture
+def transfer(tmp_path):
+    transfer = SharedTransfer(str(tmp_path))
+    yield transfer
+    transfer.close()
+
+
+def test_workload_segment_layout(tmp_path):
+    path = tmp_path / 'wl'
+    path.write_bytes(b'')
+    write_workload(str(path), ([0, 2], [5, 3], [1, 4]))
+    data = path.read_bytes()
+    assert data[:8] == WORKLOAD_MAGIC
+    assert struct.unpack('<q', data[8:WORKLOAD_HEADER]) == (2,)
+    assert struct.unpack('<6q', data[WORKLOAD_HEADER:]) == (0, 2, 5, 3, 1, 4)
+
+
+def test_load_command_sorts_by_arrival(transfer):
+    command = transfer.load_command([{'arrival': 4, 'burst': 1, 'priority': 2},
+                                     {'arrival': 1, 'burst': 7, 'priority': 3}])
+    assert command == f"LOADMAP {transfer.workload_path}\n"
+    with open(transfer.workload_path, 'rb') as f:
+        assert struct.unpack('<6q', f.read()[WORKLOAD_HEADER:]) == (1, 4, 7, 1, 3, 2)
+
+
+def test_read_result_columns(transfer):
+    slices = [[1, 2], [0, 5], [5, 8]]
+    rows = [[1, 2], [0, 1], [5, 3], [5, 8], [5, 7], [0, 4]]
+    with open(transfer.result_path, 'wb') as f:
+        f.write(b'\0' * 16)
+        for column in slices + rows:
+            f.write(struct.pack('<2q', *column))
+    assert [list(c) for c in transfer.read_result(16, 2, 2)] == slices + rows
+    with pytest.raises(ProtocolError):
+        transfer.read_result(24, 2, 2)
+
+
+def test_map_frame_reads_the_segment(transfer):
+    with open(transfer.result_path, 'wb') as f:
+        f.write(struct.pack('<9q', 1, 0, 4, 1, 0, 4, 4, 4, 0))
+    doc = ('{"algorithm":"FCFS","quantum":0,"segment":[0,1,1],'
+           '"avg_wt":0.00,"avg_tat":4.00}')
+    output = f"RESULT_MAP {len(doc)}\n{doc}\n"
+    result = decode_results(output, transfer)[0][0]
+    assert list(result.slice_end) == [4]
+    assert list(result.completion) == [4]
+    with pytest.raises(ProtocolError):
+        decode_results(output)
+
+
+def test_close_removes_both_files(tmp_path):
+    transfer = SharedTransfer(str(tmp_path))
+    transfer.close()
+    transfer.close()
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.skipif(locate_backend() is None, reason="main_system backend is not built")
+@pytest.mark.parametrize('cpus', [1, 3])
+def test_backend_parity_with_json(cpus):
+    workload = random_workload(400, seed=5)
+    text = BackendSession(locate_backend(), timeout=20, init_payloads=[FORMAT_COMMAND])
+    mapped = BackendSession(locate_backend(), timeout=20, init_payloads=[FORMAT_COMMAND],
+                            shared_memory=True)
+    try:
+        expected, _ = decode_results(text.run_algorithm(6, workload, cpus=cpus))
+        # Twice, so the second run has to reuse the truncated result segment
+        for option in (6, 6):
+            output = mapped.run_algorithm(option, workload, cpus=cpus)
+            assert 'RESULT_JSON' not in output
+            results, _ = decode_results(output, mapped.segment)
+            assert len(results) == len(expected) == 7
+            for remote, local in zip(results, expected):
+                assert remote.algorithm == local.algorithm
+                assert columns(remote) == columns(local), remote.algorithm
+                assert remote.summary == local.summary
+                if cpus > 1:
+                    assert remote.cores.to_dict() == local.cores.to_dict()
+    finally:
+        text.close()
+        mapped.close()
+    assert not os.path.exists(mapped.segment.result_path)
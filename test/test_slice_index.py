@@ -0,0 +1,66 @@
+import random
+from array import array
+
+import pytest
+
+import slice_index
+from slice_index import SliceIndex
+
+
+def schedule(lanes, seed=1):
+    """Random multi-lane schedule: time-ordered, non-overlapping per lane"""
+    rng = random.Random(seed)
+    pid, start, end = array('q'), array('q'), array('q')
+    for count in lanes:
+        t = 0
+        for _ in range(count):
+            t += rng.randint(0, 3)
+            length = rng.randint(1, 5)
+            pid.append(rng.randint(1, 20))
+            start.append(t)
+            end.append(t + length)
+            t += length
+    return pid, start, end
+
+
+def test_slice_at_finds_the_running_slice_or_a_gap():
+    index = SliceIndex(array('q', [1, 2, 1]), array('q', [0, 5, 9]), array('q', [5, 7, 12]))
+    assert [index.slice_at(0, t) for t in (0, 4, 5, 7, 8, 9, 11, 12)] == \
+        [0, 0, 1, None, None, 2, 2, None]
+
+
+def test_time_queries_match_a_scan():
+    lanes = [300, 0, 250, 400]
+    pid, start, end = schedule(lanes)
+    index = SliceIndex(pid, start, end, lanes)
+    offsets = [0, 300, 300, 550, 950]
+    for t in range(0, 1500, 7):
+        expected = [(lane, k) for lane in range(4) for k in range(offsets[lane], offsets[lane + 1])
+                    if start[k] <= t < end[k]]
+        assert index.running_at(t) == expected
+    for t0, t1 in ((0, 10), (100, 400), (333, 334), (1400, 2000)):
+        expected = sum(1 for k in range(len(start)) if start[k] < t1 and end[k] > t0)
+        assert index.count_between(t0, t1) == expected
+    assert [index.lane_of(k) for k in (0, 299, 300, 549, 550, 949)] == [0, 0, 2, 2, 3, 3]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_process_index_keeps_time_order(monkeypatch, use_numpy):
+    if not use_numpy:
+        monkeypatch.setattr(slice_index, 'np', None)
+    lanes = [200, 150]
+    pid, start, end = schedule(lanes, seed=7)
+    index = SliceIndex(pid, start, end, lanes)
+    for p in (1, 7, 20, 99):
+        assert index.process_slices(p) == [k for k in range(350) if pid[k] == p]
+    pids, starts, ends = index.process_columns()
+    lo, hi = index.process_range(1, 7, 100, 300)
+    assert all(pids[k] == 7 and starts[k] < 300 and ends[k] > 100 for k in range(lo, hi))
+    assert hi - lo == sum(1 for k in range(200, 350)
+                          if pid[k] == 7 and start[k] < 300 and end[k] > 100)
+
+
+def test_empty_schedule():
+    index = SliceIndex(array('q'), array('q'), array('q'))
+    assert index.running_at(0) == [] and index.count_between(0, 10) == 0
+    assert index.process_slices(1) == []
@@ -0,0 +1,77 @@
+import struct
+
+import pytest
+
+from process_store import ProcessStore, SAMPLE_PROCESSES
+from workload_io import (BINARY_HEADER, BINARY_MAGIC, ID_WIDTH, WorkloadFormatError,
+                         load_workload, read_workload, save_workload)
+
+
+@pytest.mark.parametrize('ext', ['.csv', '.jsonl', '.bin'])
+def test_round_trip(tmp_path, ext):
+    path = str(tmp_path / f"workload{ext}")
+    save_workload(path, ProcessStore(SAMPLE_PROCESSES))
+    assert list(load_workload(path, ProcessStore())) == SAMPLE_PROCESSES
+
+
+@pytest.mark.parametrize('ext', ['.csv', '.jsonl', '.bin'])
+def test_chunks_report_progress(tmp_path, ext):
+    store = ProcessStore()
+    store.extend_columns([f"P{k + 1}" for k in range(1000)],
+                         range(1000), [3] * 1000, [k % 7 for k in range(1000)])
+    path = str(tmp_path / f"big{ext}")
+    save_workload(path, store)
+
+    chunks = list(read_workload(path, chunk_rows=256))
+    assert [len(c) for c in chunks] == [256, 256, 256, 232]
+    progress = [c.progress for c in chunks]
+    assert progress == sorted(progress) and progress[-1] == 1.0
+    assert list(load_workload(path, ProcessStore())) == list(store)
+
+
+def test_csv_without_ids_gets_default_names(tmp_path):
+    path = tmp_path / "plain.csv"
+    path.write_text("arrival,burst,priority\n0,4,1\n2,3,2\n")
+    store = load_workload(str(path), ProcessStore())
+    assert store.ids == ['P1', 'P2']
+    assert list(store.burst) == [4, 3]
+
+
+def test_bad_rows_are_rejected(tmp_path):
+    csv_path = tmp_path / "bad.csv"
+    csv_path.write_text("id,arrival,burst,priority\nP1,0,x,1\n")
+    with pytest.raises(WorkloadFormatError, match=":2:"):
+        load_workload(str(csv_path), ProcessStore())
+
+    jsonl_path = tmp_path / "bad.jsonl"
+    jsonl_path.write_text('{"id": "P1", "arrival": 0}\n')
+    with pytest.raises(WorkloadFormatError):
+        load_workload(str(jsonl_path), ProcessStore())
+
+    bin_path = tmp_path / "bad.bin"
+    bin_path.write_bytes(b"not a workload at all....")
+    with pytest.raises(WorkloadFormatError):
+        load_workload(str(bin_path), ProcessStore())
+
+    with pytest.raises(WorkloadFormatError):
+        save_workload(str(tmp_path / "workload.txt"), ProcessStore(SAMPLE_PROCESSES))
+
+
+def test_values_outside_the_backend_range_are_rejected(tmp_path):
+    csv_path = tmp_path / "big.csv"
+    csv_path.write_text("id,arrival,burst,priority\nP1,3000000000,1,1\n")
+    with pytest.raises(WorkloadFormatError, match="between 0 and"):
+        load_workload(str(csv_path), ProcessStore())
+
+    jsonl_path = tmp_path / "big.jsonl"
+    jsonl_path.write_text('{"arrival": 0, "burst": 1, "priority": -3000000000}\n')
+    with pytest.raises(WorkloadFormatError, match="priority"):
+        load_workload(str(jsonl_path), ProcessStore())
+
+    # Binary columns are int32, so only a negative arrival or burst can get in
+    bin_path = tmp_path / "negative.bin"
+    header = BINARY_HEADER.pack(BINARY_MAGIC, 2, ID_WIDTH, 0)
+    columns = struct.pack('<6i', 0, 1, 3, -5, 1, 1)
+    bin_path.write_bytes(header + bytes(2 * ID_WIDTH) + columns)
+    with pytest.raises(WorkloadFormatError, match="record 2"):
+        load_workload(str(bin_path), ProcessStore())